@@ -0,0 +1,153 @@
+"""
+Benchmark the disk cache payload encoding.
+
+Compares the previous format (plain JSON of ``model_dump(mode="json")``,
+re-validated item by item on read) with ``cache.codec`` (compressed compact
+JSON decoded in one pydantic-core pass) on synthetic ``withSummaries=true``
+stage lists and executor lists.
+
+Run with ``uv run python benchmarks/bench_cache_encoding.py [--stages N]``.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from spark_history_mcp.cache import codec
+from spark_history_mcp.models.spark_types import ExecutorSummary, StageData
+
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def _dist(rng):
+    return sorted(rng.random() * 10_000 for _ in QUANTILES)
+
+
+def make_stage(i, rng, executors=20):
+    return {
+        "status": "COMPLETE",
+        "stageId": i,
+        "attemptId": 0,
+        "numTasks": 200,
+        "numCompleteTasks": 200,
+        "name": f"map at Job.scala:{i}",
+        "details": "org.apache.spark.rdd.RDD.map(RDD.scala:413)\n" * 8,
+        "submissionTime": "2024-01-01T00:00:00.000GMT",
+        "firstTaskLaunchedTime": "2024-01-01T00:00:01.000GMT",
+        "completionTime": "2024-01-01T00:01:00.000GMT",
+        "executorRunTime": rng.randint(1, 10**6),
+        "inputBytes": rng.randint(1, 10**9),
+        "shuffleReadBytes": rng.randint(1, 10**9),
+        "shuffleWriteBytes": rng.randint(1, 10**9),
+        "executorSummary": {
+            str(e): {
+                "taskTime": rng.randint(1, 10**5),
+                "failedTasks": 0,
+                "succeededTasks": 10,
+                "inputBytes": rng.randint(1, 10**8),
+                "shuffleRead": rng.randint(1, 10**8),
+                "peakMemoryMetrics": {"metrics": {"JVMHeapMemory": 1 << 30}},
+            }
+            for e in range(executors)
+        },
+        "taskMetricsDistributions": {
+            "quantiles": QUANTILES,
+            "duration": _dist(rng),
+            "executorRunTime": _dist(rng),
+            "jvmGcTime": _dist(rng),
+            "schedulerDelay": _dist(rng),
+            "inputMetrics": {"bytesRead": _dist(rng), "recordsRead": _dist(rng)},
+            "shuffleReadMetrics": {
+                "readBytes": _dist(rng),
+                "remoteBytesRead": _dist(rng),
+            },
+            "shuffleWriteMetrics": {
+                "writeBytes": _dist(rng),
+                "writeRecords": _dist(rng),
+                "writeTime": _dist(rng),
+            },
+        },
+        "executorMetricsDistributions": {
+            "quantiles": QUANTILES,
+            "taskTime": _dist(rng),
+            "shuffleRead": _dist(rng),
+        },
+    }
+
+
+def make_executor(i, rng):
+    return {
+        "id": str(i),
+        "hostPort": f"10.0.{i // 250}.{i % 250}:7337",
+        "isActive": True,
+        "totalCores": 4,
+        "maxTasks": 4,
+        "completedTasks": rng.randint(1, 10**4),
+        "totalDuration": rng.randint(1, 10**7),
+        "totalGCTime": rng.randint(1, 10**5),
+        "totalInputBytes": rng.randint(1, 10**10),
+        "maxMemory": 1 << 32,
+        "addTime": "2024-01-01T00:00:00.000GMT",
+        "executorLogs": {"stdout": f"http://host-{i}/stdout"},
+        "attributes": {},
+        "resources": {},
+    }
+
+
+def legacy_encode(values):
+    return json.dumps([v.model_dump(mode="json") for v in values]).encode()
+
+
+def legacy_decode(payload, model_cls):
+    return [model_cls.model_validate(d) for d in json.loads(payload)]
+
+
+def _median_seconds(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(label, model_cls, values, repeat):
+    old = legacy_encode(values)
+    new = codec.encode_models(values)
+    assert codec.decode_models(new, model_cls) == legacy_decode(old, model_cls)
+    old_load = _median_seconds(lambda: legacy_decode(old, model_cls), repeat)
+    new_load = _median_seconds(lambda: codec.decode_models(new, model_cls), repeat)
+    print(
+        f"{label:<28} {len(old) / 1024:>10.0f} KB {len(new) / 1024:>8.0f} KB "
+        f"{old_load * 1000:>9.1f} ms {new_load * 1000:>9.1f} ms "
+        f"{old_load / new_load:>6.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stages", type=int, default=1000)
+    parser.add_argument("--executors", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    stages = [StageData.model_validate(make_stage(i, rng)) for i in range(args.stages)]
+    executors = [
+        ExecutorSummary.model_validate(make_executor(i, rng))
+        for i in range(args.executors)
+    ]
+
+    print(f"codec: {'zstd' if codec.ZSTD_AVAILABLE else 'gzip'}")
+    print(
+        f"{'payload':<28} {'old size':>13} {'new size':>11} "
+        f"{'old load':>12} {'new load':>12} {'speedup':>7}"
+    )
+    run(f"{args.stages} stages (summaries)", StageData, stages, args.repeat)
+    run(f"{args.executors} executors", ExecutorSummary, executors, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
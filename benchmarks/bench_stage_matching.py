@@ -0,0 +1,121 @@
+"""
+Benchmark stage matching between two applications.
+
+Compares the previous matcher (``SequenceMatcher`` over every stage pair,
+first-come greedy assignment) with ``tools.matching.match_stages`` (exact
+names first, then a trigram index that scores only the best candidates) on
+synthetic applications whose stage names repeat the same operations and
+files with shifted line numbers. The full pairwise scan is only timed on the
+first ``--baseline-stages`` stages and extrapolated quadratically.
+
+Run with ``uv run python benchmarks/bench_stage_matching.py [--stages N]``.
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from spark_history_mcp.tools.matching import match_stages, name_similarity
+
+OPERATIONS = [
+    "map",
+    "filter",
+    "save",
+    "collect",
+    "mapPartitions",
+    "join",
+    "parquet",
+    "count",
+    "toPandas",
+    "showString",
+]
+FILES = ["Ingest", "Transform", "Report", "Writer", "Features", "Model", "Export"]
+
+
+def make_stage(name):
+    return SimpleNamespace(name=name, submission_time=None, completion_time=None)
+
+
+def make_apps(count, rng, renamed):
+    """Two apps with *count* stages; a *renamed* share moved line numbers."""
+    stages1 = [
+        make_stage(
+            f"{rng.choice(OPERATIONS)} at {rng.choice(FILES)}.scala:{rng.randint(1, 900)}"
+        )
+        for _ in range(count)
+    ]
+    stages2 = [
+        make_stage(
+            s.name.replace("scala:", "scala:1") if rng.random() < renamed else s.name
+        )
+        for s in stages1
+    ]
+    rng.shuffle(stages2)
+    return stages1, stages2
+
+
+def legacy_match_stages(stages1, stages2, threshold):
+    matches = []
+    used2 = set()
+    for s1 in stages1:
+        best_idx, best_sim = -1, 0.0
+        for i, s2 in enumerate(stages2):
+            if i in used2:
+                continue
+            sim = name_similarity(s1.name, s2.name)
+            if sim >= threshold and sim > best_sim:
+                best_idx, best_sim = i, sim
+        if best_idx >= 0:
+            matches.append(best_sim)
+            used2.add(best_idx)
+    return matches
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stages", type=int, default=5000)
+    parser.add_argument("--baseline-stages", type=int, default=400)
+    parser.add_argument("--renamed", type=float, default=0.3)
+    parser.add_argument("--threshold", type=float, default=0.75)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    stages1, stages2 = make_apps(args.stages, rng, args.renamed)
+
+    print(f"{'matcher':<34} {'matches':>8} {'mean sim':>9} {'time':>10}")
+    sample = args.baseline_stages
+    legacy, legacy_s = _timed(
+        lambda: legacy_match_stages(stages1[:sample], stages2[:sample], args.threshold)
+    )
+    scale = (args.stages / sample) ** 2
+    print(
+        f"{f'full scan ({sample} stages)':<34} {len(legacy):>8} "
+        f"{sum(legacy) / max(1, len(legacy)):>9.3f} {legacy_s:>9.2f}s"
+    )
+    print(
+        f"{f'full scan ({args.stages}, estimated)':<34} {'':>8} {'':>9} "
+        f"{legacy_s * scale:>9.0f}s"
+    )
+    for optimal in (False, True):
+        matches, elapsed = _timed(
+            lambda optimal=optimal: match_stages(
+                stages1, stages2, args.threshold, optimal=optimal
+            )
+        )
+        label = f"indexed, {'optimal' if optimal else 'greedy'} ({args.stages})"
+        print(
+            f"{label:<34} {len(matches):>8} "
+            f"{sum(m.similarity for m in matches) / max(1, len(matches)):>9.3f} "
+            f"{elapsed:>9.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
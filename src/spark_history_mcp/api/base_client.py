@@ -5,6 +5,7 @@ Base client for Spark History Server API.
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from spark_history_mcp.config.config import ServerConfig
 
@@ -18,6 +19,15 @@ class BaseApiClient:
         self.verify_ssl = server_config.verify_ssl
         self.session = requests.Session()
 
+        # Tools run in worker threads that share this session; keep enough
+        # connections alive for them instead of reopening one per request
+        adapter = HTTPAdapter(
+            pool_connections=server_config.max_connections,
+            pool_maxsize=server_config.max_connections,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Configure proxies if available
         if hasattr(server_config, "use_proxy") and server_config.use_proxy:
             proxy_url = server_config.proxy_url
@@ -0,0 +1,1990 @@
+"""
+Client that reads Spark event logs directly instead of a History Server.
+
+``EventLogClient`` answers the ``SparkRestClient`` calls the tools make from
+the event log files in a local directory (``spark.eventLog.dir`` or logs
+copied off a cluster), so every tool works without a History Server in the
+loop. Plain single-file logs, rolling logs (``eventlog_v2_*`` directories)
+and logs compressed with zstd, lz4 or snappy are supported; the codecs are
+optional dependencies (the ``eventlog`` extra).
+
+Logs are replayed with a streaming line parser: the file is decompressed and
+split into lines chunk by chunk, and only the events the REST models are
+built from are decoded as JSON (the event name is read from the line prefix,
+so large SQL plan events and unknown events are skipped without parsing).
+A replayed log is kept (in the shared memory cache, within its byte budget)
+until its files change, so completed applications are parsed once; when Spark
+appends to an in-progress log, only the appended bytes are replayed. Listing
+applications reads only the application events of each log. With an ``EventLogIndex`` the replays also persist across
+restarts.
+"""
+
+import itertools
+import json
+import logging
+import re
+import struct
+import threading
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlparse
+
+from spark_history_mcp.cache import get_memory_cache
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.memory_cache import estimate_size
+from spark_history_mcp.models.spark_types import (
+    ApplicationAttemptInfo,
+    ApplicationEnvironmentInfo,
+    ApplicationInfo,
+    ExecutionData,
+    ExecutorSummary,
+    JobData,
+    JobExecutionStatus,
+    ProcessSummary,
+    RDDStorageInfo,
+    StageData,
+    StageStatus,
+    TaskData,
+    TaskMetricDistributions,
+    TaskSorting,
+    TaskStatus,
+    ThreadStackTrace,
+    VersionInfo,
+)
+
+if TYPE_CHECKING:
+    from spark_history_mcp.api.event_log_index import EventLogIndex
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.block
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+try:
+    import snappy
+
+    SNAPPY_AVAILABLE = True
+except ImportError:
+    SNAPPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ROLLING_PREFIX = "eventlog_v2_"
+IN_PROGRESS = ".inprogress"
+
+# Quantiles the History Server uses when none are requested
+DEFAULT_TASK_SUMMARY_QUANTILES = "0.05,0.25,0.5,0.75,0.95"
+STAGE_SUMMARY_QUANTILES = "0.0,0.25,0.5,0.75,1.0"
+
+_CHUNK_SIZE = 1 << 20
+# Bytes at the end of a plain log searched for the application end event
+_TAIL_BYTES = 1 << 16
+_APP_END = b"SparkListenerApplicationEnd"
+_EVENT_PREFIX = b'{"Event":"'
+_ROLLING_INDEX = re.compile(r"^events_(\d+)_")
+_TASK_SORT_ALIASES = {
+    "runtime": TaskSorting.INCREASING_RUNTIME,
+    "-runtime": TaskSorting.DECREASING_RUNTIME,
+}
+
+# lz4-java LZ4BlockOutputStream framing
+_LZ4_MAGIC = b"LZ4Block"
+_LZ4_HEADER = struct.Struct("<Biii")  # token, compressed, original, checksum
+_LZ4_RAW = 0x10
+# snappy-java SnappyOutputStream framing
+_SNAPPY_MAGIC = b"\x82SNAPPY\x00"
+_SNAPPY_HEADER_SIZE = 16
+_SNAPPY_LENGTH = struct.Struct(">i")
+
+# Memory cache namespace of replayed logs, and rough bytes a replayed task
+# and other record (stage, executor, SQL execution) retain
+_REPLAY_NAMESPACE = "event_logs"
+_TASK_BYTES = 1400
+_RECORD_BYTES = 1024
+_client_ids = itertools.count()
+
+# (StageData total, event log "Task Metrics" path, TaskMetrics group, field)
+_METRICS: Tuple[Tuple[str, Tuple[str, ...], Optional[str], str], ...] = (
+    (
+        "executorDeserializeTime",
+        ("Executor Deserialize Time",),
+        None,
+        "executorDeserializeTime",
+    ),
+    (
+        "executorDeserializeCpuTime",
+        ("Executor Deserialize CPU Time",),
+        None,
+        "executorDeserializeCpuTime",
+    ),
+    ("executorRunTime", ("Executor Run Time",), None, "executorRunTime"),
+    ("executorCpuTime", ("Executor CPU Time",), None, "executorCpuTime"),
+    ("resultSize", ("Result Size",), None, "resultSize"),
+    ("jvmGcTime", ("JVM GC Time",), None, "jvmGcTime"),
+    (
+        "resultSerializationTime",
+        ("Result Serialization Time",),
+        None,
+        "resultSerializationTime",
+    ),
+    ("memoryBytesSpilled", ("Memory Bytes Spilled",), None, "memoryBytesSpilled"),
+    ("diskBytesSpilled", ("Disk Bytes Spilled",), None, "diskBytesSpilled"),
+    ("peakExecutionMemory", ("Peak Execution Memory",), None, "peakExecutionMemory"),
+    ("inputBytes", ("Input Metrics", "Bytes Read"), "inputMetrics", "bytesRead"),
+    ("inputRecords", ("Input Metrics", "Records Read"), "inputMetrics", "recordsRead"),
+    (
+        "outputBytes",
+        ("Output Metrics", "Bytes Written"),
+        "outputMetrics",
+        "bytesWritten",
+    ),
+    (
+        "outputRecords",
+        ("Output Metrics", "Records Written"),
+        "outputMetrics",
+        "recordsWritten",
+    ),
+    (
+        "shuffleRemoteBlocksFetched",
+        ("Shuffle Read Metrics", "Remote Blocks Fetched"),
+        "shuffleReadMetrics",
+        "remoteBlocksFetched",
+    ),
+    (
+        "shuffleLocalBlocksFetched",
+        ("Shuffle Read Metrics", "Local Blocks Fetched"),
+        "shuffleReadMetrics",
+        "localBlocksFetched",
+    ),
+    (
+        "shuffleFetchWaitTime",
+        ("Shuffle Read Metrics", "Fetch Wait Time"),
+        "shuffleReadMetrics",
+        "fetchWaitTime",
+    ),
+    (
+        "shuffleRemoteBytesRead",
+        ("Shuffle Read Metrics", "Remote Bytes Read"),
+        "shuffleReadMetrics",
+        "remoteBytesRead",
+    ),
+    (
+        "shuffleRemoteBytesReadToDisk",
+        ("Shuffle Read Metrics", "Remote Bytes Read To Disk"),
+        "shuffleReadMetrics",
+        "remoteBytesReadToDisk",
+    ),
+    (
+        "shuffleLocalBytesRead",
+        ("Shuffle Read Metrics", "Local Bytes Read"),
+        "shuffleReadMetrics",
+        "localBytesRead",
+    ),
+    (
+        "shuffleReadRecords",
+        ("Shuffle Read Metrics", "Total Records Read"),
+        "shuffleReadMetrics",
+        "recordsRead",
+    ),
+    (
+        "shuffleRemoteReqsDuration",
+        ("Shuffle Read Metrics", "Remote Requests Duration"),
+        "shuffleReadMetrics",
+        "remoteReqsDuration",
+    ),
+    (
+        "shuffleWriteBytes",
+        ("Shuffle Write Metrics", "Shuffle Bytes Written"),
+        "shuffleWriteMetrics",
+        "bytesWritten",
+    ),
+    (
+        "shuffleWriteTime",
+        ("Shuffle Write Metrics", "Shuffle Write Time"),
+        "shuffleWriteMetrics",
+        "writeTime",
+    ),
+    (
+        "shuffleWriteRecords",
+        ("Shuffle Write Metrics", "Shuffle Records Written"),
+        "shuffleWriteMetrics",
+        "recordsWritten",
+    ),
+)
+_M = {name: i for i, (name, _, _, _) in enumerate(_METRICS)}
+
+# TaskMetricDistributions field -> metric index
+_DISTRIBUTIONS = {
+    "executorDeserializeTime": _M["executorDeserializeTime"],
+    "executorDeserializeCpuTime": _M["executorDeserializeCpuTime"],
+    "executorRunTime": _M["executorRunTime"],
+    "executorCpuTime": _M["executorCpuTime"],
+    "resultSize": _M["resultSize"],
+    "jvmGcTime": _M["jvmGcTime"],
+    "resultSerializationTime": _M["resultSerializationTime"],
+    "peakExecutionMemory": _M["peakExecutionMemory"],
+    "memoryBytesSpilled": _M["memoryBytesSpilled"],
+    "diskBytesSpilled": _M["diskBytesSpilled"],
+}
+_DISTRIBUTION_GROUPS = {
+    "inputMetrics": {
+        "bytesRead": _M["inputBytes"],
+        "recordsRead": _M["inputRecords"],
+    },
+    "outputMetrics": {
+        "bytesWritten": _M["outputBytes"],
+        "recordsWritten": _M["outputRecords"],
+    },
+    "shuffleReadMetrics": {
+        "readRecords": _M["shuffleReadRecords"],
+        "remoteBlocksFetched": _M["shuffleRemoteBlocksFetched"],
+        "localBlocksFetched": _M["shuffleLocalBlocksFetched"],
+        "fetchWaitTime": _M["shuffleFetchWaitTime"],
+        "remoteBytesRead": _M["shuffleRemoteBytesRead"],
+        "remoteBytesReadToDisk": _M["shuffleRemoteBytesReadToDisk"],
+        "remoteReqsDuration": _M["shuffleRemoteReqsDuration"],
+    },
+    "shuffleWriteMetrics": {
+        "writeBytes": _M["shuffleWriteBytes"],
+        "writeRecords": _M["shuffleWriteRecords"],
+        "writeTime": _M["shuffleWriteTime"],
+    },
+}
+
+
+class EventLogError(Exception):
+    """Raised when an event log is missing, unreadable or lacks the data."""
+
+
+def _live_only(endpoint: str) -> EventLogError:
+    return EventLogError(
+        f"{endpoint} is not available when reading event logs directly; it "
+        "needs a History Server or a running application"
+    )
+
+
+# Decompression
+
+
+def _read_chunks(stream) -> Iterator[bytes]:
+    while chunk := stream.read(_CHUNK_SIZE):
+        yield chunk
+
+
+def _read_zstd(stream) -> Iterator[bytes]:
+    reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    yield from _read_chunks(reader)
+
+
+def _read_lz4(stream) -> Iterator[bytes]:
+    """Decode lz4-java block streams (what Spark's lz4 codec writes)."""
+    while True:
+        magic = stream.read(len(_LZ4_MAGIC))
+        if len(magic) < len(_LZ4_MAGIC):
+            return  # end of file, or a block still being written
+        if magic != _LZ4_MAGIC:
+            raise EventLogError("not an lz4 block stream")
+        header = stream.read(_LZ4_HEADER.size)
+        if len(header) < _LZ4_HEADER.size:
+            return
+        token, compressed_length, length, _ = _LZ4_HEADER.unpack(header)
+        block = stream.read(compressed_length)
+        if len(block) < compressed_length:
+            return
+        if length == 0:
+            continue  # end mark; appended output starts a new stream
+        if token & 0xF0 == _LZ4_RAW:
+            yield block
+        else:
+            yield lz4.block.decompress(block, uncompressed_size=length)
+
+
+def _read_snappy(stream) -> Iterator[bytes]:
+    """Decode snappy-java streams (what Spark's snappy codec writes)."""
+    while True:
+        prefix = stream.read(_SNAPPY_LENGTH.size)
+        if len(prefix) < _SNAPPY_LENGTH.size:
+            return
+        if prefix == _SNAPPY_MAGIC[: len(prefix)]:
+            # Stream header, at the start or where appended output begins
+            stream.read(_SNAPPY_HEADER_SIZE - len(prefix))
+            continue
+        (length,) = _SNAPPY_LENGTH.unpack(prefix)
+        block = stream.read(length)
+        if len(block) < length:
+            return
+        yield snappy.uncompress(block)
+
+
+_READERS: Dict[Optional[str], Tuple[Callable[[Any], Iterator[bytes]], bool, str]] = {
+    None: (_read_chunks, True, ""),
+    "zstd": (_read_zstd, ZSTD_AVAILABLE, "zstandard"),
+    "zst": (_read_zstd, ZSTD_AVAILABLE, "zstandard"),
+    "lz4": (_read_lz4, LZ4_AVAILABLE, "lz4"),
+    "snappy": (_read_snappy, SNAPPY_AVAILABLE, "python-snappy"),
+}
+
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[Tuple[bytes, bool]]:
+    """Split chunks into lines; the flag is False for an unterminated tail."""
+    pending = b""
+    for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line, True
+    if pending:
+        yield pending, False
+
+
+def _event_name(line: bytes) -> Optional[bytes]:
+    if line.startswith(_EVENT_PREFIX):
+        end = line.find(b'"', len(_EVENT_PREFIX))
+        if end > 0:
+            return line[len(_EVENT_PREFIX) : end]
+    return None
+
+
+# Log discovery
+
+
+@dataclass
+class _LogFiles:
+    """One application attempt's event log: a file or a rolling directory."""
+
+    name: str
+    files: List[Path]
+    codec: Optional[str]
+    in_progress: bool
+
+    def signature(self) -> Tuple[Any, ...]:
+        stats = []
+        for path in self.files:
+            st = path.stat()
+            stats.append((path.name, st.st_mtime_ns, st.st_size))
+        return (self.in_progress, tuple(stats))
+
+    def last_modified(self) -> int:
+        return max(int(path.stat().st_mtime * 1000) for path in self.files)
+
+
+def _split_name(file_name: str) -> Tuple[str, Optional[str], bool]:
+    """Split ``<name>[.<codec>][.inprogress]`` into its parts."""
+    in_progress = file_name.endswith(IN_PROGRESS)
+    if in_progress:
+        file_name = file_name[: -len(IN_PROGRESS)]
+    base, _, codec = file_name.partition(".")
+    return base, codec or None, in_progress
+
+
+def _rolling_log(directory: Path) -> Optional[_LogFiles]:
+    events = []
+    in_progress = False
+    codec = None
+    for entry in directory.iterdir():
+        if entry.name.startswith("appstatus_"):
+            in_progress = entry.name.endswith(IN_PROGRESS)
+            continue
+        match = _ROLLING_INDEX.match(entry.name)
+        if match and entry.is_file():
+            _, codec, _ = _split_name(entry.name)
+            events.append((int(match.group(1)), entry))
+    if not events:
+        return None
+    return _LogFiles(
+        name=directory.name[len(ROLLING_PREFIX) :],
+        files=[path for _, path in sorted(events)],
+        codec=codec,
+        in_progress=in_progress,
+    )
+
+
+def discover_logs(log_dir: Path) -> List[_LogFiles]:
+    """Find the event logs in *log_dir*, one per application attempt."""
+    logs = []
+    for entry in sorted(log_dir.iterdir()):
+        if entry.name.startswith((".", "_")) or entry.name.endswith(".crc"):
+            continue
+        if entry.is_dir():
+            if entry.name.startswith(ROLLING_PREFIX):
+                log = _rolling_log(entry)
+                if log is not None:
+                    logs.append(log)
+        elif entry.is_file():
+            name, codec, in_progress = _split_name(entry.name)
+            logs.append(_LogFiles(name, [entry], codec, in_progress))
+    return logs
+
+
+# Replay
+
+
+def _timestamp(ms: Optional[int]) -> Optional[str]:
+    """Epoch milliseconds in the History Server's date format."""
+    if not ms or ms <= 0:
+        return None
+    dt = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "GMT"
+
+
+def _parse_date(value: str) -> int:
+    """Parse ``yyyy-MM-dd`` or ``yyyy-MM-dd'T'HH:mm:ss.SSSz`` to epoch ms."""
+    text = value.strip()
+    if text.endswith("GMT"):
+        text = text[:-3] + "+00:00"
+    dt = datetime.fromisoformat(text)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def _enum_values(values: Optional[Iterable[Any]]) -> Optional[set]:
+    if not values:
+        return None
+    return {str(getattr(v, "value", v)).upper() for v in values}
+
+
+def _metric_values(metrics: Optional[Dict[str, Any]]) -> Optional[Tuple[int, ...]]:
+    if not metrics:
+        return None
+    values = []
+    for _, path, _, _ in _METRICS:
+        value: Any = metrics
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        values.append(int(value or 0))
+    return tuple(values)
+
+
+@dataclass(slots=True)
+class _Task:
+    task_id: int
+    index: int
+    attempt: int
+    partition_id: Optional[int]
+    launch_time: Optional[int]
+    executor_id: Optional[str]
+    host: str
+    locality: Optional[str]
+    speculative: bool
+    status: str = TaskStatus.RUNNING.value
+    finish_time: Optional[int] = None
+    getting_result_time: int = 0
+    error: Optional[str] = None
+    kill_reason: Optional[str] = None
+    metrics: Optional[Tuple[int, ...]] = None
+
+    @property
+    def duration(self) -> Optional[int]:
+        if self.launch_time and self.finish_time:
+            return self.finish_time - self.launch_time
+        return None
+
+    def result_fetch_time(self) -> int:
+        if self.getting_result_time and self.finish_time:
+            return self.finish_time - self.getting_result_time
+        return 0
+
+    def scheduler_delay(self) -> int:
+        duration = self.duration
+        if duration is None or self.metrics is None:
+            return 0
+        m = self.metrics
+        return max(
+            0,
+            duration
+            - m[_M["executorRunTime"]]
+            - m[_M["executorDeserializeTime"]]
+            - m[_M["resultSerializationTime"]]
+            - self.result_fetch_time(),
+        )
+
+    def to_json(self, executor_logs: Dict[str, str]) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "taskId": self.task_id,
+            "index": self.index,
+            "attempt": self.attempt,
+            "partitionId": self.partition_id,
+            "launchTime": _timestamp(self.launch_time),
+            "resultFetchStart": _timestamp(self.getting_result_time),
+            "duration": self.duration,
+            "executorId": self.executor_id,
+            "host": self.host,
+            "status": self.status,
+            "taskLocality": self.locality,
+            "speculative": self.speculative,
+            "errorMessage": self.error,
+            "executorLogs": executor_logs,
+            "schedulerDelay": self.scheduler_delay(),
+            "gettingResultTime": self.result_fetch_time(),
+        }
+        if self.metrics is not None:
+            metrics: Dict[str, Any] = {}
+            for value, (_, _, group, name) in zip(self.metrics, _METRICS, strict=True):
+                target = metrics if group is None else metrics.setdefault(group, {})
+                target[name] = value
+            data["taskMetrics"] = metrics
+        return data
+
+
+@dataclass(slots=True)
+class _Stage:
+    stage_id: int
+    attempt_id: int
+    name: str = ""
+    num_tasks: int = 0
+    details: str = ""
+    rdd_ids: List[int] = field(default_factory=list)
+    submission_time: Optional[int] = None
+    completion_time: Optional[int] = None
+    failure_reason: Optional[str] = None
+    status: str = StageStatus.PENDING.value
+    description: Optional[str] = None
+    pool: Optional[str] = None
+    resource_profile_id: Optional[int] = None
+    tasks: Dict[int, _Task] = field(default_factory=dict)
+
+    def update(self, info: Dict[str, Any]) -> None:
+        self.name = info.get("Stage Name", self.name)
+        self.num_tasks = info.get("Number of Tasks", self.num_tasks)
+        self.details = info.get("Details", self.details)
+        self.rdd_ids = [rdd["RDD ID"] for rdd in info.get("RDD Info", [])]
+        self.submission_time = info.get("Submission Time", self.submission_time)
+        self.completion_time = info.get("Completion Time", self.completion_time)
+        self.failure_reason = info.get("Failure Reason", self.failure_reason)
+        self.resource_profile_id = info.get(
+            "Resource Profile Id", self.resource_profile_id
+        )
+
+
+@dataclass(slots=True)
+class _Executor:
+    id: str
+    host: Optional[str] = None
+    host_port: Optional[str] = None
+    cores: int = 0
+    add_time: Optional[int] = None
+    remove_time: Optional[int] = None
+    remove_reason: Optional[str] = None
+    logs: Dict[str, str] = field(default_factory=dict)
+    attributes: Dict[str, str] = field(default_factory=dict)
+    resources: Dict[str, Any] = field(default_factory=dict)
+    resource_profile_id: Optional[int] = None
+    max_memory: int = 0
+    max_on_heap: int = 0
+    max_off_heap: int = 0
+    active_tasks: int = 0
+    completed_tasks: int = 0
+    failed_tasks: int = 0
+    total_duration: int = 0
+    total_gc_time: int = 0
+    total_input_bytes: int = 0
+    total_shuffle_read: int = 0
+    total_shuffle_write: int = 0
+
+
+@dataclass
+class _Execution:
+    id: int
+    description: Optional[str]
+    plan: str
+    submission_time: Optional[int]
+    completion_time: Optional[int] = None
+    error: Optional[str] = None
+    job_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class AppLog:
+    """Everything one replayed event log knows about an application attempt."""
+
+    app_id: Optional[str] = None
+    attempt_id: Optional[str] = None
+    name: str = ""
+    user: Optional[str] = None
+    spark_version: Optional[str] = None
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
+    last_updated: Optional[int] = None
+    completed: bool = False
+    jobs: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    stages: Dict[Tuple[int, int], _Stage] = field(default_factory=dict)
+    executors: Dict[str, _Executor] = field(default_factory=dict)
+    environment: Dict[str, Any] = field(default_factory=dict)
+    resource_profiles: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    executions: Dict[int, _Execution] = field(default_factory=dict)
+    malformed_lines: int = 0
+    # file name (without .inprogress) -> (bytes consumed, size, mtime_ns)
+    offsets: Dict[str, Tuple[int, int, int]] = field(default_factory=dict)
+    # Held while the log is replayed into and while models are built from it
+    lock: Any = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def stage(self, stage_id: int, attempt_id: int) -> _Stage:
+        key = (stage_id, attempt_id)
+        stage = self.stages.get(key)
+        if stage is None:
+            stage = self.stages[key] = _Stage(stage_id, attempt_id)
+        return stage
+
+    def executor(self, executor_id: str) -> _Executor:
+        executor = self.executors.get(executor_id)
+        if executor is None:
+            executor = self.executors[executor_id] = _Executor(executor_id)
+        return executor
+
+
+class _Replay:
+    """Apply listener events to an ``AppLog``, one line at a time."""
+
+    def __init__(self, log: Optional[AppLog] = None) -> None:
+        self.log = log if log is not None else AppLog()
+        self.handlers: Dict[bytes, Callable[[Dict[str, Any]], None]] = {
+            b"SparkListenerLogStart": self.on_log_start,
+            b"SparkListenerApplicationStart": self.on_application_start,
+            b"SparkListenerApplicationEnd": self.on_application_end,
+            b"SparkListenerEnvironmentUpdate": self.on_environment_update,
+            b"SparkListenerResourceProfileAdded": self.on_resource_profile_added,
+            b"SparkListenerBlockManagerAdded": self.on_block_manager_added,
+            b"SparkListenerExecutorAdded": self.on_executor_added,
+            b"SparkListenerExecutorRemoved": self.on_executor_removed,
+            b"SparkListenerJobStart": self.on_job_start,
+            b"SparkListenerJobEnd": self.on_job_end,
+            b"SparkListenerStageSubmitted": self.on_stage_submitted,
+            b"SparkListenerStageCompleted": self.on_stage_completed,
+            b"SparkListenerTaskStart": self.on_task_start,
+            b"SparkListenerTaskEnd": self.on_task_end,
+            b"org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart": (
+                self.on_sql_start
+            ),
+            b"org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionEnd": (
+                self.on_sql_end
+            ),
+            b"org.apache.spark.sql.execution.ui."
+            b"SparkListenerSQLAdaptiveExecutionUpdate": self.on_sql_plan_update,
+        }
+
+    def feed(self, line: bytes, complete: bool = True) -> None:
+        name = _event_name(line)
+        if name is not None and name not in self.handlers:
+            return
+        try:
+            event = json.loads(line)
+        except ValueError:
+            # An in-progress log may end in a partially written line
+            if complete and line.strip():
+                self.log.malformed_lines += 1
+            return
+        if name is None:
+            name = str(event.get("Event", "")).encode()
+        handler = self.handlers.get(name)
+        if handler is not None:
+            handler(event)
+
+    # Application
+
+    def on_log_start(self, event: Dict[str, Any]) -> None:
+        self.log.spark_version = event.get("Spark Version")
+
+    def on_application_start(self, event: Dict[str, Any]) -> None:
+        log = self.log
+        log.app_id = event.get("App ID")
+        log.attempt_id = event.get("App Attempt ID")
+        log.name = event.get("App Name", "")
+        log.user = event.get("User")
+        log.start_time = event.get("Timestamp")
+        driver_logs = event.get("Driver Logs")
+        if driver_logs:
+            log.executor("driver").logs = driver_logs
+
+    def on_application_end(self, event: Dict[str, Any]) -> None:
+        self.log.end_time = event.get("Timestamp")
+
+    def on_environment_update(self, event: Dict[str, Any]) -> None:
+        self.log.environment = event
+
+    def on_resource_profile_added(self, event: Dict[str, Any]) -> None:
+        self.log.resource_profiles[event["Resource Profile Id"]] = event
+
+    # Executors
+
+    def on_block_manager_added(self, event: Dict[str, Any]) -> None:
+        manager = event.get("Block Manager ID", {})
+        executor = self.log.executor(manager.get("Executor ID", ""))
+        executor.host = manager.get("Host")
+        executor.host_port = f"{manager.get('Host')}:{manager.get('Port')}"
+        executor.max_memory = event.get("Maximum Memory", 0)
+        executor.max_on_heap = event.get("Maximum Onheap Memory", 0)
+        executor.max_off_heap = event.get("Maximum Offheap Memory", 0)
+        if executor.add_time is None:
+            executor.add_time = event.get("Timestamp")
+
+    def on_executor_added(self, event: Dict[str, Any]) -> None:
+        info = event.get("Executor Info", {})
+        executor = self.log.executor(event["Executor ID"])
+        executor.host = info.get("Host", executor.host)
+        executor.cores = info.get("Total Cores", 0)
+        executor.add_time = event.get("Timestamp")
+        executor.logs = info.get("Log Urls") or {}
+        executor.attributes = info.get("Attributes") or {}
+        executor.resources = info.get("Resources") or {}
+        executor.resource_profile_id = info.get("Resource Profile Id")
+
+    def on_executor_removed(self, event: Dict[str, Any]) -> None:
+        executor = self.log.executor(event["Executor ID"])
+        executor.remove_time = event.get("Timestamp")
+        executor.remove_reason = event.get("Removed Reason")
+
+    # Jobs and stages
+
+    def on_job_start(self, event: Dict[str, Any]) -> None:
+        infos = event.get("Stage Infos", [])
+        properties = event.get("Properties") or {}
+        for info in infos:
+            stage = self.log.stage(info["Stage ID"], info.get("Stage Attempt ID", 0))
+            stage.update(info)
+        last_stage = max(infos, key=lambda info: info["Stage ID"], default={})
+        tags = properties.get("spark.job.tags")
+        self.log.jobs[event["Job ID"]] = {
+            "jobId": event["Job ID"],
+            "name": last_stage.get("Stage Name", ""),
+            "description": properties.get("spark.job.description"),
+            "submissionTime": event.get("Submission Time"),
+            "stageIds": event.get("Stage IDs", []),
+            "jobGroup": properties.get("spark.jobGroup.id"),
+            "jobTags": sorted(tags.split(",")) if tags else [],
+            "status": JobExecutionStatus.RUNNING.value,
+            "numTasks": sum(info.get("Number of Tasks", 0) for info in infos),
+        }
+        execution_id = properties.get("spark.sql.execution.id")
+        if execution_id is not None:
+            execution = self.log.executions.get(int(execution_id))
+            if execution is not None:
+                execution.job_ids.append(event["Job ID"])
+
+    def on_job_end(self, event: Dict[str, Any]) -> None:
+        job = self.log.jobs.get(event["Job ID"])
+        if job is None:
+            return
+        result = (event.get("Job Result") or {}).get("Result")
+        job["completionTime"] = event.get("Completion Time")
+        job["status"] = (
+            JobExecutionStatus.SUCCEEDED.value
+            if result == "JobSucceeded"
+            else JobExecutionStatus.FAILED.value
+        )
+        # Stages of a finished job that never ran were skipped
+        for stage in self.log.stages.values():
+            if (
+                stage.stage_id in job["stageIds"]
+                and stage.status == StageStatus.PENDING.value
+            ):
+                stage.status = StageStatus.SKIPPED.value
+
+    def on_stage_submitted(self, event: Dict[str, Any]) -> None:
+        info = event["Stage Info"]
+        stage = self.log.stage(info["Stage ID"], info.get("Stage Attempt ID", 0))
+        stage.update(info)
+        stage.status = StageStatus.ACTIVE.value
+        properties = event.get("Properties") or {}
+        stage.description = properties.get("spark.job.description")
+        stage.pool = properties.get("spark.scheduler.pool", "default")
+
+    def on_stage_completed(self, event: Dict[str, Any]) -> None:
+        info = event["Stage Info"]
+        stage = self.log.stage(info["Stage ID"], info.get("Stage Attempt ID", 0))
+        stage.update(info)
+        stage.status = (
+            StageStatus.FAILED.value
+            if stage.failure_reason
+            else StageStatus.COMPLETE.value
+        )
+
+    # Tasks
+
+    def _task(self, event: Dict[str, Any]) -> Tuple[_Stage, _Task, bool]:
+        info = event["Task Info"]
+        stage = self.log.stage(event["Stage ID"], event.get("Stage Attempt ID", 0))
+        task = stage.tasks.get(info["Task ID"])
+        created = task is None
+        if task is None:
+            task = stage.tasks[info["Task ID"]] = _Task(
+                task_id=info["Task ID"],
+                index=info.get("Index", 0),
+                attempt=info.get("Attempt", 0),
+                partition_id=info.get("Partition ID"),
+                launch_time=info.get("Launch Time"),
+                executor_id=info.get("Executor ID"),
+                host=info.get("Host", ""),
+                locality=info.get("Locality"),
+                speculative=info.get("Speculative", False),
+            )
+        return stage, task, created
+
+    def on_task_start(self, event: Dict[str, Any]) -> None:
+        _, task, created = self._task(event)
+        if created:
+            self.log.executor(task.executor_id or "").active_tasks += 1
+
+    def on_task_end(self, event: Dict[str, Any]) -> None:
+        _, task, created = self._task(event)
+        info = event["Task Info"]
+        executor = self.log.executor(task.executor_id or "")
+        if not created and task.status == TaskStatus.RUNNING.value:
+            executor.active_tasks = max(0, executor.active_tasks - 1)
+        task.finish_time = info.get("Finish Time")
+        task.getting_result_time = info.get("Getting Result Time", 0)
+        task.metrics = _metric_values(event.get("Task Metrics"))
+        reason = event.get("Task End Reason") or {}
+        if info.get("Failed"):
+            task.status = TaskStatus.FAILED.value
+        elif info.get("Killed"):
+            task.status = TaskStatus.KILLED.value
+            task.kill_reason = reason.get("Kill Reason", reason.get("Reason"))
+        else:
+            task.status = TaskStatus.SUCCESS.value
+        if task.status != TaskStatus.SUCCESS.value:
+            task.error = (
+                reason.get("Full Stack Trace")
+                or reason.get("Description")
+                or reason.get("Kill Reason")
+                or reason.get("Reason")
+            )
+
+        if task.status == TaskStatus.SUCCESS.value:
+            executor.completed_tasks += 1
+        elif task.status == TaskStatus.FAILED.value:
+            executor.failed_tasks += 1
+        executor.total_duration += task.duration or 0
+        if task.metrics is not None:
+            m = task.metrics
+            executor.total_gc_time += m[_M["jvmGcTime"]]
+            executor.total_input_bytes += m[_M["inputBytes"]]
+            executor.total_shuffle_read += (
+                m[_M["shuffleRemoteBytesRead"]] + m[_M["shuffleLocalBytesRead"]]
+            )
+            executor.total_shuffle_write += m[_M["shuffleWriteBytes"]]
+
+    # SQL
+
+    def on_sql_start(self, event: Dict[str, Any]) -> None:
+        execution_id = event["executionId"]
+        self.log.executions[execution_id] = _Execution(
+            id=execution_id,
+            description=event.get("description"),
+            plan=event.get("physicalPlanDescription", ""),
+            submission_time=event.get("time"),
+        )
+
+    def on_sql_plan_update(self, event: Dict[str, Any]) -> None:
+        execution = self.log.executions.get(event["executionId"])
+        if execution is not None:
+            execution.plan = event.get("physicalPlanDescription", execution.plan)
+
+    def on_sql_end(self, event: Dict[str, Any]) -> None:
+        execution = self.log.executions.get(event["executionId"])
+        if execution is not None:
+            execution.completion_time = event.get("time")
+            execution.error = event.get("errorMessage") or None
+
+
+def _file_key(path: Path) -> str:
+    # A single-file log keeps its offsets when .inprogress is dropped
+    name = path.name
+    return name[: -len(IN_PROGRESS)] if name.endswith(IN_PROGRESS) else name
+
+
+def _skip_bytes(chunks: Iterable[bytes], count: int) -> Iterator[bytes]:
+    """Drop the first *count* bytes of a chunk stream."""
+    for chunk in chunks:
+        if count >= len(chunk):
+            count -= len(chunk)
+            continue
+        yield chunk[count:]
+        count = 0
+
+
+def _resumable(log_files: _LogFiles, log: AppLog) -> bool:
+    """Whether *log* can be brought up to date by reading appended bytes only."""
+    if not log.offsets:
+        return False
+    sizes = {_file_key(path): path.stat().st_size for path in log_files.files}
+    # A vanished or shrunk file means the log was rewritten (or compacted)
+    return all(
+        key in sizes and sizes[key] >= size for key, (_, size, _) in log.offsets.items()
+    )
+
+
+def _reader(log_files: _LogFiles) -> Callable[[Any], Iterator[bytes]]:
+    reader, available, package = _READERS.get(log_files.codec, (None, False, ""))
+    if reader is None:
+        raise EventLogError(
+            f"Unsupported event log codec '{log_files.codec}' for {log_files.name}"
+        )
+    if not available:
+        raise EventLogError(
+            f"Event log {log_files.name} is {log_files.codec}-compressed; "
+            f"install '{package}' to read it"
+        )
+    return reader
+
+
+def _settle(log: AppLog, log_files: _LogFiles) -> None:
+    """Fill in what the files themselves say about a replayed log."""
+    log.app_id = log.app_id or log_files.name
+    log.completed = not log_files.in_progress
+    log.last_updated = log_files.last_modified()
+    if log.completed and log.end_time is None:
+        log.end_time = log.last_updated
+
+
+def replay(log_files: _LogFiles, log: Optional[AppLog] = None) -> AppLog:
+    """
+    Replay one event log (all parts of a rolling log, in order).
+
+    When *log* is an earlier replay of the same files, only what was appended
+    since is read and applied to it; otherwise the log is replayed from the
+    start. Unchanged files are skipped, plain files are read from the last
+    consumed offset and compressed files are decompressed up to it without
+    parsing. The unterminated tail of an in-progress log is left for the next
+    replay.
+    """
+    reader = _reader(log_files)
+
+    if log is None or not _resumable(log_files, log):
+        log = AppLog()
+    state = _Replay(log)
+    with log.lock:
+        malformed = log.malformed_lines
+        for path in log_files.files:
+            key = _file_key(path)
+            st = path.stat()
+            consumed, size, mtime = log.offsets.get(key, (0, -1, -1))
+            if (size, mtime) == (st.st_size, st.st_mtime_ns):
+                continue
+            with open(path, "rb") as stream:
+                if reader is _read_chunks:
+                    stream.seek(consumed)
+                    chunks = reader(stream)
+                else:
+                    chunks = _skip_bytes(reader(stream), consumed)
+                for line, complete in _iter_lines(chunks):
+                    if not complete and log_files.in_progress:
+                        # Still being written: read it once it is terminated
+                        break
+                    state.feed(line, complete)
+                    consumed += len(line) + complete
+            log.offsets[key] = (consumed, st.st_size, st.st_mtime_ns)
+
+        _settle(log, log_files)
+        if log.malformed_lines > malformed:
+            logger.warning(
+                "Skipped %d malformed lines in event log %s",
+                log.malformed_lines - malformed,
+                log_files.name,
+            )
+    return log
+
+
+def _scan(state: _Replay, lines: Iterable[Tuple[bytes, bool]], last: bytes) -> bool:
+    """Feed *lines* to *state* until an event named *last*; True if seen."""
+    for line, complete in lines:
+        state.feed(line, complete)
+        if _event_name(line) == last:
+            return True
+    return False
+
+
+def _tail_lines(stream, size: int) -> Iterator[Tuple[bytes, bool]]:
+    """Lines of the last ``_TAIL_BYTES`` of a plain file, first partial one dropped."""
+    start = max(0, size - _TAIL_BYTES)
+    stream.seek(start)
+    lines = _iter_lines(_read_chunks(stream))
+    if start:
+        next(lines, None)
+    return lines
+
+
+def scan_header(log_files: _LogFiles) -> AppLog:
+    """
+    Read only the application fields of an event log, without replaying it.
+
+    The log is read from the start up to ``SparkListenerApplicationStart``
+    (the events before it carry the Spark version and the default resource
+    profile). The end time of a completed log comes from its
+    ``SparkListenerApplicationEnd``, looked up in the tail of a plain last
+    file, or else in a pass over the last file that decodes no other event.
+    Jobs, stages, tasks and executors are left empty.
+    """
+    reader = _reader(log_files)
+    state = _Replay()
+    state.handlers = {
+        name: state.handlers[name]
+        for name in (
+            b"SparkListenerLogStart",
+            b"SparkListenerResourceProfileAdded",
+            b"SparkListenerApplicationStart",
+        )
+    }
+    with open(log_files.files[0], "rb") as stream:
+        _scan(state, _iter_lines(reader(stream)), b"SparkListenerApplicationStart")
+
+    if not log_files.in_progress:
+        state.handlers = {_APP_END: state.on_application_end}
+        last = log_files.files[-1]
+        with open(last, "rb") as stream:
+            found = reader is _read_chunks and _scan(
+                state, _tail_lines(stream, last.stat().st_size), _APP_END
+            )
+            if not found:
+                stream.seek(0)
+                _scan(state, _iter_lines(reader(stream)), _APP_END)
+
+    _settle(state.log, log_files)
+    return state.log
+
+
+# REST model builders
+
+
+def _quantile_values(values: List[float], quantiles: List[float]) -> List[float]:
+    """Pick quantiles the way the History Server's task summary does."""
+    values = sorted(values)
+    count = len(values)
+    return [float(values[min(int(q * count), count - 1)]) for q in quantiles]
+
+
+def task_metric_distributions(
+    tasks: Iterable[_Task], quantiles: List[float]
+) -> Optional[TaskMetricDistributions]:
+    """Distributions of successful tasks' metrics, or None without any."""
+    done = [
+        t
+        for t in tasks
+        if t.status == TaskStatus.SUCCESS.value and t.metrics is not None
+    ]
+    if not done:
+        return None
+
+    def dist(values: List[float]) -> List[float]:
+        return _quantile_values(values, quantiles)
+
+    data: Dict[str, Any] = {
+        "quantiles": quantiles,
+        "duration": dist([t.duration or 0 for t in done]),
+        "gettingResultTime": dist([t.result_fetch_time() for t in done]),
+        "schedulerDelay": dist([t.scheduler_delay() for t in done]),
+    }
+    for name, index in _DISTRIBUTIONS.items():
+        data[name] = dist([t.metrics[index] for t in done])
+    for group, fields in _DISTRIBUTION_GROUPS.items():
+        data[group] = {
+            name: dist([t.metrics[index] for t in done])
+            for name, index in fields.items()
+        }
+    remote, local = _M["shuffleRemoteBytesRead"], _M["shuffleLocalBytesRead"]
+    remote_blocks = _M["shuffleRemoteBlocksFetched"]
+    local_blocks = _M["shuffleLocalBlocksFetched"]
+    data["shuffleReadMetrics"]["readBytes"] = dist(
+        [t.metrics[remote] + t.metrics[local] for t in done]
+    )
+    data["shuffleReadMetrics"]["totalBlocksFetched"] = dist(
+        [t.metrics[remote_blocks] + t.metrics[local_blocks] for t in done]
+    )
+    return TaskMetricDistributions.model_validate(data)
+
+
+def _parse_quantiles(quantiles: Optional[str]) -> List[float]:
+    text = quantiles or DEFAULT_TASK_SUMMARY_QUANTILES
+    return [float(q) for q in text.split(",") if q.strip()]
+
+
+def _executor_stage_summaries(stage: _Stage) -> Dict[str, Dict[str, Any]]:
+    summaries: Dict[str, Dict[str, Any]] = {}
+    totals = (
+        ("inputBytes", "inputBytes"),
+        ("inputRecords", "inputRecords"),
+        ("outputBytes", "outputBytes"),
+        ("outputRecords", "outputRecords"),
+        ("shuffleReadRecords", "shuffleReadRecords"),
+        ("shuffleWrite", "shuffleWriteBytes"),
+        ("shuffleWriteRecords", "shuffleWriteRecords"),
+        ("memoryBytesSpilled", "memoryBytesSpilled"),
+        ("diskBytesSpilled", "diskBytesSpilled"),
+    )
+    for task in stage.tasks.values():
+        summary = summaries.setdefault(
+            task.executor_id or "",
+            {
+                "taskTime": 0,
+                "failedTasks": 0,
+                "succeededTasks": 0,
+                "killedTasks": 0,
+                "shuffleRead": 0,
+                "isExcludedForStage": False,
+                **{name: 0 for name, _ in totals},
+            },
+        )
+        summary["taskTime"] += task.duration or 0
+        if task.status == TaskStatus.SUCCESS.value:
+            summary["succeededTasks"] += 1
+        elif task.status == TaskStatus.FAILED.value:
+            summary["failedTasks"] += 1
+        elif task.status == TaskStatus.KILLED.value:
+            summary["killedTasks"] += 1
+        if task.metrics is not None:
+            m = task.metrics
+            for name, metric in totals:
+                summary[name] += m[_M[metric]]
+            summary["shuffleRead"] += (
+                m[_M["shuffleRemoteBytesRead"]] + m[_M["shuffleLocalBytesRead"]]
+            )
+    return summaries
+
+
+def _stage_json(
+    log: AppLog,
+    stage: _Stage,
+    details: bool,
+    with_summaries: bool,
+    task_status: Optional[set],
+) -> Dict[str, Any]:
+    totals = [0] * len(_METRICS)
+    counts = dict.fromkeys(TaskStatus.__members__.values(), 0)
+    completed_indices = set()
+    killed: Dict[str, int] = {}
+    first_launch = None
+    for task in stage.tasks.values():
+        counts[TaskStatus(task.status)] += 1
+        if task.status == TaskStatus.SUCCESS.value:
+            completed_indices.add(task.index)
+        elif task.status == TaskStatus.KILLED.value and task.kill_reason:
+            killed[task.kill_reason] = killed.get(task.kill_reason, 0) + 1
+        if task.launch_time and (
+            first_launch is None or task.launch_time < first_launch
+        ):
+            first_launch = task.launch_time
+        if task.metrics is not None:
+            for i, value in enumerate(task.metrics):
+                totals[i] += value
+
+    data: Dict[str, Any] = {
+        "status": stage.status,
+        "stageId": stage.stage_id,
+        "attemptId": stage.attempt_id,
+        "numTasks": stage.num_tasks,
+        "numActiveTasks": counts[TaskStatus.RUNNING],
+        "numCompleteTasks": counts[TaskStatus.SUCCESS],
+        "numFailedTasks": counts[TaskStatus.FAILED],
+        "numKilledTasks": counts[TaskStatus.KILLED],
+        "numCompletedIndices": len(completed_indices),
+        "submissionTime": _timestamp(stage.submission_time),
+        "firstTaskLaunchedTime": _timestamp(first_launch),
+        "completionTime": _timestamp(stage.completion_time),
+        "failureReason": stage.failure_reason,
+        "name": stage.name,
+        "description": stage.description,
+        "details": stage.details,
+        "schedulingPool": stage.pool,
+        "rddIds": stage.rdd_ids,
+        "killedTasksSummary": killed,
+        "resourceProfileId": stage.resource_profile_id,
+    }
+    for (name, _, _, _), value in zip(_METRICS, totals, strict=True):
+        data[name] = value
+    data["shuffleReadBytes"] = (
+        totals[_M["shuffleRemoteBytesRead"]] + totals[_M["shuffleLocalBytesRead"]]
+    )
+    if details:
+        data["tasks"] = {
+            str(task.task_id): task.to_json(_executor_logs(log, task.executor_id))
+            for task in stage.tasks.values()
+            if task_status is None or task.status in task_status
+        }
+        data["executorSummary"] = _executor_stage_summaries(stage)
+    if with_summaries:
+        distributions = task_metric_distributions(
+            stage.tasks.values(), _parse_quantiles(STAGE_SUMMARY_QUANTILES)
+        )
+        if distributions is not None:
+            data["taskMetricsDistributions"] = distributions.model_dump(
+                by_alias=True, exclude_none=True
+            )
+    return data
+
+
+def _executor_logs(log: AppLog, executor_id: Optional[str]) -> Dict[str, str]:
+    executor = log.executors.get(executor_id or "")
+    return dict(executor.logs) if executor is not None else {}
+
+
+def _executor_json(executor: _Executor) -> Dict[str, Any]:
+    return {
+        "id": executor.id,
+        "hostPort": executor.host_port or executor.host,
+        "isActive": executor.remove_time is None,
+        "rddBlocks": 0,
+        "memoryUsed": 0,
+        "diskUsed": 0,
+        "totalCores": executor.cores,
+        "maxTasks": executor.cores,
+        "activeTasks": executor.active_tasks,
+        "failedTasks": executor.failed_tasks,
+        "completedTasks": executor.completed_tasks,
+        "totalTasks": (
+            executor.active_tasks + executor.failed_tasks + executor.completed_tasks
+        ),
+        "totalDuration": executor.total_duration,
+        "totalGCTime": executor.total_gc_time,
+        "totalInputBytes": executor.total_input_bytes,
+        "totalShuffleRead": executor.total_shuffle_read,
+        "totalShuffleWrite": executor.total_shuffle_write,
+        "isBlacklisted": False,
+        "maxMemory": executor.max_memory,
+        "addTime": _timestamp(executor.add_time),
+        "removeTime": _timestamp(executor.remove_time),
+        "removeReason": executor.remove_reason,
+        "executorLogs": executor.logs,
+        "memoryMetrics": {
+            "usedOnHeapStorageMemory": 0,
+            "usedOffHeapStorageMemory": 0,
+            "totalOnHeapStorageMemory": executor.max_on_heap,
+            "totalOffHeapStorageMemory": executor.max_off_heap,
+        },
+        "attributes": executor.attributes,
+        "resources": executor.resources,
+        "resourceProfileId": executor.resource_profile_id,
+        "isExcluded": False,
+    }
+
+
+def _attempt_json(log: AppLog) -> Dict[str, Any]:
+    return {
+        "attemptId": log.attempt_id,
+        "startTime": _timestamp(log.start_time),
+        "endTime": _timestamp(log.end_time) if log.completed else None,
+        "lastUpdated": _timestamp(log.last_updated),
+        # Like the History Server, running attempts report no duration yet
+        "duration": (
+            max(0, (log.end_time or 0) - (log.start_time or 0)) if log.completed else 0
+        ),
+        "sparkUser": log.user,
+        "appSparkVersion": log.spark_version,
+        "completed": log.completed,
+    }
+
+
+def _profile_amount(log: AppLog, resource: str) -> Optional[int]:
+    profile = log.resource_profiles.get(0) or {}
+    request = (profile.get("Executor Resource Requests") or {}).get(resource)
+    return int(request["Amount"]) if request else None
+
+
+def _replay_size(log: AppLog) -> int:
+    """Estimated bytes a replayed log retains, for the memory cache budget."""
+    tasks = sum(len(stage.tasks) for stage in log.stages.values())
+    records = len(log.stages) + len(log.executors) + len(log.executions)
+    plans = sum(len(execution.plan) for execution in log.executions.values())
+    return (
+        estimate_size((log.jobs, log.environment, log.resource_profiles))
+        + tasks * _TASK_BYTES
+        + records * _RECORD_BYTES
+        + plans
+    )
+
+
+class EventLogClient:
+    """
+    Serve the ``SparkRestClient`` API from Spark event log files.
+
+    Applications are looked up by log name (``<app id>[_<attempt id>]``, the
+    names Spark gives its logs); all attempts of an application are merged
+    into one ``ApplicationInfo`` and job, stage, executor and environment
+    calls read the latest attempt.
+
+    Replayed logs are kept in the process-wide memory cache (namespace
+    ``event_logs``), so they count against its byte budget and the least
+    recently used are dropped first; a dropped log is reloaded from the index
+    or replayed again when next asked for. ``list_applications`` only reads
+    the application fields of logs that are not in memory (``scan_header``).
+    """
+
+    def __init__(
+        self, server_config: ServerConfig, index: Optional["EventLogIndex"] = None
+    ):
+        """
+        Initialize the event log client.
+
+        Args:
+            server_config: Configuration object with ``event_log_dir`` set
+            index: Optional persistent index replays are loaded from and saved to
+        """
+        self.config = server_config
+        self.index = index
+        directory = server_config.event_log_dir or ""
+        if directory.startswith("file:"):
+            directory = urlparse(directory).path
+        self.log_dir = Path(directory).expanduser()
+        self._lock = threading.Lock()
+        # log name -> [lock, callers holding or waiting for it]
+        self._log_locks: Dict[str, List[Any]] = {}
+        # log name -> (file signature, application fields) for listings
+        self._headers: Dict[str, Tuple[Tuple[Any, ...], AppLog]] = {}
+        # Replayed logs: (owner, "event_logs", log name) -> (signature, log)
+        self._parsed = get_memory_cache()
+        self._cache_owner = ("event_log", next(_client_ids))
+        owner = self._cache_owner
+        weakref.finalize(self, self._parsed.discard_where, lambda key: key[0] == owner)
+
+    # Log access
+
+    def _discover(self) -> List[_LogFiles]:
+        if not self.log_dir.is_dir():
+            raise EventLogError(f"Event log directory not found: {self.log_dir}")
+        return discover_logs(self.log_dir)
+
+    def _owns(self, key: Any) -> bool:
+        return isinstance(key, tuple) and key[0] == self._cache_owner
+
+    @contextmanager
+    def _log_lock(self, name: str) -> Iterator[None]:
+        # Dropped once nobody holds or waits for it, so locks do not pile up
+        with self._lock:
+            entry = self._log_locks.setdefault(name, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._log_locks[name]
+
+    def _load(self, log_files: _LogFiles) -> AppLog:
+        signature = log_files.signature()
+        key = (self._cache_owner, _REPLAY_NAMESPACE, log_files.name)
+        # One replay per log even when several tools ask for it at once
+        with self._log_lock(log_files.name):
+            cached = self._parsed.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            previous = cached[1] if cached is not None else None
+            if previous is None and self.index is not None:
+                previous = self.index.load(log_files)
+            offsets = dict(previous.offsets) if previous is not None else None
+            # Appended bytes only, when the files were only appended to
+            log = replay(log_files, previous)
+            self._parsed.set(key, (signature, log), size=_replay_size(log))
+            if self.index is not None and log.offsets != offsets:
+                self.index.save(log_files, log)
+            return log
+
+    def _header(self, log_files: _LogFiles) -> AppLog:
+        """The application fields of a log, from memory or ``scan_header``."""
+        signature = log_files.signature()
+        cached = self._parsed.get(
+            (self._cache_owner, _REPLAY_NAMESPACE, log_files.name)
+        )
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with self._lock:
+            header = self._headers.get(log_files.name)
+        if header is not None and header[0] == signature:
+            return header[1]
+        log = scan_header(log_files)
+        with self._lock:
+            self._headers[log_files.name] = (signature, log)
+        return log
+
+    def _attempts(self, app_id: str) -> List[AppLog]:
+        candidates = [
+            log_files
+            for log_files in self._discover()
+            if log_files.name == app_id or log_files.name.startswith(app_id + "_")
+        ]
+        logs = [self._load(log_files) for log_files in candidates]
+        attempts = [log for log in logs if log.app_id == app_id]
+        if not attempts:
+            raise EventLogError(f"No event log found for application {app_id}")
+        # Oldest first, like ApplicationInfo.attempts is read elsewhere
+        return sorted(attempts, key=lambda log: log.start_time or 0)
+
+    @contextmanager
+    def _latest(self, app_id: str) -> Iterator[AppLog]:
+        # Held while models are built: replays extend a log in place
+        log = self._attempts(app_id)[-1]
+        with log.lock:
+            yield log
+
+    def _application(self, attempts: List[AppLog]) -> ApplicationInfo:
+        latest = attempts[-1]
+        return ApplicationInfo.model_validate(
+            {
+                "id": latest.app_id,
+                "name": latest.name,
+                "coresPerExecutor": _profile_amount(latest, "cores"),
+                "memoryPerExecutorMB": _profile_amount(latest, "memory"),
+                "attempts": [_attempt_json(log) for log in attempts],
+            }
+        )
+
+    # Applications
+
+    def get_version(self) -> VersionInfo:
+        """Get the Spark version of the most recently written event log."""
+        logs = self._discover()
+        if not logs:
+            return VersionInfo(spark="unknown")
+        newest = max(logs, key=lambda log_files: log_files.last_modified())
+        return VersionInfo(spark=self._header(newest).spark_version or "unknown")
+
+    def list_applications(
+        self,
+        status: Optional[List[str]] = None,
+        min_date: Optional[str] = None,
+        max_date: Optional[str] = None,
+        min_end_date: Optional[str] = None,
+        max_end_date: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[ApplicationInfo]:
+        """
+        Get a list of all applications with an event log.
+
+        Args:
+            status: Filter by application status (COMPLETED, RUNNING)
+            min_date: Minimum start date (yyyy-MM-dd'T'HH:mm:ss.SSSz or yyyy-MM-dd)
+            max_date: Maximum start date
+            min_end_date: Minimum end date
+            max_end_date: Maximum end date
+            limit: Maximum number of applications to return
+
+        Returns:
+            List of ApplicationInfo objects, most recently started first
+        """
+        by_app: Dict[str, List[AppLog]] = {}
+        discovered = self._discover()
+        for log_files in discovered:
+            try:
+                log = self._header(log_files)
+            except Exception as e:
+                logger.warning("Skipping event log %s: %s", log_files.name, e)
+                continue
+            by_app.setdefault(log.app_id, []).append(log)
+        names = {log_files.name for log_files in discovered}
+        with self._lock:
+            # Forget logs that were deleted since the last listing
+            for name in [name for name in self._headers if name not in names]:
+                del self._headers[name]
+
+        statuses = _enum_values(status)
+        bounds = [
+            (_parse_date(value), attr, op)
+            for value, attr, op in (
+                (min_date, "start_time", "min"),
+                (max_date, "start_time", "max"),
+                (min_end_date, "end_time", "min"),
+                (max_end_date, "end_time", "max"),
+            )
+            if value
+        ]
+
+        def matches(log: AppLog) -> bool:
+            for bound, attr, op in bounds:
+                value = getattr(log, attr)
+                if value is None:
+                    return False
+                if (op == "min" and value < bound) or (op == "max" and value > bound):
+                    return False
+            return True
+
+        applications = []
+        for logs in by_app.values():
+            logs.sort(key=lambda log: log.start_time or 0)
+            app_status = "COMPLETED" if logs[-1].completed else "RUNNING"
+            if statuses and app_status not in statuses:
+                continue
+            if bounds and not any(matches(log) for log in logs):
+                continue
+            applications.append(logs)
+        applications.sort(key=lambda logs: logs[-1].start_time or 0, reverse=True)
+        if limit:
+            applications = applications[:limit]
+        return [self._application(logs) for logs in applications]
+
+    def get_application(self, app_id: str) -> ApplicationInfo:
+        """Get information about a specific application."""
+        return self._application(self._attempts(app_id))
+
+    def get_application_attempt(
+        self, app_id: str, attempt_id: str
+    ) -> ApplicationAttemptInfo:
+        """Get information about a specific application attempt."""
+        for log in self._attempts(app_id):
+            if str(log.attempt_id) == str(attempt_id):
+                return ApplicationAttemptInfo.model_validate(_attempt_json(log))
+        raise EventLogError(f"No attempt {attempt_id} of application {app_id}")
+
+    # Jobs
+
+    def _job(self, log: AppLog, job: Dict[str, Any]) -> JobData:
+        stages: Dict[int, _Stage] = {}
+        task_counts = dict.fromkeys(("active", "completed", "failed", "killed"), 0)
+        completed_indices = 0
+        for stage in log.stages.values():
+            if stage.stage_id not in job["stageIds"]:
+                continue
+            latest = stages.get(stage.stage_id)
+            if latest is None or stage.attempt_id > latest.attempt_id:
+                stages[stage.stage_id] = stage
+            indices = set()
+            for task in stage.tasks.values():
+                if task.status == TaskStatus.RUNNING.value:
+                    task_counts["active"] += 1
+                elif task.status == TaskStatus.SUCCESS.value:
+                    task_counts["completed"] += 1
+                    indices.add(task.index)
+                elif task.status == TaskStatus.FAILED.value:
+                    task_counts["failed"] += 1
+                else:
+                    task_counts["killed"] += 1
+            completed_indices += len(indices)
+        by_status: Dict[str, List[_Stage]] = {}
+        for stage in stages.values():
+            by_status.setdefault(stage.status, []).append(stage)
+
+        data = dict(job)
+        data.update(
+            {
+                "submissionTime": _timestamp(job.get("submissionTime")),
+                "completionTime": _timestamp(job.get("completionTime")),
+                "numActiveTasks": task_counts["active"],
+                "numCompletedTasks": task_counts["completed"],
+                "numSkippedTasks": sum(
+                    s.num_tasks for s in by_status.get(StageStatus.SKIPPED.value, [])
+                ),
+                "numFailedTasks": task_counts["failed"],
+                "numKilledTasks": task_counts["killed"],
+                "numCompletedIndices": completed_indices,
+                "numActiveStages": len(by_status.get(StageStatus.ACTIVE.value, [])),
+                "numCompletedStages": len(
+                    by_status.get(StageStatus.COMPLETE.value, [])
+                ),
+                "numSkippedStages": len(by_status.get(StageStatus.SKIPPED.value, [])),
+                "numFailedStages": len(by_status.get(StageStatus.FAILED.value, [])),
+            }
+        )
+        return JobData.model_validate(data)
+
+    def list_jobs(
+        self, app_id: str, status: Optional[List[JobExecutionStatus]] = None
+    ) -> List[JobData]:
+        """Get a list of all jobs for an application, newest first."""
+        with self._latest(app_id) as log:
+            statuses = _enum_values(status)
+            return [
+                self._job(log, job)
+                for job_id, job in sorted(log.jobs.items(), reverse=True)
+                if statuses is None or job["status"] in statuses
+            ]
+
+    def get_job(self, app_id: str, job_id: int) -> JobData:
+        """Get information about a specific job."""
+        with self._latest(app_id) as log:
+            job = log.jobs.get(int(job_id))
+            if job is None:
+                raise EventLogError(f"No job {job_id} in application {app_id}")
+            return self._job(log, job)
+
+    # Stages
+
+    def list_stages(
+        self,
+        app_id: str,
+        status: Optional[List[StageStatus]] = None,
+        details: bool = False,
+        with_summaries: bool = False,
+        task_status: Optional[List[TaskStatus]] = None,
+    ) -> List[StageData]:
+        """
+        Get a list of all stage attempts for an application, newest first.
+
+        Args:
+            app_id: The application ID
+            status: Filter by stage status
+            details: Whether to include tasks and per-executor summaries
+            with_summaries: Whether to include task metric distributions
+            task_status: Filter included tasks by status (only with details)
+
+        Returns:
+            List of StageData objects
+        """
+        with self._latest(app_id) as log:
+            statuses = _enum_values(status)
+            tasks = _enum_values(task_status) if details else None
+            return [
+                StageData.model_validate(
+                    _stage_json(log, stage, details, with_summaries, tasks)
+                )
+                for _, stage in sorted(log.stages.items(), reverse=True)
+                if statuses is None or stage.status in statuses
+            ]
+
+    def list_stage_attempts(
+        self,
+        app_id: str,
+        stage_id: int,
+        details: bool = False,
+        task_status: Optional[List[TaskStatus]] = None,
+        with_summaries: bool = True,
+    ) -> List[StageData]:
+        """Get every attempt of a stage, oldest first."""
+        with self._latest(app_id) as log:
+            tasks = _enum_values(task_status)
+            attempts = [
+                StageData.model_validate(
+                    _stage_json(log, stage, details, with_summaries, tasks)
+                )
+                for (sid, _), stage in sorted(log.stages.items())
+                if sid == int(stage_id)
+            ]
+            if not attempts:
+                raise EventLogError(f"No stage {stage_id} in application {app_id}")
+            return attempts
+
+    def _stage(
+        self, log: AppLog, app_id: str, stage_id: int, attempt_id: int
+    ) -> _Stage:
+        stage = log.stages.get((int(stage_id), int(attempt_id)))
+        if stage is None:
+            raise EventLogError(
+                f"No attempt {attempt_id} of stage {stage_id} in application {app_id}"
+            )
+        return stage
+
+    def get_stage_attempt(
+        self,
+        app_id: str,
+        stage_id: int,
+        attempt_id: int,
+        details: bool = True,
+        task_status: Optional[List[TaskStatus]] = None,
+        with_summaries: bool = False,
+    ) -> StageData:
+        """Get information about a specific stage attempt."""
+        with self._latest(app_id) as log:
+            stage = self._stage(log, app_id, stage_id, attempt_id)
+            return StageData.model_validate(
+                _stage_json(
+                    log, stage, details, with_summaries, _enum_values(task_status)
+                )
+            )
+
+    def get_stage_task_summary(
+        self,
+        app_id: str,
+        stage_id: int,
+        attempt_id: int,
+        quantiles: Optional[str] = None,
+    ) -> TaskMetricDistributions:
+        """
+        Get task metric distributions of a stage attempt's successful tasks.
+
+        Args:
+            app_id: The application ID
+            stage_id: The stage ID
+            attempt_id: The attempt ID
+            quantiles: Optional comma-separated quantiles (e.g. "0.05,0.5,0.95")
+
+        Returns:
+            TaskMetricDistributions object
+        """
+        with self._latest(app_id) as log:
+            stage = self._stage(log, app_id, stage_id, attempt_id)
+            distributions = task_metric_distributions(
+                stage.tasks.values(), _parse_quantiles(quantiles)
+            )
+            if distributions is None:
+                raise EventLogError(
+                    f"No tasks reported metrics for stage {stage_id} attempt {attempt_id}"
+                )
+            return distributions
+
+    def list_stage_tasks(
+        self,
+        app_id: str,
+        stage_id: int,
+        attempt_id: int,
+        offset: int = 0,
+        length: int = 20,
+        sort_by: str = "ID",
+        status: Optional[List[TaskStatus]] = None,
+    ) -> List[TaskData]:
+        """Get one page of a stage attempt's tasks."""
+        with self._latest(app_id) as log:
+            stage = self._stage(log, app_id, stage_id, attempt_id)
+            statuses = _enum_values(status)
+            tasks = [
+                task
+                for task in stage.tasks.values()
+                if statuses is None or task.status in statuses
+            ]
+            sort_key = str(getattr(sort_by, "value", sort_by))
+            sorting = _TASK_SORT_ALIASES.get(sort_key.lower()) or TaskSorting(
+                sort_key.upper()
+            )
+            if sorting == TaskSorting.ID:
+                tasks.sort(key=lambda task: task.task_id)
+            else:
+                run_time = _M["executorRunTime"]
+                tasks.sort(
+                    key=lambda task: task.metrics[run_time] if task.metrics else -1,
+                    reverse=sorting == TaskSorting.DECREASING_RUNTIME,
+                )
+            return [
+                TaskData.model_validate(
+                    task.to_json(_executor_logs(log, task.executor_id))
+                )
+                for task in tasks[offset : offset + length]
+            ]
+
+    def stage_task_records(
+        self, app_id: str, stage_id: int, attempt_id: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Flat per-task records of a stage attempt, without building TaskData.
+
+        Each record has ``taskId``, ``executorId``, ``host``, ``status``,
+        ``launchTime`` (epoch ms), ``duration`` and ``schedulerDelay``, plus
+        every task metric under its StageData total name (``executorRunTime``,
+        ``shuffleWriteBytes``...) when the task reported metrics.
+        """
+        with self._latest(app_id) as log:
+            stage = self._stage(log, app_id, stage_id, attempt_id)
+            records = []
+            for task in stage.tasks.values():
+                record: Dict[str, Any] = {
+                    "taskId": task.task_id,
+                    "executorId": task.executor_id,
+                    "host": task.host,
+                    "status": task.status,
+                    "launchTime": task.launch_time,
+                    "duration": task.duration,
+                    "schedulerDelay": task.scheduler_delay(),
+                }
+                if task.metrics is not None:
+                    record.update(zip(_M, task.metrics, strict=True))
+                records.append(record)
+            return records
+
+    # Executors and environment
+
+    def list_executors(self, app_id: str) -> List[ExecutorSummary]:
+        """Get the executors of an application that are still active."""
+        return [e for e in self.list_all_executors(app_id) if e.is_active]
+
+    def list_all_executors(self, app_id: str) -> List[ExecutorSummary]:
+        """Get all executors (active and removed) of an application."""
+        with self._latest(app_id) as log:
+            return [
+                ExecutorSummary.model_validate(_executor_json(executor))
+                for executor in log.executors.values()
+                if executor.id
+            ]
+
+    def get_environment(self, app_id: str) -> ApplicationEnvironmentInfo:
+        """Get environment information for an application."""
+        with self._latest(app_id) as log:
+            env = log.environment
+            jvm = env.get("JVM Information") or {}
+
+            def pairs(section: str) -> List[Tuple[str, str]]:
+                return sorted((env.get(section) or {}).items())
+
+            return ApplicationEnvironmentInfo.model_validate(
+                {
+                    "runtime": {
+                        "javaVersion": jvm.get("Java Version"),
+                        "javaHome": jvm.get("Java Home"),
+                        "scalaVersion": jvm.get("Scala Version"),
+                    },
+                    "sparkProperties": pairs("Spark Properties"),
+                    "hadoopProperties": pairs("Hadoop Properties"),
+                    "systemProperties": pairs("System Properties"),
+                    "metricsProperties": pairs("Metrics Properties"),
+                    "classpathEntries": pairs("Classpath Entries"),
+                    "resourceProfiles": [
+                        {
+                            "id": profile_id,
+                            "executorResources": {
+                                name: {
+                                    "resourceName": request.get("Resource Name"),
+                                    "amount": request.get("Amount"),
+                                    "discoveryScript": request.get("Discovery Script"),
+                                    "vendor": request.get("Vendor"),
+                                }
+                                for name, request in (
+                                    profile.get("Executor Resource Requests") or {}
+                                ).items()
+                            },
+                            "taskResources": {
+                                name: {
+                                    "resourceName": request.get("Resource Name"),
+                                    "amount": request.get("Amount"),
+                                }
+                                for name, request in (
+                                    profile.get("Task Resource Requests") or {}
+                                ).items()
+                            },
+                        }
+                        for profile_id, profile in sorted(log.resource_profiles.items())
+                    ],
+                }
+            )
+
+    # SQL
+
+    def _execution(
+        self, log: AppLog, execution: _Execution, plan_description: bool
+    ) -> ExecutionData:
+        jobs = [log.jobs[job_id] for job_id in execution.job_ids if job_id in log.jobs]
+        if execution.completion_time is None:
+            status = "RUNNING"
+        elif execution.error or any(j["status"] == "FAILED" for j in jobs):
+            status = "FAILED"
+        else:
+            status = "COMPLETED"
+        duration = None
+        if execution.completion_time and execution.submission_time:
+            duration = execution.completion_time - execution.submission_time
+        return ExecutionData.model_validate(
+            {
+                "id": execution.id,
+                "status": status,
+                "description": execution.description,
+                "planDescription": execution.plan if plan_description else "",
+                "submissionTime": _timestamp(execution.submission_time),
+                "durationMilliSeconds": duration,
+                "runningJobIds": [j["jobId"] for j in jobs if j["status"] == "RUNNING"],
+                "successJobIds": [
+                    j["jobId"] for j in jobs if j["status"] == "SUCCEEDED"
+                ],
+                "failedJobIds": [j["jobId"] for j in jobs if j["status"] == "FAILED"],
+                # Plan graphs and their metrics are not rebuilt from events
+                "nodes": [],
+                "edges": [],
+            }
+        )
+
+    def get_sql_list(
+        self,
+        app_id: str,
+        attempt_id: Optional[str] = None,
+        details: bool = True,
+        plan_description: bool = False,
+        offset: int = 0,
+        length: int = 20,
+    ) -> List[ExecutionData]:
+        """Get one page of an application's SQL executions, without plan graphs."""
+        with self._latest(app_id) as log:
+            executions = [log.executions[i] for i in sorted(log.executions)]
+            return [
+                self._execution(log, execution, plan_description)
+                for execution in executions[offset : offset + length]
+            ]
+
+    def get_sql_execution(
+        self,
+        app_id: str,
+        execution_id: int,
+        attempt_id: Optional[str] = None,
+        details: bool = True,
+        plan_description: bool = True,
+    ) -> ExecutionData:
+        """Get information about a specific SQL execution, without plan graph."""
+        with self._latest(app_id) as log:
+            execution = log.executions.get(int(execution_id))
+            if execution is None:
+                raise EventLogError(
+                    f"No SQL execution {execution_id} in application {app_id}"
+                )
+            return self._execution(log, execution, plan_description)
+
+    # Cache
+
+    def clear_cache(self):
+        """Forget replayed and indexed logs so the next call reads the files."""
+        self._parsed.discard_where(self._owns)
+        with self._lock:
+            self._headers.clear()
+        if self.index is not None:
+            self.index.clear()
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Return the number of replayed logs in memory and in the index."""
+        info = {"replayed_logs": {"currsize": self._parsed.count_where(self._owns)}}
+        if self.index is not None:
+            info["indexed_logs"] = {"currsize": len(self.index.entries())}
+        return info
+
+    # Live-only endpoints
+    #
+    # Thread dumps, process lists, RDD storage, Prometheus metrics and the HTML
+    # UI come from a running driver or History Server; event logs record none
+    # of them.
+
+    def list_executor_thread_dump(
+        self, app_id: str, executor_id: str
+    ) -> List[ThreadStackTrace]:
+        """Not available from event logs: thread dumps need a live executor."""
+        raise _live_only("list_executor_thread_dump")
+
+    def get_task_thread_dump(
+        self, app_id: str, task_id: int, executor_id: str
+    ) -> ThreadStackTrace:
+        """Not available from event logs: thread dumps need a live executor."""
+        raise _live_only("get_task_thread_dump")
+
+    def list_all_processes(self, app_id: str) -> List[ProcessSummary]:
+        """Not available from event logs: processes are listed by a live driver."""
+        raise _live_only("list_all_processes")
+
+    def list_rdds(self, app_id: str) -> List[RDDStorageInfo]:
+        """Not available from event logs: RDD storage is not logged."""
+        raise _live_only("list_rdds")
+
+    def get_rdd(self, app_id: str, rdd_id: int) -> RDDStorageInfo:
+        """Not available from event logs: RDD storage is not logged."""
+        raise _live_only("get_rdd")
+
+    def get_metrics_prometheus(self, app_id: str) -> str:
+        """Not available from event logs: metrics are served by a live driver."""
+        raise _live_only("get_metrics_prometheus")
+
+    def get_sql_execution_html(
+        self, app_id: str, execution_id: int, attempt_id: Optional[str] = None
+    ) -> str:
+        """Not available from event logs: there is no web UI to read."""
+        raise _live_only("get_sql_execution_html")
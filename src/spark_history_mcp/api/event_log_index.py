@@ -0,0 +1,225 @@
+"""
+Persistent index of replayed Spark event logs.
+
+``EventLogIndex`` keeps what ``replay`` learned from an event log in one
+compact file per log, so an ``EventLogClient`` restarted against the same
+directory answers from the index instead of parsing a multi-gigabyte log
+again. The index records, for every file of the log, how many bytes were
+consumed and the size and mtime they were read at: an unchanged log is served
+as loaded, and a log that grew (a running application, a new rolling part) is
+brought up to date by replaying only what was appended.
+
+Tasks are stored column by column (one list per task field and per metric),
+which keeps index files small and quick to load. Files are compact JSON,
+framed and compressed by ``cache.codec``, and replaced atomically so
+concurrent servers sharing an index directory never read a partial file.
+
+The index directory is a ``cache.FileStore`` bounded by
+``SHS_CACHE_EVENT_LOG_INDEX_MAX_BYTES``: least recently used files are evicted
+when a save goes over budget, and the default directory is covered by the
+``cache`` commands. Files are grouped by log directory and log name, so
+``cache invalidate`` finds the index of an application by its ID.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from spark_history_mcp.api.event_log_client import (
+    _METRICS,
+    AppLog,
+    _Execution,
+    _Executor,
+    _LogFiles,
+    _Stage,
+    _Task,
+)
+from spark_history_mcp.cache import FileStore, codec, get_cache_config, get_file_store
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+_TASK_FIELDS = tuple(f.name for f in fields(_Task) if f.name != "metrics")
+_STAGE_FIELDS = tuple(f.name for f in fields(_Stage) if f.name != "tasks")
+_METRIC_NAMES = [name for name, _, _, _ in _METRICS]
+
+
+def _log_path(log_files: _LogFiles) -> str:
+    # The file (or rolling directory) name without codec or .inprogress, so a
+    # log keeps its index entry when Spark renames it on completion
+    return str((log_files.files[0].parent / log_files.name).resolve())
+
+
+def _task_columns(tasks: Iterable[_Task]) -> Dict[str, Any]:
+    rows = list(tasks)
+    columns: Dict[str, Any] = {
+        name: [getattr(task, name) for task in rows] for name in _TASK_FIELDS
+    }
+    columns["metrics"] = [
+        [task.metrics[i] if task.metrics else None for task in rows]
+        for i in range(len(_METRICS))
+    ]
+    return columns
+
+
+def _tasks(columns: Dict[str, Any]) -> Dict[int, _Task]:
+    tasks = {}
+    rows = zip(*(columns[name] for name in _TASK_FIELDS), strict=True)
+    metrics = zip(*columns["metrics"], strict=True)
+    for values, row_metrics in zip(rows, metrics, strict=True):
+        task = _Task(*values)
+        if row_metrics and row_metrics[0] is not None:
+            task.metrics = tuple(row_metrics)
+        tasks[task.task_id] = task
+    return tasks
+
+
+def dump_app_log(log: AppLog) -> Dict[str, Any]:
+    """Convert a replayed log to the JSON structure of an index file."""
+    return {
+        "app": {
+            "app_id": log.app_id,
+            "attempt_id": log.attempt_id,
+            "name": log.name,
+            "user": log.user,
+            "spark_version": log.spark_version,
+            "start_time": log.start_time,
+            "end_time": log.end_time,
+            "last_updated": log.last_updated,
+            "completed": log.completed,
+            "malformed_lines": log.malformed_lines,
+        },
+        "jobs": list(log.jobs.values()),
+        "stages": [
+            {
+                **{name: getattr(stage, name) for name in _STAGE_FIELDS},
+                "tasks": _task_columns(stage.tasks.values()),
+            }
+            for stage in log.stages.values()
+        ],
+        "executors": [asdict(executor) for executor in log.executors.values()],
+        "environment": log.environment,
+        "resource_profiles": list(log.resource_profiles.values()),
+        "executions": [asdict(execution) for execution in log.executions.values()],
+        "offsets": log.offsets,
+    }
+
+
+def load_app_log(data: Dict[str, Any]) -> AppLog:
+    """Rebuild a replayed log from the JSON structure of an index file."""
+    log = AppLog(**data["app"])
+    log.jobs = {job["jobId"]: job for job in data["jobs"]}
+    for entry in data["stages"]:
+        stage = _Stage(**{name: entry[name] for name in _STAGE_FIELDS})
+        stage.tasks = _tasks(entry["tasks"])
+        log.stages[(stage.stage_id, stage.attempt_id)] = stage
+    for entry in data["executors"]:
+        log.executors[entry["id"]] = _Executor(**entry)
+    log.environment = data["environment"]
+    log.resource_profiles = {
+        profile["Resource Profile Id"]: profile for profile in data["resource_profiles"]
+    }
+    for entry in data["executions"]:
+        log.executions[entry["id"]] = _Execution(**entry)
+    log.offsets = {key: tuple(value) for key, value in data["offsets"].items()}
+    return log
+
+
+class EventLogIndex:
+    """One index file per event log, under *root*.
+
+    Args:
+        root: Index directory (default: the ``event-log-index`` file store of
+            the disk cache)
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        if root is None:
+            self.files = get_file_store("event-log-index")
+        else:
+            self.files = FileStore(
+                Path(root).expanduser(),
+                INDEX_SUFFIX,
+                get_cache_config().event_log_index_max_bytes,
+                server_scoped=False,
+            )
+        self.root = self.files.root
+
+    def path(self, log_files: _LogFiles) -> Path:
+        log_path = Path(_log_path(log_files))
+        app_dir = self.files.app_dir(str(log_path.parent), log_path.name)
+        return app_dir / f"replay{INDEX_SUFFIX}"
+
+    def load(self, log_files: _LogFiles) -> Optional[AppLog]:
+        """
+        Return the indexed replay of *log_files*, or None if there is none.
+
+        The returned log may be behind the files; ``replay`` checks the
+        recorded offsets and reads what was appended since (or starts over if
+        the files were rewritten).
+        """
+        path = self.path(log_files)
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            data = json.loads(codec.decompress(payload))
+            if (
+                data.get("version") != FORMAT_VERSION
+                or data.get("log") != _log_path(log_files)
+                or data.get("metrics") != _METRIC_NAMES
+            ):
+                return None
+            log = load_app_log(data)
+        except (codec.CodecError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable index of %s: %s", log_files.name, e)
+            return None
+        self.files.touch(path)
+        return log
+
+    def save(self, log_files: _LogFiles, log: AppLog) -> None:
+        """Write the replay of *log_files* (best effort; failures are logged)."""
+        with log.lock:
+            data = {
+                "version": FORMAT_VERSION,
+                "log": _log_path(log_files),
+                "metrics": _METRIC_NAMES,
+                **dump_app_log(log),
+            }
+            body = json.dumps(data, separators=(",", ":")).encode()
+        path = self.path(log_files)
+        try:
+            try:
+                previous: Optional[int] = path.stat().st_size
+            except FileNotFoundError:
+                previous = None
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(codec.compress(body))
+                os.replace(tmp, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.warning("Could not write index of %s: %s", log_files.name, e)
+            return
+        self.files.saved(path, previous)
+
+    def clear(self) -> int:
+        """Remove every index file. Returns the number of files removed."""
+        return self.files.clear()
+
+    def entries(self) -> List[Path]:
+        """Index files currently on disk."""
+        return sorted(entry.path for entry in self.files.entries())
@@ -1,24 +1,52 @@
 """
 Factory for creating Spark REST clients.
+
+``SparkClientRegistry`` creates the client of each configured server lazily,
+on first use, so servers that are slow to set up (EMR Persistent UIs) do not
+delay startup or the requests of other servers.
 """
 
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Union
+
 from spark_history_mcp.api.emr_persistent_ui_client import EMRPersistentUIClient
+from spark_history_mcp.api.event_log_client import EventLogClient
+from spark_history_mcp.api.event_log_index import EventLogIndex
 from spark_history_mcp.api.spark_client import SparkRestClient
 from spark_history_mcp.config.config import ServerConfig
 
+logger = logging.getLogger(__name__)
+
+SparkClient = Union[SparkRestClient, EventLogClient]
+
 
-def create_spark_client(server_config: ServerConfig) -> SparkRestClient:
+def create_spark_client(server_config: ServerConfig) -> SparkClient:
     """
     Create and initialize a Spark REST client based on configuration.
 
-    Handles both standard Spark History Servers and EMR Persistent UIs.
+    Handles standard Spark History Servers, EMR Persistent UIs and local
+    event log directories (read directly, without a History Server).
 
     Args:
         server_config: Configuration for the server
 
     Returns:
-        An initialized SparkRestClient
+        An initialized SparkRestClient, or an EventLogClient when
+        ``event_log_dir`` is configured
     """
+    if server_config.event_log_dir:
+        index = None
+        if server_config.event_log_index:
+            index = EventLogIndex(
+                Path(server_config.event_log_index_dir)
+                if server_config.event_log_index_dir
+                else None
+            )
+        return EventLogClient(server_config, index=index)
     if server_config.emr_cluster_arn:
         # Create EMR client
         emr_client = EMRPersistentUIClient(server_config)
@@ -38,3 +66,158 @@ def create_spark_client(server_config: ServerConfig) -> SparkRestClient:
     else:
         # Regular Spark REST client
         return SparkRestClient(server_config)
+
+
+def server_kind(server_config: ServerConfig) -> str:
+    """The backend a server config selects: event_log, emr or rest."""
+    if server_config.event_log_dir:
+        return "event_log"
+    if server_config.emr_cluster_arn:
+        return "emr"
+    return "rest"
+
+
+class LazyClient:
+    """One server's client, created on first ``get``.
+
+    Concurrent first callers wait for a single initialization. A failed
+    initialization is recorded and retried by the next ``get``.
+    """
+
+    def __init__(
+        self,
+        server_config: ServerConfig,
+        factory: Callable[[ServerConfig], SparkClient] = create_spark_client,
+    ):
+        self.server_config = server_config
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._client: Optional[SparkClient] = None
+        self.state = "pending"  # pending, initializing, ready or failed
+        self.error: Optional[str] = None
+        self.init_seconds: Optional[float] = None
+
+    @property
+    def client(self) -> Optional[SparkClient]:
+        """The client if it has been created, without creating it."""
+        return self._client
+
+    def get(self) -> SparkClient:
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                self._initialize()
+            return self._client
+
+    def _initialize(self) -> None:
+        self.state = "initializing"
+        start = time.perf_counter()
+        try:
+            client = self._factory(self.server_config)
+        except Exception as exc:
+            self.state = "failed"
+            self.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.init_seconds = round(time.perf_counter() - start, 3)
+        self._client = client
+        self.state = "ready"
+        self.error = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "kind": server_kind(self.server_config),
+            "default": self.server_config.default,
+            "state": self.state,
+            "init_seconds": self.init_seconds,
+            "error": self.error,
+        }
+
+
+class SparkClientRegistry(Mapping[str, SparkClient]):
+    """Clients of the configured servers by name, each created on first lookup.
+
+    Looking up a server initializes its client (see ``LazyClient``) and
+    raises the initialization error if that fails.
+    """
+
+    def __init__(
+        self,
+        servers: Mapping[str, ServerConfig],
+        factory: Callable[[ServerConfig], SparkClient] = create_spark_client,
+    ):
+        self._clients = {
+            name: LazyClient(server_config, factory)
+            for name, server_config in servers.items()
+        }
+        self.default_server = next(
+            (name for name, cfg in servers.items() if cfg.default), None
+        )
+
+    def __getitem__(self, name: str) -> SparkClient:
+        return self._clients[name].get()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def default(self) -> Optional[SparkClient]:
+        """The default server's client, or None without a default server."""
+        if self.default_server is None:
+            return None
+        return self[self.default_server]
+
+    def initialized(self) -> Dict[str, SparkClient]:
+        """Clients created so far, without creating the others."""
+        return {
+            name: lazy.client
+            for name, lazy in self._clients.items()
+            if lazy.client is not None
+        }
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Initialization state, time and last error of each server's client."""
+        return {name: lazy.status() for name, lazy in self._clients.items()}
+
+    def initialize_all(self, max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """Create every client not created yet, in parallel, and return ``status``."""
+        pending = [name for name, lazy in self._clients.items() if lazy.client is None]
+        if pending:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(pending))),
+                thread_name_prefix="shs-client-init",
+            ) as executor:
+                errors = executor.map(_try_get, (self._clients[n] for n in pending))
+                for name, error in zip(pending, errors, strict=True):
+                    if error is not None:
+                        logger.warning(
+                            "Failed to initialize server %s: %s", name, error
+                        )
+        return self.status()
+
+    def warm_up(self, max_workers: int = 8) -> threading.Thread:
+        """Run ``initialize_all`` in a background thread and return the thread."""
+        thread = threading.Thread(
+            target=self.initialize_all,
+            args=(max_workers,),
+            name="shs-client-warm-up",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+
+def _try_get(lazy: LazyClient) -> Optional[Exception]:
+    try:
+        lazy.get()
+    except Exception as exc:
+        return exc
+    return None
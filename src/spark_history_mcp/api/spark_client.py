@@ -1,12 +1,16 @@
+import functools
+import itertools
 import json
 import re
-from functools import lru_cache
-from typing import Any, Dict, List, Optional, Type, TypeVar
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
 from urllib.parse import urljoin
 
 import requests
 from pydantic import BaseModel
 
+from spark_history_mcp.cache import get_cache_config, get_memory_cache
 from spark_history_mcp.config.config import ServerConfig
 from spark_history_mcp.models.spark_types import (
     ApplicationAttemptInfo,
@@ -31,6 +35,72 @@ from .base_client import BaseApiClient
 
 T = TypeVar("T", bound=BaseModel)
 
+_APP_URL_PATTERN = re.compile(r"(.*?/applications/[^/]+/)(.+)")
+
+# Methods decorated with _cached; each name is also its cache namespace
+_CACHED_METHODS = (
+    "get_application",
+    "get_application_attempt",
+    "list_jobs",
+    "get_job",
+    "get_stage_task_summary",
+    "list_executors",
+    "list_all_executors",
+    "get_rdd",
+    "get_environment",
+)
+
+# Identifies a client's entries in the shared cache without referencing it
+_client_ids = itertools.count()
+
+_MISSING = object()
+
+
+def add_default_attempt_id(url: str) -> str:
+    """Insert the default attempt ID (``1``) into an application URL.
+
+    Applications running on YARN expose their REST resources under an attempt
+    ID; SHS answers 404 for the attempt-less form, so callers retry with this.
+    """
+    match = _APP_URL_PATTERN.search(url)
+    if match:
+        prefix = match.group(1)
+        suffix = match.group(2)
+        # Check if the suffix already starts with a number (attempt ID)
+        if not re.match(r"^\d+/", suffix):
+            # If no attempt ID present, add the first (and probably only) attempt of the app running on YARN
+            app_attempt_id = 1
+            return f"{prefix}{app_attempt_id}/{suffix}"
+    return url
+
+
+def _cached(namespace: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Memoize a client method in the shared in-process response cache.
+
+    Entries are keyed by ``(owner, namespace, args, kwargs)``, where ``owner``
+    identifies the client without referencing it, so cached responses do not
+    pin the client and count against the budgets of ``cache.get_memory_cache``.
+    """
+
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            key = (self._cache_owner, namespace, args, tuple(sorted(kwargs.items())))
+            value = self._response_cache.get(key, _MISSING, namespace)
+            hit = value is not _MISSING
+            with self._cache_lock:
+                self._cache_counts[namespace][0 if hit else 1] += 1
+            if not hit:
+                value = method(self, *args, **kwargs)
+                app_id = args[0] if args else kwargs.get("app_id")
+                ttl = self._response_ttl(namespace, app_id, value)
+                self._response_cache.set(key, value, namespace, ttl=ttl)
+            return value
+
+        return wrapper
+
+    return decorator
+
 
 class SparkRestClient(BaseApiClient):
     """
@@ -49,7 +119,18 @@ class SparkRestClient(BaseApiClient):
             self.config.url.rstrip("/") + "/api/v1" if self.config.url else ""
         )
         self.auth = None
-        self.pattern = re.compile(r"(.*?/applications/[^/]+/)(.+)")
+        self.pattern = _APP_URL_PATTERN
+        self._response_cache = get_memory_cache()
+        self._cache_owner = ("client", next(_client_ids))
+        # namespace -> [hits, misses] of this client's cached calls
+        self._cache_counts = {name: [0, 0] for name in _CACHED_METHODS}
+        self._cache_lock = threading.Lock()
+        # Drop this client's responses once it is garbage collected
+        weakref.finalize(
+            self, self._response_cache.discard_where, self._owns(self._cache_owner)
+        )
+        # app_id -> whether the latest attempt had completed when last fetched
+        self._app_completed: Dict[str, bool] = {}
 
         # Set up basic auth if provided
         if self.config.auth:
@@ -78,16 +159,7 @@ class SparkRestClient(BaseApiClient):
         )
 
     def _modify_url(self, url):
-        match = self.pattern.search(url)
-        if match:
-            prefix = match.group(1)
-            suffix = match.group(2)
-            # Check if the suffix already starts with a number (attempt ID)
-            if not re.match(r"^\d+/", suffix):
-                # If no attempt ID present, add the first (and probably only) attempt of the app running on YARN
-                app_attempt_id = 1
-                return f"{prefix}{app_attempt_id}/{suffix}"
-        return url
+        return add_default_attempt_id(url)
 
     def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -192,7 +264,7 @@ class SparkRestClient(BaseApiClient):
         data = self._get("applications", params)
         return self._parse_model_list(data, ApplicationInfo)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("get_application")
     def get_application(self, app_id: str) -> ApplicationInfo:
         """
         Get information about a specific application.
@@ -209,7 +281,7 @@ class SparkRestClient(BaseApiClient):
         data = self._get(f"applications/{app_id}")
         return self._parse_model(data, ApplicationInfo)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("get_application_attempt")
     def get_application_attempt(
         self, app_id: str, attempt_id: str
     ) -> ApplicationAttemptInfo:
@@ -239,7 +311,7 @@ class SparkRestClient(BaseApiClient):
         data = self._get(f"applications/{app_id}/jobs", params)
         return self._parse_model_list(data, JobData)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("list_jobs")
     def _list_jobs_cached(
         self, app_id: str, status_tuple: Optional[tuple] = None
     ) -> List[JobData]:
@@ -264,7 +336,7 @@ class SparkRestClient(BaseApiClient):
         status_tuple = tuple(status) if status else None
         return self._list_jobs_cached(app_id, status_tuple)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("get_job")
     def get_job(self, app_id: str, job_id: int) -> JobData:
         """
         Get information about a specific job.
@@ -396,12 +468,13 @@ class SparkRestClient(BaseApiClient):
         )
         return self._parse_model(data, StageData)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("get_stage_task_summary")
     def get_stage_task_summary(
         self,
         app_id: str,
         stage_id: int,
         attempt_id: int,
+        quantiles: Optional[str] = None,
     ) -> TaskMetricDistributions:
         """
         Get task summary metrics for a specific stage attempt.
@@ -412,11 +485,12 @@ class SparkRestClient(BaseApiClient):
             app_id: The application ID
             stage_id: The stage ID
             attempt_id: The attempt ID
+            quantiles: Optional comma-separated quantiles (e.g. "0.05,0.5,0.95")
 
         Returns:
             TaskMetricDistributions object
         """
-        params = {}
+        params = {"quantiles": quantiles} if quantiles else {}
         data = self._get(
             f"applications/{app_id}/stages/{stage_id}/{attempt_id}/taskSummary", params
         )
@@ -457,7 +531,7 @@ class SparkRestClient(BaseApiClient):
         )
         return self._parse_model_list(data, TaskData)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("list_executors")
     def list_executors(self, app_id: str) -> List[ExecutorSummary]:
         """
         Get a list of all executors for an application.
@@ -473,7 +547,7 @@ class SparkRestClient(BaseApiClient):
         data = self._get(f"applications/{app_id}/executors")
         return self._parse_model_list(data, ExecutorSummary)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("list_all_executors")
     def list_all_executors(self, app_id: str) -> List[ExecutorSummary]:
         """
         Get a list of all executors (active and inactive) for an application.
@@ -549,7 +623,7 @@ class SparkRestClient(BaseApiClient):
         data = self._get(f"applications/{app_id}/storage/rdd")
         return self._parse_model_list(data, RDDStorageInfo)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("get_rdd")
     def get_rdd(self, app_id: str, rdd_id: int) -> RDDStorageInfo:
         """
         Get information about a specific RDD.
@@ -566,7 +640,7 @@ class SparkRestClient(BaseApiClient):
         data = self._get(f"applications/{app_id}/storage/rdd/{rdd_id}")
         return self._parse_model(data, RDDStorageInfo)
 
-    @lru_cache(maxsize=1000)  # noqa: B019
+    @_cached("get_environment")
     def get_environment(self, app_id: str) -> ApplicationEnvironmentInfo:
         """
         Get environment information for an application.
@@ -790,6 +864,32 @@ class SparkRestClient(BaseApiClient):
 
         return dag_data
 
+    def _response_ttl(
+        self, namespace: str, app_id: Optional[str], value: Any
+    ) -> Optional[float]:
+        """TTL for a cached response, based on whether its app is still running.
+
+        Completed applications are immutable and cached until evicted; data of
+        running applications expires quickly. Once an application is seen
+        completed, its short-lived entries are dropped so the final state is
+        fetched and cached permanently.
+        """
+        if namespace == "get_application" and app_id is not None:
+            completed = getattr(value, "status", None) == "COMPLETED"
+            if completed and self._app_completed.get(app_id) is False:
+                owner = self._cache_owner
+                self._response_cache.discard_where(
+                    lambda key: (
+                        key[0] == owner
+                        and key[1] != "get_application"
+                        and (key[2][:1] == (app_id,) or ("app_id", app_id) in key[3])
+                    )
+                )
+            self._app_completed[app_id] = completed
+        if self._app_completed.get(app_id) is False:
+            return get_cache_config().running_app_ttl_seconds
+        return None
+
     def clear_cache(self):
         """
         Clear all cached method results.
@@ -797,22 +897,16 @@ class SparkRestClient(BaseApiClient):
         This is useful if you need to force fresh data retrieval from the server,
         for example when analyzing running applications or after data updates.
         """
-        # Clear all cached methods
-        methods_to_clear = [
-            self.get_application,
-            self.get_application_attempt,
-            self._list_jobs_cached,
-            self.get_job,
-            self.get_stage_task_summary,
-            self.list_executors,
-            self.list_all_executors,
-            self.get_rdd,
-            self.get_environment,
-        ]
-
-        for method in methods_to_clear:
-            if hasattr(method, "cache_clear"):
-                method.cache_clear()
+        self._response_cache.discard_where(self._owns(self._cache_owner))
+        self._app_completed.clear()
+        with self._cache_lock:
+            for counts in self._cache_counts.values():
+                counts[:] = [0, 0]
+
+    @staticmethod
+    def _owns(owner: Any) -> Callable[[Any], bool]:
+        """Predicate matching the shared-cache keys of the client *owner*."""
+        return lambda key: isinstance(key, tuple) and key[:1] == (owner,)
 
     def cache_info(self) -> Dict[str, Any]:
         """
@@ -821,28 +915,19 @@ class SparkRestClient(BaseApiClient):
         Returns:
             Dictionary mapping method names to cache info (hits, misses, size, maxsize)
         """
+        cache = self._response_cache
+        owner = self._cache_owner
         cache_stats = {}
-
-        cached_methods = {
-            "get_application": self.get_application,
-            "get_application_attempt": self.get_application_attempt,
-            "list_jobs": self._list_jobs_cached,
-            "get_job": self.get_job,
-            "get_stage_task_summary": self.get_stage_task_summary,
-            "list_executors": self.list_executors,
-            "list_all_executors": self.list_all_executors,
-            "get_rdd": self.get_rdd,
-            "get_environment": self.get_environment,
-        }
-
-        for name, method in cached_methods.items():
-            if hasattr(method, "cache_info"):
-                info = method.cache_info()
-                cache_stats[name] = {
-                    "hits": info.hits,
-                    "misses": info.misses,
-                    "maxsize": info.maxsize,
-                    "currsize": info.currsize,
-                }
-
+        for name in _CACHED_METHODS:
+            hits, misses = self._cache_counts[name]
+            cache_stats[name] = {
+                "hits": hits,
+                "misses": misses,
+                "maxsize": cache.namespace_max_entries.get(
+                    name, cache.namespace_default_max_entries
+                ),
+                "currsize": cache.count_where(
+                    lambda key, name=name: key[:2] == (owner, name)
+                ),
+            }
         return cache_stats
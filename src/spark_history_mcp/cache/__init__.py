@@ -0,0 +1,252 @@
+"""
+Disk cache for Spark History Server API responses.
+
+History server data for completed apps is immutable, making disk caching safe.
+Entries are stored by a pluggable backend selected with ``CacheConfig.backend``
+(``SHS_CACHE_BACKEND``): ``file`` keeps one file per entry, ``sqlite`` keeps
+all entries in a single WAL-mode database and supports per-app invalidation.
+Payloads are compressed by ``codec`` (zstd when available, gzip otherwise).
+
+The cache is bounded by ``CacheConfig`` (``SHS_CACHE_*`` env vars): total bytes
+and entry count, enforced by evicting the least recently accessed entries, and
+an optional TTL per namespace (``stages``, ``env``, ...). Hit/miss counters are
+persisted by the backend so ``cache stats`` can report them.
+
+Derived files saved next to the entries (the task columns of
+``tools.task_columns``, the event log index of ``api.event_log_index``) live in ``FileStore`` directories with their own byte
+budgets; ``get_file_store`` returns them, and ``prune``, ``cache_stats``,
+``invalidate_app`` and ``clear_cache`` cover them too.
+
+``get_memory_cache`` returns the in-process cache in front of it, shared by the
+tool fetchers and the REST clients and sized by the ``memory_*`` fields of the
+same configuration.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.config import CacheConfig
+from ..memory_cache import MemoryCache
+from . import codec
+from .base import CacheBackend, CacheEntry
+from .file_backend import FileCacheBackend
+from .file_store import FileStore
+from .sqlite_backend import SQLiteCacheBackend
+
+CACHE_DIR = Path.home() / ".cache" / "spark-history-mcp"
+
+BACKENDS = {
+    FileCacheBackend.name: FileCacheBackend,
+    SQLiteCacheBackend.name: SQLiteCacheBackend,
+}
+
+# File store directory -> (file suffix, CacheConfig field of its byte budget,
+# whether files are scoped by server key)
+FILE_STORES = {
+    "task-columns": (".cols", "task_columns_max_bytes", True),
+    "event-log-index": (".idx", "event_log_index_max_bytes", False),
+}
+
+_lock = threading.Lock()
+_config: Optional[CacheConfig] = None
+_backend: Optional[CacheBackend] = None
+_file_stores: Dict[str, FileStore] = {}
+_memory: Optional[MemoryCache] = None
+
+
+def get_cache_config() -> CacheConfig:
+    """Return the active disk cache configuration."""
+    global _config
+    if _config is None:
+        _config = CacheConfig()
+    return _config
+
+
+def configure(config: Optional[CacheConfig] = None) -> None:
+    """Override the disk cache configuration (``None`` re-reads the env)."""
+    global _config, _backend
+    with _lock:
+        backend, _backend = _backend, None
+        _config = config
+        _file_stores.clear()
+    if backend is not None:
+        backend.close()
+
+
+def create_backend(config: CacheConfig, root: Optional[Path] = None) -> CacheBackend:
+    """Instantiate the backend named by ``config.backend``."""
+    return BACKENDS[config.backend](root or config.directory or CACHE_DIR, config)
+
+
+def get_backend() -> CacheBackend:
+    """Return the backend for the active configuration, creating it lazily."""
+    global _backend
+    cfg = get_cache_config()
+    root = cfg.directory or CACHE_DIR
+    with _lock:
+        backend = _backend
+        if backend is not None and backend.config is cfg and backend.root == root:
+            return backend
+        _backend = create_backend(cfg, root)
+    if backend is not None:
+        backend.close()
+    return _backend
+
+
+def get_file_store(name: str) -> FileStore:
+    """Return the file store *name* (see ``FILE_STORES``) in the cache directory."""
+    cfg = get_cache_config()
+    root = (cfg.directory or CACHE_DIR) / name
+    suffix, budget, server_scoped = FILE_STORES[name]
+    with _lock:
+        store = _file_stores.get(name)
+        if store is None or store.root != root:
+            store = _file_stores[name] = FileStore(
+                root, suffix, getattr(cfg, budget), server_scoped
+            )
+        return store
+
+
+def file_stores() -> List[FileStore]:
+    """Return every file store of the cache directory."""
+    return [get_file_store(name) for name in FILE_STORES]
+
+
+def get_memory_cache() -> MemoryCache:
+    """Return the process-wide in-memory response cache, creating it lazily.
+
+    Its budgets are read from the active configuration when it is created.
+    """
+    global _memory
+    with _lock:
+        if _memory is None:
+            cfg = get_cache_config()
+            _memory = MemoryCache(
+                max_bytes=cfg.memory_max_bytes,
+                namespace_max_bytes=cfg.memory_namespace_max_bytes,
+                namespace_default_max_entries=cfg.memory_namespace_max_entries,
+            )
+        return _memory
+
+
+def disk_get_bytes(key: Tuple[Any, ...]) -> Optional[bytes]:
+    """Read the encoded payload for *key*, or None if missing or expired."""
+    return get_backend().get(key)
+
+
+def disk_set_bytes(key: Tuple[Any, ...], payload: bytes) -> None:
+    """Write an encoded payload (see ``codec``) to disk for *key*."""
+    get_backend().set(key, payload)
+
+
+def disk_get(key: Tuple[Any, ...]) -> Optional[str]:
+    """Read cached JSON string for *key*, or None if missing or expired."""
+    payload = disk_get_bytes(key)
+    if payload is None:
+        return None
+    try:
+        return codec.decode_text(payload)
+    except (codec.CodecError, UnicodeDecodeError):
+        return None
+
+
+def disk_set(key: Tuple[Any, ...], data: str) -> None:
+    """Compress and write *data* (JSON string) to disk for *key*."""
+    disk_set_bytes(key, codec.encode_text(data))
+
+
+def iter_entries() -> List[CacheEntry]:
+    """List all cache entries with their size and access/modification times."""
+    return get_backend().iter_entries()
+
+
+def invalidate_app(app_id: str, server_key: Optional[str] = None) -> int:
+    """Remove all cached entries and saved files of one application.
+
+    The files are removed even when the backend cannot select entries by app.
+
+    Raises:
+        NotImplementedError: If the configured backend cannot select by app
+    """
+    removed = sum(store.invalidate_app(app_id, server_key) for store in file_stores())
+    return removed + get_backend().invalidate_app(app_id, server_key)
+
+
+def prune(
+    max_bytes: Optional[int] = None,
+    max_entries: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Remove expired entries, then evict least recently accessed ones.
+
+    File stores are pruned to their own configured budgets.
+
+    Args:
+        max_bytes: Byte budget to evict down to (default: configured budget)
+        max_entries: Entry budget to evict down to (default: configured budget)
+
+    Returns:
+        Counts of expired and evicted entries and the remaining entries/bytes,
+        and under ``stores`` the evicted and remaining files of each store.
+    """
+    result: Dict[str, Any] = dict(get_backend().prune(max_bytes, max_entries))
+    result["stores"] = {store.name: store.prune() for store in file_stores()}
+    return result
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Report entry counts, bytes and hit rates overall and per namespace.
+
+    The files and bytes of each file store are reported under ``stores``.
+    """
+    stats = get_backend().stats()
+    stats["stores"] = {store.name: store.stats() for store in file_stores()}
+    return stats
+
+
+def clear_cache() -> int:
+    """Remove all cached entries and saved files. Returns the number removed."""
+    removed = sum(store.clear() for store in file_stores())
+    return removed + get_backend().clear()
+
+
+def flush_stats() -> None:
+    """Persist this process's pending hit/miss counters."""
+    backend = _backend
+    if backend is not None:
+        backend.flush_stats()
+
+
+atexit.register(flush_stats)
+
+__all__ = [
+    "BACKENDS",
+    "CACHE_DIR",
+    "CacheBackend",
+    "CacheEntry",
+    "FILE_STORES",
+    "FileCacheBackend",
+    "FileStore",
+    "SQLiteCacheBackend",
+    "cache_stats",
+    "clear_cache",
+    "configure",
+    "create_backend",
+    "codec",
+    "disk_get",
+    "disk_get_bytes",
+    "disk_set",
+    "disk_set_bytes",
+    "file_stores",
+    "flush_stats",
+    "get_backend",
+    "get_cache_config",
+    "get_file_store",
+    "get_memory_cache",
+    "invalidate_app",
+    "iter_entries",
+    "prune",
+]
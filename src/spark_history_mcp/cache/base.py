@@ -0,0 +1,240 @@
+"""
+Backend interface for the disk cache.
+
+A backend stores opaque payloads (see ``codec``) under fetcher keys
+``(server_key, namespace, app_id, ...)`` and enforces the budgets and TTLs of a
+``CacheConfig``. Hit/miss counters are buffered in-process and periodically
+persisted by the backend so ``cache stats`` can report them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config.config import CacheConfig
+from ..memory_cache import default_namespace
+
+# Automatic pruning frees space down to this fraction of the budget so that
+# it does not run again on the very next write.
+LOW_WATERMARK = 0.9
+STATS_FLUSH_EVERY = 50
+
+
+class CacheEntry(NamedTuple):
+    path: Optional[Path]  # None for backends that do not store files
+    namespace: str
+    size: int
+    atime: float
+    mtime: float
+
+
+def key_hash(key: Tuple[Any, ...]) -> str:
+    raw = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def key_namespace(key: Tuple[Any, ...]) -> str:
+    """Filesystem-safe namespace of a fetcher key."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", default_namespace(key)) or "default"
+
+
+def key_server(key: Tuple[Any, ...]) -> Optional[str]:
+    return str(key[0]) if isinstance(key, tuple) and key else None
+
+
+def key_app_id(key: Tuple[Any, ...]) -> Optional[str]:
+    if isinstance(key, tuple) and len(key) > 2 and isinstance(key[2], str):
+        return key[2]
+    return None
+
+
+class CacheBackend(ABC):
+    """Storage for the disk cache.
+
+    Args:
+        root: Directory holding the cache data
+        config: Budgets and TTLs to enforce
+    """
+
+    name = "base"
+
+    def __init__(self, root: Path, config: CacheConfig):
+        self.root = root
+        self.config = config
+        self._lock = threading.Lock()
+        # Running [bytes, entries] estimate for this process; None until scanned
+        self._usage: Optional[List[int]] = None
+        self._pending: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._pending_ops = 0
+
+    # -- storage ------------------------------------------------------------
+
+    @abstractmethod
+    def get(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        """Return the cached payload for *key*, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: Tuple[Any, ...], data: bytes) -> None:
+        """Store *data* for *key*, evicting entries if over budget."""
+
+    @abstractmethod
+    def iter_entries(self) -> List[CacheEntry]:
+        """List all entries with their size and access/write times."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove all entries and counters. Returns the number of entries."""
+
+    @abstractmethod
+    def _prune(
+        self, max_bytes: Optional[int], max_entries: Optional[int]
+    ) -> Dict[str, int]:
+        """Drop expired entries, then evict least recently accessed ones."""
+
+    @abstractmethod
+    def _read_counters(self) -> Dict[str, Dict[str, int]]:
+        """Load persisted counters keyed by namespace."""
+
+    @abstractmethod
+    def _merge_counters(self, pending: Dict[str, Dict[str, int]]) -> None:
+        """Add *pending* counter deltas to the persisted counters."""
+
+    def invalidate_app(self, app_id: str, server_key: Optional[str] = None) -> int:
+        """Remove all entries of one application. Returns the count removed."""
+        raise NotImplementedError(
+            f"The {self.name} cache backend does not support per-app invalidation"
+        )
+
+    def usage_by_namespace(self) -> Dict[str, Dict[str, int]]:
+        """Return ``{namespace: {"entries": n, "bytes": b}}``."""
+        usage: Dict[str, Dict[str, int]] = {}
+        for entry in self.iter_entries():
+            ns = usage.setdefault(entry.namespace, {"entries": 0, "bytes": 0})
+            ns["entries"] += 1
+            ns["bytes"] += entry.size
+        return usage
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+        self.flush_stats()
+
+    # -- budgets ------------------------------------------------------------
+
+    def prune(
+        self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Apply TTLs and evict down to the given (default: configured) budget.
+
+        Returns:
+            Counts of expired and evicted entries and the remaining entries/bytes.
+        """
+        if max_bytes is None:
+            max_bytes = self.config.max_bytes
+        if max_entries is None:
+            max_entries = self.config.max_entries
+        return self._prune(max_bytes, max_entries)
+
+    def is_expired(self, namespace: str, written_at: float, now: float) -> bool:
+        ttl = self.config.ttl_for(namespace)
+        return ttl is not None and now - written_at > ttl
+
+    def over_budget(self, total_bytes: int, entries: int) -> bool:
+        cfg = self.config
+        return (cfg.max_bytes is not None and total_bytes > cfg.max_bytes) or (
+            cfg.max_entries is not None and entries > cfg.max_entries
+        )
+
+    def watermark_budget(self) -> Tuple[Optional[int], Optional[int]]:
+        """Budgets automatic pruning evicts down to."""
+        cfg = self.config
+        return (
+            None if cfg.max_bytes is None else int(cfg.max_bytes * LOW_WATERMARK),
+            None if cfg.max_entries is None else int(cfg.max_entries * LOW_WATERMARK),
+        )
+
+    def track_write(self, size_delta: int, entries_delta: int) -> bool:
+        """Update the usage estimate; True if it is unknown or over budget."""
+        with self._lock:
+            if self._usage is None:
+                return True
+            self._usage[0] += size_delta
+            self._usage[1] += entries_delta
+            return self.over_budget(*self._usage)
+
+    def track_removal(self, size: int) -> None:
+        with self._lock:
+            if self._usage is not None:
+                self._usage[0] -= size
+                self._usage[1] -= 1
+
+    def reset_usage(self, total_bytes: Optional[int], entries: int = 0) -> None:
+        with self._lock:
+            self._usage = None if total_bytes is None else [total_bytes, entries]
+
+    # -- stats --------------------------------------------------------------
+
+    def record(self, namespace: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._pending[namespace][counter] += amount
+            self._pending_ops += 1
+            flush = self._pending_ops >= STATS_FLUSH_EVERY
+        if flush:
+            self.flush_stats()
+
+    def flush_stats(self) -> None:
+        """Persist this process's pending counters."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending = {ns: dict(c) for ns, c in self._pending.items()}
+            self._pending.clear()
+            self._pending_ops = 0
+        try:
+            self._merge_counters(pending)
+        except Exception:  # noqa: S110 - counters are best effort
+            pass
+
+    def discard_pending_stats(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._pending_ops = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Report entry counts, bytes and hit rates overall and per namespace."""
+        self.flush_stats()
+        namespaces: Dict[str, Dict[str, Any]] = {
+            ns: dict(values) for ns, values in self.usage_by_namespace().items()
+        }
+        for namespace, values in self._read_counters().items():
+            ns = namespaces.setdefault(namespace, {"entries": 0, "bytes": 0})
+            ns.update(values)
+
+        totals: Dict[str, Any] = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}
+        for values in namespaces.values():
+            _with_hit_rate(values)
+            for name in totals:
+                totals[name] += values.get(name, 0)
+
+        return {
+            "backend": self.name,
+            "directory": str(self.root),
+            "max_bytes": self.config.max_bytes,
+            "max_entries": self.config.max_entries,
+            **_with_hit_rate(totals),
+            "namespaces": dict(sorted(namespaces.items())),
+        }
+
+
+def _with_hit_rate(values: Dict[str, Any]) -> Dict[str, Any]:
+    hits = values.get("hits", 0)
+    misses = values.get("misses", 0)
+    lookups = hits + misses
+    values["hit_rate"] = round(hits / lookups, 4) if lookups else None
+    return values
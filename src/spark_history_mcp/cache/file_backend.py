@@ -0,0 +1,318 @@
+"""
+File-per-entry disk cache backend.
+
+Stores one file per entry in ``<root>/<namespace>/<ab>/<cd>/`` keyed by SHA256
+hash (sharded on the first two byte pairs of the hash so no single directory
+grows huge). Files keep the ``.json`` extension of the original plain-JSON
+layout so entries written by earlier releases are still found.
+
+Entries are written to a temp file and atomically renamed into place, so
+readers never see partial payloads. Stats updates, pruning and clearing take an
+advisory file lock, so several processes can share one cache directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    FCNTL_AVAILABLE = False
+
+from .base import CacheBackend, CacheEntry, key_hash, key_namespace
+
+STATS_FILE = ".stats"
+LOCK_FILE = ".lock"
+TEMP_SUFFIX = ".tmp"
+# Leftover temp files older than this are from crashed writers
+STALE_TEMP_SECONDS = 3600
+
+
+class FileCacheBackend(CacheBackend):
+    """One file per entry; access time tracked with ``os.utime``."""
+
+    name = "file"
+
+    def key_to_path(self, key: Tuple[Any, ...]) -> Path:
+        h = key_hash(key)
+        return self.root / key_namespace(key) / h[:2] / h[2:4] / f"{h}.json"
+
+    def legacy_paths(self, key: Tuple[Any, ...]) -> Tuple[Path, ...]:
+        """Locations used by earlier, unsharded cache layouts."""
+        h = key_hash(key)
+        return (self.root / key_namespace(key) / f"{h}.json", self.root / f"{h}.json")
+
+    def _namespace_of_path(self, path: Path) -> str:
+        parts = path.relative_to(self.root).parts
+        return parts[0] if len(parts) > 1 else "default"
+
+    @contextlib.contextmanager
+    def _file_lock(self, blocking: bool = True) -> Iterator[bool]:
+        """Hold the cross-process cache lock; yields False if not acquired."""
+        if not FCNTL_AVAILABLE:
+            yield True
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            handle = open(self.root / LOCK_FILE, "a+")
+        except OSError:
+            yield True
+            return
+        with handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    # -- storage ------------------------------------------------------------
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        path = self.key_to_path(key)
+        namespace = self._namespace_of_path(path)
+        now = time.time()
+        try:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                st = self._migrate_legacy(key, path)
+            if self.is_expired(namespace, st.st_mtime, now):
+                self._remove(path, st.st_size)
+                self.record(namespace, "expired")
+                self.record(namespace, "misses")
+                return None
+            data = path.read_bytes()
+        except OSError:
+            self.record(namespace, "misses")
+            return None
+
+        # Track access explicitly: many filesystems are mounted
+        # noatime/relatime. mtime is preserved because it drives TTL expiry.
+        with contextlib.suppress(OSError):
+            os.utime(path, (now, st.st_mtime))
+        self.record(namespace, "hits")
+        return data
+
+    def set(self, key: Tuple[Any, ...], data: bytes) -> None:
+        path = self.key_to_path(key)
+        try:
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = None
+            _atomic_write(path, data)
+            size = path.stat().st_size
+        except OSError:
+            return  # non-fatal; in-process cache still works
+
+        self.record(self._namespace_of_path(path), "writes")
+        if self.track_write(size - (previous or 0), 0 if previous is not None else 1):
+            self._auto_prune()
+
+    def iter_entries(self) -> List[CacheEntry]:
+        entries = []
+        for dir_entry in self._walk_files(".json"):
+            if dir_entry.name.startswith("."):
+                continue
+            try:
+                st = dir_entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            path = Path(dir_entry.path)
+            entries.append(
+                CacheEntry(
+                    path,
+                    self._namespace_of_path(path),
+                    st.st_size,
+                    st.st_atime,
+                    st.st_mtime,
+                )
+            )
+        return entries
+
+    def clear(self) -> int:
+        self.discard_pending_stats()
+        self.reset_usage(None)
+        if not self.root.exists():
+            return 0
+        with self._file_lock():
+            count = len(self.iter_entries())
+            for child in self.root.iterdir():
+                if child.name == LOCK_FILE:
+                    continue  # other processes may be waiting on it
+                if child.is_dir() and not child.is_symlink():
+                    shutil.rmtree(child, ignore_errors=True)
+                else:
+                    with contextlib.suppress(OSError):
+                        child.unlink()
+        return count
+
+    def _migrate_legacy(self, key: Tuple[Any, ...], path: Path) -> os.stat_result:
+        """Move an entry written by an older layout into its shard."""
+        for legacy in self.legacy_paths(key):
+            if not legacy.is_file():
+                continue
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(legacy, path)
+                return path.stat()
+            except FileNotFoundError:
+                continue  # moved concurrently by another process
+        raise FileNotFoundError(path)
+
+    def _remove(self, path: Path, size: int) -> bool:
+        try:
+            path.unlink()
+        except OSError:
+            return False
+        self.track_removal(size)
+        return True
+
+    def _walk_files(self, suffix: str) -> Iterator[os.DirEntry]:
+        stack = [str(self.root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(suffix):
+                            yield entry
+            except OSError:
+                continue
+
+    def _remove_stale_temp_files(self, now: float) -> int:
+        removed = 0
+        for dir_entry in self._walk_files(TEMP_SUFFIX):
+            try:
+                mtime = dir_entry.stat(follow_symlinks=False).st_mtime
+                if now - mtime > STALE_TEMP_SECONDS:
+                    os.unlink(dir_entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    # -- budgets ------------------------------------------------------------
+
+    def _auto_prune(self) -> None:
+        with self._file_lock(blocking=False) as acquired:
+            if not acquired:
+                return  # another process is already pruning the directory
+            entries = self.iter_entries()
+            total = sum(e.size for e in entries)
+            if not self.over_budget(total, len(entries)):
+                self.reset_usage(total, len(entries))
+                return
+            _, removed = self._prune_entries(*self.watermark_budget(), entries)
+        self._record_removals(removed)
+
+    def _prune(
+        self, max_bytes: Optional[int], max_entries: Optional[int]
+    ) -> Dict[str, int]:
+        with self._file_lock():
+            result, removed = self._prune_entries(
+                max_bytes, max_entries, self.iter_entries()
+            )
+        self._record_removals(removed)
+        return result
+
+    def _prune_entries(
+        self,
+        max_bytes: Optional[int],
+        max_entries: Optional[int],
+        entries: List[CacheEntry],
+    ) -> Tuple[Dict[str, int], Dict[Tuple[str, str], int]]:
+        """Remove expired entries, then the least recently used over budget.
+
+        Returns the prune result and the removals per (namespace, counter).
+        They are recorded by the caller once the file lock is released:
+        recording may flush the stats, which takes the lock again.
+        """
+        now = time.time()
+        self._remove_stale_temp_files(now)
+        removed: Dict[Tuple[str, str], int] = defaultdict(int)
+        expired = evicted = 0
+        live = []
+        for entry in entries:
+            if self.is_expired(entry.namespace, entry.mtime, now):
+                if self._remove(entry.path, entry.size):
+                    expired += 1
+                    removed[(entry.namespace, "expired")] += 1
+            else:
+                live.append(entry)
+
+        live.sort(key=lambda e: e.atime)
+        total = sum(e.size for e in live)
+        count = len(live)
+        for entry in live:
+            if (max_bytes is None or total <= max_bytes) and (
+                max_entries is None or count <= max_entries
+            ):
+                break
+            if self._remove(entry.path, entry.size):
+                evicted += 1
+                total -= entry.size
+                count -= 1
+                removed[(entry.namespace, "evictions")] += 1
+
+        self.reset_usage(total, count)
+        result = {
+            "expired": expired,
+            "evicted": evicted,
+            "entries": count,
+            "bytes": total,
+        }
+        return result, removed
+
+    def _record_removals(self, removed: Dict[Tuple[str, str], int]) -> None:
+        for (namespace, counter), amount in removed.items():
+            self.record(namespace, counter, amount)
+
+    # -- stats --------------------------------------------------------------
+
+    def _read_counters(self) -> Dict[str, Dict[str, int]]:
+        try:
+            return json.loads((self.root / STATS_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _merge_counters(self, pending: Dict[str, Dict[str, int]]) -> None:
+        # The read-modify-write happens under the cross-process lock, so
+        # concurrent servers sharing the directory do not lose increments.
+        with self._file_lock():
+            stats = self._read_counters()
+            for namespace, counters in pending.items():
+                merged = stats.setdefault(namespace, {})
+                for name, value in counters.items():
+                    merged[name] = merged.get(name, 0) + value
+            _atomic_write(self.root / STATS_FILE, json.dumps(stats).encode())
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write *data* to a temp file in the target directory and rename it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
@@ -0,0 +1,247 @@
+"""
+Bounded directories of derived files kept next to the disk cache.
+
+Some data is saved as whole files rather than cache entries: the
+memory-mappable task columns of ``tools.task_columns`` and the replay index of
+``api.event_log_index``. A ``FileStore`` owns one such directory: it tracks the
+bytes written by this process, evicts the least recently used files once the
+directory exceeds its byte budget, and lets the ``cache`` commands list, prune,
+clear and invalidate the files.
+
+Files are laid out as ``<root>/<scope>/<app>[/...]``, both levels named with
+``path_component`` (a readable, filesystem-safe prefix plus a short hash), so
+the files of one application are found without opening them. The scope is the
+server key, or for stores shared by servers (``server_scoped=False``) whatever
+else separates applications of the same name, e.g. the event log directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base import LOW_WATERMARK, CacheEntry
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+_READABLE_CHARS = 80
+
+
+def path_component(value: str) -> str:
+    """Filesystem-safe directory name for *value*, unique per value."""
+    digest = hashlib.sha256(value.encode()).hexdigest()[:12]
+    return f"{_UNSAFE.sub('_', value)[:_READABLE_CHARS]}-{digest}"
+
+
+def _readable(component: str) -> str:
+    return component.rpartition("-")[0]
+
+
+class FileStore:
+    """Files ending in *suffix* under *root*, bounded by *max_bytes*.
+
+    Args:
+        root: Directory holding the files
+        suffix: Extension of the store's files; other files are ignored
+        max_bytes: Byte budget (None disables it)
+        server_scoped: Whether the scope directories are server keys
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        suffix: str,
+        max_bytes: Optional[int],
+        server_scoped: bool = True,
+    ):
+        self.root = Path(root)
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.server_scoped = server_scoped
+        self._lock = threading.Lock()
+        # Running byte estimate for this process; None until scanned
+        self._usage: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return self.root.name
+
+    def app_dir(self, scope: str, app_id: str) -> Path:
+        """Directory of the files of one application."""
+        return self.root / path_component(scope) / path_component(app_id)
+
+    # -- bookkeeping ----------------------------------------------------------
+
+    def saved(self, path: Path, previous_size: Optional[int] = None) -> None:
+        """Account for a file just written, evicting others if over budget.
+
+        Args:
+            path: The written file
+            previous_size: Size of the file it replaced, if any
+        """
+        if self.max_bytes is None:
+            return
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            if self._usage is not None:
+                self._usage += size - (previous_size or 0)
+            usage = self._usage
+        if usage is None:
+            usage = self.stats()["bytes"]
+        if usage > self.max_bytes:
+            self.prune(int(self.max_bytes * LOW_WATERMARK), keep=path)
+
+    def touch(self, path: Path) -> None:
+        """Record a read of *path* for LRU eviction (mtime is preserved)."""
+        with contextlib.suppress(OSError):
+            os.utime(path, (time.time(), path.stat().st_mtime))
+
+    # -- listing --------------------------------------------------------------
+
+    def entries(self) -> List[CacheEntry]:
+        """List the store's files with their size and access/write times."""
+        entries = []
+        for dir_entry in self._walk_files():
+            try:
+                st = dir_entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            entries.append(
+                CacheEntry(
+                    Path(dir_entry.path),
+                    self.name,
+                    st.st_size,
+                    st.st_atime,
+                    st.st_mtime,
+                )
+            )
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the file count, bytes and budget of the store."""
+        entries = self.entries()
+        total = sum(e.size for e in entries)
+        with self._lock:
+            self._usage = total
+        return {
+            "directory": str(self.root),
+            "files": len(entries),
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    # -- removal --------------------------------------------------------------
+
+    def prune(
+        self, max_bytes: Optional[int] = None, keep: Optional[Path] = None
+    ) -> Dict[str, int]:
+        """Evict least recently used files down to the given (default:
+        configured) budget.
+
+        Args:
+            max_bytes: Byte budget to evict down to
+            keep: A file never evicted, e.g. the one just written
+
+        Returns:
+            The evicted file count and the remaining files/bytes.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = sorted(self.entries(), key=lambda e: e.atime)
+        total = sum(e.size for e in entries)
+        count = len(entries)
+        evicted = 0
+        for entry in entries:
+            if max_bytes is None or total <= max_bytes:
+                break
+            if entry.path == keep:
+                continue
+            try:
+                entry.path.unlink()
+            except OSError:
+                continue
+            evicted += 1
+            total -= entry.size
+            count -= 1
+            self._remove_empty_parents(entry.path.parent)
+        with self._lock:
+            self._usage = total
+        return {"evicted": evicted, "files": count, "bytes": total}
+
+    def invalidate_app(self, app_id: str, server_key: Optional[str] = None) -> int:
+        """Remove the files of one application. Returns the count removed.
+
+        Application directories named after *app_id* or one of its attempts
+        (``<app_id>_<attempt>``) are removed, in every scope or, if the store
+        is server scoped, only in the scope of *server_key*.
+        """
+        if not self.root.is_dir():
+            return 0
+        name = _UNSAFE.sub("_", app_id)[:_READABLE_CHARS]
+        scope = None
+        if server_key is not None and self.server_scoped:
+            scope = path_component(server_key)
+        removed = 0
+        for scope_dir in self._children(self.root):
+            if scope is not None and scope_dir.name != scope:
+                continue
+            for app_dir in self._children(scope_dir):
+                readable = _readable(app_dir.name)
+                if readable == name or readable.startswith(name + "_"):
+                    removed += sum(1 for _ in self._walk_files(app_dir))
+                    shutil.rmtree(app_dir, ignore_errors=True)
+            self._remove_empty_parents(scope_dir)
+        with self._lock:
+            self._usage = None
+        return removed
+
+    def clear(self) -> int:
+        """Remove every file of the store. Returns the number removed."""
+        count = len(self.entries())
+        shutil.rmtree(self.root, ignore_errors=True)
+        with self._lock:
+            self._usage = None
+        return count
+
+    # -- helpers --------------------------------------------------------------
+
+    def _walk_files(self, top: Optional[Path] = None) -> Iterator[os.DirEntry]:
+        stack = [str(top or self.root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(self.suffix):
+                            yield entry
+            except OSError:
+                continue
+
+    @staticmethod
+    def _children(directory: Path) -> List[Path]:
+        try:
+            return [
+                child
+                for child in directory.iterdir()
+                if child.is_dir() and not child.is_symlink()
+            ]
+        except OSError:
+            return []
+
+    def _remove_empty_parents(self, directory: Path) -> None:
+        while directory != self.root and self.root in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
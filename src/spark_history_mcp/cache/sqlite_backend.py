@@ -0,0 +1,333 @@
+"""
+SQLite disk cache backend.
+
+All entries live in one WAL-mode database (``<root>/cache.sqlite3``) with the
+key, namespace, server, application id, size and created/accessed timestamps
+as indexed columns and the compressed payload (see ``codec``) as a BLOB.
+Per-app invalidation, eviction and stats are index queries instead of
+directory walks, and the cache costs a handful of files instead of one per
+response, which matters on network-mounted home directories.
+
+WAL lets readers proceed while one writer commits, and ``BEGIN IMMEDIATE``
+serializes writers across processes sharing the database.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .base import (
+    CacheBackend,
+    CacheEntry,
+    key_app_id,
+    key_hash,
+    key_namespace,
+    key_server,
+)
+
+DB_FILE = "cache.sqlite3"
+# Bumped when the table layout or payload format changes; older entries are
+# discarded rather than migrated since the cache can always be refilled.
+SCHEMA_VERSION = 2
+# Seconds a connection waits for another writer before giving up
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key_hash TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    server TEXT,
+    app_id TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_app ON entries (app_id, server);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace, created_at);
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (namespace, name)
+);
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Single-database cache.
+
+    Each thread (and each forked process) uses its own connection.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, root, config):
+        super().__init__(root, config)
+        self.path = self.root / DB_FILE
+        self._local = threading.local()
+        self._connections: List[Tuple[int, sqlite3.Connection]] = []
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT,
+            isolation_level=None,  # transactions are explicit
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM entries")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._lock:
+            self._connections.append((os.getpid(), conn))
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            with contextlib.suppress(sqlite3.Error):  # may already be rolled back
+                conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        super().close()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for pid, conn in connections:
+            if pid == os.getpid():  # never touch a parent's inherited handles
+                with contextlib.suppress(sqlite3.Error):
+                    conn.close()
+        self._local = threading.local()
+
+    # -- storage ------------------------------------------------------------
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        namespace = key_namespace(key)
+        h = key_hash(key)
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT created_at, size, payload FROM entries WHERE key_hash = ?",
+                (h,),
+            ).fetchone()
+            if row is None:
+                self.record(namespace, "misses")
+                return None
+            created_at, size, payload = row
+            if self.is_expired(namespace, created_at, now):
+                deleted = conn.execute(
+                    "DELETE FROM entries WHERE key_hash = ? AND created_at = ?",
+                    (h, created_at),
+                ).rowcount
+                if deleted:
+                    self.track_removal(size)
+                    self.record(namespace, "expired")
+                self.record(namespace, "misses")
+                return None
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key_hash = ?", (now, h)
+            )
+        except sqlite3.Error:
+            self.record(namespace, "misses")
+            return None
+        self.record(namespace, "hits")
+        return payload
+
+    def set(self, key: Tuple[Any, ...], data: bytes) -> None:
+        namespace = key_namespace(key)
+        size = len(data)
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                h = key_hash(key)
+                row = conn.execute(
+                    "SELECT size FROM entries WHERE key_hash = ?", (h,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key_hash, key, namespace,"
+                    " server, app_id, size, created_at, accessed_at, payload)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        h,
+                        json.dumps(key, default=str),
+                        namespace,
+                        key_server(key),
+                        key_app_id(key),
+                        size,
+                        now,
+                        now,
+                        data,
+                    ),
+                )
+        except sqlite3.Error:
+            return  # non-fatal; in-process cache still works
+
+        self.record(namespace, "writes")
+        previous = None if row is None else row[0]
+        if self.track_write(size - (previous or 0), 0 if row is not None else 1):
+            self._auto_prune()
+
+    def iter_entries(self) -> List[CacheEntry]:
+        try:
+            rows = self._connection().execute(
+                "SELECT namespace, size, accessed_at, created_at FROM entries"
+            )
+            return [CacheEntry(None, *row) for row in rows]
+        except sqlite3.Error:
+            return []
+
+    def usage_by_namespace(self) -> Dict[str, Dict[str, int]]:
+        try:
+            rows = self._connection().execute(
+                "SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace"
+            )
+            return {ns: {"entries": n, "bytes": b} for ns, n, b in rows}
+        except sqlite3.Error:
+            return {}
+
+    def invalidate_app(self, app_id: str, server_key: Optional[str] = None) -> int:
+        query = "DELETE FROM entries WHERE app_id = ?"
+        params: Tuple[str, ...] = (app_id,)
+        if server_key is not None:
+            query += " AND server = ?"
+            params += (server_key,)
+        with self._transaction() as conn:
+            removed = conn.execute(query, params).rowcount
+        if removed:
+            self.reset_usage(None)  # re-established by the next write
+        return removed
+
+    def clear(self) -> int:
+        self.discard_pending_stats()
+        self.reset_usage(None)
+        if not self.path.exists():
+            return 0
+        with self._transaction() as conn:
+            count = conn.execute("DELETE FROM entries").rowcount
+            conn.execute("DELETE FROM counters")
+        return count
+
+    # -- budgets ------------------------------------------------------------
+
+    def _totals(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        total, count = conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries"
+        ).fetchone()
+        return total, count
+
+    def _auto_prune(self) -> None:
+        try:
+            total, count = self._totals(self._connection())
+            if not self.over_budget(total, count):
+                self.reset_usage(total, count)
+                return
+            self._prune(*self.watermark_budget())
+        except sqlite3.Error:
+            pass  # retried on a later write
+
+    def _prune(
+        self, max_bytes: Optional[int], max_entries: Optional[int]
+    ) -> Dict[str, int]:
+        now = time.time()
+        expired: Dict[str, int] = {}
+        evicted: Dict[str, int] = {}
+        with self._transaction() as conn:
+            namespaces = [
+                row[0] for row in conn.execute("SELECT DISTINCT namespace FROM entries")
+            ]
+            for namespace in namespaces:
+                ttl = self.config.ttl_for(namespace)
+                if ttl is None:
+                    continue
+                removed = conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND created_at < ?",
+                    (namespace, now - ttl),
+                ).rowcount
+                if removed:
+                    expired[namespace] = removed
+
+            total, count = self._totals(conn)
+            victims = []
+            if (max_bytes is not None and total > max_bytes) or (
+                max_entries is not None and count > max_entries
+            ):
+                rows = conn.execute(
+                    "SELECT key_hash, namespace, size FROM entries ORDER BY accessed_at"
+                )
+                for h, namespace, size in rows:
+                    if (max_bytes is None or total <= max_bytes) and (
+                        max_entries is None or count <= max_entries
+                    ):
+                        break
+                    victims.append((h,))
+                    evicted[namespace] = evicted.get(namespace, 0) + 1
+                    total -= size
+                    count -= 1
+                rows.close()
+                conn.executemany("DELETE FROM entries WHERE key_hash = ?", victims)
+
+        for namespace, amount in expired.items():
+            self.record(namespace, "expired", amount)
+        for namespace, amount in evicted.items():
+            self.record(namespace, "evictions", amount)
+        self.reset_usage(total, count)
+        return {
+            "expired": sum(expired.values()),
+            "evicted": len(victims),
+            "entries": count,
+            "bytes": total,
+        }
+
+    # -- stats --------------------------------------------------------------
+
+    def _read_counters(self) -> Dict[str, Dict[str, int]]:
+        counters: Dict[str, Dict[str, int]] = {}
+        if not self.path.exists():
+            return counters
+        try:
+            rows = self._connection().execute(
+                "SELECT namespace, name, value FROM counters"
+            )
+            for namespace, name, value in rows:
+                counters.setdefault(namespace, {})[name] = value
+        except sqlite3.Error:
+            pass
+        return counters
+
+    def _merge_counters(self, pending: Dict[str, Dict[str, int]]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO counters (namespace, name, value) VALUES (?, ?, ?)"
+                " ON CONFLICT (namespace, name)"
+                " DO UPDATE SET value = value + excluded.value",
+                [
+                    (namespace, name, value)
+                    for namespace, values in pending.items()
+                    for name, value in values.items()
+                ],
+            )
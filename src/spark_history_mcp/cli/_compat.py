@@ -37,24 +37,27 @@ def cli_unavailable_stub(command_name: str):
     return _stub
 
 
-def create_tool_context(client):
-    """Build an MCP tool context wrapper for a Spark client."""
+def create_tool_context(client, clients=None):
+    """Build an MCP tool context wrapper for a Spark client.
+
+    *clients* maps server names to clients for tools that take ``server``.
+    """
     return SimpleNamespace(
         request_context=SimpleNamespace(
             lifespan_context=SimpleNamespace(
                 default_client=client,
-                clients={"default": client},
+                clients={"default": client, **(clients or {})},
             )
         )
     )
 
 
 @contextmanager
-def patch_tool_context(client, tools_module):
+def patch_tool_context(client, tools_module, clients=None):
     """Temporarily patch ``tools_module.mcp.get_context`` for CLI tools."""
 
     original_get_context = getattr(tools_module.mcp, "get_context", None)
-    tools_module.mcp.get_context = lambda: create_tool_context(client)
+    tools_module.mcp.get_context = lambda: create_tool_context(client, clients)
     try:
         yield
     finally:
@@ -228,6 +228,69 @@ if CLI_AVAILABLE:
                 f"Error analyzing shuffle skew for {app_id}: {err}"
             ) from err
 
+    @analyze.command("stragglers")
+    @click.argument("app_id")
+    @click.option("--server", "-s", help="Server name to use")
+    @click.option(
+        "--top-stages",
+        type=int,
+        default=5,
+        help="Number of heaviest stages to analyze",
+    )
+    @click.option(
+        "--tail-ratio",
+        type=float,
+        default=2.0,
+        help="Multiple of the median task duration that marks a tail task",
+    )
+    @click.option(
+        "--max-tail-tasks",
+        type=int,
+        default=10,
+        help="Slowest tail tasks to report per stage",
+    )
+    @click.option(
+        "--format",
+        "-f",
+        "output_format",
+        type=click.Choice(["human", "json", "table"]),
+        default="human",
+        help="Output format",
+    )
+    @click.pass_context
+    def stragglers(
+        ctx,
+        app_id: str,
+        server: Optional[str],
+        top_stages: int,
+        tail_ratio: float,
+        max_tail_tasks: int,
+        output_format: str,
+    ):
+        """Find straggler tasks in the heaviest stages and their causes."""
+        try:
+            from spark_history_mcp.tools import analyze_stragglers
+
+            client = get_spark_client(ctx.obj["config_path"], server)
+            with tool_runner(ctx, client, server, output_format, app_id) as (
+                formatter,
+                resolved_id,
+            ):
+                straggler_data = analyze_stragglers(
+                    app_id=resolved_id,
+                    server=server,
+                    top_stages=top_stages,
+                    tail_ratio=tail_ratio,
+                    max_tail_tasks=max_tail_tasks,
+                )
+                formatter.output(
+                    straggler_data, f"Straggler Analysis for {resolved_id}"
+                )
+        except Exception as err:
+            raise click.ClickException(
+                f"Error analyzing stragglers for {app_id}: {err}"
+            ) from err
+
     @analyze.command("slowest")
     @click.argument("app_id")
     @click.option("--server", "-s", help="Server name to use")
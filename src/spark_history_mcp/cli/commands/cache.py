@@ -2,6 +2,9 @@
 Cache management CLI commands.
 """
 
+import json
+from typing import Optional, Tuple
+
 try:
     import click
 
@@ -10,6 +13,20 @@ except ImportError:
     CLI_AVAILABLE = False
 
 
+def _format_bytes(value: Optional[float]) -> str:
+    if value is None:
+        return "unlimited"
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if value < 1024.0:
+            return f"{value:.1f}{unit}"
+        value /= 1024.0
+    return f"{value:.1f}PB"
+
+
+def _format_hit_rate(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value * 100:.1f}%"
+
+
 if CLI_AVAILABLE:
 
     @click.group(name="cache")
@@ -18,12 +35,235 @@ if CLI_AVAILABLE:
 
     @cache_cmd.command("clear")
     def cache_clear():
-        """Remove all cached Spark History Server API responses."""
+        """Remove all cached Spark History Server API responses and saved files."""
         from spark_history_mcp.cache import clear_cache
 
         count = clear_cache()
         click.echo(f"Cleared {count} cached entries.")
 
+    @cache_cmd.command("stats")
+    @click.option(
+        "--format",
+        "-f",
+        "output_format",
+        type=click.Choice(["human", "json"]),
+        default="human",
+        help="Output format",
+    )
+    def cache_stats(output_format: str):
+        """Show entry counts, disk usage and hit rates of the disk cache."""
+        from spark_history_mcp.cache import cache_stats as collect_stats
+
+        stats = collect_stats()
+        if output_format == "json":
+            click.echo(json.dumps(stats, indent=2))
+            return
+
+        max_entries = stats["max_entries"]
+        click.echo(f"Cache directory: {stats['directory']} ({stats['backend']})")
+        click.echo(
+            f"Entries: {stats['entries']} / "
+            f"{max_entries if max_entries is not None else 'unlimited'}"
+        )
+        click.echo(
+            f"Size: {_format_bytes(stats['bytes'])} / "
+            f"{_format_bytes(stats['max_bytes'])}"
+        )
+        click.echo(
+            f"Hit rate: {_format_hit_rate(stats['hit_rate'])} "
+            f"({stats['hits']} hits, {stats['misses']} misses)"
+        )
+        if stats["namespaces"]:
+            click.echo("")
+            click.echo(f"{'Namespace':<22} {'Entries':>8} {'Size':>10} {'Hit rate':>9}")
+            for name, ns in stats["namespaces"].items():
+                click.echo(
+                    f"{name:<22} {ns['entries']:>8} "
+                    f"{_format_bytes(ns['bytes']):>10} "
+                    f"{_format_hit_rate(ns['hit_rate']):>9}"
+                )
+        if stats.get("stores"):
+            click.echo("")
+            click.echo(f"{'Store':<22} {'Files':>8} {'Size':>10} {'Budget':>10}")
+            for name, store in stats["stores"].items():
+                click.echo(
+                    f"{name:<22} {store['files']:>8} "
+                    f"{_format_bytes(store['bytes']):>10} "
+                    f"{_format_bytes(store['max_bytes']):>10}"
+                )
+
+    @cache_cmd.command("prune")
+    @click.option(
+        "--max-bytes",
+        type=int,
+        help="Evict down to this many bytes (default: SHS_CACHE_MAX_BYTES)",
+    )
+    @click.option(
+        "--max-entries",
+        type=int,
+        help="Evict down to this many entries (default: SHS_CACHE_MAX_ENTRIES)",
+    )
+    def cache_prune(max_bytes: Optional[int], max_entries: Optional[int]):
+        """Drop expired entries and evict least recently used ones over budget.
+
+        Saved files (task columns, event log index) are evicted down to their
+        own budgets.
+        """
+        from spark_history_mcp.cache import prune
+
+        result = prune(max_bytes=max_bytes, max_entries=max_entries)
+        click.echo(
+            f"Removed {result['expired']} expired and {result['evicted']} "
+            f"evicted entries; {result['entries']} entries "
+            f"({_format_bytes(result['bytes'])}) remain."
+        )
+        for name, store in result.get("stores", {}).items():
+            click.echo(
+                f"{name}: removed {store['evicted']} files; {store['files']} files "
+                f"({_format_bytes(store['bytes'])}) remain."
+            )
+
+    @cache_cmd.command("invalidate")
+    @click.argument("app_id")
+    @click.option(
+        "--server", "server_key", help="Only entries fetched from this server"
+    )
+    def cache_invalidate(app_id: str, server_key: Optional[str]):
+        """Remove all cached responses of one application (sqlite backend).
+
+        Saved files of the application (task columns, event log index) are
+        removed with any backend.
+        """
+        from spark_history_mcp.cache import invalidate_app
+
+        try:
+            count = invalidate_app(app_id, server_key=server_key)
+        except NotImplementedError as e:
+            raise click.ClickException(
+                f"{e}; set SHS_CACHE_BACKEND=sqlite or use 'cache clear'"
+            ) from e
+        click.echo(f"Removed {count} cached entries for {app_id}.")
+
+    @cache_cmd.command("warm")
+    @click.argument("app_ids", nargs=-1)
+    @click.option("--name", "app_name", help="Select applications by name")
+    @click.option(
+        "--search-type",
+        type=click.Choice(["exact", "contains", "regex"]),
+        default="contains",
+        help="How --name is matched",
+    )
+    @click.option(
+        "--status",
+        multiple=True,
+        help="Application statuses to select (default: COMPLETED)",
+    )
+    @click.option("--min-date", help="Minimum start date (yyyy-MM-dd)")
+    @click.option("--max-date", help="Maximum start date (yyyy-MM-dd)")
+    @click.option("--limit", type=int, help="Maximum applications to select per server")
+    @click.option(
+        "--server",
+        "-s",
+        "servers",
+        multiple=True,
+        help="Server name from config (repeatable; default server if omitted)",
+    )
+    @click.option(
+        "--resources",
+        help="Comma-separated subset of app,env,jobs,stages,executors",
+    )
+    @click.option("--workers", type=int, help="Applications warmed concurrently")
+    @click.option(
+        "--per-server", type=int, help="Applications warmed concurrently per server"
+    )
+    @click.option(
+        "--format",
+        "-f",
+        "output_format",
+        type=click.Choice(["human", "json"]),
+        default="human",
+        help="Output format",
+    )
+    @click.pass_context
+    def cache_warm(
+        ctx,
+        app_ids: Tuple[str, ...],
+        app_name: Optional[str],
+        search_type: str,
+        status: Tuple[str, ...],
+        min_date: Optional[str],
+        max_date: Optional[str],
+        limit: Optional[int],
+        servers: Tuple[str, ...],
+        resources: Optional[str],
+        workers: Optional[int],
+        per_server: Optional[int],
+        output_format: str,
+    ):
+        """Prefetch application data into the disk cache.
+
+        Warms the given APP_IDS, or the applications selected with --name,
+        --status and --min-date/--max-date, from one or more servers.
+        """
+        import spark_history_mcp.tools as tools_module
+        from spark_history_mcp.cli._compat import patch_tool_context
+        from spark_history_mcp.cli.utils.context import get_spark_client
+
+        if not (app_ids or app_name or min_date or max_date or limit):
+            raise click.UsageError(
+                "Give APP_IDS or select applications with --name, "
+                "--min-date, --max-date or --limit"
+            )
+
+        config_path = (ctx.obj or {}).get("config_path")
+        clients = {name: get_spark_client(config_path, name) for name in servers}
+        default_client = (
+            next(iter(clients.values()))
+            if clients
+            else get_spark_client(config_path, None)
+        )
+        try:
+            with patch_tool_context(default_client, tools_module, clients):
+                result = tools_module.warm_cache(
+                    app_ids=list(app_ids) or None,
+                    servers=list(servers) or None,
+                    app_name=app_name,
+                    search_type=search_type,
+                    status=list(status) or None,
+                    min_date=min_date,
+                    max_date=max_date,
+                    limit=limit,
+                    resources=resources.split(",") if resources else None,
+                    max_workers=workers,
+                    per_server_limit=per_server,
+                )
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+
+        if output_format == "json":
+            click.echo(json.dumps(result, indent=2))
+            return
+
+        rate = result["apps_per_second"]
+        click.echo(
+            f"Warmed {result['warmed']} of {result['requested']} applications "
+            f"in {result['elapsed_s']:.1f}s "
+            f"({rate if rate is not None else 'n/a'} apps/s, "
+            f"{result['requests']} requests)."
+        )
+        if result["skipped_running"]:
+            click.echo(
+                f"Skipped {result['skipped_running']} running applications "
+                "(not cached until they complete)."
+            )
+        for failure in result["failures"]:
+            detail = failure.get("error") or ", ".join(
+                f"{name}: {error}" for name, error in failure["errors"].items()
+            )
+            click.echo(f"  {failure['app_id']}: {detail}", err=True)
+        if result["failed"]:
+            ctx.exit(1)
+
 else:
 
     def cache_cmd():  # type: ignore[misc]
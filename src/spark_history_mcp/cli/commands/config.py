@@ -188,6 +188,15 @@ if CLI_AVAILABLE:
                             click.echo(
                                 f"  EMR Cluster: {server_config.emr_cluster_arn}"
                             )
+                        if server_config.event_log_dir:
+                            click.echo(
+                                f"  Event Log Directory: {server_config.event_log_dir}"
+                            )
+                            if server_config.event_log_index:
+                                click.echo(
+                                    "  Event Log Index: "
+                                    f"{server_config.event_log_index_dir or 'default'}"
+                                )
                     else:
                         raise click.ClickException(
                             f"Server '{server}' not found in configuration"
@@ -225,7 +234,11 @@ if CLI_AVAILABLE:
 
             # Check for missing URLs
             for name, server_config in config.servers.items():
-                if not server_config.url and not server_config.emr_cluster_arn:
+                if not (
+                    server_config.url
+                    or server_config.emr_cluster_arn
+                    or server_config.event_log_dir
+                ):
                     click.echo(
                         f"⚠️  Warning: Server '{name}' has no URL or EMR cluster configured"
                     )
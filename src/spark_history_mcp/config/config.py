@@ -23,6 +23,9 @@ DEFAULT_SHUFFLE_SKEW_RATIO = 2.0
 DEFAULT_SHUFFLE_SKEW_EXTREME_RATIO = 10.0
 DEFAULT_FAILURE_RATE_HIGH_THRESHOLD = 10.0
 DEFAULT_HOST_CONCENTRATION_THRESHOLD = 0.5
+DEFAULT_STRAGGLER_TAIL_RATIO = 2.0  # tail task: duration > ratio x median
+DEFAULT_STRAGGLER_FETCH_WAIT_RATIO = 0.2  # fetch wait / task duration
+DEFAULT_SLOW_HOST_RATIO = 1.5  # host mean task duration / stage mean
 
 
 class AuthConfig(BaseSettings):
@@ -44,6 +47,42 @@ class ServerConfig(BaseSettings):
     use_proxy: bool = False
     proxy_url: Optional[str] = Field(default=DEFAULT_PROXY_URL)
     timeout: int = 30  # HTTP request timeout in seconds
+    max_connections: int = 10  # Keep-alive connections kept per host
+    # Read Spark event logs from this directory instead of a History Server
+    event_log_dir: Optional[str] = None
+    # Persist replayed event logs so restarts and appends skip re-parsing
+    event_log_index: bool = True
+    # None uses <cache dir>/event-log-index, which the cache commands manage
+    event_log_index_dir: Optional[str] = None
+
+
+class CacheConfig(BaseSettings):
+    """Budgets for the response caches (``SHS_CACHE_*`` env vars)."""
+
+    # "file" stores one JSON file per entry; "sqlite" uses a single WAL database
+    backend: Literal["file", "sqlite"] = "file"
+    directory: Optional[Path] = None  # None uses ~/.cache/spark-history-mcp
+    max_bytes: Optional[int] = 2 * 1024 * 1024 * 1024  # 2GB; None disables the cap
+    max_entries: Optional[int] = 100_000
+    default_ttl_seconds: Optional[int] = None  # None keeps entries until evicted
+    ttl_seconds: Dict[str, int] = Field(default_factory=dict)  # per namespace
+    # Running applications are cached in memory only, for this many seconds
+    running_app_ttl_seconds: float = 15.0
+    # In-process cache shared by the fetchers and the REST clients
+    memory_max_bytes: Optional[int] = 512 * 1024 * 1024
+    memory_namespace_max_bytes: Dict[str, int] = Field(
+        default_factory=lambda: {"stages": 256 * 1024 * 1024}
+    )
+    memory_namespace_max_entries: Optional[int] = 1000  # per namespace
+    # Saved task columns (<directory>/task-columns), evicted least recently used
+    task_columns_max_bytes: Optional[int] = 1024 * 1024 * 1024
+    # Replayed event logs (<directory>/event-log-index, or event_log_index_dir)
+    event_log_index_max_bytes: Optional[int] = 1024 * 1024 * 1024
+    model_config = SettingsConfigDict(env_prefix="SHS_CACHE_", extra="ignore")
+
+    def ttl_for(self, namespace: str) -> Optional[int]:
+        """Return the TTL in seconds for *namespace*, if entries expire."""
+        return self.ttl_seconds.get(namespace, self.default_ttl_seconds)
 
 
 class McpConfig(BaseSettings):
@@ -55,6 +94,10 @@ class McpConfig(BaseSettings):
     address: Optional[str] = "localhost"
     port: Optional[Union[int, str]] = "18888"
     debug: Optional[bool] = False
+    # Server clients are created on first use; also create them all in the
+    # background at startup, this many at a time
+    warm_up_clients: bool = False
+    warm_up_workers: int = 8
     model_config = SettingsConfigDict(extra="ignore")
 
 
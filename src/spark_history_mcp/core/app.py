@@ -1,36 +1,57 @@
+import inspect
 import os
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from spark_history_mcp.api.factory import create_spark_client
-from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.api.factory import SparkClient, SparkClientRegistry
 from spark_history_mcp.config.config import Config
 
 
 @dataclass
 class AppContext:
-    clients: dict[str, SparkRestClient]
-    default_client: Optional[SparkRestClient] = None
+    clients: SparkClientRegistry
+
+    @property
+    def default_client(self) -> Optional[SparkClient]:
+        return self.clients.default
 
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     config = Config.from_file("config.yaml")
 
-    clients: dict[str, SparkRestClient] = {}
-    default_client = None
+    # Clients are created on first use, so slow servers (EMR Persistent UIs)
+    # do not hold up startup
+    clients = SparkClientRegistry(config.servers)
+    if config.mcp and config.mcp.warm_up_clients:
+        clients.warm_up(config.mcp.warm_up_workers)
+
+    yield AppContext(clients=clients)
+
+
+class SparkMCP(FastMCP):
+    """FastMCP server whose synchronous tools run off the event loop.
 
-    for name, server_config in config.servers.items():
-        clients[name] = create_spark_client(server_config)
+    Tools are plain functions doing blocking History Server I/O, and FastMCP
+    calls synchronous tools directly on the event loop, so one slow tool would
+    stall every other client of a ``streamable-http`` server. Each synchronous
+    tool is registered as usual (the decorator still returns the plain
+    function) and then served through ``tools.concurrency.offload_tool``.
+    """
 
-        if server_config.default:
-            default_client = clients[name]
+    def add_tool(self, fn: Any, name: Optional[str] = None, **kwargs: Any) -> None:
+        super().add_tool(fn, name=name, **kwargs)
+        if inspect.iscoroutinefunction(fn):
+            return
+        from spark_history_mcp.tools.concurrency import offload_tool
 
-    yield AppContext(clients=clients, default_client=default_client)
+        tool = self._tool_manager.get_tool(name or fn.__name__)
+        tool.fn = offload_tool(tool.name, fn)
+        tool.is_async = True
 
 
 def run(config: Config):
@@ -40,7 +61,7 @@ def run(config: Config):
     mcp.run(transport=os.getenv("SHS_MCP_TRANSPORT", config.mcp.transports[0]))
 
 
-mcp = FastMCP("Spark Events", lifespan=app_lifespan)
+mcp = SparkMCP("Spark Events", lifespan=app_lifespan)
 
 # Import tools to register them with MCP
 # Import prompts to register them with MCP
@@ -0,0 +1,288 @@
+"""
+Bounded in-process cache for Spark History Server API responses.
+
+Entries are kept in LRU order and accounted by an estimated payload size, so
+the cache can be capped by bytes overall and per namespace (``stages``,
+``env``, ``executors``...). Entries may carry a TTL. Hit, miss, eviction and
+expiry counters are kept per namespace.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from pydantic import BaseModel
+
+DEFAULT_NAMESPACE = "default"
+
+
+def default_namespace(key: Hashable) -> str:
+    """Namespace of a fetcher key ``(server_key, namespace, identifiers...)``."""
+    if isinstance(key, tuple) and len(key) > 1 and isinstance(key[1], str):
+        return key[1]
+    return DEFAULT_NAMESPACE
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate the memory retained by *obj* in bytes.
+
+    Walks containers and pydantic models, counting each object once. This is an
+    approximation meant for cache budgeting, not an exact measurement.
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, BaseModel):
+            stack.append(current.__dict__)
+            extra = current.__pydantic_extra__
+            if extra:
+                stack.append(extra)
+    return total
+
+
+class _Entry:
+    __slots__ = ("value", "size", "namespace", "expires_at")
+
+    def __init__(
+        self, value: Any, size: int, namespace: str, expires_at: Optional[float]
+    ):
+        self.value = value
+        self.size = size
+        self.namespace = namespace
+        self.expires_at = expires_at
+
+
+class _NamespaceStats:
+    __slots__ = ("hits", "misses", "evictions", "expired", "entries", "bytes")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.entries = 0
+        self.bytes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "entries": self.entries,
+            "bytes": self.bytes,
+        }
+
+
+class MemoryCache:
+    """Thread-safe, size-aware LRU cache with per-namespace limits.
+
+    Args:
+        max_bytes: Budget for the estimated size of all entries (None = no cap)
+        max_entries: Cap on the total number of entries (None = no cap)
+        namespace_max_bytes: Optional byte budget per namespace
+        namespace_max_entries: Optional entry cap per namespace
+        namespace_default_max_entries: Entry cap of namespaces not listed in
+            namespace_max_entries (None = no cap)
+        namespace_of: Function deriving a namespace from a key
+        sizeof: Function estimating the size of a value
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        namespace_max_bytes: Optional[Dict[str, int]] = None,
+        namespace_max_entries: Optional[Dict[str, int]] = None,
+        namespace_default_max_entries: Optional[int] = None,
+        namespace_of: Callable[[Hashable], str] = default_namespace,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.namespace_max_bytes = dict(namespace_max_bytes or {})
+        self.namespace_max_entries = dict(namespace_max_entries or {})
+        self.namespace_default_max_entries = namespace_default_max_entries
+        self._namespace_of = namespace_of
+        self._sizeof = sizeof
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        # Per-namespace LRU order so namespace limits evict their own entries
+        self._ns_order: Dict[str, "OrderedDict[Hashable, None]"] = {}
+        self._stats: Dict[str, _NamespaceStats] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def _ns_stats(self, namespace: str) -> _NamespaceStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = _NamespaceStats()
+        return stats
+
+    def get(
+        self, key: Hashable, default: Any = None, namespace: Optional[str] = None
+    ) -> Any:
+        """Return the cached value for *key* (marking it recently used)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.expires_at is not None and time.monotonic() >= entry.expires_at
+            ):
+                self._remove(key)
+                self._ns_stats(entry.namespace).expired += 1
+                entry = None
+            if entry is None:
+                self._ns_stats(namespace or self._namespace_of(key)).misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._ns_order[entry.namespace].move_to_end(key)
+            self._ns_stats(entry.namespace).hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        namespace: Optional[str] = None,
+        size: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Store *value* under *key* and evict entries to respect budgets.
+
+        Values larger than the applicable byte budget are not cached. Entries
+        stored with a *ttl* (seconds) are dropped once it elapses. Returns
+        *value* so callers can ``return cache.set(key, value)``.
+        """
+        namespace = namespace or self._namespace_of(key)
+        if size is None:
+            size = self._sizeof(value)
+
+        ns_budget = self.namespace_max_bytes.get(namespace)
+        if (self.max_bytes is not None and size > self.max_bytes) or (
+            ns_budget is not None and size > ns_budget
+        ):
+            with self._lock:
+                self._remove(key)
+            return value
+
+        with self._lock:
+            self._remove(key)
+            expires_at = None if ttl is None else time.monotonic() + ttl
+            self._entries[key] = _Entry(value, size, namespace, expires_at)
+            self._ns_order.setdefault(namespace, OrderedDict())[key] = None
+            stats = self._ns_stats(namespace)
+            stats.entries += 1
+            stats.bytes += size
+            self._bytes += size
+            self._evict(namespace)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove *key* and return its value, or *default* if missing."""
+        with self._lock:
+            entry = self._remove(key)
+            return default if entry is None else entry.value
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove all entries whose key matches *predicate*; return the count."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def count_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Return the number of entries whose key matches *predicate*."""
+        with self._lock:
+            return sum(1 for key in self._entries if predicate(key))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop all entries (or those of one namespace) and reset counters."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._ns_order.clear()
+                self._stats.clear()
+                self._bytes = 0
+                return
+            for key in list(self._ns_order.get(namespace, ())):
+                self._remove(key)
+            self._stats.pop(namespace, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache-wide and per-namespace counters."""
+        with self._lock:
+            namespaces = {ns: s.as_dict() for ns, s in self._stats.items()}
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": sum(s["hits"] for s in namespaces.values()),
+                "misses": sum(s["misses"] for s in namespaces.values()),
+                "evictions": sum(s["evictions"] for s in namespaces.values()),
+                "expired": sum(s["expired"] for s in namespaces.values()),
+                "namespaces": namespaces,
+            }
+
+    def _remove(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._ns_order[entry.namespace].pop(key, None)
+        stats = self._ns_stats(entry.namespace)
+        stats.entries -= 1
+        stats.bytes -= entry.size
+        self._bytes -= entry.size
+        return entry
+
+    def _evict_one(self, key: Hashable) -> None:
+        entry = self._remove(key)
+        if entry is not None:
+            self._ns_stats(entry.namespace).evictions += 1
+
+    def _evict(self, namespace: str) -> None:
+        ns_order = self._ns_order[namespace]
+        ns_stats = self._ns_stats(namespace)
+        ns_bytes = self.namespace_max_bytes.get(namespace)
+        ns_entries = self.namespace_max_entries.get(
+            namespace, self.namespace_default_max_entries
+        )
+        while ns_order and (
+            (ns_bytes is not None and ns_stats.bytes > ns_bytes)
+            or (ns_entries is not None and ns_stats.entries > ns_entries)
+        ):
+            self._evict_one(next(iter(ns_order)))
+
+        while self._entries and (
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            self._evict_one(next(iter(self._entries)))
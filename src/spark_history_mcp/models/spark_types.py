@@ -532,7 +532,8 @@ class StageData(BaseModel):
     details: str
     scheduling_pool: Optional[str] = Field(None, alias="schedulingPool")
 
-    # rdd_ids: Optional[Sequence[int]] = Field(None, alias="rddIds")
+    # Only read to fingerprint the stage; not part of tool output or the cache
+    rdd_ids: Optional[Sequence[int]] = Field(None, alias="rddIds", exclude=True)
     accumulator_updates: Optional[Sequence["AccumulableInfo"]] = Field(
         None, alias="accumulatorUpdates"
     )
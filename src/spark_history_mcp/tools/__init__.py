@@ -7,6 +7,7 @@ from .analysis import (
     analyze_auto_scaling,
     analyze_failed_tasks,
     analyze_shuffle_skew,
+    analyze_stragglers,
     get_job_bottlenecks,
 )
 from .application import (
@@ -37,6 +38,7 @@ from .comparison_modules.executors import (
     compare_app_executors,
     compare_stage_executor_timeline,
 )
+from .comparison_modules.matrix import compare_apps_matrix
 from .comparison_modules.stages import (
     compare_stage_metrics_dist,
     compare_stages,
@@ -58,11 +60,19 @@ from .executors import (
 from .jobs_stages import (
     find_slowest,
     get_stage,
+    get_stage_task_distribution,
+    get_stage_task_stats,
     get_stage_task_summary,
     list_jobs,
     list_stages,
 )
 
+# Server tools
+from .servers import get_server_status
+
+# Cache tools
+from .warmup import warm_cache
+
 # Make tools available at package level
 __all__ = [
     # Core utilities
@@ -79,6 +89,8 @@ __all__ = [
     "list_stages",
     "find_slowest",
     "get_stage",
+    "get_stage_task_stats",
+    "get_stage_task_distribution",
     "get_stage_task_summary",
     # Executor tools
     "list_executors",
@@ -89,11 +101,17 @@ __all__ = [
     "get_job_bottlenecks",
     "analyze_auto_scaling",
     "analyze_shuffle_skew",
+    "analyze_stragglers",
     "analyze_failed_tasks",
     # Cleanup tools
     "delete_event_logs",
+    # Server tools
+    "get_server_status",
+    # Cache tools
+    "warm_cache",
     # Comparison tools (MCP-exposed)
     "compare_app_performance",
+    "compare_apps_matrix",
     "compare_stages",
     "compare_stage_metrics_dist",
     "compare_app_environments",
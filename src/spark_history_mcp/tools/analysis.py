@@ -8,6 +8,7 @@ detection, and failure analysis.
 
 import heapq
 import statistics
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
@@ -19,12 +20,24 @@ from ..config.config import (
     DEFAULT_SHUFFLE_SKEW_EXTREME_RATIO,
     DEFAULT_SHUFFLE_SKEW_RATIO,
     DEFAULT_SHUFFLE_SKEW_THRESHOLD_GB,
+    DEFAULT_SLOW_HOST_RATIO,
     DEFAULT_SPILL_THRESHOLD_BYTES,
+    DEFAULT_STRAGGLER_FETCH_WAIT_RATIO,
+    DEFAULT_STRAGGLER_TAIL_RATIO,
 )
 from ..core.app import mcp
+from ..models.spark_types import StageStatus, TaskStatus
+from . import common
+from .concurrency import iter_completed
 from .executors import get_executor_summary
-from .fetchers import fetch_executors, fetch_stage_task_summary, fetch_stages
+from .fetchers import (
+    fetch_executors,
+    fetch_stage_task_summary,
+    fetch_stage_tasks,
+    fetch_stages,
+)
 from .jobs_stages import _find_slowest_jobs, _find_slowest_stages
+from .task_stats import TaskStatsAccumulator
 
 # Conservative scaling factor: assume 1/4 of ideal parallelism to avoid over-provisioning
 _AUTO_SCALING_CONSERVATIVE_FACTOR = 4
@@ -321,6 +334,9 @@ def analyze_shuffle_skew(
 
     This dual analysis helps identify both data distribution issues and
     executor resource/performance bottlenecks during shuffle operations.
+    Missing task summaries are fetched by a bounded worker pool
+    (stage_summary_max_workers, capped per server by
+    per_server_max_concurrency) and scored as they arrive.
 
     Args:
         app_id: The Spark application ID
@@ -330,8 +346,9 @@ def analyze_shuffle_skew(
 
     Returns:
         Dictionary containing shuffle skew analysis results with both task-level
-        and executor-level skew detection
+        and executor-level skew detection, plus latency metadata
     """
+    started = time.perf_counter()
     # Try to get stages with summaries, fallback to basic stages if validation fails
     try:
         stages = fetch_stages(app_id=app_id, server=server, with_summaries=True)
@@ -343,67 +360,49 @@ def analyze_shuffle_skew(
             raise e
 
     shuffle_threshold_bytes = shuffle_threshold_gb * 1024 * 1024 * 1024
+    candidates = [
+        stage
+        for stage in stages
+        if stage.shuffle_write_bytes
+        and stage.shuffle_write_bytes >= shuffle_threshold_bytes
+    ]
+    order = {id(stage): i for i, stage in enumerate(candidates)}
     skewed_stages = []
 
-    for stage in stages:
-        # Check if stage has significant shuffle write
-        if (
-            not stage.shuffle_write_bytes
-            or stage.shuffle_write_bytes < shuffle_threshold_bytes
-        ):
-            continue
-
-        stage_skew_info = {
-            "stage_id": stage.stage_id,
-            "attempt_id": stage.attempt_id,
-            "name": stage.name,
-            "total_shuffle_write_gb": round(
-                stage.shuffle_write_bytes / (1024 * 1024 * 1024), 2
-            ),
-            "task_count": stage.num_tasks,
-            "failed_tasks": stage.num_failed_tasks,
-            "task_skew": None,
-            "executor_skew": None,
-        }
-
-        # Analyze task-level skew
-        task_skew_result = _analyze_stage_task_skew(
-            stage, app_id, skew_ratio_threshold, server
-        )
-        if task_skew_result:
-            stage_skew_info["task_skew"] = task_skew_result
-
-        # Analyze executor-level skew
-        executor_skew_result = _analyze_stage_executor_skew(stage, skew_ratio_threshold)
-        if executor_skew_result:
-            stage_skew_info["executor_skew"] = executor_skew_result
-
-        # Add stage to skewed list if either task or executor skew is detected
-        is_task_skewed = (
-            stage_skew_info["task_skew"] and stage_skew_info["task_skew"]["is_skewed"]
-        )
-        is_executor_skewed = (
-            stage_skew_info["executor_skew"]
-            and stage_skew_info["executor_skew"]["is_skewed"]
+    def score(stage) -> None:
+        stage_skew_info = _score_stage_shuffle_skew(stage, skew_ratio_threshold)
+        if stage_skew_info is not None:
+            skewed_stages.append((order[id(stage)], stage_skew_info))
+
+    # Stages whose summaries are already known are scored right away; the rest
+    # are scored as their task summaries arrive from the worker pool
+    cfg = common.get_config()
+    to_fetch = [s for s in candidates if _needs_task_summary(s)]
+    for stage in candidates:
+        if not _needs_task_summary(stage):
+            score(stage)
+
+    fetch_started = time.perf_counter()
+    fetch_errors = 0
+    for stage, task_summary, error in iter_completed(
+        lambda stage: _fetch_task_summary(stage, app_id, server),
+        to_fetch,
+        cfg.stage_summary_max_workers,
+    ):
+        if error is not None:
+            fetch_errors += 1
+        elif task_summary:
+            stage.task_metrics_distributions = task_summary
+        score(stage)
+    fetch_elapsed = time.perf_counter() - fetch_started
+
+    # Sort by max skew ratio (highest first), ties in stage order
+    skewed_stages = [
+        info
+        for _, info in sorted(
+            skewed_stages, key=lambda item: (-item[1]["max_skew_ratio"], item[0])
         )
-
-        if is_task_skewed or is_executor_skewed:
-            # Calculate overall skew ratio for sorting (use higher of the two)
-            task_ratio = (
-                stage_skew_info["task_skew"]["skew_ratio"]
-                if stage_skew_info["task_skew"]
-                else 0
-            )
-            exec_ratio = (
-                stage_skew_info["executor_skew"]["skew_ratio"]
-                if stage_skew_info["executor_skew"]
-                else 0
-            )
-            stage_skew_info["max_skew_ratio"] = max(task_ratio, exec_ratio)
-            skewed_stages.append(stage_skew_info)
-
-    # Sort by max skew ratio (highest first)
-    skewed_stages.sort(key=lambda x: x["max_skew_ratio"], reverse=True)
+    ]
 
     # Generate recommendations
     recommendations = _generate_shuffle_skew_recommendations(skewed_stages)
@@ -423,6 +422,13 @@ def analyze_shuffle_skew(
         "skewed_stages": skewed_stages,
         "summary": summary,
         "recommendations": recommendations,
+        "metadata": {
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "task_summary_fetches": len(to_fetch),
+            "task_summary_fetch_errors": fetch_errors,
+            "task_summary_fetch_s": round(fetch_elapsed, 3),
+            "max_workers": cfg.stage_summary_max_workers,
+        },
     }
 
 
@@ -555,30 +561,310 @@ def analyze_failed_tasks(
     }
 
 
+@mcp.tool()
+def analyze_stragglers(
+    app_id: str,
+    server: Optional[str] = None,
+    top_stages: int = 5,
+    tail_ratio: float = DEFAULT_STRAGGLER_TAIL_RATIO,
+    max_tail_tasks: int = 10,
+) -> Dict[str, Any]:
+    """
+    Find straggler tasks that extended the heaviest stages and explain them.
+
+    For the stages with the most task time, streams every successful task and
+    flags tail tasks running longer than tail_ratio x the stage's median task
+    duration. Every tail task is attributed to likely causes (input skew, GC,
+    shuffle fetch wait, spill, slow host) and counted; the slowest ones are
+    also reported individually. The wall-clock time the tail added to the
+    stage is estimated by replaying task launch times with tail tasks
+    shortened to the median.
+
+    Args:
+        app_id: The Spark application ID
+        server: Optional server name to use (uses default if not specified)
+        top_stages: Number of heaviest stages to analyze (default: 5)
+        tail_ratio: Multiple of the median duration that marks a tail task (default: 2.0)
+        max_tail_tasks: Slowest tail tasks to report per stage (default: 10)
+
+    Returns:
+        Dictionary with per-stage tail statistics, attributed tail tasks and
+        slow hosts, ordered by wall-clock time lost, plus a summary and
+        recommendations
+    """
+    cfg = common.get_config()
+    stages = [
+        stage
+        for stage in fetch_stages(app_id=app_id, server=server)
+        if stage.status == StageStatus.COMPLETE
+        and (stage.num_tasks or 0) >= cfg.min_task_count
+    ]
+    heaviest = heapq.nlargest(
+        top_stages, stages, key=lambda s: s.executor_run_time or 0
+    )
+
+    analyzed = []
+    errors = []
+    for stage in heaviest:
+        try:
+            analyzed.append(
+                _analyze_stage_stragglers(
+                    stage, app_id, server, tail_ratio, max_tail_tasks
+                )
+            )
+        except Exception as e:
+            errors.append({"stage_id": stage.stage_id, "error": str(e)})
+
+    analyzed.sort(key=lambda s: s["wall_clock_lost_ms"], reverse=True)
+    cause_counts: Dict[str, int] = {}
+    for stage_result in analyzed:
+        for cause, count in stage_result["tail_causes"].items():
+            cause_counts[cause] = cause_counts.get(cause, 0) + count
+
+    return {
+        "application_id": app_id,
+        "analysis_type": "Straggler Analysis",
+        "parameters": {
+            "top_stages": top_stages,
+            "tail_ratio": tail_ratio,
+            "max_tail_tasks": max_tail_tasks,
+        },
+        "stages": analyzed,
+        "summary": {
+            "stages_analyzed": len(analyzed),
+            "stages_with_stragglers": sum(1 for s in analyzed if s["tail_task_count"]),
+            "total_wall_clock_lost_ms": round(
+                sum(s["wall_clock_lost_ms"] for s in analyzed), 1
+            ),
+            "tail_causes": dict(
+                sorted(cause_counts.items(), key=lambda kv: kv[1], reverse=True)
+            ),
+        },
+        "recommendations": _generate_straggler_recommendations(cause_counts),
+        "errors": errors,
+    }
+
+
+def _analyze_stage_stragglers(
+    stage,
+    app_id: str,
+    server: Optional[str],
+    tail_ratio: float,
+    max_tail_tasks: int,
+) -> Dict[str, Any]:
+    """Stream one stage's successful tasks and attribute its tail."""
+    stats = TaskStatsAccumulator(top_n=max_tail_tasks, keep_tail_metrics=True).add_all(
+        fetch_stage_tasks(
+            app_id,
+            stage.stage_id,
+            attempt_id=stage.attempt_id,
+            server=server,
+            status=[TaskStatus.SUCCESS],
+        )
+    )
+    durations = stats.sorted_durations()
+    median = stats.duration_quantile(0.5) or 0
+    threshold = median * tail_ratio
+    mean = sum(durations) / len(durations) if durations else 0
+
+    slow_hosts = []
+    if len(stats.by_host) > 1 and mean > 0:
+        for host, group in stats.by_host.items():
+            host_mean = group.duration_sum / group.tasks if group.tasks else 0
+            # Even the host's fastest task must be slow, so a few outlier
+            # tasks do not make the host that ran them look slow
+            if (
+                group.tasks >= 2
+                and host_mean >= DEFAULT_SLOW_HOST_RATIO * mean
+                and (group.duration_min or 0) > median
+            ):
+                slow_hosts.append(
+                    {
+                        "host": host,
+                        "tasks": group.tasks,
+                        "mean_task_ms": round(host_mean, 1),
+                        "ratio_to_stage_mean": round(host_mean / mean, 2),
+                    }
+                )
+        slow_hosts.sort(key=lambda h: h["ratio_to_stage_mean"], reverse=True)
+
+    median_bytes = stats.bytes_read_quantile(0.5) or 0
+    slow_host_names = {h["host"] for h in slow_hosts}
+    # Causes are counted over the whole tail, not only the reported tasks
+    tail_causes: Dict[str, int] = {}
+    for record in stats.tail_records(threshold) if median else ():
+        for cause in _straggler_causes(
+            record, median_bytes, slow_host_names, tail_ratio
+        ):
+            tail_causes[cause] = tail_causes.get(cause, 0) + 1
+
+    tail_tasks = []
+    for record in stats.slowest_tasks():
+        if not median or record["duration_ms"] <= threshold:
+            continue
+        causes = _straggler_causes(record, median_bytes, slow_host_names, tail_ratio)
+        tail_tasks.append(
+            {
+                **record,
+                "ratio_to_median": round(record["duration_ms"] / median, 2),
+                "causes": causes,
+            }
+        )
+
+    lost_ms = stats.wall_clock_lost_ms(threshold, median) if median else 0.0
+    stage_ms = None
+    if stage.submission_time and stage.completion_time:
+        stage_ms = (
+            stage.completion_time - stage.submission_time
+        ).total_seconds() * 1000
+
+    return {
+        "stage_id": stage.stage_id,
+        "attempt_id": stage.attempt_id,
+        "name": stage.name,
+        "task_count": stats.tasks,
+        "median_task_ms": median,
+        "max_task_ms": durations[-1] if durations else None,
+        "tail_threshold_ms": threshold,
+        "tail_task_count": stats.count_above(threshold) if median else 0,
+        "wall_clock_lost_ms": round(lost_ms, 1),
+        "wall_clock_lost_pct": round(lost_ms / stage_ms * 100, 1) if stage_ms else None,
+        "tail_causes": tail_causes,
+        "slow_hosts": slow_hosts,
+        "tail_tasks": tail_tasks,
+    }
+
+
+def _straggler_causes(
+    record: Dict[str, Any],
+    median_bytes: float,
+    slow_hosts: set,
+    tail_ratio: float,
+) -> List[str]:
+    """Likely reasons a tail task ran long, from its own metrics."""
+    duration = record["duration_ms"] or 0
+    causes = []
+    if record["bytes_read"] > 0 and record["bytes_read"] > tail_ratio * median_bytes:
+        causes.append("input_skew")
+    if duration and (record["gc_time_ms"] or 0) / duration > (
+        DEFAULT_GC_PRESSURE_THRESHOLD
+    ):
+        causes.append("gc")
+    if duration and (record["shuffle_fetch_wait_ms"] or 0) / duration > (
+        DEFAULT_STRAGGLER_FETCH_WAIT_RATIO
+    ):
+        causes.append("shuffle_fetch_wait")
+    if record["spill_bytes"] > 0:
+        causes.append("spill")
+    if record["host"] in slow_hosts:
+        causes.append("slow_host")
+    return causes or ["unknown"]
+
+
+def _generate_straggler_recommendations(
+    cause_counts: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    """Generate recommendations for the causes found among tail tasks."""
+    suggestions = {
+        "input_skew": (
+            "data_partitioning",
+            "Repartition on a better-distributed key, salt hot keys, or enable "
+            "spark.sql.adaptive.skewJoin.enabled",
+        ),
+        "gc": (
+            "memory",
+            "Increase executor memory or reduce per-task memory pressure "
+            "(fewer cores per executor, more partitions)",
+        ),
+        "shuffle_fetch_wait": (
+            "shuffle",
+            "Check network and shuffle service health; consider push-based "
+            "shuffle or fewer, larger shuffle blocks",
+        ),
+        "spill": (
+            "memory",
+            "Increase spark.sql.shuffle.partitions or executor memory to avoid spills",
+        ),
+        "slow_host": (
+            "infrastructure",
+            "Investigate the slow hosts and enable speculation "
+            "(spark.speculation=true) to hedge against them",
+        ),
+    }
+    recommendations = []
+    for cause, count in sorted(cause_counts.items(), key=lambda kv: -kv[1]):
+        if cause not in suggestions:
+            continue
+        rec_type, suggestion = suggestions[cause]
+        recommendations.append(
+            {
+                "type": rec_type,
+                "priority": "high" if count >= 5 else "medium",
+                "issue": f"{count} tail tasks attributed to {cause.replace('_', ' ')}",
+                "suggestion": suggestion,
+            }
+        )
+    return recommendations
+
+
 # Helper functions for analyze_shuffle_skew refactoring
+def _score_stage_shuffle_skew(
+    stage, skew_ratio_threshold: float
+) -> Optional[Dict[str, Any]]:
+    """Build the skew entry of a stage, or None if it is not skewed."""
+    stage_skew_info = {
+        "stage_id": stage.stage_id,
+        "attempt_id": stage.attempt_id,
+        "name": stage.name,
+        "total_shuffle_write_gb": round(
+            stage.shuffle_write_bytes / (1024 * 1024 * 1024), 2
+        ),
+        "task_count": stage.num_tasks,
+        "failed_tasks": stage.num_failed_tasks,
+        "task_skew": _analyze_stage_task_skew(stage, skew_ratio_threshold),
+        "executor_skew": _analyze_stage_executor_skew(stage, skew_ratio_threshold),
+    }
+
+    task_skew = stage_skew_info["task_skew"]
+    executor_skew = stage_skew_info["executor_skew"]
+    is_task_skewed = task_skew and task_skew["is_skewed"]
+    is_executor_skewed = executor_skew and executor_skew["is_skewed"]
+    if not (is_task_skewed or is_executor_skewed):
+        return None
+
+    # Overall skew ratio for sorting (use higher of the two)
+    task_ratio = task_skew["skew_ratio"] if task_skew else 0
+    exec_ratio = executor_skew["skew_ratio"] if executor_skew else 0
+    stage_skew_info["max_skew_ratio"] = max(task_ratio, exec_ratio)
+    return stage_skew_info
+
+
+def _task_skew_quantiles(stage) -> Optional[Any]:
+    task_summary = getattr(stage, "task_metrics_distributions", None)
+    return getattr(task_summary, "shuffle_write_bytes", None)
+
+
+def _needs_task_summary(stage) -> bool:
+    quantiles = _task_skew_quantiles(stage)
+    return not quantiles or len(quantiles) < 5
+
+
+def _fetch_task_summary(stage, app_id: str, server: Optional[str] = None):
+    """Fetch a stage's task summary; the fetcher holds a server slot for the call."""
+    return fetch_stage_task_summary(
+        app_id=app_id,
+        stage_id=stage.stage_id,
+        attempt_id=getattr(stage, "attempt_id", 0),
+        server=server,
+    )
+
+
 def _analyze_stage_task_skew(
-    stage, app_id: str, skew_ratio_threshold: float, server: Optional[str] = None
+    stage, skew_ratio_threshold: float
 ) -> Optional[Dict[str, Any]]:
-    """Analyze task-level shuffle skew for a stage."""
+    """Analyze task-level shuffle skew for a stage from its task summary."""
     try:
-        task_summary = getattr(stage, "task_metrics_distributions", None)
-        quantiles = getattr(task_summary, "shuffle_write_bytes", None)
-
-        needs_summary_fetch = not quantiles or len(quantiles) < 5
-        if needs_summary_fetch:
-            try:
-                task_summary = fetch_stage_task_summary(
-                    app_id=app_id,
-                    stage_id=stage.stage_id,
-                    attempt_id=getattr(stage, "attempt_id", 0),
-                    server=server,
-                )
-                if task_summary:
-                    stage.task_metrics_distributions = task_summary
-                    quantiles = getattr(task_summary, "shuffle_write_bytes", None)
-            except Exception:
-                return None
-
+        quantiles = _task_skew_quantiles(stage)
         if quantiles and len(quantiles) >= 5:
             median = quantiles[2]  # 50th percentile
             max_val = quantiles[4]  # 100th percentile (max)
@@ -5,6 +5,8 @@ This module contains tools for retrieving and analyzing Spark application
 metadata, environment configuration, and high-level application insights.
 """
 
+import logging
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -16,10 +18,13 @@ from .analysis import (
     analyze_shuffle_skew,
 )
 from .common import compact_output
+from .concurrency import run_concurrently
 from .fetchers import fetch_app, fetch_env, fetch_executors, fetch_stages
 from .metrics import summarize_app
 from .recommendations import compact_recommendation
 
+logger = logging.getLogger(__name__)
+
 
 @mcp.tool()
 def get_application(
@@ -196,24 +201,47 @@ def get_application_insights(
         "analyses": {},
     }
 
-    # Run requested analyses
+    analyses = {}
     if include_auto_scaling:
-        try:
-            insights["analyses"]["auto_scaling"] = analyze_auto_scaling(app_id, server)
-        except Exception as e:
-            insights["analyses"]["auto_scaling"] = {"error": str(e)}
-
+        analyses["auto_scaling"] = lambda: analyze_auto_scaling(app_id, server)
     if include_shuffle_skew:
-        try:
-            insights["analyses"]["shuffle_skew"] = analyze_shuffle_skew(app_id, server)
-        except Exception as e:
-            insights["analyses"]["shuffle_skew"] = {"error": str(e)}
+        analyses["shuffle_skew"] = lambda: analyze_shuffle_skew(app_id, server)
+    if include_failed_tasks:
+        analyses["failed_tasks"] = lambda: analyze_failed_tasks(app_id, server)
+
+    cfg = common.get_config()
+    # One budget for the prefetch and the analyses together
+    deadline = time.monotonic() + cfg.insights_analysis_timeout_s
 
+    # Warm the shared fetcher cache once so the analyses below reuse the same
+    # env/stages/executors payloads instead of each issuing their own calls.
+    prefetch = {}
+    if include_auto_scaling:
+        prefetch["env"] = lambda: fetch_env(app_id=app_id, server=server)
+    if include_auto_scaling or include_failed_tasks:
+        prefetch["stages"] = lambda: fetch_stages(app_id=app_id, server=server)
+    if include_shuffle_skew:
+        prefetch["stages_with_summaries"] = lambda: fetch_stages(
+            app_id=app_id, server=server, with_summaries=True
+        )
     if include_failed_tasks:
-        try:
-            insights["analyses"]["failed_tasks"] = analyze_failed_tasks(app_id, server)
-        except Exception as e:
-            insights["analyses"]["failed_tasks"] = {"error": str(e)}
+        prefetch["executors"] = lambda: fetch_executors(app_id=app_id, server=server)
+    if analyses:
+        prefetched = run_concurrently(
+            prefetch, cfg.insights_max_workers, deadline=deadline
+        )
+        for name, outcome in prefetched.items():
+            if "error" in outcome:
+                # The analyses needing it fetch it again and report the error
+                logger.warning(
+                    "Prefetching %s of %s failed: %s", name, app_id, outcome["error"]
+                )
+
+    # Run requested analyses concurrently within what is left of the budget;
+    # a slow or failing analysis only affects its own entry.
+    outcomes = run_concurrently(analyses, cfg.insights_max_workers, deadline=deadline)
+    for name, outcome in outcomes.items():
+        insights["analyses"][name] = outcome.get("result", outcome)
 
     # Aggregate recommendations from all analyses
     all_recommendations = []
@@ -280,7 +308,6 @@ def get_application_insights(
         else "needs_attention",
     }
 
-    cfg = common.get_config()
     if cfg.compact_tool_output:
         # Compact: summarize each sub-analysis instead of full results
         compact_analyses = {}
@@ -11,7 +11,7 @@ This module centralizes:
 from __future__ import annotations
 
 import sys
-from typing import Any, Callable, Optional, TypeVar
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -51,6 +51,14 @@ class ToolConfig(BaseSettings):
     time_overlap_window_s: int = Field(
         default=300, description="Window in seconds for considering stage time overlap"
     )
+    stage_match_max_candidates: int = Field(
+        default=20,
+        description="Fuzzy-match candidates scored per stage after indexing",
+    )
+    stage_match_optimal: bool = Field(
+        default=False,
+        description="Solve fuzzy stage matching as an optimal assignment",
+    )
 
     # Timeline settings
     default_interval_minutes: int = Field(
@@ -78,10 +86,61 @@ class ToolConfig(BaseSettings):
 
     # SQL pagination and defaults
     sql_page_size: int = Field(default=100, description="Page size for SQL listings")
+    sql_pages_in_flight: int = Field(
+        default=4, description="SQL listing pages requested concurrently"
+    )
+    task_page_size: int = Field(
+        default=1000, description="Page size for stage task listings"
+    )
+    task_pages_in_flight: int = Field(
+        default=4, description="Stage task listing pages requested concurrently"
+    )
     include_running_defaults: bool = Field(
         default=False, description="Default for including running entities in rankings"
     )
 
+    # Concurrency
+    insights_max_workers: int = Field(
+        default=4, description="Worker threads for application insight analyses"
+    )
+    insights_analysis_timeout_s: float = Field(
+        default=120.0,
+        description="Seconds to wait for the insight analyses, prefetch included",
+    )
+    per_server_max_concurrency: int = Field(
+        default=8,
+        description="Concurrent REST calls from this process to one History Server",
+    )
+    stage_summary_max_workers: int = Field(
+        default=8, description="Worker threads fetching per-stage task summaries"
+    )
+    comparison_max_workers: int = Field(
+        default=8,
+        description="Fetches run concurrently when preparing an app comparison",
+    )
+    cache_warm_max_workers: int = Field(
+        default=8, description="Applications warmed concurrently by warm_cache"
+    )
+    cache_warm_per_server_limit: int = Field(
+        default=4,
+        description="Applications warmed concurrently against one History Server",
+    )
+    client_init_max_workers: int = Field(
+        default=8, description="Server clients created concurrently on request"
+    )
+    tool_max_concurrency: int = Field(
+        default=32,
+        description="Synchronous tool calls the MCP server runs at once in threads",
+    )
+    tool_concurrency_limits: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "compare_app_performance": 4,
+            "compare_apps_matrix": 2,
+            "warm_cache": 2,
+        },
+        description="Per-tool caps on concurrent calls, by tool name",
+    )
+
     # Debug/validation
     debug_validate_schema: bool = Field(
         default=False, description="Validate outputs against schema in debug mode"
@@ -334,13 +393,14 @@ def get_client(ctx, server: Optional[str] = None):
     """
     if ctx is None:
         raise ValueError("Spark MCP context is not available outside of a request")
-    clients = ctx.request_context.lifespan_context.clients
-    default_client = ctx.request_context.lifespan_context.default_client
+    lifespan_context = ctx.request_context.lifespan_context
 
     if server:
-        client = clients.get(server)
+        client = lifespan_context.clients.get(server)
         if client:
             return client
+    # Resolved only when needed: clients may be created on first use
+    default_client = lifespan_context.default_client
     if default_client:
         return default_client
     raise ValueError(
@@ -6,6 +6,7 @@ This package contains the refactored comparison functionality organized into foc
 - core: Main comparison functions (compare_app_performance, compare_app_summaries)
 - stages: Stage-specific comparisons (find_top_stage_differences, compare_stages)
 - executors: Executor and timeline comparisons
+- matrix: N-way comparison of many applications against a baseline
 - environment: Resource and environment comparisons
 - utils: Common utilities and helper functions
 
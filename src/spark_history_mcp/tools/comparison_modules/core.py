@@ -6,10 +6,9 @@ comprehensive performance comparison and summary comparison.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from ...core.app import mcp
-from .. import fetchers as fetcher_tools
 from ..application import get_app_summary as _get_app_summary_impl
 from ..common import get_config, resolve_legacy_tool
 from ..recommendations import (
@@ -31,7 +30,8 @@ from .constants import (
     SIGNIFICANCE_THRESHOLD,
     SIMILARITY_THRESHOLD,
 )
-from .environment import compare_app_stages_aggregated
+from .environment import _compare_stages_aggregated, compare_app_stages_aggregated
+from .session import ComparisonSession
 from .utils import (
     resolve_client,
     sort_comparison_data,
@@ -78,16 +78,19 @@ def compare_app_performance(
     """
     resolve_client(server)
 
-    # Get application info via fetchers to populate caches used downstream
+    # Fetch both applications' data once, concurrently; every sub-comparison
+    # below reads from (and memoizes its aggregates in) this session
+    session = ComparisonSession(app_id1, app_id2, server, stage_summaries=True)
+    session.prefetch(get_config().comparison_max_workers)
     try:
-        app1 = fetcher_tools.fetch_app(app_id1, server)
+        app1 = session.app(1)
     except Exception as e:
         return _create_error_response(
             app_id1, app_id2, str(e), "app1", top_n, similarity_threshold
         )
 
     try:
-        app2 = fetcher_tools.fetch_app(app_id2, server)
+        app2 = session.app(2)
     except Exception as e:
         return _create_error_response(
             app_id1,
@@ -100,18 +103,14 @@ def compare_app_performance(
         )
 
     # Import specialized comparison tools to avoid circular imports
-    from .executors import compare_app_executors
-    from .stages import find_top_stage_differences
+    from .executors import _compare_executors
+    from .stages import _top_stage_differences
 
     # PHASE 1: AGGREGATED APPLICATION OVERVIEW
     # Use specialized comparison tools for aggregated overview with hardcoded defaults
     try:
-        executor_comparison = compare_app_executors(
-            app_id1,
-            app_id2,
-            server,
-            significance_threshold=significance_threshold,
-            show_only_significant=True,
+        executor_comparison = _compare_executors(
+            session, significance_threshold, show_only_significant=True
         )
     except Exception as e:
         executor_comparison = {"error": f"Failed to get executor comparison: {str(e)}"}
@@ -129,9 +128,7 @@ def compare_app_performance(
     # PHASE 2: STAGE-LEVEL DEEP DIVE ANALYSIS
     # Use the new find_top_stage_differences tool for stage analysis
     try:
-        stage_analysis = find_top_stage_differences(
-            app_id1, app_id2, server, top_n, similarity_threshold=similarity_threshold
-        )
+        stage_analysis = _top_stage_differences(session, top_n, similarity_threshold)
     except Exception as e:
         stage_analysis = _create_stage_analysis_error(
             app1, app2, app_id1, app_id2, str(e), top_n
@@ -200,8 +197,14 @@ def compare_app_performance(
 
     # APP SUMMARY COMPARISON
     try:
-        app_summary_diff = compare_app_summaries(
-            app_id1, app_id2, server, significance_threshold
+        app_summary_diff = _compare_summaries(
+            _session_app_summary(session, 1),
+            _session_app_summary(session, 2),
+            significance_threshold,
+            lambda: _compare_stages_aggregated(
+                session, significance_threshold, show_only_significant=True
+            ),
+            app_ids=(app_id1, app_id2),
         )
     except Exception as e:
         app_summary_diff = {"error": f"Failed to get app summary comparison: {str(e)}"}
@@ -212,8 +215,8 @@ def compare_app_performance(
     try:
         from .utils import _compare_environments
 
-        app1_env = fetcher_tools.fetch_env(app_id1, server)
-        app2_env = fetcher_tools.fetch_env(app_id2, server)
+        app1_env = session.environment(1)
+        app2_env = session.environment(2)
         environment_comparison = _compare_environments(
             app1_env, app2_env, filter_auto_generated=True
         )
@@ -274,6 +277,42 @@ def compare_app_summaries(
     app1_summary = get_app_summary(app_id1, server)
     app2_summary = get_app_summary(app_id2, server)
 
+    return _compare_summaries(
+        app1_summary,
+        app2_summary,
+        significance_threshold,
+        lambda: compare_app_stages_aggregated(
+            app_id1=app_id1,
+            app_id2=app_id2,
+            server=server,
+            significance_threshold=significance_threshold,
+            show_only_significant=True,
+        ),
+        app_ids=(app_id1, app_id2),
+    )
+
+
+def _session_app_summary(session: ComparisonSession, which: int) -> Dict[str, Any]:
+    """get_app_summary over the data of *session*."""
+    try:
+        return session.app_summary(which)
+    except Exception as e:
+        return {
+            "error": f"Failed to generate app summary: {str(e)}",
+            "application_id": session.app_ids[which],
+        }
+
+
+def _compare_summaries(
+    app1_summary: Dict[str, Any],
+    app2_summary: Dict[str, Any],
+    significance_threshold: float,
+    compare_stages: Callable[[], Dict[str, Any]],
+    app_ids: Tuple[str, str],
+) -> Dict[str, Any]:
+    """Diff two get_app_summary results; *compare_stages* adds stage totals."""
+    app_id1, app_id2 = app_ids
+
     # Define non-comparable fields to exclude from comparison
     exclude_fields = {"application_id", "application_name", "analysis_timestamp"}
 
@@ -345,13 +384,7 @@ def compare_app_summaries(
     }
 
     try:
-        aggregated_stage_comparison = compare_app_stages_aggregated(
-            app_id1=app_id1,
-            app_id2=app_id2,
-            server=server,
-            significance_threshold=significance_threshold,
-            show_only_significant=True,
-        )
+        aggregated_stage_comparison = compare_stages()
         if not aggregated_stage_comparison.get("error"):
             result["aggregated_stage_comparison"] = aggregated_stage_comparison
     except Exception as exc:
@@ -10,8 +10,8 @@ from typing import Any, Dict, Optional
 
 from ...core.app import mcp
 from .. import fetchers as fetcher_tools
-from ..stage_aggregation import aggregate_stage_metrics_for_comparison
 from .constants import SIGNIFICANCE_THRESHOLD
+from .session import ComparisonSession
 from .utils import (
     _compare_environments,
     calculate_safe_ratio,
@@ -217,16 +217,26 @@ def compare_app_stages_aggregated(
     Returns:
         Dict containing aggregated stage comparison, I/O analysis, and recommendations
     """
-    try:
-        # Get stages and application info
-        stages1 = fetcher_tools.fetch_stages(app_id=app_id1, server=server)
-        stages2 = fetcher_tools.fetch_stages(app_id=app_id2, server=server)
-        app1 = fetcher_tools.fetch_app(app_id1, server)
-        app2 = fetcher_tools.fetch_app(app_id2, server)
+    return _compare_stages_aggregated(
+        ComparisonSession(app_id1, app_id2, server),
+        significance_threshold,
+        show_only_significant,
+    )
 
+
+def _compare_stages_aggregated(
+    session: ComparisonSession,
+    significance_threshold: float,
+    show_only_significant: bool,
+) -> Dict[str, Any]:
+    """compare_app_stages_aggregated over the data of *session*."""
+    app_id1, app_id2 = session.app_ids[1], session.app_ids[2]
+    try:
         # Calculate aggregated stage metrics using shared aggregation
-        agg_metrics1 = aggregate_stage_metrics_for_comparison(stages1)
-        agg_metrics2 = aggregate_stage_metrics_for_comparison(stages2)
+        agg_metrics1 = session.stage_comparison_metrics(1)
+        agg_metrics2 = session.stage_comparison_metrics(2)
+        app1 = session.app(1)
+        app2 = session.app(2)
 
         # Calculate stage performance ratios
         stage_comparison = {}
@@ -9,10 +9,16 @@ from datetime import timedelta
 from typing import Any, Dict, Optional
 
 from ...core.app import mcp
-from .. import executors as executor_tools
 from .. import fetchers as fetcher_tools
-from ..timelines import merge_intervals
+from ..timelines import (
+    OPEN_END,
+    merge_intervals,
+    range_totals,
+    time_offsets,
+    window_overlaps,
+)
 from .constants import SIGNIFICANCE_THRESHOLD
+from .session import ComparisonSession
 from .utils import calculate_safe_ratio, filter_significant_metrics
 
 
@@ -220,14 +226,28 @@ def compare_app_executors(
     Returns:
         Dict containing executor performance comparison, efficiency ratios, and recommendations
     """
+    return _compare_executors(
+        ComparisonSession(app_id1, app_id2, server),
+        significance_threshold,
+        show_only_significant,
+    )
+
+
+def _compare_executors(
+    session: ComparisonSession,
+    significance_threshold: float,
+    show_only_significant: bool,
+) -> Dict[str, Any]:
+    """compare_app_executors over the data of *session*."""
+    app_id1, app_id2 = session.app_ids[1], session.app_ids[2]
     try:
         # Get executor summaries for both applications
-        exec1 = executor_tools.get_executor_summary(app_id1, server)
-        exec2 = executor_tools.get_executor_summary(app_id2, server)
+        exec1 = session.executor_summary(1)
+        exec2 = session.executor_summary(2)
 
         # Get applications for basic info
-        app1 = fetcher_tools.fetch_app(app_id1, server)
-        app2 = fetcher_tools.fetch_app(app_id2, server)
+        app1 = session.app(1)
+        app2 = session.app(2)
 
         # Build basic executor efficiency metrics
         efficiency_metrics = _build_executor_efficiency_metrics(exec1, exec2)
@@ -400,89 +420,131 @@ def _create_timeline_intervals(start_time, end_time, interval_minutes: int) -> l
 
 
 def _analyze_intervals(intervals, timeline_events) -> list:
-    """Analyze timeline intervals for executor usage patterns."""
-    analysis = []
-    current_executors = set()
-    current_cores = 0
-    current_memory_mb = 0
-    active_stages = set()
-
-    event_idx = 0
-
-    for interval in intervals:
-        # Process events that occur in this interval
-        while (
-            event_idx < len(timeline_events)
-            and timeline_events[event_idx]["timestamp"] <= interval["end"]
-        ):
-            event = timeline_events[event_idx]
-
-            if event["type"] == "executor_add":
-                current_executors.add(event["executor_id"])
-                current_cores += event.get("cores", 0)
-                current_memory_mb += event.get("memory_mb", 0)
-            elif event["type"] == "executor_remove":
-                if event["executor_id"] in current_executors:
-                    current_executors.remove(event["executor_id"])
-                    # Note: We don't track individual executor resources for removal
-            elif event["type"] == "stage_start":
-                active_stages.add(event["stage_id"])
-            elif event["type"] == "stage_end":
-                active_stages.discard(event["stage_id"])
-
-            event_idx += 1
-
-        analysis.append(
-            {
-                "interval": interval,
-                "executor_count": len(current_executors),
-                "total_cores": current_cores,
-                "total_memory_mb": current_memory_mb,
-                "active_stages": len(active_stages),
-            }
-        )
+    """Analyze timeline intervals for executor usage patterns.
 
-    return analysis
+    Each interval reflects the events up to its end: executors and stages are
+    active between their add/start and remove/end events, while cores and
+    memory add up every executor added so far.
+    """
+    if not intervals:
+        return []
+
+    origin = intervals[0]["start"]
+    interval_ends = time_offsets([interval["end"] for interval in intervals], origin)
+    count = len(intervals)
+
+    executor_first, executor_stop = _event_period_ranges(
+        timeline_events,
+        "executor_add",
+        "executor_remove",
+        "executor_id",
+        origin,
+        interval_ends,
+    )
+    stage_first, stage_stop = _event_period_ranges(
+        timeline_events, "stage_start", "stage_end", "stage_id", origin, interval_ends
+    )
+    # Removals are not subtracted from resources (only ids are tracked)
+    adds = [event for event in timeline_events if event["type"] == "executor_add"]
+    add_first, add_stop = window_overlaps(
+        time_offsets([event["timestamp"] for event in adds], origin),
+        [OPEN_END] * len(adds),
+        interval_ends,
+        interval_ends,
+    )
 
+    executor_counts = range_totals(executor_first, executor_stop, count)
+    stage_counts = range_totals(stage_first, stage_stop, count)
+    cores = range_totals(
+        add_first, add_stop, count, [event.get("cores", 0) for event in adds]
+    )
+    memory_mb = range_totals(
+        add_first, add_stop, count, [event.get("memory_mb", 0) for event in adds]
+    )
 
-def _analyze_stage_intervals(intervals, active_executors, start_time, end_time) -> list:
-    """Analyze intervals for stage-specific executor usage."""
-    analysis = []
-
-    for interval in intervals:
-        # Count executors active during this interval
-        active_count = 0
-        total_cores = 0
-        total_memory = 0
-
-        for executor in active_executors:
-            # Check if executor was active during this interval
-            exec_start = (
-                max(executor.add_time, start_time) if executor.add_time else start_time
-            )
-            exec_end = (
-                min(executor.remove_time, end_time)
-                if executor.remove_time
-                else end_time
-            )
+    return [
+        {
+            "interval": interval,
+            "executor_count": executor_counts[index],
+            "total_cores": cores[index],
+            "total_memory_mb": memory_mb[index],
+            "active_stages": stage_counts[index],
+        }
+        for index, interval in enumerate(intervals)
+    ]
 
-            if exec_start <= interval["end"] and exec_end >= interval["start"]:
-                active_count += 1
-                total_cores += executor.total_cores or 0
-                total_memory += (
-                    (executor.max_memory / (1024 * 1024)) if executor.max_memory else 0
-                )
 
-        analysis.append(
-            {
-                "interval": interval,
-                "active_executor_count": active_count,
-                "total_cores": total_cores,
-                "total_memory_mb": total_memory,
-            }
-        )
+def _event_period_ranges(
+    timeline_events, open_type: str, close_type: str, key: str, origin, interval_ends
+):
+    """Intervals during which each id is open, as ``window_overlaps`` ranges.
+
+    An id opens at its first open event and closes at the next close event,
+    so it is active for the intervals ending in ``[opened, closed)``.
+    """
+    opened: Dict[Any, Any] = {}
+    starts = []
+    ends = []
+    for event in timeline_events:
+        if event["type"] == open_type:
+            opened.setdefault(event[key], event["timestamp"])
+        elif event["type"] == close_type and event[key] in opened:
+            starts.append(opened.pop(event[key]))
+            ends.append(event["timestamp"])
+
+    start_offsets = time_offsets(starts + list(opened.values()), origin)
+    # Closed windows [start, end - 1us] turn the half-open period into
+    # "start <= interval end < close"
+    end_offsets = [offset - 1 for offset in time_offsets(ends, origin)]
+    end_offsets += [OPEN_END] * len(opened)
+    return window_overlaps(start_offsets, end_offsets, interval_ends, interval_ends)
+
+
+def _analyze_stage_intervals(intervals, active_executors, start_time, end_time) -> list:
+    """Analyze intervals for stage-specific executor usage."""
+    if not intervals:
+        return []
+
+    origin = intervals[0]["start"]
+    # Executor lifetimes clipped to the stage
+    exec_starts = [
+        max(executor.add_time, start_time) if executor.add_time else start_time
+        for executor in active_executors
+    ]
+    exec_ends = [
+        min(executor.remove_time, end_time) if executor.remove_time else end_time
+        for executor in active_executors
+    ]
+    first, stop = window_overlaps(
+        time_offsets(exec_starts, origin),
+        time_offsets(exec_ends, origin),
+        time_offsets([interval["start"] for interval in intervals], origin),
+        time_offsets([interval["end"] for interval in intervals], origin),
+    )
+    count = len(intervals)
+    active_counts = range_totals(first, stop, count)
+    cores = range_totals(
+        first, stop, count, [e.total_cores or 0 for e in active_executors]
+    )
+    memory_mb = range_totals(
+        first,
+        stop,
+        count,
+        [
+            (e.max_memory / (1024 * 1024)) if e.max_memory else 0
+            for e in active_executors
+        ],
+    )
 
-    return analysis
+    return [
+        {
+            "interval": interval,
+            "active_executor_count": active_counts[index],
+            "total_cores": cores[index],
+            "total_memory_mb": memory_mb[index],
+        }
+        for index, interval in enumerate(intervals)
+    ]
 
 
 def _analyze_timeline_differences(timeline1, timeline2, app1, app2) -> Dict[str, Any]:
@@ -0,0 +1,248 @@
+"""
+N-way application comparison against a baseline.
+
+``compare_apps_matrix`` compares many runs of a job in one call: every
+application's data is fetched once and concurrently, summarized once with
+``summarize_app``, and its stages are matched once against the baseline's.
+The result is a metric-by-application matrix with the spread of each metric,
+instead of one pairwise comparison (and one baseline refetch) per run.
+"""
+
+import statistics
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence
+
+from ...core.app import mcp
+from .. import fetchers as fetcher_tools
+from .. import matching as matching_tools
+from ..common import get_config
+from ..concurrency import run_concurrently
+from ..metrics import summarize_app
+from .constants import SIMILARITY_THRESHOLD
+from .utils import calculate_stage_duration
+
+# Summary fields that identify an application rather than measure it
+_NON_METRICS = {"application_id", "application_name", "analysis_timestamp"}
+
+_LOADERS = {
+    "app": lambda app_id, server: fetcher_tools.fetch_app(app_id, server),
+    "stages": lambda app_id, server: fetcher_tools.fetch_stages(
+        app_id=app_id, server=server
+    ),
+    "executors": lambda app_id, server: fetcher_tools.fetch_executors(
+        app_id=app_id, server=server
+    ),
+}
+
+
+def spread(values: Sequence[Optional[float]]) -> Dict[str, Any]:
+    """Min, max, mean, median, population stdev and CV of the known values."""
+    known = [v for v in values if v is not None]
+    if not known:
+        return {"count": 0}
+    mean = statistics.fmean(known)
+    stdev = statistics.pstdev(known)
+    return {
+        "count": len(known),
+        "min": round(min(known), 3),
+        "max": round(max(known), 3),
+        "mean": round(mean, 3),
+        "median": round(statistics.median(known), 3),
+        "stdev": round(stdev, 3),
+        "cv_percent": round(stdev / abs(mean) * 100, 1) if mean else None,
+    }
+
+
+def _change_percent(value: Optional[float], base: Optional[float]):
+    if value is None or base is None or base == 0:
+        return None
+    return round((value - base) / abs(base) * 100, 1)
+
+
+def _load_all(app_ids: Sequence[str], server: Optional[str]):
+    """Fetch app, stages and executors of every application concurrently."""
+    tasks = {
+        f"{app_id}/{kind}": partial(load, app_id, server)
+        for app_id in app_ids
+        for kind, load in _LOADERS.items()
+    }
+    outcomes = run_concurrently(tasks, get_config().comparison_max_workers)
+    data: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for app_id in app_ids:
+        for kind in _LOADERS:
+            outcome = outcomes[f"{app_id}/{kind}"]
+            if "error" in outcome:
+                errors.setdefault(app_id, f"Failed to fetch {kind}: {outcome['error']}")
+            else:
+                data.setdefault(app_id, {})[kind] = outcome["result"]
+    return {a: d for a, d in data.items() if a not in errors}, errors
+
+
+def _metric_rows(summaries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-metric values (in column order), change vs. baseline and spread."""
+    names = [
+        name
+        for name, value in summaries[0].items()
+        if name not in _NON_METRICS and isinstance(value, (int, float))
+    ]
+    rows = {}
+    for name in names:
+        values = [s.get(name) for s in summaries]
+        if not any(values):
+            continue
+        rows[name] = {
+            "values": values,
+            "change_percent": [_change_percent(v, values[0]) for v in values],
+            "spread": spread(values),
+        }
+    # Most variable metrics first
+    return dict(
+        sorted(
+            rows.items(),
+            key=lambda row: row[1]["spread"].get("cv_percent") or 0.0,
+            reverse=True,
+        )
+    )
+
+
+def _stage_duration(stage: Any) -> Optional[float]:
+    """Wall-clock duration of a stage in ms, or None when its times are unknown."""
+    if stage.submission_time is None or stage.completion_time is None:
+        return None
+    return calculate_stage_duration(stage)
+
+
+def _stage_rows(
+    columns: List[str],
+    stages: Dict[str, Sequence[Any]],
+    similarity_threshold: float,
+    top_stages: int,
+    server: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Align every application's stages with the baseline's in one pass each."""
+    fingerprints = {
+        app_id: fetcher_tools.fetch_stage_fingerprints(app_id, server)
+        for app_id in columns
+    }
+    baseline_stages = list(stages[columns[0]])
+    durations = [[_stage_duration(s)] for s in baseline_stages]
+    position = {id(stage): i for i, stage in enumerate(baseline_stages)}
+    matched = {}
+    for app_id in columns[1:]:
+        by_stage = {
+            id(m.stage1): _stage_duration(m.stage2)
+            for m in matching_tools.match_stages(
+                baseline_stages,
+                stages[app_id],
+                similarity_threshold,
+                fingerprints1=fingerprints[columns[0]],
+                fingerprints2=fingerprints[app_id],
+            )
+        }
+        matched[app_id] = len(by_stage)
+        for stage in baseline_stages:
+            durations[position[id(stage)]].append(by_stage.get(id(stage)))
+
+    rows = []
+    for stage, values in zip(baseline_stages, durations, strict=True):
+        known = [v for v in values if v is not None]
+        if len(known) < 2:
+            continue
+        rows.append(
+            {
+                "stage_id": stage.stage_id,
+                "name": stage.name,
+                "duration_ms": values,
+                "spread": spread(values),
+                "_range": max(known) - min(known),
+            }
+        )
+    rows.sort(key=lambda row: row["_range"], reverse=True)
+    for row in rows:
+        del row["_range"]
+    return {
+        "baseline_stages": len(baseline_stages),
+        "matched_stages": matched,
+        "most_variable": rows[: max(0, top_stages)],
+    }
+
+
+@mcp.tool()
+def compare_apps_matrix(
+    app_ids: List[str],
+    baseline: Optional[str] = None,
+    server: Optional[str] = None,
+    similarity_threshold: float = SIMILARITY_THRESHOLD,
+    top_stages: int = 5,
+) -> Dict[str, Any]:
+    """
+    Compare many Spark applications against one baseline in a single call.
+
+    Fetches every application once and concurrently, summarizes each with the
+    get_app_summary metrics, and matches each application's stages against the
+    baseline's. Use it to validate a configuration change across many runs
+    instead of calling compare_app_performance once per run.
+
+    Args:
+        app_ids: Spark application IDs to compare
+        baseline: Application to compare against (default: first of app_ids)
+        server: Optional server name to use (uses default if not specified)
+        similarity_threshold: Minimum similarity for stage name matching
+        top_stages: Number of baseline stages with the widest duration range
+
+    Returns:
+        Dictionary containing:
+        - applications: Column order of every matrix row, baseline first
+        - metrics: Per-metric values, percent change vs. the baseline and spread
+          (min/max/mean/median/stdev/CV), most variable metrics first
+        - stages: Matched stage counts and the stages whose durations vary most
+        - errors: Applications that could not be fetched (left out of the matrix)
+    """
+    columns = list(dict.fromkeys(app_ids or []))
+    baseline = baseline or (columns[0] if columns else None)
+    if baseline is None:
+        return {"error": "No applications to compare"}
+    columns = [baseline] + [a for a in columns if a != baseline]
+    if len(columns) < 2:
+        return {"error": "At least two distinct applications are required"}
+
+    data, errors = _load_all(columns, server)
+    if baseline in errors:
+        return {
+            "error": f"Failed to load baseline {baseline}: {errors[baseline]}",
+            "errors": errors,
+        }
+    columns = [a for a in columns if a in data]
+
+    summaries = []
+    for app_id in list(columns):
+        d = data[app_id]
+        summary = summarize_app(d["app"], d["stages"], d["executors"], app_id=app_id)
+        if "error" in summary:
+            errors[app_id] = summary["error"]
+            columns.remove(app_id)
+            continue
+        summaries.append(summary)
+    if baseline not in columns:
+        return {"error": errors[baseline], "errors": errors}
+
+    result: Dict[str, Any] = {
+        "schema_version": 1,
+        "baseline": baseline,
+        "applications": [
+            {"id": app_id, "name": getattr(data[app_id]["app"], "name", None)}
+            for app_id in columns
+        ],
+        "metrics": _metric_rows(summaries),
+        "stages": _stage_rows(
+            columns,
+            {app_id: data[app_id]["stages"] for app_id in columns},
+            similarity_threshold,
+            top_stages,
+            server,
+        ),
+    }
+    if errors:
+        result["errors"] = errors
+    return result
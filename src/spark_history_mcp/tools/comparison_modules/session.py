@@ -0,0 +1,168 @@
+"""
+Shared data for comparing two Spark applications.
+
+A ``ComparisonSession`` fetches the application, stages, executors and
+environment of both applications at most once and memoizes what is derived
+from them (stage aggregates, executor and app summaries, stage matches), so
+the sub-comparisons of ``compare_app_performance`` share one set of History
+Server calls instead of each refetching and re-aggregating the same data.
+"""
+
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .. import executors as executor_tools
+from .. import fetchers as fetcher_tools
+from .. import matching as matching_tools
+from ..concurrency import run_concurrently
+from ..metrics import summarize_app
+from ..stage_aggregation import (
+    aggregate_stage_metrics,
+    aggregate_stage_metrics_for_comparison,
+)
+
+APPS = (1, 2)
+
+
+class ComparisonSession:
+    """Fetch-once, compute-once view of two applications.
+
+    Accessors take ``1`` or ``2`` for the baseline and comparison target.
+    Values are loaded lazily in the order they are first requested, unless
+    ``prefetch`` loads all of them concurrently up front. Failures are
+    remembered too: a fetch that failed raises the same error again instead
+    of being retried by the next sub-comparison.
+
+    Args:
+        app_id1: First Spark application ID (baseline)
+        app_id2: Second Spark application ID (comparison target)
+        server: Optional server name to use (uses default if not specified)
+        stage_summaries: Fetch stages with their task metric distributions
+    """
+
+    def __init__(
+        self,
+        app_id1: str,
+        app_id2: str,
+        server: Optional[str] = None,
+        *,
+        stage_summaries: bool = False,
+    ) -> None:
+        self.app_ids = {1: app_id1, 2: app_id2}
+        self.server = server
+        self.stage_summaries = stage_summaries
+        self._outcomes: Dict[Hashable, Tuple[Any, Optional[BaseException]]] = {}
+
+    def _get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if key not in self._outcomes:
+            try:
+                self._outcomes[key] = (compute(), None)
+            except Exception as exc:
+                self._outcomes[key] = (None, exc)
+        value, error = self._outcomes[key]
+        if error is not None:
+            raise error
+        return value
+
+    def prefetch(self, max_workers: int) -> None:
+        """Load the raw data of both applications concurrently."""
+        loaders = (self.app, self.stages, self.executors, self.environment)
+        tasks = {
+            f"{loader.__name__}{which}": partial(loader, which)
+            for which in APPS
+            for loader in loaders
+        }
+        # Errors stay in the session and surface from the accessors
+        run_concurrently(tasks, max_workers)
+
+    # Raw data
+
+    def app(self, which: int):
+        return self._get(
+            ("app", which),
+            lambda: fetcher_tools.fetch_app(self.app_ids[which], self.server),
+        )
+
+    def stages(self, which: int):
+        return self._get(
+            ("stages", which),
+            lambda: fetcher_tools.fetch_stages(
+                app_id=self.app_ids[which],
+                server=self.server,
+                with_summaries=self.stage_summaries,
+            ),
+        )
+
+    def stage_fingerprints(self, which: int):
+        # Filled in by fetch_stages, so fetch the stages first
+        self.stages(which)
+        return self._get(
+            ("stage_fingerprints", which),
+            lambda: fetcher_tools.fetch_stage_fingerprints(
+                self.app_ids[which], self.server
+            ),
+        )
+
+    def executors(self, which: int):
+        return self._get(
+            ("executors", which),
+            lambda: fetcher_tools.fetch_executors(
+                app_id=self.app_ids[which], server=self.server
+            ),
+        )
+
+    def environment(self, which: int):
+        return self._get(
+            ("environment", which),
+            lambda: fetcher_tools.fetch_env(self.app_ids[which], self.server),
+        )
+
+    # Derived values
+
+    def stage_metrics(self, which: int) -> Dict[str, Any]:
+        """Raw ``aggregate_stage_metrics`` of the application's stages."""
+        return self._get(
+            ("stage_metrics", which),
+            lambda: aggregate_stage_metrics(self.stages(which), include_duration=True),
+        )
+
+    def stage_comparison_metrics(self, which: int) -> Dict[str, Any]:
+        return self._get(
+            ("stage_comparison_metrics", which),
+            lambda: aggregate_stage_metrics_for_comparison(
+                self.stages(which), aggregated=self.stage_metrics(which)
+            ),
+        )
+
+    def executor_summary(self, which: int) -> Dict[str, Any]:
+        return self._get(
+            ("executor_summary", which),
+            lambda: executor_tools.summarize_executors(
+                self.app(which), self.executors(which), self.stages(which)
+            ),
+        )
+
+    def app_summary(self, which: int) -> Dict[str, Any]:
+        return self._get(
+            ("app_summary", which),
+            lambda: summarize_app(
+                self.app(which),
+                self.stages(which),
+                self.executors(which),
+                app_id=self.app_ids[which],
+                aggregated=self.stage_metrics(which),
+            ),
+        )
+
+    def matches(self, similarity_threshold: float):
+        """Stage matches between the applications, baseline stages first."""
+        return self._get(
+            ("matches", similarity_threshold),
+            lambda: matching_tools.match_stages(
+                self.stages(1),
+                self.stages(2),
+                similarity_threshold,
+                fingerprints1=self.stage_fingerprints(1),
+                fingerprints2=self.stage_fingerprints(2),
+            ),
+        )
@@ -6,7 +6,7 @@ including finding top stage differences and detailed stage-level comparisons.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from ...core.app import mcp
 from ...models.spark_types import StageData, TaskMetricDistributions
@@ -17,8 +17,9 @@ from ...utils import (
     get_quantile_value,
 )
 from .. import fetchers as fetcher_tools
-from .. import matching as matching_tools
+from ..task_columns import DEFAULT_METRICS, parse_quantiles
 from .constants import SIGNIFICANCE_THRESHOLD, SIMILARITY_THRESHOLD
+from .session import ComparisonSession
 from .utils import calculate_stage_duration
 
 logger = logging.getLogger(__name__)
@@ -51,16 +52,25 @@ def find_top_stage_differences(
         - top_stage_differences: List of top N stages with biggest time differences
           Each entry includes stage details, time differences, and performance metrics
     """
+    return _top_stage_differences(
+        ComparisonSession(app_id1, app_id2, server, stage_summaries=True),
+        top_n,
+        similarity_threshold,
+    )
+
+
+def _top_stage_differences(
+    session: ComparisonSession, top_n: int, similarity_threshold: float
+) -> Dict[str, Any]:
+    """find_top_stage_differences over the data of *session*."""
+    app_id1, app_id2 = session.app_ids[1], session.app_ids[2]
+
     # Get application info
-    app1 = fetcher_tools.fetch_app(app_id1, server)
-    app2 = fetcher_tools.fetch_app(app_id2, server)
+    app1 = session.app(1)
+    app2 = session.app(2)
 
-    stages1 = fetcher_tools.fetch_stages(
-        app_id=app_id1, server=server, with_summaries=True
-    )
-    stages2 = fetcher_tools.fetch_stages(
-        app_id=app_id2, server=server, with_summaries=True
-    )
+    stages1 = session.stages(1)
+    stages2 = session.stages(2)
 
     if not stages1 or not stages2:
         return _create_no_stages_error(
@@ -68,7 +78,7 @@ def find_top_stage_differences(
         )
 
     # Find matching stages between applications via shared matcher
-    matches = matching_tools.match_stages(stages1, stages2, similarity_threshold)
+    matches = session.matches(similarity_threshold)
 
     if not matches:
         return _create_no_matches_error(
@@ -568,13 +578,16 @@ def compare_stage_metrics_dist(
     stage_id2: int,
     server: Optional[str] = None,
     significance_threshold: float = SIGNIFICANCE_THRESHOLD,
+    quantiles: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Compare task metric distributions between two stages.
 
     Shows median and p95 (max) values for key metrics like executor_run_time,
     jvm_gc_time, shuffle metrics, etc. This is useful for identifying task-level
-    performance differences between stages.
+    performance differences between stages. With quantiles, the successful
+    tasks of both stages are also compared at those exact quantiles, computed
+    from their per-task metric columns.
 
     Args:
         app_id1: First Spark application ID
@@ -584,12 +597,16 @@ def compare_stage_metrics_dist(
         server: Optional server name to use (uses default if not specified)
         significance_threshold: Minimum difference threshold to include metric
                                 (default: 0.1 = 10%)
+        quantiles: Optional comma-separated quantiles (e.g. "0.5,0.9,0.99") to
+                   compare from the stages' task lists
 
     Returns:
         Dictionary containing:
         - stages: Info about both stages being compared
         - metric_distributions: Comparison of median and p95 values for each metric
         - summary: Count of total metrics compared and significant differences
+        - task_quantiles: Per-metric values at the requested quantiles (only
+          with quantiles)
     """
     # Fetch task metric distributions for both stages
     try:
@@ -747,7 +764,7 @@ def compare_stage_metrics_dist(
             if filtered_entry:
                 metric_distributions[display_name] = filtered_entry
 
-    return {
+    result = {
         "stages": {
             "stage1": {
                 "app_id": app_id1,
@@ -767,3 +784,49 @@ def compare_stage_metrics_dist(
             "significance_threshold": significance_threshold,
         },
     }
+    if quantiles:
+        result["task_quantiles"] = _compare_task_quantiles(
+            (app_id1, stage_id1), (app_id2, stage_id2), server, quantiles
+        )
+    return result
+
+
+def _compare_task_quantiles(
+    stage1: Tuple[str, int],
+    stage2: Tuple[str, int],
+    server: Optional[str],
+    quantiles: str,
+) -> Dict[str, Any]:
+    """Compare two stages' successful tasks at arbitrary quantiles."""
+    qs = parse_quantiles(quantiles)
+    try:
+        columns = [
+            fetcher_tools.fetch_task_columns(app_id, stage_id, 0, server=server).where(
+                status=["SUCCESS"]
+            )
+            for app_id, stage_id in (stage1, stage2)
+        ]
+    except Exception as e:
+        return {"error": f"Failed to fetch stage tasks: {str(e)}"}
+
+    metrics: Dict[str, Any] = {}
+    for name in DEFAULT_METRICS:
+        values1 = columns[0].quantiles(name, qs)
+        values2 = columns[1].quantiles(name, qs)
+        if not any(values1) and not any(values2):
+            continue
+        metrics[name] = {
+            "stage1": values1,
+            "stage2": values2,
+            "change": [
+                f"{(v2 - v1) / max(abs(v1), 1) * 100:+.1f}%"
+                if v1 is not None and v2 is not None
+                else None
+                for v1, v2 in zip(values1, values2, strict=True)
+            ],
+        }
+    return {
+        "quantiles": qs,
+        "task_counts": [len(columns[0]), len(columns[1])],
+        "metrics": metrics,
+    }
@@ -9,6 +9,7 @@ comparison_modules package. All new development should occur in those modules.
 from .comparison_modules.core import *  # noqa: F401,F403
 from .comparison_modules.environment import *  # noqa: F401,F403
 from .comparison_modules.executors import *  # noqa: F401,F403
+from .comparison_modules.matrix import *  # noqa: F401,F403
 from .comparison_modules.stages import *  # noqa: F401,F403
 from .comparison_modules.utils import (  # noqa: F401
     _compare_environments,
@@ -0,0 +1,196 @@
+"""
+Helpers for running tool work concurrently in worker threads.
+
+Tools resolve their Spark client through the MCP request context, which lives
+in a ``contextvars.ContextVar``. Plain ``ThreadPoolExecutor`` workers start
+with an empty context, so every submission here runs inside a copy of the
+caller's context.
+
+``server_slot`` caps the calls one process makes to a single History Server
+at once. The fetchers in ``tools.fetchers`` hold a slot around every remote
+call, so the cap applies across all tools and worker pools that fetch
+through them.
+
+``offload_tool`` lets the MCP server run a synchronous tool in a worker
+thread, so blocking History Server I/O in one call does not stall the event
+loop that serves every other client.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import anyio
+import anyio.to_thread
+
+from . import common
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_slots_lock = threading.Lock()
+_server_slots: Dict[Tuple[str, int], threading.BoundedSemaphore] = {}
+_tool_limiters: Dict[Tuple[Optional[str], int], anyio.CapacityLimiter] = {}
+
+
+def submit_with_context(
+    executor: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Future:
+    """Submit ``fn`` to ``executor`` inside a copy of the current context."""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def run_concurrently(
+    tasks: Mapping[str, Callable[[], Any]],
+    max_workers: int,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Run named zero-argument callables concurrently.
+
+    Args:
+        tasks: Mapping of task name to callable
+        max_workers: Maximum number of worker threads
+        timeout: Seconds to wait for all tasks; ``None`` waits indefinitely
+        deadline: ``time.monotonic()`` value to stop waiting at, for a budget
+            shared with earlier batches; the earlier of the two limits applies
+
+    Returns:
+        Mapping of task name to ``{"result": value}``, ``{"error": message}``
+        or ``{"error": message, "timed_out": True}``. Tasks that time out keep
+        running in the background but no longer delay the caller.
+    """
+    if not tasks:
+        return {}
+    if deadline is not None:
+        remaining = round(max(0.0, deadline - time.monotonic()), 3)
+        timeout = remaining if timeout is None else min(timeout, remaining)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(tasks))),
+        thread_name_prefix="shs-tool",
+    )
+    try:
+        futures = {
+            name: submit_with_context(executor, fn) for name, fn in tasks.items()
+        }
+        wait(futures.values(), timeout=timeout)
+
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                logger.warning("Task %s timed out after %ss", name, timeout)
+                outcomes[name] = {
+                    "error": f"Timed out after {timeout}s",
+                    "timed_out": True,
+                }
+                continue
+            exc = future.exception()
+            if exc is not None:
+                outcomes[name] = {"error": str(exc)}
+            else:
+                outcomes[name] = {"result": future.result()}
+        return outcomes
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@contextlib.contextmanager
+def server_slot(server: Optional[str] = None) -> Iterator[None]:
+    """Hold one of the ``per_server_max_concurrency`` slots of *server*."""
+    limit = max(1, common.get_config().per_server_max_concurrency)
+    key = (common.get_server_key(server), limit)
+    with _slots_lock:
+        semaphore = _server_slots.get(key)
+        if semaphore is None:
+            semaphore = _server_slots[key] = threading.BoundedSemaphore(limit)
+    with semaphore:
+        yield
+
+
+def _tool_limiter(name: Optional[str], limit: int) -> anyio.CapacityLimiter:
+    key = (name, max(1, limit))
+    with _slots_lock:
+        limiter = _tool_limiters.get(key)
+        if limiter is None:
+            limiter = _tool_limiters[key] = anyio.CapacityLimiter(key[1])
+    return limiter
+
+
+def offload_tool(name: str, fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """Wrap the synchronous tool ``fn`` to run in a worker thread when awaited.
+
+    All offloaded tools share ``tool_max_concurrency`` threads, and a tool
+    named in ``tool_concurrency_limits`` waits for one of its own slots first,
+    so a burst of heavy calls cannot take every thread. The worker runs in a
+    copy of the caller's context, keeping the MCP request context visible. A
+    cancelled call stops waiting at once; its thread finishes in the background.
+    """
+
+    @functools.wraps(fn)
+    async def run(**kwargs: Any) -> T:
+        config = common.get_config()
+        threads = _tool_limiter(None, config.tool_max_concurrency)
+        call = functools.partial(fn, **kwargs)
+        limit = config.tool_concurrency_limits.get(name)
+        if limit is None:
+            return await anyio.to_thread.run_sync(
+                call, limiter=threads, abandon_on_cancel=True
+            )
+        async with _tool_limiter(name, limit):
+            return await anyio.to_thread.run_sync(
+                call, limiter=threads, abandon_on_cancel=True
+            )
+
+    return run
+
+
+def iter_completed(
+    fn: Callable[[T], Any],
+    items: Iterable[T],
+    max_workers: int,
+) -> Iterator[Tuple[T, Any, Optional[BaseException]]]:
+    """Run ``fn(item)`` concurrently, yielding results as they finish.
+
+    Yields:
+        ``(item, result, None)`` on success or ``(item, None, error)``.
+        Closing the generator early cancels items not yet started.
+    """
+    items = list(items)
+    if not items:
+        return
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items))),
+        thread_name_prefix="shs-tool",
+    )
+    try:
+        futures = {submit_with_context(executor, fn, item): item for item in items}
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                yield futures[future], None, error
+            else:
+                yield futures[future], future.result(), None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -16,8 +16,8 @@ from .common import (
     compact_dict,
     compact_output,
 )
-from .fetchers import fetch_app, fetch_executors, fetch_stages
-from .timelines import build_app_executor_timeline
+from .fetchers import fetch_app, fetch_executors, fetch_stage_attempt, fetch_stages
+from .timelines import build_app_executor_timeline, build_stage_executor_timeline
 
 
 @mcp.tool()
@@ -112,7 +112,11 @@ def get_executor_summary(app_id: str, server: Optional[str] = None):
     executors = fetch_executors(app_id=app_id, server=server)
     app = fetch_app(app_id=app_id, server=server)
     stages = fetch_stages(app_id=app_id, server=server)
+    return summarize_executors(app, executors, stages)
 
+
+def summarize_executors(app, executors, stages) -> Dict[str, Any]:
+    """Build the executor summary dict used by get_executor_summary."""
     summary = {
         "total_executors": len(executors),
         "active_executors": sum(1 for e in executors if e.is_active),
@@ -346,6 +350,31 @@ def _get_intervals_timeline(
     )
 
 
+def _get_stage_intervals_timeline(
+    app_id: str,
+    stage_id: int,
+    attempt_id: int = 0,
+    server: Optional[str] = None,
+    interval_minutes: int = DEFAULT_INTERVAL_MINUTES,
+    max_intervals: int = MAX_INTERVALS,
+    include_executor_details: bool = True,
+) -> Dict[str, Any]:
+    """Internal helper: Get interval-based executor timeline for one stage."""
+    stage = fetch_stage_attempt(
+        app_id=app_id, stage_id=stage_id, attempt_id=attempt_id, server=server
+    )
+    executors = fetch_executors(app_id=app_id, server=server)
+
+    result = build_stage_executor_timeline(
+        stage,
+        executors,
+        interval_minutes=interval_minutes,
+        max_intervals=max_intervals,
+        include_executor_details=include_executor_details,
+    )
+    return compact_dict({"application_id": app_id, **result})
+
+
 @mcp.tool()
 def get_timeline(
     app_id: str,
@@ -353,6 +382,9 @@ def get_timeline(
     server: Optional[str] = None,
     interval_minutes: int = DEFAULT_INTERVAL_MINUTES,
     max_intervals: int = MAX_INTERVALS,
+    stage_id: Optional[int] = None,
+    attempt_id: int = 0,
+    include_executor_details: bool = True,
 ) -> Dict[str, Any]:
     """
     Get resource usage timeline for a Spark application.
@@ -367,13 +399,29 @@ def get_timeline(
         server: Optional server name to use (uses default if not specified)
         interval_minutes: Time interval in minutes for interval mode (default: 1)
         max_intervals: Maximum number of intervals for interval mode (default: 10000)
+        stage_id: Optional stage ID; in interval mode, limits the timeline to
+            the executors active while that stage ran
+        attempt_id: Stage attempt ID used with stage_id (default: 0)
+        include_executor_details: Whether a stage timeline lists the active
+            executors of each interval; set False to keep only counts and
+            totals (default: True)
 
     Returns:
         Dictionary containing timeline data based on the selected mode
     """
     timeline_mode = mode.lower()
 
-    if timeline_mode == "intervals":
+    if timeline_mode == "intervals" and stage_id is not None:
+        return _get_stage_intervals_timeline(
+            app_id=app_id,
+            stage_id=stage_id,
+            attempt_id=attempt_id,
+            server=server,
+            interval_minutes=interval_minutes,
+            max_intervals=max_intervals,
+            include_executor_details=include_executor_details,
+        )
+    elif timeline_mode == "intervals":
         return _get_intervals_timeline(
             app_id=app_id,
             server=server,
@@ -8,28 +8,104 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 from unittest import mock
 
 from pydantic import BaseModel
 
 from .. import cache
+from ..api.event_log_client import EventLogClient
 from ..models.spark_types import (
     ApplicationEnvironmentInfo,
     ApplicationInfo,
+    ExecutionData,
     ExecutorSummary,
     JobData,
     JobExecutionStatus,
     StageData,
     StageStatus,
+    TaskData,
+    TaskStatus,
 )
 from . import common
 from .common import get_active_mcp_context, get_server_key
+from .concurrency import server_slot
+from .matching import fingerprint_stages
+from .task_columns import TaskColumns, TaskColumnStore
 
 logger = logging.getLogger(__name__)
 
-# Basic per-process caches keyed by (server_key, namespace, identifiers...)
-_CACHE: Dict[Tuple[Any, ...], Any] = {}
+
+# Per-process cache keyed by (server_key, namespace, identifiers...); the REST
+# clients keep their responses in it too, under keys of their own
+_CACHE = cache.get_memory_cache()
+
+
+class _Call:
+    """A fetch in progress whose outcome is shared with waiting callers."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical fetches into a single call.
+
+    The first caller for a key (the leader) runs the loader; callers arriving
+    while it is in flight wait for and share its result or exception instead
+    of issuing their own SHS request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[Any, ...], _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Tuple[Any, ...], fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.value
+
+
+_SINGLE_FLIGHT = SingleFlight()
 
 
 def _resolve_client(server: Optional[str]):
@@ -43,17 +119,24 @@ def _resolve_client(server: Optional[str]):
 
 
 def _cache_get(key: Tuple[Any, ...], use_cache: bool):
-    if use_cache and key in _CACHE:
-        return _CACHE[key]
+    if use_cache:
+        return _CACHE.get(key)
     return None
 
 
-def _cache_set(key: Tuple[Any, ...], value: Any, use_cache: bool):
-    if use_cache:
-        _CACHE[key] = value
+def _cache_set(
+    key: Tuple[Any, ...], value: Any, use_cache: bool, ttl: Optional[float] = None
+):
+    if use_cache and value is not None:
+        _CACHE.set(key, value, ttl=ttl)
     return value
 
 
+def memory_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss/eviction counters of the in-process fetcher cache."""
+    return _CACHE.stats()
+
+
 # ---------------------------------------------------------------------------
 # Typed disk-cache helpers
 # ---------------------------------------------------------------------------
@@ -63,11 +146,11 @@ def _disk_get_single(key: Tuple[Any, ...], model_cls: Type[BaseModel], use_disk:
     """Try to load a single model from disk cache."""
     if not use_disk:
         return None
-    raw = cache.disk_get(key)
+    raw = cache.disk_get_bytes(key)
     if raw is None:
         return None
     try:
-        return model_cls.model_validate_json(raw)
+        return cache.codec.decode_model(raw, model_cls)
     except Exception:
         return None
 
@@ -77,7 +160,7 @@ def _disk_set_single(key: Tuple[Any, ...], value: BaseModel, use_disk: bool) ->
     if not use_disk:
         return
     try:
-        cache.disk_set(key, value.model_dump_json())
+        cache.disk_set_bytes(key, cache.codec.encode_model(value))
     except Exception as exc:  # noqa: S110
         logger.debug("Failed to persist disk cache entry", exc_info=exc)
 
@@ -86,12 +169,11 @@ def _disk_get_list(key: Tuple[Any, ...], model_cls: Type[BaseModel], use_disk: b
     """Try to load a list of models from disk cache."""
     if not use_disk:
         return None
-    raw = cache.disk_get(key)
+    raw = cache.disk_get_bytes(key)
     if raw is None:
         return None
     try:
-        items = json.loads(raw)
-        return [model_cls.model_validate(d) for d in items]
+        return cache.codec.decode_models(raw, model_cls)
     except Exception:
         return None
 
@@ -103,12 +185,105 @@ def _disk_set_list(
     if not use_disk:
         return
     try:
-        data = json.dumps([v.model_dump(mode="json") for v in values])
-        cache.disk_set(key, data)
+        cache.disk_set_bytes(key, cache.codec.encode_models(values))
     except Exception as exc:  # noqa: S110
         logger.debug("Failed to persist disk cache list", exc_info=exc)
 
 
+# ---------------------------------------------------------------------------
+# Completion-aware cache policy
+#
+# Data of completed applications is immutable and cached permanently (memory
+# and disk). Data of running applications is only kept in memory for
+# CacheConfig.running_app_ttl_seconds and never persisted. When an app is seen
+# completing, its short-lived entries are dropped so the final state gets
+# fetched and promoted to the permanent tier.
+# ---------------------------------------------------------------------------
+
+# Applications last seen running are marked in _CACHE under this namespace.
+# A marker outlives every entry cached for the app while it was running (the
+# app info and its data each live one running TTL), so it expires with them
+# instead of accumulating over the life of the server.
+_RUNNING_NAMESPACE = "running_app"
+
+
+def is_completed(app: Any) -> bool:
+    """Whether *app* (an ``ApplicationInfo``) has finished, so its data is final."""
+    return getattr(app, "status", None) == "COMPLETED"
+
+
+def _running_ttl() -> float:
+    return cache.get_cache_config().running_app_ttl_seconds
+
+
+def _policy_for_app(app: Any, use_disk: bool) -> Tuple[bool, Optional[float]]:
+    """Return ``(use_disk, memory_ttl)`` for data of *app*."""
+    if is_completed(app):
+        return use_disk, None
+    return False, _running_ttl()
+
+
+def _track_app_state(server: Optional[str], app_id: str, app: Any) -> None:
+    server_key = get_server_key(server)
+    marker = (server_key, _RUNNING_NAMESPACE, app_id)
+    if not is_completed(app):
+        _CACHE.set(marker, True, size=0, ttl=2 * _running_ttl())
+        return
+    # pop is atomic, so only one thread drops the running entries
+    if _CACHE.pop(marker) is not None:
+        dropped = _CACHE.discard_where(
+            lambda key: key[0] == server_key and key[1] != "app" and key[2] == app_id
+        )
+        logger.debug("App %s completed; dropped %d running entries", app_id, dropped)
+
+
+def _app_cache_policy(
+    app_id: str, server: Optional[str], use_cache: bool, use_disk: bool
+) -> Tuple[bool, Optional[float]]:
+    """Resolve ``(use_disk, memory_ttl)`` for data scoped to *app_id*."""
+    if not (use_cache or use_disk):
+        return use_disk, None
+    try:
+        app = fetch_app(app_id, server)
+    except Exception:
+        # State unknown: do not freeze what may be a live application
+        return False, _running_ttl()
+    return _policy_for_app(app, use_disk)
+
+
+def _fetch(
+    key: Tuple[Any, ...],
+    model_cls: Type[BaseModel],
+    many: bool,
+    use_cache: bool,
+    use_disk: bool,
+    remote: Callable[[], Any],
+    ttl: Optional[float] = None,
+):
+    """Memory cache -> disk cache -> SHS, coalescing concurrent misses."""
+    cached = _cache_get(key, use_cache)
+    if cached is not None:
+        return cached
+
+    def load():
+        # A leader that finished just before we registered may have filled it
+        cached = _cache_get(key, use_cache)
+        if cached is not None:
+            return cached
+        disk_get = _disk_get_list if many else _disk_get_single
+        disk = disk_get(key, model_cls, use_disk)
+        if disk is not None:
+            return _cache_set(key, disk, use_cache)
+        with server_slot(key[0]):
+            result = remote()
+        if result is not None:
+            disk_set = _disk_set_list if many else _disk_set_single
+            disk_set(key, result, use_disk)
+        return _cache_set(key, result, use_cache, ttl)
+
+    return _SINGLE_FLIGHT.do(key, load)
+
+
 # ---------------------------------------------------------------------------
 # Fetchers
 # ---------------------------------------------------------------------------
@@ -117,15 +292,37 @@ def _disk_set_list(
 def fetch_env(app_id: str, server: Optional[str] = None):
     client, use_cache, use_disk = _resolve_client(server)
     key = (get_server_key(server), "env", app_id)
-    cached = _cache_get(key, use_cache)
-    if cached is not None:
-        return cached
-    disk = _disk_get_single(key, ApplicationEnvironmentInfo, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.get_environment(app_id=app_id)
-    _disk_set_single(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        ApplicationEnvironmentInfo,
+        False,
+        use_cache,
+        use_disk,
+        lambda: client.get_environment(app_id=app_id),
+        ttl=ttl,
+    )
+
+
+def _load_app_from_disk(key: Tuple[Any, ...], use_disk: bool):
+    app = _disk_get_single(key, ApplicationInfo, use_disk)
+    # Only completed snapshots are trusted; anything else may be stale
+    return app if is_completed(app) else None
+
+
+def _store_app(
+    key: Tuple[Any, ...],
+    app_id: str,
+    server: Optional[str],
+    app: Any,
+    use_cache: bool,
+    use_disk: bool,
+):
+    persist, ttl = _policy_for_app(app, use_disk)
+    if app is not None:
+        _disk_set_single(key, app, persist)
+        _track_app_state(server, app_id, app)
+    return _cache_set(key, app, use_cache, ttl)
 
 
 def fetch_app(app_id: str, server: Optional[str] = None):
@@ -134,12 +331,19 @@ def fetch_app(app_id: str, server: Optional[str] = None):
     cached = _cache_get(key, use_cache)
     if cached is not None:
         return cached
-    disk = _disk_get_single(key, ApplicationInfo, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.get_application(app_id)
-    _disk_set_single(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
+
+    def load():
+        cached = _cache_get(key, use_cache)
+        if cached is not None:
+            return cached
+        disk = _load_app_from_disk(key, use_disk)
+        if disk is not None:
+            return _cache_set(key, disk, use_cache)
+        with server_slot(server):
+            app = client.get_application(app_id)
+        return _store_app(key, app_id, server, app, use_cache, use_disk)
+
+    return _SINGLE_FLIGHT.do(key, load)
 
 
 def fetch_jobs(
@@ -152,15 +356,77 @@ def fetch_jobs(
         job_statuses = [JobExecutionStatus.from_string(s) for s in status]
 
     key = (get_server_key(server), "jobs", app_id, tuple(sorted(status or [])))
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        JobData,
+        True,
+        use_cache,
+        use_disk,
+        lambda: client.list_jobs(app_id=app_id, status=job_statuses),
+        ttl=ttl,
+    )
+
+
+def _fingerprints_key(app_id: str, server: Optional[str]) -> Tuple[Any, ...]:
+    return (get_server_key(server), "stage_fingerprints", app_id)
+
+
+def _load_fingerprints(
+    key: Tuple[Any, ...], use_cache: bool, use_disk: bool
+) -> Dict[str, str]:
     cached = _cache_get(key, use_cache)
     if cached is not None:
         return cached
-    disk = _disk_get_list(key, JobData, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.list_jobs(app_id=app_id, status=job_statuses)
-    _disk_set_list(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
+    raw = cache.disk_get(key) if use_disk else None
+    if raw is None:
+        return {}
+    try:
+        fingerprints = json.loads(raw)
+    except ValueError:
+        return {}
+    return _cache_set(key, fingerprints, use_cache)
+
+
+def _store_fingerprints(
+    key: Tuple[Any, ...],
+    stages: Any,
+    use_cache: bool,
+    use_disk: bool,
+    ttl: Optional[float],
+) -> Any:
+    """Merge the fingerprints of freshly fetched *stages* into the app's map.
+
+    The RDD ids a fingerprint needs are not cached with the stages, so the
+    fingerprints are cached next to them, keyed by ``matching.stage_key``.
+    Returns *stages*.
+    """
+    if not (use_cache or use_disk):
+        # Stages fetched every time are fingerprinted on demand when matched
+        return stages
+    fingerprints = {
+        **_load_fingerprints(key, use_cache, use_disk),
+        **fingerprint_stages(stages),
+    }
+    _cache_set(key, fingerprints, use_cache, ttl)
+    if use_disk:
+        try:
+            cache.disk_set(key, json.dumps(fingerprints))
+        except Exception as exc:  # noqa: S110
+            logger.debug("Failed to persist stage fingerprints", exc_info=exc)
+    return stages
+
+
+def fetch_stage_fingerprints(
+    app_id: str, server: Optional[str] = None
+) -> Dict[str, str]:
+    """Fingerprints of the stages of *app_id* fetched so far by fetch_stages.
+
+    Keyed by ``matching.stage_key`` (``"stage_id:attempt_id"``); pass them to
+    ``matching.match_stages``. Empty when the stages are not cached.
+    """
+    _, use_cache, use_disk = _resolve_client(server)
+    return _load_fingerprints(_fingerprints_key(app_id, server), use_cache, use_disk)
 
 
 def fetch_stages(
@@ -182,17 +448,24 @@ def fetch_stages(
         tuple(sorted(status or [])),
         bool(with_summaries),
     )
-    cached = _cache_get(key, use_cache)
-    if cached is not None:
-        return cached
-    disk = _disk_get_list(key, StageData, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.list_stages(
-        app_id=app_id, status=stage_statuses, with_summaries=with_summaries
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        StageData,
+        True,
+        use_cache,
+        use_disk,
+        lambda: _store_fingerprints(
+            _fingerprints_key(app_id, server),
+            client.list_stages(
+                app_id=app_id, status=stage_statuses, with_summaries=with_summaries
+            ),
+            use_cache,
+            use_disk,
+            ttl,
+        ),
+        ttl=ttl,
     )
-    _disk_set_list(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
 
 
 def fetch_executors(
@@ -202,15 +475,16 @@ def fetch_executors(
 
     # list_all_executors already includes inactive in most SHS implementations
     key = (get_server_key(server), "executors", app_id, bool(include_inactive))
-    cached = _cache_get(key, use_cache)
-    if cached is not None:
-        return cached
-    disk = _disk_get_list(key, ExecutorSummary, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.list_all_executors(app_id=app_id)
-    _disk_set_list(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        ExecutorSummary,
+        True,
+        use_cache,
+        use_disk,
+        lambda: client.list_all_executors(app_id=app_id),
+        ttl=ttl,
+    )
 
 
 def fetch_stage_attempt(
@@ -229,21 +503,22 @@ def fetch_stage_attempt(
         int(attempt_id),
         bool(with_summaries),
     )
-    cached = _cache_get(key, use_cache)
-    if cached is not None:
-        return cached
-    disk = _disk_get_single(key, StageData, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.get_stage_attempt(
-        app_id=app_id,
-        stage_id=stage_id,
-        attempt_id=attempt_id,
-        details=False,
-        with_summaries=with_summaries,
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        StageData,
+        False,
+        use_cache,
+        use_disk,
+        lambda: client.get_stage_attempt(
+            app_id=app_id,
+            stage_id=stage_id,
+            attempt_id=attempt_id,
+            details=False,
+            with_summaries=with_summaries,
+        ),
+        ttl=ttl,
     )
-    _disk_set_single(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
 
 
 def fetch_stage_attempts(
@@ -260,20 +535,21 @@ def fetch_stage_attempts(
         int(stage_id),
         bool(with_summaries),
     )
-    cached = _cache_get(key, use_cache)
-    if cached is not None:
-        return cached
-    disk = _disk_get_list(key, StageData, use_disk)
-    if disk is not None:
-        return _cache_set(key, disk, use_cache)
-    result = client.list_stage_attempts(
-        app_id=app_id,
-        stage_id=stage_id,
-        details=False,
-        with_summaries=with_summaries,
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        StageData,
+        True,
+        use_cache,
+        use_disk,
+        lambda: client.list_stage_attempts(
+            app_id=app_id,
+            stage_id=stage_id,
+            details=False,
+            with_summaries=with_summaries,
+        ),
+        ttl=ttl,
     )
-    _disk_set_list(key, result, use_disk)
-    return _cache_set(key, result, use_cache)
 
 
 def fetch_stage_task_summary(
@@ -283,6 +559,8 @@ def fetch_stage_task_summary(
     server: Optional[str] = None,
     quantiles: Optional[str] = None,
 ):
+    from ..models.spark_types import TaskMetricDistributions
+
     client, use_cache, use_disk = _resolve_client(server)
     key = (
         get_server_key(server),
@@ -292,20 +570,6 @@ def fetch_stage_task_summary(
         int(attempt_id),
         quantiles or "",
     )
-    cached = _cache_get(key, use_cache)
-    if cached is not None:
-        return cached
-    # Raw JSON caching (TaskMetricDistributions is not a simple model)
-    if use_disk:
-        raw = cache.disk_get(key)
-        if raw is not None:
-            try:
-                from ..models.spark_types import TaskMetricDistributions
-
-                result = TaskMetricDistributions.model_validate_json(raw)
-                return _cache_set(key, result, use_cache)
-            except Exception as exc:  # noqa: S110
-                logger.debug("Failed to load cached task summary", exc_info=exc)
     kwargs: Dict[str, Any] = {
         "app_id": app_id,
         "stage_id": stage_id,
@@ -313,52 +577,231 @@ def fetch_stage_task_summary(
     }
     if quantiles:
         kwargs["quantiles"] = quantiles
-    result = client.get_stage_task_summary(**kwargs)
-    if use_disk and result is not None:
-        try:
-            cache.disk_set(key, result.model_dump_json())
-        except Exception as exc:  # noqa: S110
-            logger.debug("Failed to persist task summary", exc_info=exc)
-    return _cache_set(key, result, use_cache)
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    return _fetch(
+        key,
+        TaskMetricDistributions,
+        False,
+        use_cache,
+        use_disk,
+        lambda: client.get_stage_task_summary(**kwargs),
+        ttl=ttl,
+    )
 
 
-def fetch_sql_pages(
+def _iter_offset_pages(
+    fetch_page: Callable[[int], List[Any]],
+    page_size: int,
+    pages_in_flight: int,
+    thread_name_prefix: str,
+) -> Iterator[List[Any]]:
+    """Yield non-empty pages of an offset/length listing in order.
+
+    The first page is requested alone so small listings cost a single call.
+    When it comes back full, up to *pages_in_flight* following pages are
+    requested concurrently; paging stops at the first short page. Closing the
+    generator early cancels pages not yet started.
+    """
+    page = fetch_page(0)
+    if page:
+        yield page
+    if len(page) < page_size:
+        return
+
+    next_offset = page_size
+    if pages_in_flight == 1:
+        while True:
+            page = fetch_page(next_offset)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            next_offset += page_size
+
+    executor = ThreadPoolExecutor(
+        max_workers=pages_in_flight, thread_name_prefix=thread_name_prefix
+    )
+    pending: Deque[Future] = deque()
+    try:
+        while True:
+            while len(pending) < pages_in_flight:
+                pending.append(executor.submit(fetch_page, next_offset))
+                next_offset += page_size
+            page = pending.popleft().result()
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_sql_pages(
     app_id: str,
     server: Optional[str] = None,
-    attempt_id: Optional[int] = None,
+    attempt_id: Optional[str] = None,
     page_size: Optional[int] = None,
     details: bool = True,
     plan_description: bool = False,
-):
-    """Fetch SQL executions in pages. Returns a list for simplicity.
-
-    If paging is not supported by the client, falls back to a single call.
-    """
+    pages_in_flight: Optional[int] = None,
+) -> Iterator[List[ExecutionData]]:
+    """Yield pages of SQL executions using offset/length paging."""
     cfg = common.get_config()
-    page_size = page_size or cfg.sql_page_size
+    page_size = max(1, page_size or cfg.sql_page_size)
     client, _, _ = _resolve_client(server)
 
-    # Try an API that supports paging; otherwise use the simple list
-    if hasattr(client, "get_sql_list_paged"):
-        results = []
-        page = 1
-        while True:
-            items = client.get_sql_list_paged(
+    def fetch_page(offset: int) -> List[ExecutionData]:
+        with server_slot(server):
+            return client.get_sql_list(
                 app_id,
-                page=page,
-                page_size=page_size,
+                attempt_id=attempt_id,
                 details=details,
                 plan_description=plan_description,
+                offset=offset,
+                length=page_size,
             )
-            if not items:
-                break
-            results.extend(items)
-            if len(items) < page_size:
-                break
-            page += 1
-        return results
-
-    # Fallback
-    return client.get_sql_list(
-        app_id, details=details, plan_description=plan_description
+
+    return _iter_offset_pages(
+        fetch_page,
+        page_size,
+        max(1, pages_in_flight or cfg.sql_pages_in_flight),
+        "shs-sql",
     )
+
+
+def fetch_sql_pages(
+    app_id: str,
+    server: Optional[str] = None,
+    attempt_id: Optional[str] = None,
+    page_size: Optional[int] = None,
+    details: bool = True,
+    plan_description: bool = False,
+    pages_in_flight: Optional[int] = None,
+) -> Iterator[ExecutionData]:
+    """Stream all SQL executions of an application, page by page.
+
+    Only the pages currently in flight are held in memory, so callers that
+    reduce the stream (e.g. a top-k ranking) scale to any number of
+    executions. Wrap in ``list()`` to materialize.
+    """
+    for page in iter_sql_pages(
+        app_id,
+        server=server,
+        attempt_id=attempt_id,
+        page_size=page_size,
+        details=details,
+        plan_description=plan_description,
+        pages_in_flight=pages_in_flight,
+    ):
+        yield from page
+
+
+def iter_stage_task_pages(
+    app_id: str,
+    stage_id: int,
+    attempt_id: int = 0,
+    server: Optional[str] = None,
+    page_size: Optional[int] = None,
+    sort_by: str = "ID",
+    status: Optional[List[TaskStatus]] = None,
+    pages_in_flight: Optional[int] = None,
+) -> Iterator[List[TaskData]]:
+    """Yield pages of one stage attempt's tasks (``taskList``) in order."""
+    cfg = common.get_config()
+    page_size = max(1, page_size or cfg.task_page_size)
+    client, _, _ = _resolve_client(server)
+
+    def fetch_page(offset: int) -> List[TaskData]:
+        with server_slot(server):
+            return client.list_stage_tasks(
+                app_id=app_id,
+                stage_id=stage_id,
+                attempt_id=attempt_id,
+                offset=offset,
+                length=page_size,
+                sort_by=sort_by,
+                status=status,
+            )
+
+    return _iter_offset_pages(
+        fetch_page,
+        page_size,
+        max(1, pages_in_flight or cfg.task_pages_in_flight),
+        "shs-tasks",
+    )
+
+
+def fetch_stage_tasks(
+    app_id: str,
+    stage_id: int,
+    attempt_id: int = 0,
+    server: Optional[str] = None,
+    page_size: Optional[int] = None,
+    sort_by: str = "ID",
+    status: Optional[List[TaskStatus]] = None,
+    pages_in_flight: Optional[int] = None,
+) -> Iterator[TaskData]:
+    """Stream the tasks of one stage attempt, page by page.
+
+    Task lists are not cached: stages can have hundreds of thousands of tasks,
+    so consumers reduce the stream (see ``task_stats``) instead of holding it.
+    """
+    for page in iter_stage_task_pages(
+        app_id,
+        stage_id,
+        attempt_id=attempt_id,
+        server=server,
+        page_size=page_size,
+        sort_by=sort_by,
+        status=status,
+        pages_in_flight=pages_in_flight,
+    ):
+        yield from page
+
+
+def fetch_task_columns(
+    app_id: str,
+    stage_id: int,
+    attempt_id: int = 0,
+    server: Optional[str] = None,
+) -> TaskColumns:
+    """Per-task metric columns of one stage attempt (see ``task_columns``).
+
+    Built once per stage attempt, from the streamed task list or, for event
+    log servers, from the replayed task records, then kept in memory and, for
+    completed applications, on disk as a memory-mappable file.
+    """
+    client, use_cache, use_disk = _resolve_client(server)
+    server_key = get_server_key(server)
+    stage_id, attempt_id = int(stage_id), int(attempt_id)
+    key = (server_key, "task_columns", app_id, stage_id, attempt_id)
+    cached = _cache_get(key, use_cache)
+    if cached is not None:
+        return cached
+    use_disk, ttl = _app_cache_policy(app_id, server, use_cache, use_disk)
+    store = TaskColumnStore() if use_disk else None
+
+    def load():
+        cached = _cache_get(key, use_cache)
+        if cached is not None:
+            return cached
+        if store is not None:
+            saved = store.get(server_key, app_id, stage_id, attempt_id)
+            if saved is not None:
+                return _cache_set(key, saved, use_cache)
+        if isinstance(client, EventLogClient):
+            columns = TaskColumns.from_records(
+                client.stage_task_records(app_id, stage_id, attempt_id)
+            )
+        else:
+            columns = TaskColumns.from_tasks(
+                fetch_stage_tasks(app_id, stage_id, attempt_id, server=server)
+            )
+        if store is not None:
+            try:
+                store.put(server_key, app_id, stage_id, attempt_id, columns)
+            except OSError as exc:
+                logger.debug("Failed to persist task columns", exc_info=exc)
+        return _cache_set(key, columns, use_cache, ttl)
+
+    return _SINGLE_FLIGHT.do(key, load)
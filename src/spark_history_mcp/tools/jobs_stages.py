@@ -6,13 +6,15 @@ including performance metrics, SQL queries, and stage dependencies.
 """
 
 import heapq
-from typing import Any, Optional
+import time
+from typing import Any, Dict, List, Optional
 
 from ..core.app import mcp
 from ..models.spark_types import (
     JobExecutionStatus,
     SQLExecutionStatus,
     TaskMetricDistributions,
+    TaskStatus,
 )
 from . import common
 from .common import compact_output
@@ -22,8 +24,12 @@ from .fetchers import (
     fetch_stage_attempt,
     fetch_stage_attempts,
     fetch_stage_task_summary,
+    fetch_stage_tasks,
     fetch_stages,
+    fetch_task_columns,
 )
+from .task_columns import DEFAULT_METRICS, parse_quantiles
+from .task_stats import TaskStatsAccumulator
 
 
 @mcp.tool()
@@ -221,6 +227,128 @@ def get_stage_task_summary(
     )
 
 
+@mcp.tool()
+def get_stage_task_stats(
+    app_id: str,
+    stage_id: int,
+    attempt_id: int = 0,
+    server: Optional[str] = None,
+    top_n: int = 10,
+    max_groups: Optional[int] = 20,
+    status: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Compute exact task statistics for a stage from its individual tasks.
+
+    Streams the stage's task list page by page and aggregates it on the fly,
+    so stages with 100k+ tasks are handled without loading every task at
+    once. Unlike get_stage_task_summary (five server-side quantiles), this
+    attributes time to individual executors, hosts and tasks.
+
+    Args:
+        app_id: The Spark application ID
+        stage_id: The stage ID
+        attempt_id: The stage attempt ID (default: 0)
+        server: Optional server name to use (uses default if not specified)
+        top_n: Number of slowest tasks to return (default: 10)
+        max_groups: Executors/hosts to return, busiest first (None for all)
+        status: Only include tasks with these statuses (e.g. ["SUCCESS"])
+
+    Returns:
+        Dictionary with duration quantiles, the slowest tasks, per-executor and
+        per-host totals, power-of-two histograms of task duration and bytes
+        read, and the time spent fetching tasks
+    """
+    started = time.perf_counter()
+    stats = TaskStatsAccumulator(top_n=top_n).add_all(
+        fetch_stage_tasks(
+            app_id,
+            stage_id,
+            attempt_id=attempt_id,
+            server=server,
+            status=[TaskStatus.from_string(s) for s in status] if status else None,
+        )
+    )
+    return {
+        "app_id": app_id,
+        "stage_id": stage_id,
+        "attempt_id": attempt_id,
+        **stats.summary(max_groups=max_groups),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+@mcp.tool()
+def get_stage_task_distribution(
+    app_id: str,
+    stage_id: int,
+    attempt_id: int = 0,
+    server: Optional[str] = None,
+    metrics: Optional[List[str]] = None,
+    quantiles: str = "0.5,0.9,0.99,1.0",
+    histogram_bins: int = 0,
+    group_by: Optional[str] = None,
+    status: Optional[List[str]] = None,
+    max_groups: Optional[int] = 20,
+) -> Dict[str, Any]:
+    """
+    Compute any quantiles, histograms and per-executor/host totals of task metrics.
+
+    Works on the stage's per-task metric columns, built once per stage from
+    its task list (or event log) and reused by later calls, so unlike
+    get_stage_task_summary it is not limited to the quantiles the history
+    server precomputes.
+
+    Args:
+        app_id: The Spark application ID
+        stage_id: The stage ID
+        attempt_id: The stage attempt ID (default: 0)
+        server: Optional server name to use (uses default if not specified)
+        metrics: Task metrics to report (default: duration_ms, jvm_gc_time_ms,
+            shuffle_read_bytes, shuffle_write_bytes, shuffle_fetch_wait_ms,
+            memory_bytes_spilled, disk_bytes_spilled)
+        quantiles: Comma-separated quantiles (default: "0.5,0.9,0.99,1.0")
+        histogram_bins: Equal-width histogram bins per metric (0 for none)
+        group_by: "executor_id" or "host" to add per-group totals
+        status: Only include tasks with these statuses (e.g. ["SUCCESS"])
+        max_groups: Groups to return, largest first by the first metric
+
+    Returns:
+        Dictionary with the task count and, per metric, the number of tasks
+        reporting it, its quantiles and optional histogram, plus the optional
+        per-group task count and sum/mean/max of each metric
+    """
+    names = metrics or list(DEFAULT_METRICS)
+    qs = parse_quantiles(quantiles)
+    columns = fetch_task_columns(app_id, stage_id, attempt_id, server=server)
+    if status:
+        columns = columns.where(status=[s.upper() for s in status])
+
+    distributions = {}
+    for name in names:
+        entry: Dict[str, Any] = {
+            "count": len(columns.values(name)),
+            "quantiles": columns.quantiles(name, qs),
+        }
+        if histogram_bins > 0:
+            entry["histogram"] = columns.histogram(name, histogram_bins)
+        distributions[name] = entry
+
+    result: Dict[str, Any] = {
+        "app_id": app_id,
+        "stage_id": stage_id,
+        "attempt_id": attempt_id,
+        "task_count": len(columns),
+        "quantiles": qs,
+        "metrics": distributions,
+    }
+    if group_by:
+        groups = columns.group_by(group_by, names)
+        result["group_count"] = len(groups)
+        result[f"by_{group_by}"] = dict(list(groups.items())[:max_groups])
+    return result
+
+
 def _find_slowest_sql(
     app_id: str,
     server: Optional[str] = None,
@@ -232,7 +360,7 @@ def _find_slowest_sql(
     """Internal helper: Get the N slowest SQL queries for a Spark application."""
     cfg = common.get_config()
 
-    all_executions = fetch_sql_pages(
+    executions = fetch_sql_pages(
         app_id=app_id,
         server=server,
         attempt_id=attempt_id,
@@ -240,16 +368,15 @@ def _find_slowest_sql(
         details=True,
         plan_description=False,  # Don't fetch plans for ranking
     )
-
-    if not all_executions:
-        return []
-
     if not include_running:
-        all_executions = [
-            e for e in all_executions if e.status != SQLExecutionStatus.RUNNING.value
-        ]
+        executions = (
+            e for e in executions if e.status != SQLExecutionStatus.RUNNING.value
+        )
 
-    slowest = heapq.nlargest(n, all_executions, key=lambda e: e.duration or 0)
+    # nlargest keeps a heap of n items while consuming the page stream
+    slowest = heapq.nlargest(n, executions, key=lambda e: e.duration or 0)
+    if not slowest:
+        return []
     return compact_output(slowest, compact)
 
 
@@ -3,17 +3,45 @@ Stage matching and scoring utilities.
 
 Provide consistent, configurable logic for pairing stages between applications
 based on name similarity and optional time overlap.
+
+Matching never scores every stage pair. Stages with the same fingerprint
+(see ``stage_fingerprint``) are joined first, then stages with identical
+names. The remaining stages are looked up in a character-trigram
+index over the other application's names, and only the best candidates are
+scored with ``SequenceMatcher`` (after its cheap upper bounds). The scored
+pairs are then assigned greedily, best similarity first, or optimally per
+connected group of candidates.
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import re
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from difflib import SequenceMatcher
-from typing import List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from ..models.spark_types import StageData
 from .common import get_config
 
+_DIGITS = re.compile(r"\d+")
+# Per-JVM parts of call sites: lambda class ids and identity hash codes
+_RUN_SPECIFIC = re.compile(r"\$\$Lambda\$\d+/0x[0-9a-f]+|@[0-9a-f]{6,}\b")
+# Largest group of competing stages solved exactly; larger groups use greedy
+MAX_OPTIMAL_GROUP = 400
+
 
 def name_similarity(a: str, b: str) -> float:
     if not a or not b:
@@ -21,6 +49,97 @@ def name_similarity(a: str, b: str) -> float:
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+@functools.lru_cache(maxsize=65536)
+def normalize_stage_name(name: str) -> str:
+    """Lowercase, collapse whitespace and replace digit runs with ``#``.
+
+    ``map at Job.scala:42`` and ``map at Job.scala:57`` normalize alike.
+    """
+    return _DIGITS.sub("#", " ".join(name.lower().split()))
+
+
+@functools.lru_cache(maxsize=65536)
+def _name_grams(name: str) -> FrozenSet[str]:
+    text = f" {name.lower()} "
+    return frozenset(text[i : i + 3] for i in range(len(text) - 2))
+
+
+def stage_fingerprint(stage: Any, include_rdds: bool = True) -> str:
+    """Hash of the stage fields that stay the same across runs of one job.
+
+    Combines the name, the call site (``details`` without per-JVM lambda ids
+    and hash codes), the number of RDDs when known and *include_rdds* is set,
+    and the power-of-two band of the task count. Repeated stages of one job
+    share a fingerprint and are told apart by order of appearance when
+    matching.
+    """
+    details = _RUN_SPECIFIC.sub("", getattr(stage, "details", None) or "")
+    rdd_ids = getattr(stage, "rdd_ids", None) if include_rdds else None
+    num_tasks = getattr(stage, "num_tasks", None) or 0
+    parts = (
+        stage.name or "",
+        details,
+        "" if rdd_ids is None else str(len(rdd_ids)),
+        str(num_tasks.bit_length()),
+    )
+    digest = hashlib.sha1("\x1f".join(parts).encode(), usedforsecurity=False)
+    return digest.hexdigest()[:16]
+
+
+def stage_key(stage: Any) -> str:
+    """``"stage_id:attempt_id"``, the key of a stage in a fingerprint map."""
+    return f"{getattr(stage, 'stage_id', None)}:{getattr(stage, 'attempt_id', None)}"
+
+
+def fingerprint_stages(stages: Any) -> Dict[str, str]:
+    """Fingerprints of freshly fetched ``StageData``, keyed by ``stage_key``.
+
+    Computed while the RDD ids are still known; they are not cached with the
+    stages, so the map is cached next to them instead. Stages without RDD
+    ids are left out.
+    """
+    if not isinstance(stages, list):
+        return {}
+    return {
+        stage_key(stage): stage_fingerprint(stage)
+        for stage in stages
+        if isinstance(stage, StageData) and stage.rdd_ids is not None
+    }
+
+
+def _fingerprint(
+    stage: Any, fingerprints: Optional[Mapping[str, str]]
+) -> Optional[str]:
+    """Fingerprint including the RDD count, or None when it is unknown."""
+    if fingerprints:
+        known = fingerprints.get(stage_key(stage))
+        if known:
+            return known
+    if getattr(stage, "rdd_ids", None) is None:
+        return None
+    return stage_fingerprint(stage)
+
+
+def _stage_fingerprints(
+    stages1: List[StageData],
+    stages2: List[StageData],
+    fingerprints1: Optional[Mapping[str, str]],
+    fingerprints2: Optional[Mapping[str, str]],
+) -> Dict[int, str]:
+    """Comparable fingerprints of both stage lists, keyed by ``id(stage)``.
+
+    A fingerprint with the RDD count never equals one without it, so unless
+    the count is known for every stage all of them are hashed without it.
+    """
+    fingerprints = {id(s): _fingerprint(s, fingerprints1) for s in stages1}
+    fingerprints.update((id(s), _fingerprint(s, fingerprints2)) for s in stages2)
+    if None not in fingerprints.values():
+        return fingerprints
+    return {
+        id(s): stage_fingerprint(s, include_rdds=False) for s in (*stages1, *stages2)
+    }
+
+
 def _time_overlap_seconds(s1: StageData, s2: StageData) -> float:
     if not s1.submission_time or not s2.submission_time:
         return 0.0
@@ -38,6 +157,49 @@ class StageMatch:
     stage2: StageData
     similarity: float
     overlap_seconds: float
+    # "fingerprint", "name" or "similarity"
+    matched_by: str = "similarity"
+
+
+class StageNameIndex:
+    """Trigram and normalized-name index over a list of stage names.
+
+    ``candidates(name, limit)`` returns the positions of the indexed names
+    sharing the most trigrams with *name*, plus those with the same
+    normalized name. Trigrams are visited rarest first, and ones shared by
+    more than *common_threshold* names are skipped once enough candidates
+    have been found, so common fragments such as ``"at "`` cost nothing.
+    """
+
+    def __init__(self, names: Sequence[str], common_threshold: int = 64) -> None:
+        self.common_threshold = common_threshold
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._normalized: Dict[str, List[int]] = defaultdict(list)
+        for position, name in enumerate(names):
+            if not name:
+                continue
+            for gram in _name_grams(name):
+                self._postings[gram].append(position)
+            self._normalized[normalize_stage_name(name)].append(position)
+
+    def candidates(self, name: str, limit: int) -> List[int]:
+        if not name:
+            return []
+        postings = [
+            self._postings[gram] for gram in _name_grams(name) if gram in self._postings
+        ]
+        postings.sort(key=len)
+        shared: Counter = Counter()
+        for posting in postings:
+            if len(posting) > self.common_threshold and len(shared) >= limit:
+                break
+            shared.update(posting)
+        ranked = [position for position, _ in shared.most_common(limit)]
+        seen = set(ranked)
+        for position in self._normalized.get(normalize_stage_name(name), ())[:limit]:
+            if position not in seen:
+                ranked.append(position)
+        return ranked
 
 
 def match_stages(
@@ -45,8 +207,22 @@ def match_stages(
     stages2: List[StageData],
     similarity_threshold: Optional[float] = None,
     require_overlap: bool = False,
+    optimal: Optional[bool] = None,
+    max_candidates: Optional[int] = None,
+    fingerprints1: Optional[Mapping[str, str]] = None,
+    fingerprints2: Optional[Mapping[str, str]] = None,
 ) -> List[StageMatch]:
-    """Greedy one-to-one matching using name similarity and optional overlap.
+    """One-to-one matching using name similarity and optional overlap.
+
+    Stages with equal fingerprints are joined first (taken from
+    *fingerprints1*/*fingerprints2*, see ``fetchers.fetch_stage_fingerprints``,
+    or computed from the stage when missing; without the RDD count when it
+    is unknown for any stage), then stages with
+    identical names (ignoring case); repeated keys pair in order of
+    appearance. Each remaining stage is scored against at most *max_candidates* indexed
+    candidates; pairs below the threshold are dropped. With *optimal* the
+    pairs maximize total similarity, otherwise the most similar pairs are
+    taken first.
 
     Returns a list of StageMatch with scores, sorted by similarity desc.
     """
@@ -56,31 +232,250 @@ def match_stages(
         if similarity_threshold is not None
         else cfg.stage_match_similarity
     )
+    optimal = cfg.stage_match_optimal if optimal is None else optimal
+    limit = max_candidates or cfg.stage_match_max_candidates
+
+    if sim_thresh > 1.0:
+        return []
+
+    fingerprints = _stage_fingerprints(stages1, stages2, fingerprints1, fingerprints2)
+    matches, residue1, residue2 = _join_on_key(
+        stages1,
+        stages2,
+        range(len(stages1)),
+        range(len(stages2)),
+        lambda stage: fingerprints[id(stage)],
+        "fingerprint",
+        require_overlap,
+    )
+    name_matches, residue1, residue2 = _join_on_key(
+        stages1,
+        stages2,
+        residue1,
+        residue2,
+        lambda stage: stage.name.lower() if stage.name else None,
+        "name",
+        require_overlap,
+    )
+    matches.extend(name_matches)
+    edges = _score_candidates(
+        stages1, stages2, residue1, residue2, sim_thresh, require_overlap, limit
+    )
+    assign = _assign_optimal if optimal else _assign_greedy
+    for i, j, similarity, overlap in assign(edges):
+        matches.append(StageMatch(stages1[i], stages2[j], similarity, overlap))
+
+    # Highest similarity first
+    matches.sort(key=lambda m: (m.similarity, m.overlap_seconds), reverse=True)
+    return matches
+
+
+def _join_on_key(
+    stages1: List[StageData],
+    stages2: List[StageData],
+    positions1: Sequence[int],
+    positions2: Sequence[int],
+    key: Callable[[Any], Optional[str]],
+    matched_by: str,
+    require_overlap: bool,
+) -> Tuple[List[StageMatch], List[int], List[int]]:
+    """Hash join on *key*; return the matches and the unmatched positions."""
+    buckets: Dict[str, List[int]] = defaultdict(list)
+    for j in positions2:
+        value = key(stages2[j])
+        if value:
+            buckets[value].append(j)
 
     matches: List[StageMatch] = []
+    residue1: List[int] = []
     used2: set[int] = set()
+    for i in positions1:
+        s1 = stages1[i]
+        value = key(s1)
+        bucket = buckets.get(value, []) if value else []
+        chosen = None
+        # Repeated keys pair in order of appearance
+        for position, j in enumerate(bucket):
+            overlap = _time_overlap_seconds(s1, stages2[j])
+            if not require_overlap or overlap > 0:
+                chosen = j
+                del bucket[position]
+                break
+        if chosen is None:
+            residue1.append(i)
+            continue
+        used2.add(chosen)
+        s2 = stages2[chosen]
+        similarity = 1.0 if matched_by == "name" else name_similarity(s1.name, s2.name)
+        matches.append(StageMatch(s1, s2, similarity, overlap, matched_by))
+
+    residue2 = [j for j in positions2 if j not in used2]
+    return matches, residue1, residue2
+
 
-    for s1 in stages1:
-        best_idx = -1
-        best_sim = 0.0
-        best_overlap = 0.0
-        for i, s2 in enumerate(stages2):
-            if i in used2:
+def _score_candidates(
+    stages1: List[StageData],
+    stages2: List[StageData],
+    residue1: List[int],
+    residue2: List[int],
+    sim_thresh: float,
+    require_overlap: bool,
+    limit: int,
+) -> List[Tuple[int, int, float, float]]:
+    """Similarity edges ``(i, j, similarity, overlap)`` at or above threshold."""
+    if not residue1 or not residue2:
+        return []
+
+    names2 = [stages2[j].name or "" for j in residue2]
+    index = StageNameIndex(names2)
+    # The second sequence is the one SequenceMatcher preprocesses and caches
+    matchers: Dict[int, SequenceMatcher] = {}
+    edges: List[Tuple[int, int, float, float]] = []
+    for i in residue1:
+        s1 = stages1[i]
+        if not s1.name:
+            continue
+        name1 = s1.name.lower()
+        for position in index.candidates(s1.name, limit):
+            matcher = matchers.get(position)
+            if matcher is None:
+                matcher = matchers[position] = SequenceMatcher(
+                    None, b=names2[position].lower()
+                )
+            matcher.set_seq1(name1)
+            if (
+                matcher.real_quick_ratio() < sim_thresh
+                or matcher.quick_ratio() < sim_thresh
+            ):
                 continue
-            sim = name_similarity(s1.name, s2.name)
-            if sim < sim_thresh:
+            similarity = matcher.ratio()
+            if similarity < sim_thresh or similarity <= 0:
                 continue
-            overlap = _time_overlap_seconds(s1, s2)
+            j = residue2[position]
+            overlap = _time_overlap_seconds(s1, stages2[j])
             if require_overlap and overlap <= 0:
                 continue
-            if sim > best_sim or (sim == best_sim and overlap > best_overlap):
-                best_sim = sim
-                best_idx = i
-                best_overlap = overlap
-        if best_idx >= 0:
-            matches.append(StageMatch(s1, stages2[best_idx], best_sim, best_overlap))
-            used2.add(best_idx)
+            edges.append((i, j, similarity, overlap))
+    return edges
 
-    # Highest similarity first
-    matches.sort(key=lambda m: (m.similarity, m.overlap_seconds), reverse=True)
-    return matches
+
+def _assign_greedy(
+    edges: List[Tuple[int, int, float, float]],
+) -> List[Tuple[int, int, float, float]]:
+    """Take the most similar remaining pair first (overlap breaks ties)."""
+    chosen = []
+    used1: set[int] = set()
+    used2: set[int] = set()
+    for edge in sorted(edges, key=lambda e: (-e[2], -e[3], e[0], e[1])):
+        i, j = edge[0], edge[1]
+        if i in used1 or j in used2:
+            continue
+        used1.add(i)
+        used2.add(j)
+        chosen.append(edge)
+    return chosen
+
+
+def _assign_optimal(
+    edges: List[Tuple[int, int, float, float]],
+) -> List[Tuple[int, int, float, float]]:
+    """Maximize total similarity within each group of competing stages.
+
+    Groups are the connected components of the candidate graph; each is
+    solved with the Hungarian algorithm unless it has more than
+    ``MAX_OPTIMAL_GROUP`` stages on either side, in which case it is
+    assigned greedily.
+    """
+    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for i, j, _, _ in edges:
+        parent[find((1, i))] = find((2, j))
+
+    groups: Dict[Tuple[int, int], List[Tuple[int, int, float, float]]] = defaultdict(
+        list
+    )
+    for edge in edges:
+        groups[find((1, edge[0]))].append(edge)
+
+    chosen = []
+    for group in groups.values():
+        rows = sorted({edge[0] for edge in group})
+        cols = sorted({edge[1] for edge in group})
+        if len(group) == 1 or max(len(rows), len(cols)) > MAX_OPTIMAL_GROUP:
+            chosen.extend(_assign_greedy(group))
+            continue
+        chosen.extend(_hungarian_max_weight(group, rows, cols))
+    return chosen
+
+
+def _hungarian_max_weight(
+    edges: List[Tuple[int, int, float, float]], rows: List[int], cols: List[int]
+) -> List[Tuple[int, int, float, float]]:
+    """Maximum-similarity matching on a small bipartite group (O(n^2 m))."""
+    transpose = len(rows) > len(cols)
+    if transpose:
+        rows, cols = cols, rows
+    row_index = {node: r for r, node in enumerate(rows)}
+    col_index = {node: c for c, node in enumerate(cols)}
+    by_cell = {}
+    # Non-candidate cells cost 0, i.e. "leave unmatched"
+    cost = [[0.0] * len(cols) for _ in rows]
+    for edge in edges:
+        r, c = (edge[1], edge[0]) if transpose else (edge[0], edge[1])
+        r, c = row_index[r], col_index[c]
+        # Tiny overlap bonus keeps the greedy tie-break among equal similarities
+        cost[r][c] = -(edge[2] + min(edge[3], 1e6) * 1e-12)
+        by_cell[(r, c)] = edge
+
+    n, m = len(rows), len(cols)
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    owner = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for r in range(1, n + 1):
+        owner[0] = r
+        c0 = 0
+        min_slack = [inf] * (m + 1)
+        visited = [False] * (m + 1)
+        while True:
+            visited[c0] = True
+            r0 = owner[c0]
+            delta = inf
+            c1 = 0
+            for c in range(1, m + 1):
+                if visited[c]:
+                    continue
+                slack = cost[r0 - 1][c - 1] - u[r0] - v[c]
+                if slack < min_slack[c]:
+                    min_slack[c] = slack
+                    way[c] = c0
+                if min_slack[c] < delta:
+                    delta = min_slack[c]
+                    c1 = c
+            for c in range(m + 1):
+                if visited[c]:
+                    u[owner[c]] += delta
+                    v[c] -= delta
+                else:
+                    min_slack[c] -= delta
+            c0 = c1
+            if owner[c0] == 0:
+                break
+        while c0:
+            c1 = way[c0]
+            owner[c0] = owner[c1]
+            c0 = c1
+
+    return [
+        by_cell[(owner[c] - 1, c - 1)]
+        for c in range(1, m + 1)
+        if owner[c] and (owner[c] - 1, c - 1) in by_cell
+    ]
@@ -12,7 +12,12 @@ from .stage_aggregation import aggregate_stage_metrics
 
 
 def summarize_app(
-    app, stages, executors, *, app_id: Optional[str] = None
+    app,
+    stages,
+    executors,
+    *,
+    app_id: Optional[str] = None,
+    aggregated: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Build the application summary dict used by get_app_summary.
 
@@ -24,6 +29,7 @@ def summarize_app(
         stages: Iterable of stage objects with metrics
         executors: Iterable of executor objects with timing info
         app_id: Optional application ID override (uses app.id if not provided)
+        aggregated: ``aggregate_stage_metrics(stages)`` if already computed
     """
     resolved_app_id = app_id if app_id is not None else getattr(app, "id", None)
 
@@ -39,7 +45,9 @@ def summarize_app(
     stages_list = list(stages)
 
     # Use dynamic aggregation for stage metrics
-    agg = aggregate_stage_metrics(stages_list, include_duration=False)
+    agg = aggregated
+    if agg is None:
+        agg = aggregate_stage_metrics(stages_list, include_duration=False)
 
     # Application duration from attempt
     total_runtime_min = ms_to_min(getattr(attempt, "duration", 0))
@@ -0,0 +1,50 @@
+"""
+Server status tool.
+
+Reports the configured Spark servers and how far their clients got through
+initialization. Clients are created on first use (see
+``api.factory.SparkClientRegistry``), so this is where slow or failing
+servers, such as EMR Persistent UIs that cannot be created, show up.
+"""
+
+from typing import Any, Dict
+
+from ..api.factory import SparkClientRegistry
+from ..core.app import mcp
+from . import common
+
+
+@mcp.tool()
+def get_server_status(initialize: bool = False) -> Dict[str, Any]:
+    """
+    Report each configured Spark server and the state of its client.
+
+    Clients are created when a server is first used. With initialize, every
+    client not created yet is created now, in parallel, before reporting.
+
+    Args:
+        initialize: Create all pending clients and wait for them (default: False)
+
+    Returns:
+        Dictionary with the default server name and, per server, its kind
+        (rest, emr or event_log), whether it is the default, its state
+        (pending, initializing, ready or failed), the seconds its last
+        initialization took and the error of a failed initialization
+    """
+    ctx = common.get_active_mcp_context()
+    if ctx is None:
+        raise ValueError("Spark MCP context is not available outside of a request")
+    clients = ctx.request_context.lifespan_context.clients
+
+    if not isinstance(clients, SparkClientRegistry):
+        # Contexts built around ready-made clients (e.g. the CLI)
+        return {
+            "default_server": None,
+            "servers": {name: {"state": "ready"} for name in clients},
+        }
+
+    if initialize:
+        servers = clients.initialize_all(common.get_config().client_init_max_workers)
+    else:
+        servers = clients.status()
+    return {"default_server": clients.default_server, "servers": servers}
@@ -7,7 +7,7 @@ replacing multiple hardcoded implementations with dynamic field discovery.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, Optional
 
 from ..models.spark_types import StageData, StageStatus
 from ..utils.model_fields import get_aggregatable_fields
@@ -164,6 +164,8 @@ def get_aggregated_field_names() -> list[str]:
 
 def aggregate_stage_metrics_for_comparison(
     stages: Iterable[Any],
+    *,
+    aggregated: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Aggregate stage metrics formatted for comparison tools.
@@ -173,6 +175,7 @@ def aggregate_stage_metrics_for_comparison(
 
     Args:
         stages: Iterable of stage objects
+        aggregated: ``aggregate_stage_metrics(stages)`` if already computed
 
     Returns:
         Dictionary with converted units matching get_app_summary format:
@@ -205,7 +208,9 @@ def aggregate_stage_metrics_for_comparison(
         }
 
     # Use the base aggregation
-    agg = aggregate_stage_metrics(stages_list, include_duration=True)
+    agg = aggregated
+    if agg is None:
+        agg = aggregate_stage_metrics(stages_list, include_duration=True)
 
     # Map to comparison format with human-readable names and unit conversions
     # Values from aggregate_stage_metrics are RAW, so apply unit conversions here
@@ -0,0 +1,561 @@
+"""
+Columnar store of per-task metrics.
+
+``TaskColumns`` holds the tasks of one stage attempt as parallel float64
+columns (duration, run time, GC, shuffle read/write bytes, fetch wait, spill,
+...) plus dictionary-encoded executor, host and status columns. Quantiles at
+any rank, equal-width histograms and per-executor/per-host totals are computed
+over whole columns: vectorized when NumPy is installed (``numpy`` extra), with
+``array`` and plain loops otherwise. A metric a task did not report is NaN and
+left out. Quantiles are nearest-rank, like ``task_stats.quantile``.
+
+Columns are filled from ``TaskData`` (``fetchers.fetch_stage_tasks``) or from
+the task records of an ``EventLogClient``. ``save`` writes one stage to one
+file, a JSON header followed by the raw little-endian columns 8-byte aligned,
+so ``load`` memory-maps the columns with NumPy instead of reading them.
+``TaskColumnStore`` keeps these files per server, application and stage in
+the ``task-columns`` file store of the disk cache, bounded by
+``SHS_CACHE_TASK_COLUMNS_MAX_BYTES``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..cache import FileStore, get_cache_config, get_file_store
+from ..models.spark_types import TaskData
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Numeric columns, in file order
+COLUMNS = (
+    "duration_ms",
+    "executor_run_time_ms",
+    "executor_cpu_time_ns",
+    "jvm_gc_time_ms",
+    "scheduler_delay_ms",
+    "input_bytes",
+    "output_bytes",
+    "shuffle_read_bytes",
+    "shuffle_fetch_wait_ms",
+    "shuffle_write_bytes",
+    "memory_bytes_spilled",
+    "disk_bytes_spilled",
+    "peak_execution_memory",
+    "launch_time_ms",
+)
+# Dictionary-encoded columns tasks can be grouped by
+KEYS = ("executor_id", "host", "status")
+# Metrics reported when a caller does not pick any
+DEFAULT_METRICS = (
+    "duration_ms",
+    "jvm_gc_time_ms",
+    "shuffle_read_bytes",
+    "shuffle_write_bytes",
+    "shuffle_fetch_wait_ms",
+    "memory_bytes_spilled",
+    "disk_bytes_spilled",
+)
+
+FILE_MAGIC = b"STC1"
+FILE_SUFFIX = ".cols"
+_HEADER_LENGTH = struct.Struct("<I")
+_NAN = math.nan
+
+Row = Tuple[Tuple[float, ...], Tuple[str, str, str]]
+
+
+def _number(value: Any) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _task_data_row(task: TaskData) -> Row:
+    m = task.task_metrics
+    inputs = m.input_metrics if m is not None else None
+    outputs = m.output_metrics if m is not None else None
+    read = m.shuffle_read_metrics if m is not None else None
+    write = m.shuffle_write_metrics if m is not None else None
+    values = (
+        _number(task.duration),
+        _number(m.executor_run_time if m is not None else None),
+        _number(m.executor_cpu_time if m is not None else None),
+        _number(m.jvm_gc_time if m is not None else None),
+        _number(task.scheduler_delay if m is not None else None),
+        _number(inputs.bytes_read if inputs is not None else None),
+        _number(outputs.bytes_written if outputs is not None else None),
+        _number(
+            (read.remote_bytes_read or 0) + (read.local_bytes_read or 0)
+            if read is not None
+            else None
+        ),
+        _number(read.fetch_wait_time if read is not None else None),
+        _number(write.bytes_written if write is not None else None),
+        _number(m.memory_bytes_spilled if m is not None else None),
+        _number(m.disk_bytes_spilled if m is not None else None),
+        _number(m.peak_execution_memory if m is not None else None),
+        task.launch_time.timestamp() * 1000 if task.launch_time else _NAN,
+    )
+    return values, (task.executor_id or "unknown", task.host, task.status)
+
+
+def _record_row(record: Dict[str, Any]) -> Row:
+    """Row of an ``EventLogClient.stage_task_records`` record."""
+    metered = "executorRunTime" in record
+
+    def metric(*names: str) -> float:
+        if not metered:
+            return _NAN
+        return float(sum(record.get(name) or 0 for name in names))
+
+    values = (
+        _number(record.get("duration")),
+        metric("executorRunTime"),
+        metric("executorCpuTime"),
+        metric("jvmGcTime"),
+        _number(record.get("schedulerDelay")) if metered else _NAN,
+        metric("inputBytes"),
+        metric("outputBytes"),
+        metric("shuffleRemoteBytesRead", "shuffleLocalBytesRead"),
+        metric("shuffleFetchWaitTime"),
+        metric("shuffleWriteBytes"),
+        metric("memoryBytesSpilled"),
+        metric("diskBytesSpilled"),
+        metric("peakExecutionMemory"),
+        _number(record.get("launchTime")),
+    )
+    return values, (
+        record.get("executorId") or "unknown",
+        record.get("host") or "",
+        record.get("status") or "",
+    )
+
+
+def _check_column(name: str) -> None:
+    if name not in COLUMNS:
+        raise ValueError(f"Unknown task metric '{name}'. Must be one of: {COLUMNS}")
+
+
+def _check_key(key: str) -> None:
+    if key not in KEYS:
+        raise ValueError(f"Cannot group tasks by '{key}'. Must be one of: {KEYS}")
+
+
+def parse_quantiles(quantiles: str) -> List[float]:
+    """Parse comma-separated quantiles such as ``"0.5,0.9,0.99"``."""
+    try:
+        values = [float(q) for q in quantiles.split(",") if q.strip()]
+    except ValueError:
+        values = []
+    if not values or any(not 0.0 <= q <= 1.0 for q in values):
+        raise ValueError(f"Invalid quantiles '{quantiles}'. Use values in [0, 1]")
+    return values
+
+
+def _nearest_rank(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    if not len(sorted_values):
+        return None
+    rank = math.ceil(q * len(sorted_values)) - 1
+    return float(sorted_values[min(len(sorted_values) - 1, max(0, rank))])
+
+
+class TaskColumns:
+    """Per-task metrics of one stage attempt, one column per metric.
+
+    Build with ``from_tasks`` or ``from_records``; ``load`` memory-maps a
+    saved stage. Columns are read-only.
+    """
+
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        codes: Dict[str, Any],
+        labels: Dict[str, List[str]],
+    ) -> None:
+        self._values = values
+        self._codes = codes
+        self._labels = labels
+        self._rows = len(values[COLUMNS[0]])
+
+    # Construction
+
+    @classmethod
+    def _from_rows(cls, rows: Iterable[Row]) -> "TaskColumns":
+        values = {name: array("d") for name in COLUMNS}
+        codes = {key: array("i") for key in KEYS}
+        lookup: Dict[str, Dict[str, int]] = {key: {} for key in KEYS}
+        appenders = [values[name].append for name in COLUMNS]
+        for numbers, keys in rows:
+            for append, value in zip(appenders, numbers, strict=True):
+                append(value)
+            for key, label in zip(KEYS, keys, strict=True):
+                index = lookup[key].setdefault(label, len(lookup[key]))
+                codes[key].append(index)
+        labels = {key: list(lookup[key]) for key in KEYS}
+        if NUMPY_AVAILABLE:
+            return cls(
+                {
+                    name: np.frombuffer(column, dtype=np.float64)
+                    for name, column in values.items()
+                },
+                {
+                    key: np.frombuffer(column, dtype=np.intc)
+                    for key, column in codes.items()
+                },
+                labels,
+            )
+        return cls(values, codes, labels)
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[TaskData]) -> "TaskColumns":
+        """Columns of a stream of ``TaskData`` (e.g. ``fetch_stage_tasks``)."""
+        return cls._from_rows(_task_data_row(task) for task in tasks)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "TaskColumns":
+        """Columns of ``EventLogClient.stage_task_records``."""
+        return cls._from_rows(_record_row(record) for record in records)
+
+    # Access
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __sizeof__(self) -> int:
+        # Lets the memory cache budget the columns, not just this wrapper
+        return object.__sizeof__(self) + self._rows * (8 * len(COLUMNS) + 4 * len(KEYS))
+
+    def labels(self, key: str) -> List[str]:
+        """Distinct values of a key column, in code order."""
+        _check_key(key)
+        return list(self._labels[key])
+
+    def values(self, name: str) -> List[float]:
+        """The reported values of one metric, in task order."""
+        _check_column(name)
+        column = self._values[name]
+        if NUMPY_AVAILABLE:
+            column = np.asarray(column)
+            return column[~np.isnan(column)].tolist()
+        return [v for v in column if not math.isnan(v)]
+
+    def where(self, **keys: Optional[Iterable[str]]) -> "TaskColumns":
+        """Tasks whose key columns take one of the given values.
+
+        Example: ``columns.where(status=["SUCCESS"], host=["h1", "h2"])``.
+        Keys given as None are not filtered on.
+        """
+        wanted: Dict[str, set] = {}
+        for key, allowed in keys.items():
+            _check_key(key)
+            if allowed is not None:
+                labels = set(allowed)
+                wanted[key] = {
+                    code
+                    for code, label in enumerate(self._labels[key])
+                    if label in labels
+                }
+        if not wanted:
+            return self
+        if NUMPY_AVAILABLE:
+            mask = np.ones(self._rows, dtype=bool)
+            for key, allowed_codes in wanted.items():
+                mask &= np.isin(np.asarray(self._codes[key]), list(allowed_codes))
+            return TaskColumns(
+                {name: np.asarray(c)[mask] for name, c in self._values.items()},
+                {key: np.asarray(c)[mask] for key, c in self._codes.items()},
+                self._labels,
+            )
+        rows = [
+            i
+            for i in range(self._rows)
+            if all(self._codes[key][i] in codes for key, codes in wanted.items())
+        ]
+        return TaskColumns(
+            {
+                name: array("d", (column[i] for i in rows))
+                for name, column in self._values.items()
+            },
+            {
+                key: array("i", (column[i] for i in rows))
+                for key, column in self._codes.items()
+            },
+            self._labels,
+        )
+
+    # Statistics
+
+    def _sorted(self, name: str) -> Any:
+        _check_column(name)
+        column = self._values[name]
+        if NUMPY_AVAILABLE:
+            column = np.asarray(column)
+            return np.sort(column[~np.isnan(column)])
+        return sorted(v for v in column if not math.isnan(v))
+
+    def quantiles(self, name: str, qs: Sequence[float]) -> List[Optional[float]]:
+        """Nearest-rank quantiles of a metric (None when no task reported it)."""
+        ordered = self._sorted(name)
+        count = len(ordered)
+        if not count:
+            return [None for _ in qs]
+        if NUMPY_AVAILABLE:
+            ranks = np.ceil(np.asarray(qs, dtype=np.float64) * count) - 1
+            ranks = np.clip(ranks, 0, count - 1).astype(np.intp)
+            return ordered[ranks].tolist()
+        return [_nearest_rank(ordered, q) for q in qs]
+
+    def histogram(self, name: str, bins: int = 10) -> List[Dict[str, Any]]:
+        """Equal-width histogram of a metric; the last bin includes the max."""
+        ordered = self._sorted(name)
+        count = len(ordered)
+        if not count:
+            return []
+        low, high = float(ordered[0]), float(ordered[-1])
+        bins = max(1, bins)
+        if low == high:
+            return [{"lower": low, "upper": high, "count": count}]
+        span = high - low
+        if NUMPY_AVAILABLE:
+            index = ((ordered - low) / span * bins).astype(np.intp)
+            counts = np.bincount(np.minimum(index, bins - 1), minlength=bins)
+            counts = counts.tolist()
+        else:
+            counts = [0] * bins
+            for value in ordered:
+                counts[min(int((value - low) / span * bins), bins - 1)] += 1
+        return [
+            {
+                "lower": low + span * i / bins,
+                "upper": low + span * (i + 1) / bins,
+                "count": counts[i],
+            }
+            for i in range(bins)
+        ]
+
+    def group_by(
+        self, key: str, names: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Task count and per-metric sum, mean and max for each key value.
+
+        Groups are ordered by the sum of the first metric (``duration_ms`` by
+        default), largest first.
+        """
+        _check_key(key)
+        names = list(names or ("duration_ms",))
+        for name in names:
+            _check_column(name)
+        labels = self._labels[key]
+        codes = self._codes[key]
+        stats: Dict[str, Tuple[List[int], List[float], List[float]]] = {}
+        if NUMPY_AVAILABLE:
+            codes = np.asarray(codes)
+            tasks = np.bincount(codes, minlength=len(labels)).tolist()
+            for name in names:
+                column = np.asarray(self._values[name])
+                known = ~np.isnan(column)
+                counts = np.bincount(codes[known], minlength=len(labels))
+                sums = np.bincount(
+                    codes[known], weights=column[known], minlength=len(labels)
+                )
+                maxes = np.full(len(labels), -np.inf)
+                np.maximum.at(maxes, codes[known], column[known])
+                stats[name] = (counts.tolist(), sums.tolist(), maxes.tolist())
+        else:
+            tasks = [0] * len(labels)
+            for code in codes:
+                tasks[code] += 1
+            for name in names:
+                counts = [0] * len(labels)
+                sums = [0.0] * len(labels)
+                maxes = [-math.inf] * len(labels)
+                for code, value in zip(codes, self._values[name], strict=True):
+                    if math.isnan(value):
+                        continue
+                    counts[code] += 1
+                    sums[code] += value
+                    maxes[code] = max(maxes[code], value)
+                stats[name] = (counts, sums, maxes)
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for code, label in enumerate(labels):
+            if not tasks[code]:
+                continue
+            group: Dict[str, Any] = {"tasks": tasks[code]}
+            for name in names:
+                counts, sums, maxes = stats[name]
+                known = counts[code]
+                group[f"{name}_sum"] = sums[code]
+                group[f"{name}_mean"] = round(sums[code] / known, 1) if known else None
+                group[f"{name}_max"] = maxes[code] if known else None
+            groups[label] = group
+        first = f"{names[0]}_sum"
+        return dict(sorted(groups.items(), key=lambda kv: kv[1][first], reverse=True))
+
+    # Persistence
+
+    def save(self, path: Path) -> None:
+        """Write the columns to *path* atomically (see the module docstring)."""
+        header = json.dumps(
+            {"rows": self._rows, "columns": COLUMNS, "keys": self._labels},
+            separators=(",", ":"),
+        ).encode()
+        prefix = FILE_MAGIC + _HEADER_LENGTH.pack(len(header)) + header
+        prefix += b"\0" * (-len(prefix) % 8)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(prefix)
+                for name in COLUMNS:
+                    handle.write(_little_endian(self._values[name], "d"))
+                for key in KEYS:
+                    handle.write(_little_endian(self._codes[key], "i"))
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "TaskColumns":
+        """Open saved columns; memory-mapped when NumPy is installed.
+
+        Raises:
+            ValueError: If the file is not a task column file or is truncated
+        """
+        with open(path, "rb") as handle:
+            start = handle.read(len(FILE_MAGIC) + _HEADER_LENGTH.size)
+            if len(start) < len(FILE_MAGIC) + 4 or not start.startswith(FILE_MAGIC):
+                raise ValueError(f"{path} is not a task column file")
+            (length,) = _HEADER_LENGTH.unpack(start[len(FILE_MAGIC) :])
+            header = json.loads(handle.read(length))
+        if header["columns"] != list(COLUMNS) or set(header["keys"]) != set(KEYS):
+            raise ValueError(f"{path} was written with other columns")
+        rows = header["rows"]
+        offset = len(FILE_MAGIC) + _HEADER_LENGTH.size + length
+        offset += -offset % 8
+        expected = offset + rows * (8 * len(COLUMNS) + 4 * len(KEYS))
+        if path.stat().st_size != expected:
+            raise ValueError(f"{path} is truncated")
+        labels = {key: header["keys"][key] for key in KEYS}
+
+        if NUMPY_AVAILABLE and rows:
+            values = np.memmap(
+                path, dtype="<f8", mode="r", offset=offset, shape=(len(COLUMNS), rows)
+            )
+            codes = np.memmap(
+                path,
+                dtype="<i4",
+                mode="r",
+                offset=offset + values.nbytes,
+                shape=(len(KEYS), rows),
+            )
+            return cls(
+                dict(zip(COLUMNS, values, strict=True)),
+                dict(zip(KEYS, codes, strict=True)),
+                labels,
+            )
+
+        data = path.read_bytes()[offset:]
+        values_, codes_ = {}, {}
+        for i, name in enumerate(COLUMNS):
+            values_[name] = _from_little_endian(
+                data[i * rows * 8 : (i + 1) * rows * 8], "d"
+            )
+        base = len(COLUMNS) * rows * 8
+        for i, key in enumerate(KEYS):
+            codes_[key] = _from_little_endian(
+                data[base + i * rows * 4 : base + (i + 1) * rows * 4], "i"
+            )
+        if NUMPY_AVAILABLE:
+            values_ = {k: np.asarray(v, dtype=np.float64) for k, v in values_.items()}
+            codes_ = {k: np.asarray(v, dtype=np.intc) for k, v in codes_.items()}
+        return cls(values_, codes_, labels)
+
+
+def _little_endian(column: Any, typecode: str) -> bytes:
+    if NUMPY_AVAILABLE:
+        dtype = "<f8" if typecode == "d" else "<i4"
+        return np.asarray(column).astype(dtype, copy=False).tobytes()
+    data = array(typecode, column)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _from_little_endian(data: bytes, typecode: str) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class TaskColumnStore:
+    """Saved ``TaskColumns``, one file per server, application and stage.
+
+    Args:
+        root: Directory of the files (default: the ``task-columns`` file store
+            of the disk cache)
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        if root is None:
+            self.files = get_file_store("task-columns")
+        else:
+            self.files = FileStore(
+                Path(root), FILE_SUFFIX, get_cache_config().task_columns_max_bytes
+            )
+        self.root = self.files.root
+
+    def path(
+        self, server_key: str, app_id: str, stage_id: int, attempt_id: int
+    ) -> Path:
+        app_dir = self.files.app_dir(server_key, app_id)
+        return app_dir / f"{stage_id}_{attempt_id}{FILE_SUFFIX}"
+
+    def get(
+        self, server_key: str, app_id: str, stage_id: int, attempt_id: int
+    ) -> Optional[TaskColumns]:
+        """Saved columns of a stage attempt, or None if missing or unreadable."""
+        path = self.path(server_key, app_id, stage_id, attempt_id)
+        try:
+            columns = TaskColumns.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        self.files.touch(path)
+        return columns
+
+    def put(
+        self,
+        server_key: str,
+        app_id: str,
+        stage_id: int,
+        attempt_id: int,
+        columns: TaskColumns,
+    ) -> None:
+        """Save the columns of a stage attempt, replacing earlier ones.
+
+        Least recently used files are evicted once the store is over budget.
+        """
+        path = self.path(server_key, app_id, stage_id, attempt_id)
+        try:
+            previous: Optional[int] = path.stat().st_size
+        except FileNotFoundError:
+            previous = None
+        columns.save(path)
+        self.files.saved(path, previous)
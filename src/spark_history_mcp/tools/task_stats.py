@@ -0,0 +1,343 @@
+"""
+Streaming aggregation of task-level metrics.
+
+``TaskStatsAccumulator`` consumes ``TaskData`` one task at a time (typically
+from ``fetchers.fetch_stage_tasks``) and keeps only constant-size state per
+executor and host, a bounded heap of the slowest tasks, power-of-two
+histograms and a few floats per task (duration, launch time, bytes read) for
+exact quantiles and tail what-ifs. Stages with
+hundreds of thousands of tasks can therefore be analysed without holding
+their ``TaskData`` objects in memory. With ``keep_tail_metrics`` it also keeps
+the few per-task metrics straggler causes are read from, so every task over a
+threshold can be examined once the threshold is known (``tail_records``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..models.spark_types import TaskData
+
+DURATION_QUANTILES = (0.5, 0.75, 0.9, 0.99)
+
+
+def task_bytes_read(task: TaskData) -> int:
+    """Input plus shuffle bytes read by a task."""
+    metrics = task.task_metrics
+    if metrics is None:
+        return 0
+    total = 0
+    if metrics.input_metrics is not None:
+        total += metrics.input_metrics.bytes_read or 0
+    shuffle = metrics.shuffle_read_metrics
+    if shuffle is not None:
+        total += (shuffle.remote_bytes_read or 0) + (shuffle.local_bytes_read or 0)
+    return total
+
+
+def task_record(task: TaskData) -> Dict[str, Any]:
+    """Flat summary of one task, small enough to keep for ranked tasks."""
+    metrics = task.task_metrics
+    shuffle = metrics.shuffle_read_metrics if metrics is not None else None
+    return {
+        "task_id": task.task_id,
+        "index": task.index,
+        "attempt": task.attempt,
+        "executor_id": task.executor_id,
+        "host": task.host,
+        "status": task.status,
+        "speculative": task.speculative,
+        "duration_ms": task.duration,
+        "run_time_ms": metrics.executor_run_time if metrics is not None else None,
+        "gc_time_ms": metrics.jvm_gc_time if metrics is not None else None,
+        "bytes_read": task_bytes_read(task),
+        "shuffle_fetch_wait_ms": shuffle.fetch_wait_time if shuffle else None,
+        "spill_bytes": _spill_bytes(task),
+        "scheduler_delay_ms": task.scheduler_delay,
+    }
+
+
+def _spill_bytes(task: TaskData) -> int:
+    metrics = task.task_metrics
+    if metrics is None:
+        return 0
+    return (metrics.memory_bytes_spilled or 0) + (metrics.disk_bytes_spilled or 0)
+
+
+def quantile(sorted_values: Any, q: float) -> Optional[float]:
+    """Nearest-rank quantile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(q * len(sorted_values)) - 1
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank))]
+
+
+class _GroupStats:
+    """Running totals for the tasks of one executor or host."""
+
+    __slots__ = (
+        "tasks",
+        "failed",
+        "duration_sum",
+        "duration_min",
+        "duration_max",
+        "gc_time_sum",
+        "bytes_read",
+        "fetch_wait_sum",
+        "spill_bytes",
+    )
+
+    def __init__(self) -> None:
+        self.tasks = 0
+        self.failed = 0
+        self.duration_sum = 0
+        self.duration_min: Optional[int] = None
+        self.duration_max: Optional[int] = None
+        self.gc_time_sum = 0
+        self.bytes_read = 0
+        self.fetch_wait_sum = 0
+        self.spill_bytes = 0
+
+    def add(self, task: TaskData, bytes_read: int, spill: int) -> None:
+        self.tasks += 1
+        if task.status in ("FAILED", "KILLED"):
+            self.failed += 1
+        duration = task.duration
+        if duration is not None:
+            self.duration_sum += duration
+            if self.duration_min is None or duration < self.duration_min:
+                self.duration_min = duration
+            if self.duration_max is None or duration > self.duration_max:
+                self.duration_max = duration
+        metrics = task.task_metrics
+        if metrics is not None:
+            self.gc_time_sum += metrics.jvm_gc_time or 0
+            if metrics.shuffle_read_metrics is not None:
+                self.fetch_wait_sum += metrics.shuffle_read_metrics.fetch_wait_time or 0
+        self.bytes_read += bytes_read
+        self.spill_bytes += spill
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tasks": self.tasks,
+            "failed_tasks": self.failed,
+            "duration_sum_ms": self.duration_sum,
+            "duration_mean_ms": round(self.duration_sum / self.tasks, 1)
+            if self.tasks
+            else None,
+            "duration_min_ms": self.duration_min,
+            "duration_max_ms": self.duration_max,
+            "gc_time_ms": self.gc_time_sum,
+            "bytes_read": self.bytes_read,
+            "shuffle_fetch_wait_ms": self.fetch_wait_sum,
+            "spill_bytes": self.spill_bytes,
+        }
+
+
+class Log2Histogram:
+    """Counts per power-of-two bucket; needs no range known up front."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        bucket = int(value).bit_length() if value > 0 else 0
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+    def buckets(self) -> List[Dict[str, int]]:
+        """Non-empty buckets as ``[lower, upper)`` ranges in ascending order."""
+        return [
+            {
+                "lower": 0 if bucket == 0 else 1 << (bucket - 1),
+                "upper": 1 << bucket,
+                "count": self.counts[bucket],
+            }
+            for bucket in sorted(self.counts)
+        ]
+
+
+class TaskStatsAccumulator:
+    """Reduce a stream of tasks to exact per-executor/per-host statistics.
+
+    Args:
+        top_n: Number of slowest tasks to keep
+        keep_tail_metrics: Also keep the metrics ``tail_records`` reports
+    """
+
+    def __init__(self, top_n: int = 10, keep_tail_metrics: bool = False) -> None:
+        self.top_n = max(0, top_n)
+        self.keep_tail_metrics = keep_tail_metrics
+        self.tasks = 0
+        self.failed = 0
+        self.speculative = 0
+        self.by_executor: Dict[str, _GroupStats] = {}
+        self.by_host: Dict[str, _GroupStats] = {}
+        self.duration_histogram = Log2Histogram()
+        self.bytes_read_histogram = Log2Histogram()
+        self._durations = array("d")
+        self._launches = array("d")  # epoch ms per duration, NaN if unknown
+        self._bytes_read = array("d")
+        self._sorted_bytes: Optional[List[float]] = None
+        self._slowest: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._sorted: Optional[List[float]] = None
+        # Aligned with _durations, filled only with keep_tail_metrics
+        self._tail_bytes_read = array("d")
+        self._tail_gc_times = array("d")
+        self._tail_fetch_waits = array("d")
+        self._tail_spills = array("d")
+        self._tail_hosts: List[str] = []
+
+    def add(self, task: TaskData) -> None:
+        self.tasks += 1
+        if task.status in ("FAILED", "KILLED"):
+            self.failed += 1
+        if task.speculative:
+            self.speculative += 1
+
+        bytes_read = task_bytes_read(task)
+        spill = _spill_bytes(task)
+        executor_id = task.executor_id or "unknown"
+        self.by_executor.setdefault(executor_id, _GroupStats()).add(
+            task, bytes_read, spill
+        )
+        self.by_host.setdefault(task.host, _GroupStats()).add(task, bytes_read, spill)
+        self.bytes_read_histogram.add(bytes_read)
+        self._bytes_read.append(bytes_read)
+        self._sorted_bytes = None
+
+        duration = task.duration
+        if duration is None:
+            return
+        self._durations.append(duration)
+        self._launches.append(
+            task.launch_time.timestamp() * 1000 if task.launch_time else math.nan
+        )
+        self._sorted = None
+        self.duration_histogram.add(duration)
+        if self.keep_tail_metrics:
+            metrics = task.task_metrics
+            shuffle = metrics.shuffle_read_metrics if metrics is not None else None
+            self._tail_bytes_read.append(bytes_read)
+            self._tail_gc_times.append(
+                (metrics.jvm_gc_time or 0) if metrics is not None else 0
+            )
+            self._tail_fetch_waits.append(
+                (shuffle.fetch_wait_time or 0) if shuffle is not None else 0
+            )
+            self._tail_spills.append(spill)
+            self._tail_hosts.append(task.host)
+        if self.top_n:
+            # Only tasks entering the heap are summarized
+            entry = (duration, next(self._sequence))
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, (*entry, task_record(task)))
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (*entry, task_record(task)))
+
+    def add_all(self, tasks: Iterable[TaskData]) -> "TaskStatsAccumulator":
+        for task in tasks:
+            self.add(task)
+        return self
+
+    def sorted_durations(self) -> List[float]:
+        if self._sorted is None:
+            self._sorted = sorted(self._durations)
+        return self._sorted
+
+    def duration_quantile(self, q: float) -> Optional[float]:
+        return quantile(self.sorted_durations(), q)
+
+    def bytes_read_quantile(self, q: float) -> Optional[float]:
+        if self._sorted_bytes is None:
+            self._sorted_bytes = sorted(self._bytes_read)
+        return quantile(self._sorted_bytes, q)
+
+    def count_above(self, threshold_ms: float) -> int:
+        """Number of tasks that ran longer than *threshold_ms*."""
+        durations = self.sorted_durations()
+        return len(durations) - bisect.bisect_right(durations, threshold_ms)
+
+    def wall_clock_lost_ms(self, threshold_ms: float, replacement_ms: float) -> float:
+        """How much later the last task finished because of tasks over a threshold.
+
+        Compares the actual last finish time with the one obtained when every
+        task longer than *threshold_ms* instead takes *replacement_ms*, keeping
+        launch times fixed. Tasks without a launch time are ignored.
+        """
+        actual_end = hypothetical_end = -math.inf
+        for launch, duration in zip(self._launches, self._durations, strict=True):
+            if math.isnan(launch):
+                continue
+            actual_end = max(actual_end, launch + duration)
+            shortened = replacement_ms if duration > threshold_ms else duration
+            hypothetical_end = max(hypothetical_end, launch + shortened)
+        if actual_end == -math.inf:
+            return 0.0
+        return max(0.0, actual_end - hypothetical_end)
+
+    def tail_records(self, threshold_ms: float) -> Iterator[Dict[str, Any]]:
+        """Metrics of every task longer than *threshold_ms*, in stream order.
+
+        Records carry the ``task_record`` keys straggler causes are read from
+        (duration, host, bytes read, GC time, shuffle fetch wait, spill).
+        Requires ``keep_tail_metrics``.
+        """
+        if not self.keep_tail_metrics:
+            raise ValueError("tail_records requires keep_tail_metrics=True")
+        for i, duration in enumerate(self._durations):
+            if duration > threshold_ms:
+                yield {
+                    "duration_ms": duration,
+                    "host": self._tail_hosts[i],
+                    "bytes_read": self._tail_bytes_read[i],
+                    "gc_time_ms": self._tail_gc_times[i],
+                    "shuffle_fetch_wait_ms": self._tail_fetch_waits[i],
+                    "spill_bytes": self._tail_spills[i],
+                }
+
+    def slowest_tasks(self) -> List[Dict[str, Any]]:
+        return [record for _, _, record in sorted(self._slowest, reverse=True)]
+
+    def summary(self, max_groups: Optional[int] = None) -> Dict[str, Any]:
+        """Build the result dict; executor/host groups sorted by busy time."""
+        durations = self.sorted_durations()
+        total = sum(durations)
+        duration_stats: Dict[str, Any] = {
+            "min": durations[0] if durations else None,
+            "mean": round(total / len(durations), 1) if durations else None,
+            "max": durations[-1] if durations else None,
+            "sum": total,
+        }
+        for q in DURATION_QUANTILES:
+            duration_stats[f"p{round(q * 100)}"] = quantile(durations, q)
+
+        return {
+            "task_count": self.tasks,
+            "failed_tasks": self.failed,
+            "speculative_tasks": self.speculative,
+            "duration_ms": duration_stats,
+            "slowest_tasks": self.slowest_tasks(),
+            "by_executor": _ranked_groups(self.by_executor, max_groups),
+            "by_host": _ranked_groups(self.by_host, max_groups),
+            "executor_count": len(self.by_executor),
+            "host_count": len(self.by_host),
+            "histograms": {
+                "duration_ms": self.duration_histogram.buckets(),
+                "bytes_read": self.bytes_read_histogram.buckets(),
+            },
+        }
+
+
+def _ranked_groups(
+    groups: Dict[str, _GroupStats], limit: Optional[int]
+) -> Dict[str, Dict[str, Any]]:
+    ranked = sorted(groups.items(), key=lambda kv: kv[1].duration_sum, reverse=True)
+    if limit is not None:
+        ranked = ranked[:limit]
+    return {name: stats.to_dict() for name, stats in ranked}
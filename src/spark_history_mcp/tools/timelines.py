@@ -1,15 +1,37 @@
 """
 Timeline helpers to build stage-level and app-level executor timelines
 and to merge consecutive intervals with identical diffs.
+
+Counts and totals per interval never test every executor against every
+interval. Times become int64 microsecond offsets, each span is mapped to the
+range of intervals it overlaps with two binary searches, and per-interval
+totals are the cumulative sum of +/- weights at the range bounds. NumPy runs
+this vectorized when installed (``numpy`` extra); the fallback does the same
+with ``bisect``. Per-executor detail lists come from a sorted add/remove sweep.
 """
 
 from __future__ import annotations
 
-from datetime import timedelta
-from typing import Any, Dict, List
+import itertools
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
 
 from .common import DEFAULT_INTERVAL_MINUTES, MAX_INTERVALS
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_BYTES_PER_MB = 1024 * 1024
+_MICROSECOND = timedelta(microseconds=1)
+# End offset of spans that never close
+OPEN_END = 2**62
+
 
 def merge_consecutive_intervals(
     comparison_data: List[Dict[str, Any]],
@@ -66,14 +88,211 @@ def merge_intervals(
     return merged
 
 
+def time_offsets(times: Sequence[datetime], origin: datetime) -> List[int]:
+    """Exact integer microseconds from *origin* to each time."""
+    return [(t - origin) // _MICROSECOND for t in times]
+
+
+def window_overlaps(
+    span_starts: Sequence[int],
+    span_ends: Sequence[int],
+    window_starts: Sequence[int],
+    window_ends: Sequence[int],
+) -> Tuple[Any, Any]:
+    """Index range ``[first, stop)`` of the windows each closed span overlaps.
+
+    Windows must be sorted with non-decreasing starts and ends. A span overlaps
+    a window when ``start <= window_end and end >= window_start``; spans that
+    overlap nothing get an empty range. Offsets are integers (see
+    ``time_offsets``).
+    """
+    if NUMPY_AVAILABLE:
+        first = np.searchsorted(
+            np.asarray(window_ends, dtype=np.int64),
+            np.asarray(span_starts, dtype=np.int64),
+            side="left",
+        )
+        stop = np.searchsorted(
+            np.asarray(window_starts, dtype=np.int64),
+            np.asarray(span_ends, dtype=np.int64),
+            side="right",
+        )
+        return first, np.maximum(stop, first)
+    first = [bisect_left(window_ends, start) for start in span_starts]
+    stop = [
+        max(bisect_right(window_starts, end), lower)
+        for end, lower in zip(span_ends, first, strict=True)
+    ]
+    return first, stop
+
+
+def range_totals(
+    first: Sequence[int],
+    stop: Sequence[int],
+    count: int,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Any]:
+    """Per-window sum of *weights* (1 each by default) over ``[first, stop)``."""
+    if NUMPY_AVAILABLE:
+        if weights is None or not len(first):
+            values = np.ones(len(first), dtype=np.int64)
+        else:
+            values = np.asarray(weights)
+        if values.dtype.kind in "bui":
+            values = values.astype(np.int64)
+        delta = np.zeros(count + 1, dtype=values.dtype)
+        np.add.at(delta, np.asarray(first, dtype=np.intp), values)
+        np.subtract.at(delta, np.asarray(stop, dtype=np.intp), values)
+        return np.cumsum(delta[:count]).tolist()
+    delta = [0] * (count + 1)
+    if weights is None:
+        weights = [1] * len(first)
+    for lower, upper, weight in zip(first, stop, weights, strict=True):
+        delta[lower] += weight
+        delta[upper] -= weight
+    return list(itertools.accumulate(delta[:count]))
+
+
+def merge_ranges_by_key(
+    first: Sequence[int], stop: Sequence[int], keys: Sequence[Hashable]
+) -> Tuple[List[int], List[int]]:
+    """Union the window ranges sharing a key, so each key counts once."""
+    by_key: Dict[Hashable, List[Tuple[int, int]]] = defaultdict(list)
+    for lower, upper, key in zip(first, stop, keys, strict=True):
+        if upper > lower:
+            by_key[key].append((int(lower), int(upper)))
+    merged_first: List[int] = []
+    merged_stop: List[int] = []
+    for ranges in by_key.values():
+        ranges.sort()
+        lower, upper = ranges[0]
+        for next_lower, next_upper in ranges[1:]:
+            if next_lower > upper:
+                merged_first.append(lower)
+                merged_stop.append(upper)
+                lower = next_lower
+            upper = max(upper, next_upper)
+        merged_first.append(lower)
+        merged_stop.append(upper)
+    return merged_first, merged_stop
+
+
+def _grid_offsets(
+    count: int, step: timedelta, total: timedelta
+) -> Tuple[Sequence[int], Sequence[int]]:
+    """Start and end offsets of *count* consecutive windows of length *step*."""
+    step_us = step // _MICROSECOND
+    total_us = total // _MICROSECOND
+    if NUMPY_AVAILABLE:
+        starts = np.arange(count, dtype=np.int64) * step_us
+        return starts, np.minimum(starts + step_us, total_us)
+    starts = [index * step_us for index in range(count)]
+    return starts, [min(start + step_us, total_us) for start in starts]
+
+
+class _SpanSweep:
+    """Active set of closed spans ``[start, end]`` over ascending windows.
+
+    ``advance(lo, hi)`` moves to the next window; a span is active while
+    ``start <= hi and end >= lo``, the same test as ``window_overlaps``.
+    Windows must not move backwards (non-decreasing ``lo`` and ``hi``), so
+    each span joins and leaves ``active`` at most once.
+    """
+
+    def __init__(self, spans: Sequence[Tuple[Any, Any]]) -> None:
+        self._spans = spans
+        self._by_start = sorted(range(len(spans)), key=lambda i: spans[i][0])
+        self._by_end = sorted(range(len(spans)), key=lambda i: spans[i][1])
+        self._next_start = 0
+        self._next_end = 0
+        self._removed = [False] * len(spans)
+        self.active: set = set()
+
+    def advance(self, lo: Any, hi: Any) -> None:
+        spans = self._spans
+        # Spans that started by the end of the window join first...
+        while (
+            self._next_start < len(spans)
+            and spans[self._by_start[self._next_start]][0] <= hi
+        ):
+            index = self._by_start[self._next_start]
+            self._next_start += 1
+            if not self._removed[index]:
+                self.active.add(index)
+        # ...then those that ended before it began leave for good
+        while (
+            self._next_end < len(spans) and spans[self._by_end[self._next_end]][1] < lo
+        ):
+            index = self._by_end[self._next_end]
+            self._next_end += 1
+            self._removed[index] = True
+            self.active.discard(index)
+
+
+def _interval_windows(
+    start: datetime, end: datetime, interval_minutes: int, max_intervals: int
+) -> List[Tuple[datetime, datetime]]:
+    """Consecutive ``(start, end)`` windows covering ``[start, end)``."""
+    step = timedelta(minutes=interval_minutes)
+    count = min(max_intervals, max(0, -(-(end - start) // step)))
+    return [
+        (start + index * step, min(start + (index + 1) * step, end))
+        for index in range(count)
+    ]
+
+
+def _executor_totals(
+    spans: Sequence[Tuple[datetime, datetime]],
+    weights: Sequence[Tuple[int, int]],
+    origin: datetime,
+    window_starts: Sequence[int],
+    window_ends: Sequence[int],
+) -> Tuple[List[int], List[int], List[int]]:
+    """Active executor count, cores and memory bytes per window."""
+    first, stop = window_overlaps(
+        time_offsets([span[0] for span in spans], origin),
+        time_offsets([span[1] for span in spans], origin),
+        window_starts,
+        window_ends,
+    )
+    count = len(window_starts)
+    return (
+        range_totals(first, stop, count),
+        range_totals(first, stop, count, [weight[0] for weight in weights]),
+        range_totals(first, stop, count, [weight[1] for weight in weights]),
+    )
+
+
+def _executor_spans(
+    executors: List[Any], default_start: datetime, default_end: datetime
+) -> Tuple[List[Tuple[datetime, datetime]], List[Tuple[int, int]]]:
+    """Lifetime span and ``(cores, memory bytes)`` weight of each executor."""
+    spans = [
+        (executor.add_time or default_start, executor.remove_time or default_end)
+        for executor in executors
+    ]
+    weights = [
+        (executor.total_cores or 0, executor.max_memory or 0) for executor in executors
+    ]
+    return spans, weights
+
+
+def _memory_mb(memory_bytes: int) -> float:
+    return memory_bytes / _BYTES_PER_MB if memory_bytes else 0
+
+
 def build_stage_executor_timeline(
     stage,
     executors: List[Any],
     interval_minutes: int = DEFAULT_INTERVAL_MINUTES,
     max_intervals: int = MAX_INTERVALS,
+    include_executor_details: bool = True,
 ) -> Dict[str, Any]:
     """Build executor timeline for a single stage given executors.
 
+    With ``include_executor_details=False`` the per-interval
+    ``active_executors`` lists are omitted, leaving only counts and totals.
+
     Returns a dict with keys: stage_info, timeline.
     """
     if not stage.submission_time:
@@ -96,58 +315,47 @@ def build_stage_executor_timeline(
     if stage_end <= stage_start:
         stage_end = stage_start + timedelta(minutes=interval_minutes)
 
-    timeline: List[Dict[str, Any]] = []
-    current_time = stage_start
-    interval_count = 0
-
-    while current_time < stage_end and interval_count < max_intervals:
-        interval_end = current_time + timedelta(minutes=interval_minutes)
-        if interval_end >= stage_end:
-            interval_end = stage_end
-
-        active_executors = []
-        total_cores = 0
-        total_memory = 0
-
-        for executor in executors:
-            executor_start = executor.add_time or stage_start
-            executor_end = executor.remove_time or stage_end
-
-            if executor_start <= interval_end and executor_end >= current_time:
-                active_executors.append(
-                    {
-                        "id": executor.id,
-                        "host_port": executor.host_port,
-                        "cores": executor.total_cores or 0,
-                        "memory_mb": (executor.max_memory / (1024 * 1024))
-                        if executor.max_memory
-                        else 0,
-                    }
-                )
-                total_cores += executor.total_cores or 0
-                total_memory += (
-                    (executor.max_memory / (1024 * 1024)) if executor.max_memory else 0
-                )
+    step = timedelta(minutes=interval_minutes)
+    windows = _interval_windows(stage_start, stage_end, interval_minutes, max_intervals)
+    spans, weights = _executor_spans(executors, stage_start, stage_end)
+    counts, cores, memory = _executor_totals(
+        spans,
+        weights,
+        stage_start,
+        *_grid_offsets(len(windows), step, stage_end - stage_start),
+    )
 
+    timeline: List[Dict[str, Any]] = []
+    for index, (current_time, interval_end) in enumerate(windows):
         timeline.append(
             {
                 "timestamp": current_time.isoformat(),
                 "interval_start": current_time.isoformat(),
                 "interval_end": interval_end.isoformat(),
-                "active_executor_count": len(active_executors),
-                "total_cores": total_cores,
-                "total_memory_mb": total_memory,
-                "active_executors": active_executors,
+                "active_executor_count": counts[index],
+                "total_cores": cores[index],
+                "total_memory_mb": _memory_mb(memory[index]),
             }
         )
 
-        if interval_end >= stage_end:
-            break
-
-        current_time = interval_end
-        interval_count += 1
-
-    if interval_count >= max_intervals:
+    if include_executor_details:
+        # One detail dict per executor, shared by every interval it is active in
+        details = [
+            {
+                "id": executor.id,
+                "host_port": executor.host_port,
+                "cores": executor.total_cores or 0,
+                "memory_mb": _memory_mb(executor.max_memory),
+            }
+            for executor in executors
+        ]
+        sweep = _SpanSweep(spans)
+        for entry, (current_time, interval_end) in zip(timeline, windows, strict=True):
+            sweep.advance(current_time, interval_end)
+            entry["active_executors"] = [details[i] for i in sorted(sweep.active)]
+
+    covered_until = windows[-1][1] if windows else stage_start
+    if covered_until < stage_end:
         timeline.append(
             {
                 "warning": f"Timeline truncated at {max_intervals} intervals to prevent excessive memory usage",
@@ -193,97 +401,40 @@ def build_app_executor_timeline(
     if not start_time:
         return None
 
-    timeline_events = []
-    for executor in executors:
-        if executor.add_time:
-            timeline_events.append(
-                {
-                    "timestamp": executor.add_time,
-                    "type": "executor_add",
-                    "executor_id": executor.id,
-                    "cores": executor.total_cores or 0,
-                    "memory_mb": (executor.max_memory / (1024 * 1024))
-                    if executor.max_memory
-                    else 0,
-                }
-            )
-        if executor.remove_time:
-            timeline_events.append(
-                {
-                    "timestamp": executor.remove_time,
-                    "type": "executor_remove",
-                    "executor_id": executor.id,
-                }
-            )
-
-    for stage in stages:
-        if stage.submission_time:
-            timeline_events.append(
-                {
-                    "timestamp": stage.submission_time,
-                    "type": "stage_start",
-                    "stage_id": stage.stage_id,
-                    "name": stage.name,
-                }
-            )
-        if stage.completion_time:
-            timeline_events.append(
-                {
-                    "timestamp": stage.completion_time,
-                    "type": "stage_end",
-                    "stage_id": stage.stage_id,
-                }
-            )
-
-    timeline_events.sort(key=lambda x: x["timestamp"])  # for future use
-
-    timeline: List[Dict[str, Any]] = []
-    current_time = start_time
-    interval_count = 0
-
-    while current_time < end_time and interval_count < max_intervals:
-        interval_end = current_time + timedelta(minutes=interval_minutes)
-        if interval_end > end_time:
-            interval_end = end_time
-
-        active_executor_count = 0
-        total_cores = 0
-        total_memory_mb = 0
-        active_stages = set()
-
-        for executor in executors:
-            executor_start = executor.add_time or start_time
-            executor_end = executor.remove_time or end_time
-            if executor_start <= interval_end and executor_end >= current_time:
-                active_executor_count += 1
-                total_cores += executor.total_cores or 0
-                total_memory_mb += (
-                    (executor.max_memory / (1024 * 1024)) if executor.max_memory else 0
-                )
-
-        for stage in stages:
-            stage_start = stage.submission_time
-            stage_end = stage.completion_time or end_time
-            if (
-                stage_start
-                and stage_start <= interval_end
-                and stage_end >= current_time
-            ):
-                active_stages.add(stage.stage_id)
+    step = timedelta(minutes=interval_minutes)
+    windows = _interval_windows(start_time, end_time, interval_minutes, max_intervals)
+    window_starts, window_ends = _grid_offsets(
+        len(windows), step, end_time - start_time
+    )
+    spans, weights = _executor_spans(executors, start_time, end_time)
+    counts, cores, memory = _executor_totals(
+        spans, weights, start_time, window_starts, window_ends
+    )
 
-        timeline.append(
-            {
-                "interval_start": current_time.isoformat(),
-                "interval_end": interval_end.isoformat(),
-                "active_executor_count": active_executor_count,
-                "total_cores": total_cores,
-                "total_memory_mb": total_memory_mb,
-                "active_stages_count": len(active_stages),
-            }
-        )
+    submitted = [stage for stage in stages if stage.submission_time]
+    stage_first, stage_stop = window_overlaps(
+        time_offsets([s.submission_time for s in submitted], start_time),
+        time_offsets([s.completion_time or end_time for s in submitted], start_time),
+        window_starts,
+        window_ends,
+    )
+    # Attempts of the same stage count once, as they share a stage_id
+    active_stages = range_totals(
+        *merge_ranges_by_key(stage_first, stage_stop, [s.stage_id for s in submitted]),
+        len(windows),
+    )
 
-        current_time = interval_end
-        interval_count += 1
+    timeline: List[Dict[str, Any]] = [
+        {
+            "interval_start": current_time.isoformat(),
+            "interval_end": interval_end.isoformat(),
+            "active_executor_count": counts[index],
+            "total_cores": cores[index],
+            "total_memory_mb": _memory_mb(memory[index]),
+            "active_stages_count": active_stages[index],
+        }
+        for index, (current_time, interval_end) in enumerate(windows)
+    ]
 
     return {
         "app_info": {
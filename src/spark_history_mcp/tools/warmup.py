@@ -0,0 +1,263 @@
+"""
+Cache warm-up tools for MCP server.
+
+Prefetches the data most tools need (application, environment, jobs, stages
+with summaries, executors) for a batch of applications so later analyses are
+served from the disk cache. Applications are processed by a bounded worker
+pool that never runs more than a configured number of applications against
+the same History Server at once.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from ..core.app import mcp
+from . import common, fetchers
+from .concurrency import submit_with_context
+
+# Resource name -> fetcher call; keys match those used by the analysis tools
+WARM_RESOURCES: Dict[str, Callable[[str, Optional[str]], Any]] = {
+    "app": lambda app_id, server: fetchers.fetch_app(app_id, server),
+    "env": lambda app_id, server: fetchers.fetch_env(app_id, server),
+    "jobs": lambda app_id, server: fetchers.fetch_jobs(app_id, server),
+    "stages": lambda app_id, server: fetchers.fetch_stages(
+        app_id, server, with_summaries=True
+    ),
+    "executors": lambda app_id, server: fetchers.fetch_executors(app_id, server),
+}
+
+
+def select_applications(
+    server: Optional[str] = None,
+    app_ids: Optional[Sequence[str]] = None,
+    app_name: Optional[str] = None,
+    search_type: str = "contains",
+    status: Optional[List[str]] = None,
+    min_date: Optional[str] = None,
+    max_date: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """Return explicit *app_ids*, or the IDs matched by ``list_applications``.
+
+    Without explicit IDs only completed applications are selected by default,
+    since data of running applications is never persisted.
+    """
+    if app_ids:
+        return list(dict.fromkeys(app_ids))
+
+    from .application import list_applications
+
+    apps = list_applications(
+        server=server,
+        status=status or ["COMPLETED"],
+        min_date=min_date,
+        max_date=max_date,
+        limit=limit,
+        app_name=app_name,
+        search_type=search_type,
+        compact=False,
+    )
+    return [app.id for app in apps]
+
+
+def _warm_one(app_id: str, server: Optional[str], resources: Sequence[str]):
+    started = time.perf_counter()
+    app = fetchers.fetch_app(app_id, server)
+    if app is None:
+        raise ValueError(f"Application {app_id} not found")
+    if not fetchers.is_completed(app):
+        return {"status": "running", "requests": 1}
+
+    errors = {}
+    requests = 1
+    for name in resources:
+        if name == "app":
+            continue
+        requests += 1
+        try:
+            WARM_RESOURCES[name](app_id, server)
+        except Exception as e:
+            errors[name] = str(e)
+    return {
+        "status": "partial" if errors else "warmed",
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def warm_applications(
+    targets: Sequence[Tuple[Optional[str], str]],
+    resources: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+    per_server_limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Prefetch *resources* for each ``(server, app_id)`` target into the cache.
+
+    Args:
+        targets: Applications to warm, with the server each one lives on
+        resources: Subset of ``WARM_RESOURCES`` (default: all)
+        max_workers: Applications warmed concurrently overall
+        per_server_limit: Applications warmed concurrently per server
+
+    Returns:
+        Counts, throughput, per-server totals and the applications that failed
+        entirely or had some resources fail (``partial``).
+    """
+    cfg = common.get_config()
+    resources = list(resources or WARM_RESOURCES)
+    unknown = sorted(set(resources) - set(WARM_RESOURCES))
+    if unknown:
+        raise ValueError(
+            f"Unknown resources {unknown}; expected a subset of {list(WARM_RESOURCES)}"
+        )
+    max_workers = max(1, max_workers or cfg.cache_warm_max_workers)
+    per_server_limit = max(1, per_server_limit or cfg.cache_warm_per_server_limit)
+
+    queues: Dict[Optional[str], Deque[str]] = {}
+    for server, app_id in dict.fromkeys(targets):
+        queues.setdefault(server, deque()).append(app_id)
+    requested = sum(len(queue) for queue in queues.values())
+    in_flight: Dict[Optional[str], int] = dict.fromkeys(queues, 0)
+    by_server = {
+        common.get_server_key(s): {"warmed": 0, "running": 0, "failed": 0}
+        for s in queues
+    }
+    failures: List[Dict[str, Any]] = []
+    warmed = running = failed = partial = requests = 0
+
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="shs-warm"
+    )
+    futures: Dict[Future, Tuple[Optional[str], str]] = {}
+
+    def fill() -> None:
+        # Round-robin over servers so one slow server cannot starve the others
+        progressed = True
+        while progressed and len(futures) < max_workers:
+            progressed = False
+            for server, queue in queues.items():
+                if len(futures) >= max_workers:
+                    break
+                if queue and in_flight[server] < per_server_limit:
+                    app_id = queue.popleft()
+                    in_flight[server] += 1
+                    future = submit_with_context(
+                        executor, _warm_one, app_id, server, resources
+                    )
+                    futures[future] = (server, app_id)
+                    progressed = True
+
+    try:
+        fill()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                server, app_id = futures.pop(future)
+                in_flight[server] -= 1
+                totals = by_server[common.get_server_key(server)]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    requests += 1
+                    failed += 1
+                    totals["failed"] += 1
+                    failures.append(
+                        {"app_id": app_id, "server": server, "error": str(e)}
+                    )
+                    continue
+                requests += outcome["requests"]
+                if outcome["status"] == "running":
+                    running += 1
+                    totals["running"] += 1
+                    continue
+                warmed += 1
+                totals["warmed"] += 1
+                if outcome["errors"]:
+                    partial += 1
+                    failures.append(
+                        {
+                            "app_id": app_id,
+                            "server": server,
+                            "errors": outcome["errors"],
+                        }
+                    )
+            fill()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "requested": requested,
+        "warmed": warmed,
+        "partial": partial,
+        "skipped_running": running,
+        "failed": failed,
+        "resources": resources,
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "apps_per_second": round(warmed / elapsed, 2) if elapsed > 0 else None,
+        "by_server": by_server,
+        "failures": failures,
+    }
+
+
+@mcp.tool()
+def warm_cache(
+    app_ids: Optional[list[str]] = None,
+    servers: Optional[list[str]] = None,
+    app_name: Optional[str] = None,
+    search_type: str = "contains",
+    status: Optional[list[str]] = None,
+    min_date: Optional[str] = None,
+    max_date: Optional[str] = None,
+    limit: Optional[int] = None,
+    resources: Optional[list[str]] = None,
+    max_workers: Optional[int] = None,
+    per_server_limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Prefetch application data into the cache for a batch of applications.
+
+    Warms app, environment, jobs, stages (with summaries) and executors so
+    later analyses of these applications are served from the cache. Select
+    applications either by ID or with the same filters as list_applications.
+
+    Args:
+        app_ids: Explicit application IDs to warm
+        servers: Server names to warm from (uses default if not specified)
+        app_name: Application name or pattern to select applications by
+        search_type: Type of name search - "exact", "contains", or "regex"
+        status: Application statuses to select (default: ["COMPLETED"])
+        min_date: Minimum start date (yyyy-MM-dd'T'HH:mm:ss.SSSz or yyyy-MM-dd)
+        max_date: Maximum start date
+        limit: Maximum number of applications to select per server
+        resources: Subset of app, env, jobs, stages, executors (default: all)
+        max_workers: Applications warmed concurrently overall
+        per_server_limit: Applications warmed concurrently per server
+
+    Returns:
+        Dictionary with warmed/failed counts, throughput and per-server totals
+    """
+    targets = []
+    for server in servers or [None]:
+        ids = select_applications(
+            server=server,
+            app_ids=app_ids,
+            app_name=app_name,
+            search_type=search_type,
+            status=status,
+            min_date=min_date,
+            max_date=max_date,
+            limit=limit,
+        )
+        targets.extend((server, app_id) for app_id in ids)
+    return warm_applications(
+        targets,
+        resources=resources,
+        max_workers=max_workers,
+        per_server_limit=per_server_limit,
+    )
@@ -97,20 +97,23 @@ class TestEMRIntegration(unittest.TestCase):
                 emr_cluster_arn=self.emr_cluster_arn, default=True, verify_ssl=True
             )
         }
+        mock_config.mcp.warm_up_clients = False
         mock_config_from_file.return_value = mock_config
 
         # Use the app_lifespan context manager
         async def test_lifespan():
             async with app_lifespan(mock_server) as context:
-                # Verify EMR client was created and initialized
+                # The EMR client is only created on first use
+                self.assertIn("emr", context.clients)
+                mock_emr_client_class.assert_not_called()
+                self.assertEqual(context.clients.status()["emr"]["state"], "pending")
+
+                self.assertEqual(context.default_client, context.clients["emr"])
                 mock_emr_client_class.assert_called_once_with(
                     mock_config.servers["emr"]
                 )
                 mock_emr_client.initialize.assert_called_once()
-
-                # Verify context has clients
-                self.assertIn("emr", context.clients)
-                self.assertEqual(context.default_client, context.clients["emr"])
+                self.assertEqual(context.clients.status()["emr"]["state"], "ready")
 
         # Run the async test
         try:
@@ -1,7 +1,7 @@
 """
 Tests for analyze CLI commands.
 
-Covers insights, bottlenecks, auto-scaling, shuffle-skew, slowest, and deprecated compare.
+Covers insights, bottlenecks, auto-scaling, shuffle-skew, stragglers, slowest, and deprecated compare.
 """
 
 import tempfile
@@ -131,6 +131,37 @@ class TestAnalyzeShuffleSkew:
         )
 
 
+class TestAnalyzeStragglers:
+    @patch("spark_history_mcp.cli.commands.analyze.get_spark_client")
+    @patch("spark_history_mcp.tools.analyze_stragglers")
+    def test_stragglers(self, mock_analyze_stragglers, mock_get_client, cli_runner):
+        mock_get_client.return_value = MagicMock()
+        mock_analyze_stragglers.return_value = {"stages": []}
+
+        result = cli_runner.invoke(
+            analyze,
+            [
+                "stragglers",
+                "app-1",
+                "--top-stages",
+                "3",
+                "--tail-ratio",
+                "3",
+                "--format",
+                "json",
+            ],
+            obj={"config_path": CONFIG_PATH},
+        )
+        assert result.exit_code == 0
+        mock_analyze_stragglers.assert_called_once_with(
+            app_id="app-1",
+            server=None,
+            top_stages=3,
+            tail_ratio=3.0,
+            max_tail_tasks=10,
+        )
+
+
 class TestAnalyzeSlowest:
     @patch("spark_history_mcp.cli.commands.analyze.get_spark_client")
     @patch("spark_history_mcp.tools.find_slowest")
@@ -0,0 +1,163 @@
+"""
+Tests for spark_history_mcp.cli.commands.cache module.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+try:
+    from click.testing import CliRunner
+
+    CLI_AVAILABLE = True
+except ImportError:
+    CLI_AVAILABLE = False
+
+from spark_history_mcp import cache
+from spark_history_mcp.config.config import CacheConfig
+
+if CLI_AVAILABLE:
+    from spark_history_mcp.cli.commands.cache import cache_cmd
+
+
+@pytest.fixture
+def populated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig(max_bytes=None, max_entries=None))
+    for i in range(3):
+        cache.disk_set(("srv", "stages", f"app-{i}"), "[]")
+    cache.disk_set(("srv", "env", "app-0"), "{}")
+    cache.disk_get(("srv", "env", "app-0"))
+    yield
+    cache.clear_cache()
+    cache.configure(None)
+
+
+@pytest.mark.skipif(not CLI_AVAILABLE, reason="CLI dependencies not available")
+class TestCacheCommands:
+    def test_stats_human(self, populated_cache):
+        result = CliRunner().invoke(cache_cmd, ["stats"])
+
+        assert result.exit_code == 0
+        assert "Entries: 4 / unlimited" in result.output
+        assert "stages" in result.output
+        assert "Hit rate: 100.0%" in result.output
+
+    def test_stats_json(self, populated_cache):
+        result = CliRunner().invoke(cache_cmd, ["stats", "--format", "json"])
+
+        stats = json.loads(result.output)
+        assert stats["namespaces"]["stages"]["entries"] == 3
+        assert stats["namespaces"]["env"]["hits"] == 1
+        assert set(stats["stores"]) == {"task-columns", "event-log-index"}
+
+    def test_prune(self, populated_cache):
+        result = CliRunner().invoke(cache_cmd, ["prune", "--max-entries", "1"])
+
+        assert result.exit_code == 0
+        assert "3 evicted" in result.output
+        assert len(cache.iter_entries()) == 1
+
+    def test_commands_cover_saved_task_columns(self, populated_cache):
+        store = cache.get_file_store("task-columns")
+        path = store.app_dir("srv", "app-0") / "1_0.cols"
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"x" * 100)
+        other = store.app_dir("srv", "app-1") / "1_0.cols"
+        other.parent.mkdir(parents=True)
+        other.write_bytes(b"x" * 100)
+
+        stats = json.loads(
+            CliRunner().invoke(cache_cmd, ["stats", "--format", "json"]).output
+        )
+        assert stats["stores"]["task-columns"]["files"] == 2
+        assert stats["stores"]["task-columns"]["bytes"] == 200
+
+        result = CliRunner().invoke(cache_cmd, ["invalidate", "app-0"])
+        assert result.exit_code != 0
+        assert not path.exists() and other.exists()
+
+        store.max_bytes = 50
+        result = CliRunner().invoke(cache_cmd, ["prune"])
+        assert "task-columns: removed 1 files" in result.output
+        assert not other.exists()
+
+        other.parent.mkdir(parents=True)
+        other.write_bytes(b"x")
+        result = CliRunner().invoke(cache_cmd, ["clear"])
+        assert "Cleared 5 cached entries" in result.output
+        assert not store.root.exists()
+
+    def test_invalidate_requires_sqlite_backend(self, populated_cache):
+        result = CliRunner().invoke(cache_cmd, ["invalidate", "app-0"])
+
+        assert result.exit_code != 0
+        assert "SHS_CACHE_BACKEND=sqlite" in result.output
+
+    def test_invalidate_app(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+        cache.configure(CacheConfig(backend="sqlite"))
+        try:
+            cache.disk_set(("srv", "stages", "app-0"), "[]")
+            cache.disk_set(("srv", "env", "app-0"), "{}")
+            cache.disk_set(("srv", "env", "app-1"), "{}")
+
+            result = CliRunner().invoke(cache_cmd, ["invalidate", "app-0"])
+
+            assert result.exit_code == 0
+            assert "Removed 2 cached entries for app-0" in result.output
+            assert len(cache.iter_entries()) == 1
+        finally:
+            cache.clear_cache()
+            cache.configure(None)
+
+    def test_warm_requires_a_selection(self):
+        result = CliRunner().invoke(cache_cmd, ["warm"])
+
+        assert result.exit_code != 0
+        assert "APP_IDS" in result.output
+
+    def test_warm_uses_named_server_clients(self):
+        clients = {"a": MagicMock(), "b": MagicMock()}
+        summary = {
+            "requested": 2,
+            "warmed": 1,
+            "partial": 0,
+            "skipped_running": 0,
+            "failed": 1,
+            "requests": 6,
+            "elapsed_s": 0.5,
+            "apps_per_second": 2.0,
+            "by_server": {},
+            "failures": [{"app_id": "app-2", "server": "b", "error": "boom"}],
+        }
+
+        def fake_warm(**kwargs):
+            import spark_history_mcp.tools as tools_module
+
+            ctx = tools_module.mcp.get_context().request_context.lifespan_context
+            assert ctx.clients["a"] is clients["a"]
+            assert ctx.clients["b"] is clients["b"]
+            assert kwargs["servers"] == ["a", "b"]
+            assert kwargs["app_ids"] == ["app-1", "app-2"]
+            assert kwargs["resources"] == ["app", "stages"]
+            return summary
+
+        with (
+            patch(
+                "spark_history_mcp.cli.utils.context.get_spark_client",
+                side_effect=lambda path, name: clients[name],
+            ),
+            patch("spark_history_mcp.tools.warm_cache", side_effect=fake_warm),
+        ):
+            result = CliRunner().invoke(
+                cache_cmd,
+                ["warm", "app-1", "app-2", "-s", "a", "-s", "b"]
+                + ["--resources", "app,stages"],
+                obj={"config_path": "config.yaml"},
+            )
+
+        assert result.exit_code == 1
+        assert "Warmed 1 of 2 applications" in result.output
+        assert "app-2: boom" in result.output
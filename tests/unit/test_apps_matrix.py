@@ -0,0 +1,161 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.models.spark_types import (
+    ApplicationInfo,
+    ExecutorSummary,
+    StageData,
+)
+from spark_history_mcp.tools import fetchers
+from spark_history_mcp.tools.comparison_modules.matrix import (
+    _stage_rows,
+    compare_apps_matrix,
+    spread,
+)
+
+
+def _app(app_id):
+    return ApplicationInfo.model_validate(
+        {
+            "id": app_id,
+            "name": "nightly etl",
+            "attempts": [
+                {
+                    "attemptId": "1",
+                    "startTime": "2024-01-01T00:00:00.000GMT",
+                    "endTime": "2024-01-01T00:10:00.000GMT",
+                    "duration": 600_000,
+                    "completed": True,
+                }
+            ],
+        }
+    )
+
+
+def _stage(stage_id, name, seconds):
+    return StageData.model_validate(
+        {
+            "status": "COMPLETE",
+            "stageId": stage_id,
+            "attemptId": 0,
+            "numTasks": 10,
+            "name": name,
+            "details": "",
+            "submissionTime": "2024-01-01T00:01:00.000GMT",
+            "completionTime": f"2024-01-01T00:01:{seconds:02d}.000GMT",
+            "executorRunTime": seconds * 60_000,
+            "inputBytes": 1 << 30,
+        }
+    )
+
+
+def _stages(join_seconds, offset):
+    # Stage IDs differ between runs; names and order stay the same
+    return [
+        _stage(offset + 1, "join at Etl.scala:10", join_seconds),
+        _stage(offset + 2, "save at Etl.scala:20", 5),
+    ]
+
+
+EXECUTOR = ExecutorSummary.model_validate(
+    {
+        "id": "1",
+        "addTime": "2024-01-01T00:00:00.000GMT",
+        "attributes": {},
+        "resources": {},
+    }
+)
+JOIN_SECONDS = {"base": 20, "run-1": 30, "run-2": 10, "run-3": 40}
+
+
+@pytest.fixture
+def client():
+    client = MagicMock(spec=SparkRestClient)
+
+    def get_application(app_id):
+        if app_id not in JOIN_SECONDS:
+            raise RuntimeError("not found")
+        return _app(app_id)
+
+    client.get_application.side_effect = get_application
+    client.list_stages.side_effect = lambda app_id, **kwargs: _stages(
+        JOIN_SECONDS[app_id], offset=10 * len(app_id)
+    )
+    client.list_all_executors.return_value = [EXECUTOR]
+    with patch.object(fetchers, "_resolve_client", return_value=(client, False, False)):
+        yield client
+
+
+def test_spread_ignores_missing_values():
+    assert spread([1.0, None, 3.0]) == {
+        "count": 2,
+        "min": 1.0,
+        "max": 3.0,
+        "mean": 2.0,
+        "median": 2.0,
+        "stdev": 1.0,
+        "cv_percent": 50.0,
+    }
+    assert spread([None]) == {"count": 0}
+
+
+def test_matrix_fetches_each_app_once_and_aligns_on_baseline(client):
+    result = compare_apps_matrix(
+        ["run-1", "run-2", "base", "run-1", "run-3"], baseline="base"
+    )
+
+    assert client.get_application.call_count == 4
+    assert client.list_stages.call_count == 4
+    assert [a["id"] for a in result["applications"]] == [
+        "base",
+        "run-1",
+        "run-2",
+        "run-3",
+    ]
+
+    runtime = result["metrics"]["total_executor_runtime_minutes"]
+    # 1 minute of executor time per second of the join stage, plus 5 for save
+    assert runtime["values"] == [25.0, 35.0, 15.0, 45.0]
+    assert runtime["change_percent"] == [0.0, 40.0, -40.0, 80.0]
+    assert runtime["spread"]["min"] == 15.0
+    assert runtime["spread"]["max"] == 45.0
+    # Unchanged metrics have no spread and sort last
+    assert result["metrics"]["input_data_size_gb"]["spread"]["cv_percent"] == 0.0
+    assert list(result["metrics"])[0] == "total_executor_runtime_minutes"
+
+    stages = result["stages"]
+    assert stages["matched_stages"] == {"run-1": 2, "run-2": 2, "run-3": 2}
+    join = stages["most_variable"][0]
+    assert join["name"] == "join at Etl.scala:10"
+    assert join["duration_ms"] == [20_000, 30_000, 10_000, 40_000]
+    assert "errors" not in result
+
+
+def test_unavailable_apps_are_reported_and_left_out(client):
+    result = compare_apps_matrix(["base", "missing", "run-1"])
+
+    assert result["errors"]["missing"].startswith("Failed to fetch app")
+    assert [a["id"] for a in result["applications"]] == ["base", "run-1"]
+    assert compare_apps_matrix(["missing", "base"])["error"].startswith(
+        "Failed to load baseline missing"
+    )
+    assert "error" in compare_apps_matrix(["base"])
+
+
+def test_zero_stage_duration_is_kept():
+    stages = {
+        "base": _stages(20, 0),
+        "instant": _stages(0, 10),
+        "unknown": [
+            s.model_copy(update={"completion_time": None}) for s in _stages(30, 20)
+        ],
+    }
+    with patch.object(fetchers, "fetch_stage_fingerprints", return_value={}):
+        rows = _stage_rows(list(stages), stages, 0.6, 5)
+
+    join = rows["most_variable"][0]
+    assert join["name"] == "join at Etl.scala:10"
+    assert join["duration_ms"] == [20_000, 0.0, None]
+    assert join["spread"]["count"] == 2
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from spark_history_mcp import cache
+from spark_history_mcp.cache import codec
+from spark_history_mcp.config.config import CacheConfig
+from spark_history_mcp.models.spark_types import ExecutorSummary, StageData
+from spark_history_mcp.tools import fetchers
+
+
+def _stage(stage_id):
+    return StageData.model_validate(
+        {
+            "status": "COMPLETE",
+            "stageId": stage_id,
+            "attemptId": 0,
+            "name": f"stage {stage_id}",
+            "details": "",
+            "submissionTime": "2024-01-01T00:00:00.000GMT",
+            "completionTime": "2024-01-01T00:01:00.000GMT",
+            "executorSummary": {"1": {"taskTime": 10, "inputBytes": 5}},
+            "taskMetricsDistributions": {
+                "quantiles": [0.5, 1.0],
+                "duration": [1.0, 2.0],
+                "shuffleReadMetrics": {"readBytes": [3.0, 4.0]},
+            },
+        }
+    )
+
+
+def _executor(executor_id):
+    return ExecutorSummary.model_validate(
+        {
+            "id": executor_id,
+            "hostPort": "host:1",
+            "addTime": "2024-01-01T00:00:00.000GMT",
+            "excludedInStages": [1, 2],
+            "attributes": {},
+            "resources": {},
+        }
+    )
+
+
+def test_models_round_trip_through_compact_encoding():
+    stages = [_stage(i) for i in range(3)]
+    executors = [_executor(str(i)) for i in range(3)]
+
+    assert codec.decode_models(codec.encode_models(stages), StageData) == stages
+    assert codec.decode_models(codec.encode_models(executors), ExecutorSummary) == (
+        executors
+    )
+    assert codec.decode_model(codec.encode_model(stages[0]), StageData) == stages[0]
+
+
+def test_payload_is_framed_compressed_and_omits_nulls():
+    stages = [_stage(i) for i in range(50)]
+    payload = codec.encode_models(stages)
+    plain = json.dumps([s.model_dump(mode="json") for s in stages]).encode()
+
+    assert payload.startswith(codec.MAGIC)
+    assert len(payload) < len(plain) / 10
+    assert b"null" not in codec.decompress(payload)
+
+
+def test_gzip_fallback_without_zstandard(monkeypatch):
+    monkeypatch.setattr(codec, "ZSTD_AVAILABLE", False)
+    payload = codec.encode_text('{"a": 1}')
+
+    assert payload[len(codec.MAGIC) : len(codec.MAGIC) + 1] == codec.GZIP
+    assert codec.decode_text(payload) == '{"a": 1}'
+
+
+def test_zstd_payload_without_zstandard_is_an_error(monkeypatch):
+    monkeypatch.setattr(codec, "ZSTD_AVAILABLE", False)
+    with pytest.raises(codec.CodecError, match="zstandard"):
+        codec.decompress(codec.MAGIC + codec.ZSTD + b"\x00")
+
+
+def test_unframed_payloads_are_read_as_plain_json():
+    legacy = json.dumps([_stage(1).model_dump(mode="json")]).encode()
+    assert codec.decode_models(legacy, StageData) == [_stage(1)]
+
+
+def test_corrupt_payload_raises_codec_error():
+    with pytest.raises(codec.CodecError):
+        codec.decompress(codec.MAGIC + codec.GZIP + b"not gzip")
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_fetcher_disk_helpers_store_encoded_lists(tmp_path, monkeypatch, backend):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig(backend=backend))
+    try:
+        key = ("srv", "stages", "app-1", True)
+        stages = [_stage(i) for i in range(5)]
+        fetchers._disk_set_list(key, stages, use_disk=True)
+
+        assert cache.disk_get_bytes(key).startswith(codec.MAGIC)
+        assert fetchers._disk_get_list(key, StageData, use_disk=True) == stages
+    finally:
+        cache.clear_cache()
+        cache.configure(None)
@@ -0,0 +1,147 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from spark_history_mcp.tools import fetchers, warmup
+
+
+class FakeFetchers:
+    """Record calls and peak concurrency per server for the warm fetchers."""
+
+    def __init__(self, monkeypatch, running=(), missing=(), broken=()):
+        self.running = set(running)
+        self.missing = set(missing)
+        self.broken = set(broken)
+        self.calls = []
+        self.active = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+        for name in ("fetch_env", "fetch_jobs", "fetch_executors"):
+            monkeypatch.setattr(fetchers, name, self._resource(name))
+        monkeypatch.setattr(fetchers, "fetch_stages", self._stages)
+        monkeypatch.setattr(fetchers, "fetch_app", self._app)
+
+    def _app(self, app_id, server=None):
+        with self._lock:
+            self.calls.append(("fetch_app", server, app_id))
+            self.active[server] = self.active.get(server, 0) + 1
+            self.peak[server] = max(self.peak.get(server, 0), self.active[server])
+        try:
+            time.sleep(0.01)
+            if app_id in self.missing:
+                return None
+            return SimpleNamespace(
+                status="RUNNING" if app_id in self.running else "COMPLETED"
+            )
+        finally:
+            with self._lock:
+                self.active[server] -= 1
+
+    def _resource(self, name):
+        def fetch(app_id, server=None):
+            with self._lock:
+                self.calls.append((name, server, app_id))
+            if (name, app_id) in self.broken:
+                raise RuntimeError(f"{name} unavailable")
+            return []
+
+        return fetch
+
+    def _stages(self, app_id, server=None, with_summaries=False):
+        assert with_summaries
+        return self._resource("fetch_stages")(app_id, server)
+
+
+def test_warms_all_resources_of_completed_apps(monkeypatch):
+    fake = FakeFetchers(monkeypatch)
+
+    result = warmup.warm_applications([(None, "app-1"), (None, "app-2")])
+
+    assert result["requested"] == 2
+    assert result["warmed"] == 2
+    assert result["failed"] == 0
+    assert result["requests"] == 10
+    assert {call[0] for call in fake.calls} == {
+        "fetch_app",
+        "fetch_env",
+        "fetch_jobs",
+        "fetch_stages",
+        "fetch_executors",
+    }
+
+
+def test_running_missing_and_partial_apps_are_reported(monkeypatch):
+    FakeFetchers(
+        monkeypatch,
+        running={"app-run"},
+        missing={"app-gone"},
+        broken={("fetch_stages", "app-ok")},
+    )
+
+    result = warmup.warm_applications(
+        [(None, "app-ok"), (None, "app-run"), (None, "app-gone"), (None, "app-ok")]
+    )
+
+    assert result["requested"] == 3
+    assert result["warmed"] == 1
+    assert result["partial"] == 1
+    assert result["skipped_running"] == 1
+    assert result["failed"] == 1
+    assert result["by_server"]["__default__"] == {
+        "warmed": 1,
+        "running": 1,
+        "failed": 1,
+    }
+    errors = {f["app_id"]: f.get("errors") or f["error"] for f in result["failures"]}
+    assert errors["app-gone"] == "Application app-gone not found"
+    assert errors["app-ok"] == {"stages": "fetch_stages unavailable"}
+
+
+def test_per_server_limit_bounds_concurrency(monkeypatch):
+    fake = FakeFetchers(monkeypatch)
+    targets = [(s, f"app-{i}") for s in ("a", "b") for i in range(8)]
+
+    result = warmup.warm_applications(
+        targets, resources=["app"], max_workers=6, per_server_limit=2
+    )
+
+    assert result["warmed"] == 16
+    assert fake.peak["a"] <= 2
+    assert fake.peak["b"] <= 2
+    assert set(result["by_server"]) == {"a", "b"}
+
+
+def test_resource_subset(monkeypatch):
+    fake = FakeFetchers(monkeypatch)
+
+    warmup.warm_applications([(None, "app-1")], resources=["app", "env"])
+
+    assert [call[0] for call in fake.calls] == ["fetch_app", "fetch_env"]
+
+
+def test_unknown_resource_is_rejected():
+    with pytest.raises(ValueError, match="Unknown resources"):
+        warmup.warm_applications([(None, "app-1")], resources=["tasks"])
+
+
+def test_tool_selects_completed_apps_per_server(monkeypatch):
+    FakeFetchers(monkeypatch)
+    apps = [SimpleNamespace(id="app-1"), SimpleNamespace(id="app-2")]
+
+    with patch(
+        "spark_history_mcp.tools.application.list_applications", return_value=apps
+    ) as list_apps:
+        result = warmup.warm_cache(
+            servers=["a", "b"], app_name="etl", min_date="2024-01-01"
+        )
+
+    assert list_apps.call_count == 2
+    kwargs = list_apps.call_args.kwargs
+    assert kwargs["status"] == ["COMPLETED"]
+    assert kwargs["app_name"] == "etl"
+    assert kwargs["min_date"] == "2024-01-01"
+    assert result["requested"] == 4
+    assert result["warmed"] == 4
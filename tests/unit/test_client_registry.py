@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from spark_history_mcp.api.factory import SparkClientRegistry
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.core.app import AppContext
+from spark_history_mcp.tools import get_client_or_default, get_server_status
+
+
+class SlowFactory:
+    """Stands in for create_spark_client; takes *delay* seconds per client."""
+
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def __call__(self, server_config):
+        with self.lock:
+            self.calls.append(server_config.url)
+        time.sleep(self.delay)
+        if server_config.url in self.fail:
+            raise ConnectionError(f"cannot reach {server_config.url}")
+        return SimpleNamespace(url=server_config.url)
+
+
+def _servers(count, default=0):
+    return {
+        f"s{i}": ServerConfig(url=f"http://h{i}:18080", default=i == default)
+        for i in range(count)
+    }
+
+
+def test_clients_are_created_once_on_first_use():
+    factory = SlowFactory(delay=0.05)
+    clients = SparkClientRegistry(_servers(3, default=1), factory)
+
+    assert factory.calls == []
+    assert list(clients) == ["s0", "s1", "s2"]
+    assert {s["state"] for s in clients.status().values()} == {"pending"}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        looked_up = list(executor.map(lambda _: clients.get("s2"), range(8)))
+
+    assert factory.calls == ["http://h2:18080"]
+    assert all(client is looked_up[0] for client in looked_up)
+    assert clients.default.url == "http://h1:18080"
+    assert set(clients.initialized()) == {"s1", "s2"}
+    status = clients.status()
+    assert status["s2"]["state"] == "ready"
+    assert status["s2"]["init_seconds"] >= 0.05
+    assert status["s0"] == {
+        "kind": "rest",
+        "default": False,
+        "state": "pending",
+        "init_seconds": None,
+        "error": None,
+    }
+
+
+def test_failed_initialization_is_reported_and_retried():
+    factory = SlowFactory(fail={"http://h0:18080"})
+    clients = SparkClientRegistry(_servers(1), factory)
+
+    with pytest.raises(ConnectionError):
+        clients.get("s0")
+    assert clients.status()["s0"]["state"] == "failed"
+    assert "cannot reach" in clients.status()["s0"]["error"]
+
+    factory.fail.clear()
+    assert clients["s0"].url == "http://h0:18080"
+    assert clients.status()["s0"]["state"] == "ready"
+    assert clients.status()["s0"]["error"] is None
+    assert len(factory.calls) == 2
+
+
+def test_initialize_all_runs_in_parallel():
+    factory = SlowFactory(delay=0.2, fail={"http://h3:18080"})
+    clients = SparkClientRegistry(_servers(8), factory)
+
+    start = time.perf_counter()
+    status = clients.initialize_all(max_workers=8)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.2 * 4
+    assert status["s3"]["state"] == "failed"
+    assert sum(s["state"] == "ready" for s in status.values()) == 7
+
+    clients.warm_up().join(5)
+    # Only the failed client is retried
+    assert len(factory.calls) == 9
+
+
+def test_server_status_tool():
+    factory = SlowFactory()
+    context = AppContext(clients=SparkClientRegistry(_servers(2), factory))
+    ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=context))
+
+    with patch("spark_history_mcp.tools.mcp.get_context", return_value=ctx):
+        before = get_server_status()
+        assert get_client_or_default(server_name="s1").url == "http://h1:18080"
+        after = get_server_status()
+        initialized = get_server_status(initialize=True)
+
+    assert before["default_server"] == "s0"
+    assert {s["state"] for s in before["servers"].values()} == {"pending"}
+    assert after["servers"]["s1"]["state"] == "ready"
+    assert after["servers"]["s0"]["state"] == "pending"
+    assert {s["state"] for s in initialized["servers"].values()} == {"ready"}
@@ -0,0 +1,181 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.models.spark_types import (
+    ApplicationEnvironmentInfo,
+    ApplicationInfo,
+    ExecutorSummary,
+    StageData,
+)
+from spark_history_mcp.tools import fetchers
+from spark_history_mcp.tools.comparison_modules import core
+from spark_history_mcp.tools.comparison_modules.executors import compare_app_executors
+from spark_history_mcp.tools.comparison_modules.session import ComparisonSession
+
+
+def _app(app_id, cores):
+    return ApplicationInfo.model_validate(
+        {
+            "id": app_id,
+            "name": f"etl {app_id}",
+            "coresGranted": cores,
+            "coresPerExecutor": 2,
+            "memoryPerExecutorMB": 4096,
+            "attempts": [
+                {
+                    "attemptId": "1",
+                    "startTime": "2024-01-01T00:00:00.000GMT",
+                    "endTime": "2024-01-01T00:10:00.000GMT",
+                    "duration": 600_000,
+                    "completed": True,
+                }
+            ],
+        }
+    )
+
+
+def _stage(stage_id, name, seconds, run_time):
+    return StageData.model_validate(
+        {
+            "status": "COMPLETE",
+            "stageId": stage_id,
+            "attemptId": 0,
+            "numTasks": 10,
+            "name": name,
+            "details": "",
+            "submissionTime": "2024-01-01T00:01:00.000GMT",
+            "completionTime": f"2024-01-01T00:01:{seconds:02d}.000GMT",
+            "executorRunTime": run_time,
+            "inputBytes": run_time * 1000,
+        }
+    )
+
+
+def _executor(executor_id, tasks):
+    return ExecutorSummary.model_validate(
+        {
+            "id": executor_id,
+            "hostPort": "host:1",
+            "isActive": False,
+            "diskUsed": 0,
+            "completedTasks": tasks,
+            "failedTasks": 0,
+            "totalDuration": tasks * 100,
+            "totalGCTime": tasks * 10,
+            "totalInputBytes": tasks * 1000,
+            "totalShuffleRead": 0,
+            "totalShuffleWrite": 0,
+            "addTime": "2024-01-01T00:00:30.000GMT",
+            "removeTime": "2024-01-01T00:09:00.000GMT",
+            "memoryMetrics": {
+                "usedOnHeapStorageMemory": 10,
+                "usedOffHeapStorageMemory": 0,
+            },
+            "attributes": {},
+            "resources": {},
+        }
+    )
+
+
+def _environment(partitions):
+    return ApplicationEnvironmentInfo.model_validate(
+        {
+            "runtime": {"javaVersion": "17"},
+            "sparkProperties": [["spark.sql.shuffle.partitions", partitions]],
+        }
+    )
+
+
+APPS = {
+    "app-1": (
+        _app("app-1", 8),
+        [_stage(1, "count at Job.scala:10", 20, 40_000), _stage(2, "save", 5, 9000)],
+        [_executor("1", 40), _executor("2", 40)],
+        _environment("200"),
+    ),
+    "app-2": (
+        _app("app-2", 32),
+        [_stage(5, "count at Job.scala:10", 50, 90_000), _stage(6, "save", 6, 9000)],
+        [_executor("1", 90)],
+        _environment("400"),
+    ),
+}
+
+
+@pytest.fixture
+def client():
+    client = MagicMock(spec=SparkRestClient)
+    client.get_application.side_effect = lambda app_id: APPS[app_id][0]
+    client.list_stages.side_effect = lambda app_id, **kwargs: APPS[app_id][1]
+    client.list_all_executors.side_effect = lambda app_id: APPS[app_id][2]
+    client.get_environment.side_effect = lambda app_id: APPS[app_id][3]
+    # No fetcher cache: every fetch reaches the client
+    with (
+        patch.object(fetchers, "_resolve_client", return_value=(client, False, False)),
+        patch.object(core, "resolve_client"),
+    ):
+        yield client
+
+
+def _calls(client):
+    return {
+        name: getattr(client, name).call_count
+        for name in (
+            "get_application",
+            "list_stages",
+            "list_all_executors",
+            "get_environment",
+        )
+    }
+
+
+def test_performance_comparison_fetches_each_app_once(client):
+    result = core.compare_app_performance("app-1", "app-2")
+
+    assert _calls(client) == {
+        "get_application": 2,
+        "list_stages": 2,
+        "list_all_executors": 2,
+        "get_environment": 2,
+    }
+    overview = result["aggregated_overview"]
+    assert "error" not in overview["executor_performance"]
+    assert "aggregated_stage_comparison" in overview["application_summary"]
+    assert result["stage_deep_dive"]["top_stage_differences"]
+    assert result["environment_comparison"]["spark_properties"]
+
+
+def test_session_results_match_standalone_tools(client):
+    result = core.compare_app_performance("app-1", "app-2")
+    overview = result["aggregated_overview"]
+
+    summaries = core.compare_app_summaries("app-1", "app-2")
+    executors = compare_app_executors("app-1", "app-2")
+
+    assert overview["application_summary"]["diff"] == summaries["diff"]
+    assert (
+        overview["application_summary"]["aggregated_stage_comparison"]
+        == summaries["aggregated_stage_comparison"]
+    )
+    assert overview["executor_performance"] == executors
+
+
+def test_session_memoizes_values_and_failures(client):
+    client.get_environment.side_effect = RuntimeError("environment unavailable")
+    session = ComparisonSession("app-1", "app-2")
+
+    session.prefetch(max_workers=4)
+    assert session.stage_metrics(1) is session.stage_metrics(1)
+    assert session.matches(0.6) is session.matches(0.6)
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="unavailable"):
+            session.environment(1)
+
+    assert _calls(client) == {
+        "get_application": 2,
+        "list_stages": 2,
+        "list_all_executors": 2,
+        "get_environment": 2,
+    }
@@ -0,0 +1,161 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from spark_history_mcp import cache
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import CacheConfig, ServerConfig
+from spark_history_mcp.models.spark_types import ApplicationInfo, JobData
+from spark_history_mcp.tools import fetchers
+
+APP_ID = "app-1"
+
+
+def _app(completed: bool) -> ApplicationInfo:
+    return ApplicationInfo.model_validate(
+        {
+            "id": APP_ID,
+            "name": "etl",
+            "attempts": [{"attemptId": "1", "duration": 1, "completed": completed}],
+        }
+    )
+
+
+def _jobs(name: str):
+    return [
+        JobData.model_validate(
+            {
+                "jobId": 1,
+                "name": name,
+                "status": "SUCCEEDED",
+                "numTasks": 1,
+                "numActiveTasks": 0,
+                "numCompletedTasks": 1,
+                "numSkippedTasks": 0,
+                "numFailedTasks": 0,
+                "numKilledTasks": 0,
+                "numCompletedIndices": 1,
+                "numActiveStages": 0,
+                "numCompletedStages": 1,
+                "numSkippedStages": 0,
+                "numFailedStages": 0,
+            }
+        )
+    ]
+
+
+def _names(jobs):
+    return [job.name for job in jobs]
+
+
+@pytest.fixture
+def isolated_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig(running_app_ttl_seconds=30))
+    fetchers._CACHE.clear()
+    yield
+    fetchers._CACHE.clear()
+    cache.clear_cache()
+    cache.configure(None)
+
+
+@pytest.fixture
+def client():
+    client = MagicMock(spec=SparkRestClient)
+    client.list_jobs.side_effect = lambda **kwargs: _jobs(
+        f"jobs-{client.list_jobs.call_count}"
+    )
+    with patch.object(fetchers, "_resolve_client", return_value=(client, True, True)):
+        yield client
+
+
+def _jobs_on_disk():
+    return [e for e in cache.iter_entries() if e.namespace == "jobs"]
+
+
+def test_running_app_is_not_persisted(isolated_caches, client):
+    client.get_application.return_value = _app(completed=False)
+
+    assert _names(fetchers.fetch_jobs(APP_ID)) == ["jobs-1"]
+
+    assert _jobs_on_disk() == []
+    assert [e.namespace for e in cache.iter_entries()] == []
+    # Memory copy is short-lived
+    entry = fetchers._CACHE._entries[("__default__", "jobs", APP_ID, ())]
+    assert entry.expires_at is not None
+
+
+def test_completed_app_is_cached_permanently(isolated_caches, client):
+    client.get_application.return_value = _app(completed=True)
+
+    fetchers.fetch_jobs(APP_ID)
+    fetchers._CACHE.clear()
+    assert _names(fetchers.fetch_jobs(APP_ID)) == ["jobs-1"]
+
+    assert client.list_jobs.call_count == 1
+    assert len(_jobs_on_disk()) == 1
+
+
+def test_running_app_snapshot_on_disk_is_ignored(isolated_caches, client):
+    # A snapshot persisted by an older version while the app was running
+    stale = [job.model_dump(mode="json") for job in _jobs("stale")]
+    cache.disk_set(("__default__", "jobs", APP_ID, ()), json.dumps(stale))
+    client.get_application.return_value = _app(completed=False)
+
+    assert _names(fetchers.fetch_jobs(APP_ID)) == ["jobs-1"]
+
+
+def test_app_is_promoted_once_completed(isolated_caches, client):
+    client.get_application.return_value = _app(completed=False)
+    assert _names(fetchers.fetch_jobs(APP_ID)) == ["jobs-1"]
+
+    # The app finishes; its cached info expires and is fetched again
+    client.get_application.return_value = _app(completed=True)
+    fetchers._CACHE.pop(("__default__", "app", APP_ID))
+
+    assert _names(fetchers.fetch_jobs(APP_ID)) == ["jobs-2"]
+    assert _names(fetchers.fetch_jobs(APP_ID)) == ["jobs-2"]
+    assert len(_jobs_on_disk()) == 1
+    assert ("__default__", "running_app", APP_ID) not in fetchers._CACHE
+
+
+def test_running_app_markers_expire(isolated_caches, client):
+    cache.configure(CacheConfig(running_app_ttl_seconds=0.05))
+    client.get_application.return_value = _app(completed=False)
+    marker = ("__default__", "running_app", APP_ID)
+
+    fetchers.fetch_jobs(APP_ID)
+    assert fetchers._CACHE.get(marker) is True
+
+    time.sleep(0.15)
+    # Expired together with the app's running entries, instead of piling up
+    assert fetchers._CACHE.get(marker) is None
+    assert fetchers._CACHE.get(("__default__", "jobs", APP_ID, ())) is None
+
+
+def test_client_response_cache_expires_running_apps(isolated_caches):
+    rest = SparkRestClient(ServerConfig(url="http://shs:18080"))
+    running = _app(completed=False)
+
+    with (
+        patch.object(rest, "_get", return_value=[]),
+        patch.object(rest, "_parse_model", return_value=running),
+    ):
+        rest.get_application(APP_ID)
+        rest.list_all_executors(APP_ID)
+
+    entries = rest._response_cache._entries
+    assert all(entry.expires_at is not None for entry in entries.values())
+
+    completed = _app(completed=True)
+    rest._response_cache.clear()
+    with (
+        patch.object(rest, "_get", return_value=[]),
+        patch.object(rest, "_parse_model", return_value=completed),
+    ):
+        rest.get_application(APP_ID)
+        rest.list_all_executors(APP_ID)
+
+    assert all(entry.expires_at is None for entry in entries.values())
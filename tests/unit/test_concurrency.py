@@ -0,0 +1,265 @@
+import contextvars
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from spark_history_mcp.tools import analysis, application, fetchers
+from spark_history_mcp.tools.concurrency import (
+    iter_completed,
+    run_concurrently,
+    server_slot,
+)
+
+_REQUEST = contextvars.ContextVar("request", default=None)
+
+
+def test_run_concurrently_collects_results_and_errors():
+    def boom():
+        raise RuntimeError("boom")
+
+    outcomes = run_concurrently({"ok": lambda: 42, "bad": boom}, max_workers=2)
+
+    assert outcomes["ok"] == {"result": 42}
+    assert outcomes["bad"] == {"error": "boom"}
+
+
+def test_run_concurrently_propagates_context():
+    token = _REQUEST.set("ctx-1")
+    try:
+        outcomes = run_concurrently({"read": _REQUEST.get}, max_workers=1)
+    finally:
+        _REQUEST.reset(token)
+
+    assert outcomes["read"] == {"result": "ctx-1"}
+
+
+def test_run_concurrently_runs_in_parallel():
+    barrier = threading.Barrier(3, timeout=5)
+
+    outcomes = run_concurrently(
+        {name: barrier.wait for name in ("a", "b", "c")}, max_workers=3
+    )
+
+    assert all("result" in outcome for outcome in outcomes.values())
+
+
+def test_run_concurrently_times_out_slow_tasks():
+    release = threading.Event()
+
+    started = time.monotonic()
+    outcomes = run_concurrently(
+        {"fast": lambda: "done", "slow": lambda: release.wait(5)},
+        max_workers=2,
+        timeout=0.2,
+    )
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert outcomes["fast"] == {"result": "done"}
+    assert outcomes["slow"]["timed_out"] is True
+    assert elapsed < 2
+
+
+@patch("spark_history_mcp.tools.application.fetch_executors")
+@patch("spark_history_mcp.tools.application.fetch_stages")
+@patch("spark_history_mcp.tools.application.fetch_env")
+@patch("spark_history_mcp.tools.application.fetch_app")
+def test_application_insights_timeout_is_per_analysis(
+    mock_app, mock_env, mock_stages, mock_executors, monkeypatch
+):
+    mock_app.return_value = MagicMock(name="app")
+    release = threading.Event()
+    monkeypatch.setenv("SHS_INSIGHTS_ANALYSIS_TIMEOUT_S", "0.2")
+    monkeypatch.setenv("SHS_COMPACT_TOOL_OUTPUT", "false")
+
+    recommendation = {"priority": "high", "issue": "skew"}
+    with (
+        patch.object(
+            application,
+            "analyze_auto_scaling",
+            side_effect=lambda *a: release.wait(5),
+        ),
+        patch.object(
+            application,
+            "analyze_shuffle_skew",
+            return_value={"recommendations": [recommendation]},
+        ),
+        patch.object(
+            application,
+            "analyze_failed_tasks",
+            side_effect=RuntimeError("no tasks"),
+        ),
+    ):
+        insights = application.get_application_insights("app-1")
+    release.set()
+
+    analyses = insights["analyses"]
+    assert analyses["auto_scaling"]["timed_out"] is True
+    assert analyses["shuffle_skew"]["recommendations"] == [recommendation]
+    assert analyses["failed_tasks"] == {"error": "no tasks"}
+    assert insights["summary"]["total_analyses_run"] == 1
+    assert insights["recommendations"][0]["source_analysis"] == "shuffle_skew"
+
+    # Shared data is prefetched once per payload before the analyses run
+    mock_env.assert_called_once_with(app_id="app-1", server=None)
+    mock_executors.assert_called_once_with(app_id="app-1", server=None)
+    assert mock_stages.call_count == 2
+
+
+@patch("spark_history_mcp.tools.application.fetch_executors")
+@patch("spark_history_mcp.tools.application.fetch_stages")
+@patch("spark_history_mcp.tools.application.fetch_env")
+@patch("spark_history_mcp.tools.application.fetch_app")
+def test_application_insights_share_one_deadline(
+    mock_app, mock_env, mock_stages, mock_executors, monkeypatch, caplog
+):
+    mock_app.return_value = MagicMock(name="app")
+    release = threading.Event()
+    mock_env.side_effect = lambda **kwargs: release.wait(5)
+    mock_executors.side_effect = RuntimeError("executors unavailable")
+    monkeypatch.setenv("SHS_INSIGHTS_ANALYSIS_TIMEOUT_S", "0.5")
+
+    started = time.monotonic()
+    with (
+        patch.object(
+            application,
+            "analyze_auto_scaling",
+            side_effect=lambda *a: release.wait(5),
+        ),
+        patch.object(application, "analyze_shuffle_skew", return_value={}),
+        patch.object(application, "analyze_failed_tasks", return_value={}),
+    ):
+        insights = application.get_application_insights("app-1")
+    elapsed = time.monotonic() - started
+    release.set()
+
+    # The stuck prefetch uses up the budget the analyses would otherwise get
+    assert elapsed < 0.9
+    assert insights["analyses"]["auto_scaling"]["timed_out"] is True
+    assert "Prefetching executors of app-1 failed: executors unavailable" in (
+        caplog.text
+    )
+
+
+def test_iter_completed_yields_results_and_errors_as_they_finish():
+    def work(item):
+        if item == "bad":
+            raise RuntimeError("boom")
+        time.sleep(0.2 if item == "slow" else 0)
+        return item.upper()
+
+    outcomes = list(iter_completed(work, ["slow", "fast", "bad"], max_workers=3))
+
+    assert outcomes[-1] == ("slow", "SLOW", None)
+    assert ("fast", "FAST", None) in outcomes
+    item, result, error = next(o for o in outcomes if o[0] == "bad")
+    assert result is None and str(error) == "boom"
+
+
+def test_iter_completed_propagates_context():
+    token = _REQUEST.set("ctx-2")
+    try:
+        outcomes = list(iter_completed(lambda _: _REQUEST.get(), [1], max_workers=1))
+    finally:
+        _REQUEST.reset(token)
+
+    assert outcomes == [(1, "ctx-2", None)]
+
+
+def _track_concurrency(fn):
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def tracked(*args, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            time.sleep(0.05)
+            return fn(*args, **kwargs)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    return tracked, state
+
+
+def test_server_slot_caps_calls_per_server(monkeypatch):
+    monkeypatch.setenv("SHS_PER_SERVER_MAX_CONCURRENCY", "2")
+
+    def call(server):
+        with server_slot(server):
+            return tracked(server)
+
+    tracked, state = _track_concurrency(lambda server: server)
+    list(iter_completed(call, ["a"] * 8, max_workers=8))
+
+    assert state["peak"] == 2
+
+
+def test_fetchers_share_the_server_cap(monkeypatch):
+    monkeypatch.setenv("SHS_PER_SERVER_MAX_CONCURRENCY", "2")
+    tracked, state = _track_concurrency(lambda app_id: [])
+    client = MagicMock()
+    client.list_all_executors.side_effect = tracked
+    client.list_jobs.side_effect = lambda app_id, status: tracked(app_id)
+
+    def fetch(i):
+        if i % 2:
+            return fetchers.fetch_jobs(f"app-{i}")
+        return fetchers.fetch_executors(f"app-{i}")
+
+    with patch.object(fetchers, "_resolve_client", return_value=(client, False, False)):
+        list(iter_completed(fetch, range(8), max_workers=8))
+
+    assert state["peak"] == 2
+
+
+def _skew_stage(stage_id):
+    return SimpleNamespace(
+        stage_id=stage_id,
+        attempt_id=0,
+        name=f"stage {stage_id}",
+        shuffle_write_bytes=20 * 1024**3,
+        num_tasks=100,
+        num_failed_tasks=0,
+        task_metrics_distributions=None,
+        executor_metrics_distributions=None,
+    )
+
+
+@pytest.mark.parametrize("cap", ["1", "3"])
+def test_shuffle_skew_fetches_summaries_concurrently(monkeypatch, cap):
+    monkeypatch.setenv("SHS_PER_SERVER_MAX_CONCURRENCY", cap)
+    stages = [_skew_stage(i) for i in range(12)]
+
+    def summary(app_id, stage_id, attempt_id):
+        if stage_id == 5:
+            raise RuntimeError("unavailable")
+        # Every stage is skewed by the same ratio except stage 7
+        top = 10 if stage_id == 7 else 4
+        return SimpleNamespace(shuffle_write_bytes=[0, 1, 1, 2, top])
+
+    # The cap is held by the fetcher around the client call
+    tracked, state = _track_concurrency(summary)
+    client = MagicMock()
+    client.get_stage_task_summary.side_effect = tracked
+    with (
+        patch.object(analysis, "fetch_stages", return_value=stages),
+        patch.object(fetchers, "_resolve_client", return_value=(client, False, False)),
+    ):
+        result = analysis.analyze_shuffle_skew("app-1")
+
+    assert 1 <= state["peak"] <= int(cap)
+    if cap != "1":
+        assert state["peak"] > 1
+    ids = [s["stage_id"] for s in result["skewed_stages"]]
+    # Highest ratio first, ties keep stage order, failed fetch is not scored
+    assert ids == [7, 0, 1, 2, 3, 4, 6, 8, 9, 10, 11]
+    metadata = result["metadata"]
+    assert metadata["task_summary_fetches"] == 12
+    assert metadata["task_summary_fetch_errors"] == 1
+    assert metadata["elapsed_s"] >= metadata["task_summary_fetch_s"]
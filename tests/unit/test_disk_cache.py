@@ -0,0 +1,239 @@
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from spark_history_mcp import cache
+from spark_history_mcp.cache import file_backend
+from spark_history_mcp.config.config import CacheConfig
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.clear_cache()
+    yield cache
+    cache.clear_cache()
+    cache.configure(None)
+
+
+def _age(key, seconds):
+    """Backdate both access and modification time of a cached entry."""
+    path = cache.get_backend().key_to_path(key)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_entries_are_grouped_by_namespace(disk_cache):
+    disk_cache.configure(CacheConfig(max_bytes=None, max_entries=None))
+    disk_cache.disk_set(("srv", "stages", "app-1"), "[]")
+    disk_cache.disk_set(("srv", "env", "app-1"), "{}")
+
+    assert disk_cache.disk_get(("srv", "stages", "app-1")) == "[]"
+    assert sorted(e.namespace for e in disk_cache.iter_entries()) == ["env", "stages"]
+
+
+def test_entry_budget_evicts_least_recently_accessed(disk_cache):
+    disk_cache.configure(CacheConfig(max_bytes=None, max_entries=3))
+    keys = [("srv", "jobs", f"app-{i}") for i in range(3)]
+    for age, key in zip((300, 200, 100), keys, strict=True):
+        disk_cache.disk_set(key, "[]")
+        _age(key, age)
+    # Reading app-0 makes it the most recently accessed entry
+    assert disk_cache.disk_get(keys[0]) == "[]"
+
+    disk_cache.disk_set(("srv", "jobs", "app-3"), "[]")
+
+    # Pruned down to the low watermark (90% of 3 entries -> 2)
+    assert disk_cache.disk_get(keys[1]) is None
+    assert disk_cache.disk_get(keys[2]) is None
+    assert disk_cache.disk_get(keys[0]) == "[]"
+    assert disk_cache.disk_get(("srv", "jobs", "app-3")) == "[]"
+
+
+def test_byte_budget(disk_cache):
+    disk_cache.configure(CacheConfig(max_bytes=250, max_entries=None))
+    for i in range(5):
+        key = ("srv", "stages", f"app-{i}")
+        disk_cache.disk_set(key, "x" * 100)
+        _age(key, 100 - i)
+
+    stats = disk_cache.cache_stats()
+    assert stats["bytes"] <= 250
+    assert disk_cache.disk_get(("srv", "stages", "app-4")) == "x" * 100
+
+
+def test_ttl_per_namespace(disk_cache):
+    disk_cache.configure(CacheConfig(ttl_seconds={"jobs": 60}))
+    disk_cache.disk_set(("srv", "jobs", "app-1"), "[]")
+    disk_cache.disk_set(("srv", "env", "app-1"), "{}")
+    _age(("srv", "jobs", "app-1"), 120)
+    _age(("srv", "env", "app-1"), 120)
+
+    assert disk_cache.disk_get(("srv", "jobs", "app-1")) is None
+    assert disk_cache.disk_get(("srv", "env", "app-1")) == "{}"
+    assert len(disk_cache.iter_entries()) == 1
+
+
+def test_prune_removes_expired_and_enforces_explicit_budget(disk_cache):
+    disk_cache.configure(CacheConfig(default_ttl_seconds=60))
+    for i in range(4):
+        disk_cache.disk_set(("srv", "env", f"app-{i}"), "{}")
+    _age(("srv", "env", "app-0"), 120)
+
+    result = disk_cache.prune(max_entries=2)
+
+    assert result["expired"] == 1
+    assert result["evicted"] == 1
+    assert result["entries"] == 2
+
+
+def _prune_all(cache_dir):
+    cache.CACHE_DIR = cache_dir
+    cache.configure(CacheConfig(max_bytes=None, max_entries=None))
+    cache.prune(max_entries=0)
+    cache.flush_stats()
+
+
+def test_pruning_many_entries_records_stats_without_deadlock(disk_cache):
+    # Recording more removals than STATS_FLUSH_EVERY flushes the counters,
+    # which takes the cache lock; pruning must not still hold it then. Runs
+    # in a child process so a deadlock can be killed instead of hanging.
+    disk_cache.configure(CacheConfig(max_bytes=None, max_entries=None))
+    for i in range(120):
+        disk_cache.disk_set(("srv", "env", f"app-{i}"), "{}")
+    disk_cache.flush_stats()
+
+    worker = multiprocessing.get_context("fork").Process(
+        target=_prune_all, args=(disk_cache.CACHE_DIR,)
+    )
+    worker.start()
+    worker.join(20)
+    if worker.is_alive():
+        worker.kill()
+        pytest.fail("prune deadlocked on the cache lock")
+
+    assert worker.exitcode == 0
+    stats = disk_cache.cache_stats()
+    assert stats["entries"] == 0
+    assert stats["namespaces"]["env"]["evictions"] == 120
+
+
+def test_stats_report_hit_rates(disk_cache):
+    disk_cache.configure(CacheConfig())
+    disk_cache.disk_set(("srv", "env", "app-1"), "{}")
+    disk_cache.disk_get(("srv", "env", "app-1"))
+    disk_cache.disk_get(("srv", "env", "app-1"))
+    disk_cache.disk_get(("srv", "env", "missing"))
+
+    stats = disk_cache.cache_stats()
+
+    assert stats["entries"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["namespaces"]["env"]["hit_rate"] == pytest.approx(2 / 3, rel=1e-3)
+    # Counters survive in the stats file across flushes
+    assert (cache.CACHE_DIR / file_backend.STATS_FILE).exists()
+
+
+def test_clear_cache_counts_entries(disk_cache):
+    disk_cache.configure(CacheConfig())
+    disk_cache.disk_set(("srv", "env", "a"), "{}")
+    disk_cache.disk_set(("srv", "jobs", "a"), "[]")
+
+    assert disk_cache.clear_cache() == 2
+    assert disk_cache.iter_entries() == []
+
+
+def test_entries_are_sharded_by_hash(disk_cache):
+    disk_cache.configure(CacheConfig())
+    key = ("srv", "stages", "app-1")
+    disk_cache.disk_set(key, "[]")
+
+    path = disk_cache.get_backend().key_to_path(key)
+    relative = path.relative_to(disk_cache.CACHE_DIR).parts
+    assert relative[0] == "stages"
+    assert relative[1] == path.stem[:2]
+    assert relative[2] == path.stem[2:4]
+    assert path.is_file()
+
+
+def test_writes_are_atomic_and_leave_no_temp_files(disk_cache, monkeypatch):
+    disk_cache.configure(CacheConfig())
+    key = ("srv", "env", "app-1")
+    disk_cache.disk_set(key, '{"v": 1}')
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(file_backend.os, "replace", failing_replace)
+        disk_cache.disk_set(key, '{"v": 2}')
+
+    # The previous complete value survives a failed write
+    assert disk_cache.disk_get(key) == '{"v": 1}'
+    leftovers = list(disk_cache.CACHE_DIR.rglob(f"*{file_backend.TEMP_SUFFIX}"))
+    assert leftovers == []
+
+
+def test_legacy_entries_are_migrated_on_read(disk_cache):
+    disk_cache.configure(CacheConfig())
+    key = ("srv", "env", "app-1")
+    flat = disk_cache.get_backend().legacy_paths(key)[1]
+    flat.parent.mkdir(parents=True, exist_ok=True)
+    flat.write_text("{}", encoding="utf-8")
+
+    assert disk_cache.disk_get(key) == "{}"
+    assert not flat.exists()
+    assert disk_cache.get_backend().key_to_path(key).is_file()
+
+
+def test_stale_temp_files_are_pruned(disk_cache):
+    disk_cache.configure(CacheConfig())
+    disk_cache.disk_set(("srv", "env", "app-1"), "{}")
+    orphan = (
+        disk_cache.get_backend()
+        .key_to_path(("srv", "env", "app-1"))
+        .with_name(".orphan" + file_backend.TEMP_SUFFIX)
+    )
+    orphan.write_text("{", encoding="utf-8")
+    past = time.time() - 2 * file_backend.STALE_TEMP_SECONDS
+    os.utime(orphan, (past, past))
+
+    disk_cache.prune()
+
+    assert not orphan.exists()
+    assert len(disk_cache.iter_entries()) == 1
+
+
+def _hammer(cache_dir, worker, rounds):
+    cache.CACHE_DIR = cache_dir
+    cache.configure(CacheConfig(max_bytes=None, max_entries=None))
+    payload = json.dumps({"worker": worker, "items": ["x" * 64] * 2000})
+    errors = 0
+    for _ in range(rounds):
+        cache.disk_set(("srv", "stages", "shared"), payload)
+        raw = cache.disk_get(("srv", "stages", "shared"))
+        if raw is not None:
+            try:
+                json.loads(raw)
+            except ValueError:
+                errors += 1
+    cache.flush_stats()
+    return errors
+
+
+def test_processes_sharing_a_directory_never_read_partial_entries(disk_cache):
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(4) as pool:
+        errors = pool.starmap(
+            _hammer, [(disk_cache.CACHE_DIR, i, 50) for i in range(4)]
+        )
+
+    assert errors == [0, 0, 0, 0]
+    stats = disk_cache.cache_stats()
+    assert stats["entries"] == 1
+    # Counter updates from every process survive the shared stats file
+    assert stats["namespaces"]["stages"]["writes"] == 200
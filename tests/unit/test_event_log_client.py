@@ -0,0 +1,361 @@
+import io
+import os
+import shutil
+import struct
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from spark_history_mcp import cache
+from spark_history_mcp.api import event_log_client
+from spark_history_mcp.api.event_log_client import (
+    EventLogClient,
+    EventLogError,
+    _read_lz4,
+    _Replay,
+)
+from spark_history_mcp.api.factory import create_spark_client
+from spark_history_mcp.config.config import CacheConfig, ServerConfig
+from spark_history_mcp.memory_cache import MemoryCache
+from spark_history_mcp.models.spark_types import StageStatus, TaskStatus
+from spark_history_mcp.tools import fetchers, get_app_summary
+
+EVENTS = Path(__file__).parents[2] / "examples" / "basic" / "events"
+APP_ID = "spark-cc4d115f011443d787f03a71a476a745"
+
+
+def _events(app_id=APP_ID) -> bytes:
+    return (EVENTS / f"eventlog_v2_{app_id}" / f"events_1_{app_id}").read_bytes()
+
+
+@pytest.fixture
+def client():
+    return EventLogClient(ServerConfig(event_log_dir=str(EVENTS)))
+
+
+def test_factory_selects_event_log_client():
+    config = ServerConfig(event_log_dir=f"file:{EVENTS}")
+    client = create_spark_client(config)
+    assert isinstance(client, EventLogClient)
+    assert client.log_dir == EVENTS
+
+
+def test_rolling_logs_are_listed_as_completed_applications(client):
+    apps = client.list_applications()
+
+    assert len(apps) == 3
+    assert all(app.status == "COMPLETED" for app in apps)
+    starts = [app.attempts[-1].start_time for app in apps]
+    assert starts == sorted(starts, reverse=True)
+    assert client.list_applications(status=["RUNNING"]) == []
+    assert len(client.list_applications(limit=1)) == 1
+    assert client.list_applications(min_date="2030-01-01") == []
+
+    app = client.get_application(APP_ID)
+    attempt = app.attempts[0]
+    assert app.name.startswith("NewYorkTaxiData")
+    assert app.cores_per_executor == 1
+    assert app.memory_per_executor_mb == 4096
+    assert attempt.app_spark_version == "3.5.3"
+    assert attempt.duration == int(
+        (attempt.end_time - attempt.start_time).total_seconds() * 1000
+    )
+
+
+def test_stage_totals_and_summaries_come_from_task_metrics(client):
+    stages = client.list_stages(APP_ID, status=[StageStatus.COMPLETE])
+    stage = max(stages, key=lambda s: s.executor_run_time)
+    tasks = client.list_stage_tasks(APP_ID, stage.stage_id, 0, length=10_000)
+
+    assert len(tasks) == stage.num_complete_tasks
+    assert stage.executor_run_time == sum(
+        t.task_metrics.executor_run_time for t in tasks
+    )
+    assert stage.shuffle_read_bytes == sum(
+        t.task_metrics.shuffle_read_metrics.remote_bytes_read
+        + t.task_metrics.shuffle_read_metrics.local_bytes_read
+        for t in tasks
+    )
+
+    summary = client.get_stage_task_summary(APP_ID, stage.stage_id, 0, "0.0,1.0")
+    run_times = sorted(t.task_metrics.executor_run_time for t in tasks)
+    assert summary.executor_run_time == [run_times[0], run_times[-1]]
+
+    slowest = client.list_stage_tasks(
+        APP_ID, stage.stage_id, 0, length=1, sort_by="-runtime"
+    )
+    assert slowest[0].task_metrics.executor_run_time == run_times[-1]
+
+    detailed = client.get_stage_attempt(
+        APP_ID, stage.stage_id, 0, task_status=[TaskStatus.SUCCESS]
+    )
+    assert len(detailed.tasks) == len(tasks)
+    assert sum(s.succeeded_tasks for s in detailed.executor_summary.values()) == len(
+        tasks
+    )
+
+
+def test_jobs_executors_and_environment(client):
+    jobs = client.list_jobs(APP_ID)
+    executors = client.list_all_executors(APP_ID)
+    environment = client.get_environment(APP_ID)
+
+    assert [j.job_id for j in jobs] == sorted((j.job_id for j in jobs), reverse=True)
+    assert all(j.status == "SUCCEEDED" for j in jobs)
+    assert sum(j.num_completed_tasks for j in jobs) == sum(
+        e.completed_tasks for e in executors
+    )
+    assert {e.id for e in executors} >= {"driver", "1", "2"}
+    assert environment.runtime.java_version.startswith("17")
+    assert ("spark.app.id", APP_ID) in environment.spark_properties
+
+
+def test_in_progress_log_ignores_truncated_tail(tmp_path):
+    data = _events()
+    cut = data.rindex(b"\n", 0, len(data) // 2)
+    (tmp_path / f"{APP_ID}.inprogress").write_bytes(data[: cut + 40])
+    client = EventLogClient(ServerConfig(event_log_dir=str(tmp_path)))
+
+    app = client.get_application(APP_ID)
+
+    assert app.status == "RUNNING"
+    assert app.attempts[0].duration == 0
+    with client._latest(APP_ID) as log:
+        assert log.malformed_lines == 0
+    assert any(s.status == "ACTIVE" for s in client.list_stages(APP_ID))
+
+
+def test_logs_are_replayed_once_until_they_change(tmp_path):
+    log = tmp_path / APP_ID
+    log.write_bytes(_events())
+    client = EventLogClient(ServerConfig(event_log_dir=str(tmp_path)))
+
+    with patch.object(
+        event_log_client, "replay", wraps=event_log_client.replay
+    ) as replay:
+        client.get_application(APP_ID)
+        client.list_stages(APP_ID)
+        assert replay.call_count == 1
+        with log.open("ab") as f:
+            f.write(b'{"Event":"SparkListenerUnknown"}\n')
+        client.list_stages(APP_ID)
+        assert replay.call_count == 2
+
+
+def test_listing_reads_only_application_fields(tmp_path, client):
+    data = _events()
+    (tmp_path / f"{APP_ID}.inprogress").write_bytes(data[: len(data) // 2])
+    running = EventLogClient(ServerConfig(event_log_dir=str(tmp_path)))
+
+    for offline in (client, running):
+        with patch.object(
+            event_log_client, "replay", wraps=event_log_client.replay
+        ) as replay:
+            apps = offline.list_applications()
+            assert replay.call_count == 0
+        # The same fields a full replay gives
+        assert apps == [offline.get_application(app.id) for app in apps]
+    assert running.list_applications()[0].status == "RUNNING"
+
+
+def test_replayed_logs_share_the_memory_budget(client):
+    app_ids = [app.id for app in client.list_applications()[:2]]
+    largest = max(
+        event_log_client._replay_size(client._attempts(app_id)[-1])
+        for app_id in app_ids
+    )
+    client._parsed = MemoryCache(namespace_max_bytes={"event_logs": largest})
+
+    for app_id in app_ids:
+        client.list_stages(app_id)
+
+    assert client.cache_info() == {"replayed_logs": {"currsize": 1}}
+    assert client._parsed.stats()["namespaces"]["event_logs"]["evictions"] == 1
+    assert client._log_locks == {}
+    client.clear_cache()
+    assert client.cache_info() == {"replayed_logs": {"currsize": 0}}
+
+
+def _fed_lines():
+    return patch.object(
+        event_log_client._Replay, "feed", autospec=True, side_effect=_Replay.feed
+    )
+
+
+def test_appends_to_in_progress_logs_are_replayed_incrementally(tmp_path, client):
+    data = _events()
+    cut = data.rindex(b"\n", 0, len(data) // 2) + 1
+    log = tmp_path / f"{APP_ID}.inprogress"
+    log.write_bytes(data[: cut + 40])
+    offline = EventLogClient(ServerConfig(event_log_dir=str(tmp_path)))
+    assert offline.get_application(APP_ID).status == "RUNNING"
+
+    with log.open("ab") as f:
+        f.write(data[cut + 40 :])
+    with _fed_lines() as feed:
+        stages = offline.list_stages(APP_ID)
+    # The unterminated line is read once complete, earlier lines are not re-read
+    assert feed.call_count == data[cut:].count(b"\n")
+
+    log.rename(tmp_path / APP_ID)
+    with _fed_lines() as feed:
+        assert offline.get_application(APP_ID).status == "COMPLETED"
+    assert feed.call_count == 0
+    assert stages == client.list_stages(APP_ID)
+
+
+def test_index_serves_replays_across_restarts(tmp_path, client):
+    lines = _events().splitlines(keepends=True)
+    rolling = tmp_path / "logs" / f"eventlog_v2_{APP_ID}"
+    rolling.mkdir(parents=True)
+    (rolling / f"events_1_{APP_ID}").write_bytes(b"".join(lines[:100]))
+    (rolling / f"appstatus_{APP_ID}.inprogress").touch()
+    config = ServerConfig(
+        event_log_dir=str(tmp_path / "logs"),
+        event_log_index_dir=str(tmp_path / "index"),
+    )
+    first = create_spark_client(config)
+    assert first.get_application(APP_ID).status == "RUNNING"
+    assert len(first.index.entries()) == 1
+
+    # A new rolling part, then completion, read by a restarted server
+    (rolling / f"events_2_{APP_ID}").write_bytes(b"".join(lines[100:]))
+    (rolling / f"appstatus_{APP_ID}.inprogress").rename(rolling / f"appstatus_{APP_ID}")
+    with _fed_lines() as feed:
+        restarted = create_spark_client(config)
+        assert restarted.get_application(APP_ID).status == "COMPLETED"
+    assert feed.call_count == len(lines) - 100
+
+    with _fed_lines() as feed:
+        stages = create_spark_client(config).list_stages(APP_ID, details=True)
+    assert feed.call_count == 0
+    assert stages == client.list_stages(APP_ID, details=True)
+
+    restarted.clear_cache()
+    assert restarted.cache_info() == {
+        "replayed_logs": {"currsize": 0},
+        "indexed_logs": {"currsize": 0},
+    }
+
+
+def test_index_is_bounded_and_invalidated_by_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig())
+    try:
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        for name in (APP_ID, f"{APP_ID}_2", "unrelated"):
+            (logs / name).write_bytes(_events())
+        config = ServerConfig(event_log_dir=str(logs))
+        index = create_spark_client(config).index
+        store = cache.get_file_store("event-log-index")
+        assert index.files is store
+
+        def replay(log_files):
+            # A fresh client, so the log is replayed and indexed again
+            EventLogClient(config, index=index)._load(log_files)
+
+        first, second, third = event_log_client.discover_logs(logs)
+        replay(first)
+        os.utime(index.path(first), (1, 1))
+        store.max_bytes = int(store.stats()["bytes"] * 1.5)
+        replay(third)
+        assert index.entries() == [index.path(third)]
+
+        store.max_bytes = None
+        replay(second)
+        replay(first)
+        # Both attempts of the application, whichever server is named
+        assert store.invalidate_app(APP_ID, server_key="local") == 2
+        assert index.entries() == [index.path(third)]
+    finally:
+        cache.configure(None)
+
+
+def _lz4_raw_stream(data: bytes) -> bytes:
+    header = struct.pack("<Biii", 0x10, len(data), len(data), 0)
+    end_mark = struct.pack("<Biii", 0x10, 0, 0, 0)
+    return b"LZ4Block" + header + data + b"LZ4Block" + end_mark
+
+
+def test_lz4_block_streams_are_decoded_across_appends():
+    # Uncompressed blocks use the same framing without needing the lz4 package
+    stream = io.BytesIO(_lz4_raw_stream(b"first\n") + _lz4_raw_stream(b"second\n"))
+    assert b"".join(_read_lz4(stream)) == b"first\nsecond\n"
+
+
+def _zstd(data: bytes) -> bytes:
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.compress(data)
+
+
+def _lz4_java(data: bytes, block_size: int = 1 << 15) -> bytes:
+    """lz4-java LZ4BlockOutputStream output: LZ4-compressed blocks, end mark."""
+    lz4_block = pytest.importorskip("lz4.block")
+    out = []
+    for start in range(0, len(data), block_size):
+        chunk = data[start : start + block_size]
+        block = lz4_block.compress(chunk, store_size=False)
+        out.append(b"LZ4Block" + struct.pack("<Biii", 0x26, len(block), len(chunk), 0))
+        out.append(block)
+    out.append(b"LZ4Block" + struct.pack("<Biii", 0x10, 0, 0, 0))
+    return b"".join(out)
+
+
+def _snappy_java(data: bytes, block_size: int = 1 << 15) -> bytes:
+    """snappy-java SnappyOutputStream output: header, length-prefixed blocks."""
+    snappy = pytest.importorskip("snappy")
+    out = [b"\x82SNAPPY\x00" + struct.pack(">ii", 1, 1)]
+    for start in range(0, len(data), block_size):
+        block = snappy.compress(data[start : start + block_size])
+        out.append(struct.pack(">i", len(block)) + block)
+    return b"".join(out)
+
+
+@pytest.mark.parametrize(
+    "codec, compress",
+    [("zstd", _zstd), ("lz4", _lz4_java), ("snappy", _snappy_java)],
+)
+def test_compressed_logs_are_read(tmp_path, client, codec, compress):
+    data = _events()
+    # Two streams, as when output is appended; the cut splits a line
+    cut = len(data) // 2
+    (tmp_path / f"{APP_ID}.{codec}").write_bytes(
+        compress(data[:cut]) + compress(data[cut:])
+    )
+    offline = EventLogClient(ServerConfig(event_log_dir=str(tmp_path)))
+
+    assert offline.list_applications() == [offline.get_application(APP_ID)]
+    assert offline.get_application(APP_ID).status == "COMPLETED"
+    assert offline.list_stages(APP_ID) == client.list_stages(APP_ID)
+
+
+def test_missing_codec_and_unknown_app_raise(tmp_path, client):
+    shutil.copy(
+        EVENTS / f"eventlog_v2_{APP_ID}" / f"events_1_{APP_ID}",
+        tmp_path / f"{APP_ID}.snappy",
+    )
+    offline = EventLogClient(ServerConfig(event_log_dir=str(tmp_path)))
+    with patch.dict(
+        event_log_client._READERS,
+        {"snappy": (event_log_client._read_snappy, False, "python-snappy")},
+    ):
+        with pytest.raises(EventLogError, match="python-snappy"):
+            offline.get_application(APP_ID)
+
+    with pytest.raises(EventLogError, match="No event log"):
+        client.get_application("spark-missing")
+    with pytest.raises(EventLogError, match="list_rdds is not available"):
+        client.list_rdds(APP_ID)
+    with pytest.raises(EventLogError, match="needs a History Server"):
+        client.list_executor_thread_dump(APP_ID, "1")
+    assert not hasattr(client, "get_missing_endpoint")
+
+
+def test_tools_run_against_event_logs(client):
+    with patch.object(fetchers, "_resolve_client", return_value=(client, False, False)):
+        summary = get_app_summary(APP_ID)
+
+    assert summary["application_id"] == APP_ID
+    assert summary["total_executor_runtime_minutes"] > 0
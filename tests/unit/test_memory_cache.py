@@ -0,0 +1,183 @@
+import gc
+import weakref
+from unittest.mock import patch
+
+from spark_history_mcp import cache
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.memory_cache import MemoryCache, estimate_size
+from spark_history_mcp.models.spark_types import ApplicationInfo
+
+
+def _fixed_size(size):
+    return lambda value: size
+
+
+def test_lru_eviction_by_entry_count():
+    cache = MemoryCache(max_entries=2)
+    cache.set(("s", "env", "a"), 1)
+    cache.set(("s", "env", "b"), 2)
+    assert cache.get(("s", "env", "a")) == 1  # a is now most recently used
+    cache.set(("s", "env", "c"), 3)
+
+    assert ("s", "env", "b") not in cache
+    assert cache.get(("s", "env", "a")) == 1
+    assert cache.get(("s", "env", "c")) == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_oldest_entries():
+    cache = MemoryCache(max_bytes=100, sizeof=_fixed_size(40))
+    for name in ("a", "b", "c"):
+        cache.set(("s", "stages", name), name)
+
+    assert len(cache) == 2
+    assert cache.total_bytes == 80
+    assert ("s", "stages", "a") not in cache
+
+
+def test_namespace_budget_only_evicts_its_own_entries():
+    cache = MemoryCache(
+        max_bytes=1000,
+        namespace_max_bytes={"stages": 100},
+        sizeof=_fixed_size(60),
+    )
+    cache.set(("s", "env", "app"), "env")
+    cache.set(("s", "stages", "a"), "a")
+    cache.set(("s", "stages", "b"), "b")
+
+    stats = cache.stats()["namespaces"]
+    assert ("s", "env", "app") in cache
+    assert ("s", "stages", "a") not in cache
+    assert stats["stages"]["entries"] == 1
+    assert stats["stages"]["evictions"] == 1
+    assert stats["env"]["evictions"] == 0
+
+
+def test_oversized_values_are_not_cached():
+    cache = MemoryCache(max_bytes=10, sizeof=_fixed_size(11))
+    assert cache.set(("s", "stages", "big"), "value") == "value"
+    assert len(cache) == 0
+
+
+def test_replacing_a_key_updates_accounting():
+    cache = MemoryCache(sizeof=len)
+    cache.set(("s", "env", "a"), "xxxx")
+    cache.set(("s", "env", "a"), "xx")
+    assert cache.total_bytes == 2
+    assert cache.stats()["namespaces"]["env"]["entries"] == 1
+
+
+def test_hit_miss_counters_and_clear():
+    cache = MemoryCache()
+    cache.get(("s", "jobs", "a"))
+    cache.set(("s", "jobs", "a"), [1])
+    cache.get(("s", "jobs", "a"))
+    cache.set(("s", "env", "a"), {})
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["namespaces"]["jobs"] == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expired": 0,
+        "entries": 1,
+        "bytes": stats["namespaces"]["jobs"]["bytes"],
+    }
+
+    cache.clear("jobs")
+    assert ("s", "jobs", "a") not in cache
+    assert ("s", "env", "a") in cache
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_ttl_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("spark_history_mcp.memory_cache.time.monotonic", lambda: now[0])
+    cache = MemoryCache()
+    cache.set(("s", "jobs", "running"), [1], ttl=10)
+    cache.set(("s", "jobs", "done"), [2])
+
+    now[0] += 11
+
+    assert cache.get(("s", "jobs", "running")) is None
+    assert cache.get(("s", "jobs", "done")) == [2]
+    assert cache.stats()["namespaces"]["jobs"]["expired"] == 1
+
+
+def test_discard_where():
+    cache = MemoryCache()
+    cache.set(("s", "jobs", "app-1"), 1)
+    cache.set(("s", "env", "app-1"), 2)
+    cache.set(("s", "env", "app-2"), 3)
+
+    assert cache.discard_where(lambda key: key[2] == "app-1") == 2
+    assert len(cache) == 1
+
+
+def test_estimate_size_grows_with_payload():
+    def app(i):
+        return ApplicationInfo.model_validate(
+            {"id": f"app-{i}", "name": "x" * 100, "attempts": []}
+        )
+
+    one = estimate_size([app(0)])
+    ten = estimate_size([app(i) for i in range(10)])
+    assert one > 100
+    assert ten > 5 * one
+
+
+def test_namespace_default_entry_cap():
+    cache = MemoryCache(
+        namespace_max_entries={"env": 3}, namespace_default_max_entries=1
+    )
+    for name in ("a", "b"):
+        cache.set(("s", "env", name), name)
+        cache.set(("s", "jobs", name), name)
+
+    assert cache.count_where(lambda key: key[1] == "env") == 2
+    assert cache.count_where(lambda key: key[1] == "jobs") == 1
+    assert ("s", "jobs", "b") in cache
+
+
+def test_client_cache_does_not_pin_client():
+    client = SparkRestClient(ServerConfig(url="http://shs:18080"))
+    key = (client._cache_owner, "get_environment", ("app",), ())
+    client._response_cache.set(key, object())
+    ref = weakref.ref(client)
+
+    del client
+    gc.collect()
+
+    assert ref() is None
+    assert key not in cache.get_memory_cache()
+
+
+def test_clients_share_the_configured_cache():
+    shared = cache.get_memory_cache()
+    first = SparkRestClient(ServerConfig(url="http://a:18080"))
+    second = SparkRestClient(ServerConfig(url="http://b:18080"))
+    app = ApplicationInfo.model_validate({"id": "app-1", "name": "a", "attempts": []})
+
+    with (
+        patch.object(SparkRestClient, "_get", return_value={}),
+        patch.object(SparkRestClient, "_parse_model", return_value=app),
+    ):
+        first.get_application("app-1")
+        first.get_application("app-1")
+        second.get_application("app-1")
+    first.clear_cache()
+
+    assert first._response_cache is second._response_cache is shared
+    assert shared.max_bytes == cache.get_cache_config().memory_max_bytes
+    assert first.cache_info()["get_application"]["currsize"] == 0
+    assert second.cache_info()["get_application"] == {
+        "hits": 0,
+        "misses": 1,
+        "maxsize": 1000,
+        "currsize": 1,
+    }
+    second.clear_cache()
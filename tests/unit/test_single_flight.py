@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from spark_history_mcp.tools import fetchers
+from spark_history_mcp.tools.fetchers import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def _clear_fetcher_cache():
+    fetchers._CACHE.clear()
+    yield
+    fetchers._CACHE.clear()
+
+
+def _run_in_threads(fn, count):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        try:
+            results[i] = fn()
+        except Exception as exc:
+            errors[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results, errors
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results, errors = _run_in_threads(lambda: flight.do(("k",), load), 8)
+
+    assert errors == [None] * 8
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.coalesced == 7
+
+
+def test_single_flight_shares_errors_and_then_retries():
+    flight = SingleFlight()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("shs down")
+
+    _, errors = _run_in_threads(lambda: flight.do(("k",), failing), 4)
+
+    assert len(calls) == 1
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    # Nothing is memoized: the next call runs the loader again
+    assert flight.do(("k",), lambda: "ok") == "ok"
+
+
+def test_fetch_stages_issues_one_request_for_concurrent_callers():
+    client = MagicMock()
+
+    def slow_list_stages(**kwargs):
+        time.sleep(0.1)
+        return ["stage"]
+
+    client.list_stages.side_effect = slow_list_stages
+
+    with patch.object(fetchers, "_resolve_client", return_value=(client, True, False)):
+        results, errors = _run_in_threads(
+            lambda: fetchers.fetch_stages("app-1", with_summaries=True), 6
+        )
+        # Subsequent calls are served from the memory cache
+        assert fetchers.fetch_stages("app-1", with_summaries=True) == ["stage"]
+
+    assert errors == [None] * 6
+    assert results == [["stage"]] * 6
+    client.list_stages.assert_called_once()
+
+
+def test_fetch_keys_are_not_coalesced_across_parameters():
+    client = MagicMock()
+    client.list_stages.side_effect = lambda **kwargs: [kwargs["with_summaries"]]
+
+    with patch.object(fetchers, "_resolve_client", return_value=(client, True, False)):
+        assert fetchers.fetch_stages("app-1", with_summaries=True) == [True]
+        assert fetchers.fetch_stages("app-1", with_summaries=False) == [False]
+
+    assert client.list_stages.call_count == 2
@@ -12,6 +12,15 @@ class TestSparkClient(unittest.TestCase):
         self.server_config = ServerConfig(url="http://spark-history-server:18080")
         self.client = SparkRestClient(self.server_config)
 
+    def test_connection_pool_sized_from_config(self):
+        client = SparkRestClient(
+            ServerConfig(url="https://shs:18080", max_connections=32)
+        )
+        adapter = client.session.get_adapter("https://shs:18080/api/v1")
+
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertIs(client.session.get_adapter("http://shs:18080"), adapter)
+
     @patch("requests.Session.request")
     def test_list_applications(self, mock_request):
         # Setup mock response
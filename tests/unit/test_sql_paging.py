@@ -0,0 +1,110 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from spark_history_mcp.tools import fetchers
+from spark_history_mcp.tools.jobs_stages import _find_slowest_sql
+
+
+class PagedSqlClient:
+    """Serve ``get_sql_list`` offset/length pages over a fixed execution list."""
+
+    def __init__(self, count):
+        self.executions = [
+            SimpleNamespace(
+                id=i,
+                duration=(i * 7919) % 10007,
+                status="RUNNING" if i % 50 == 0 else "COMPLETED",
+            )
+            for i in range(count)
+        ]
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_sql_list(
+        self,
+        app_id,
+        attempt_id=None,
+        details=True,
+        plan_description=False,
+        offset=0,
+        length=20,
+    ):
+        with self._lock:
+            self.calls.append((app_id, attempt_id, offset, length))
+        return self.executions[offset : offset + length]
+
+
+@pytest.fixture
+def paged_client():
+    def install(count):
+        client = PagedSqlClient(count)
+        patcher = patch.object(
+            fetchers, "_resolve_client", return_value=(client, False, False)
+        )
+        patcher.start()
+        installed.append(patcher)
+        return client
+
+    installed = []
+    yield install
+    for patcher in installed:
+        patcher.stop()
+
+
+@pytest.mark.parametrize("pages_in_flight", [1, 4])
+def test_streams_every_execution_in_order(paged_client, pages_in_flight):
+    client = paged_client(1234)
+
+    ids = [
+        e.id
+        for e in fetchers.fetch_sql_pages(
+            "app-1", attempt_id="2", page_size=100, pages_in_flight=pages_in_flight
+        )
+    ]
+
+    assert ids == list(range(1234))
+    assert {call[1] for call in client.calls} == {"2"}
+    assert {call[3] for call in client.calls} == {100}
+
+
+def test_small_app_needs_a_single_request(paged_client):
+    client = paged_client(30)
+
+    pages = list(fetchers.iter_sql_pages("app-1", page_size=100, pages_in_flight=4))
+
+    assert [len(p) for p in pages] == [30]
+    assert client.calls == [("app-1", None, 0, 100)]
+
+
+def test_exact_multiple_of_page_size_ends_on_empty_page(paged_client):
+    client = paged_client(200)
+
+    pages = list(fetchers.iter_sql_pages("app-1", page_size=100, pages_in_flight=1))
+
+    assert [len(p) for p in pages] == [100, 100]
+    assert [call[2] for call in client.calls] == [0, 100, 200]
+
+
+def test_closing_the_stream_stops_paging(paged_client):
+    client = paged_client(10_000)
+
+    stream = fetchers.iter_sql_pages("app-1", page_size=100, pages_in_flight=2)
+    next(stream)
+    next(stream)
+    stream.close()
+
+    assert len(client.calls) <= 4
+
+
+def test_find_slowest_sql_ranks_beyond_the_first_page(paged_client):
+    client = paged_client(5000)
+    completed = [e for e in client.executions if e.status == "COMPLETED"]
+    expected = sorted(completed, key=lambda e: e.duration, reverse=True)[:5]
+
+    result = _find_slowest_sql("app-1", n=5, compact=False)
+
+    assert [e.id for e in result] == [e.id for e in expected]
+    assert max(call[2] for call in client.calls) >= 5000
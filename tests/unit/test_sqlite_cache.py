@@ -0,0 +1,166 @@
+import json
+import multiprocessing
+import sqlite3
+import time
+
+import pytest
+
+from spark_history_mcp import cache
+from spark_history_mcp.cache import sqlite_backend
+from spark_history_mcp.cache.base import key_hash
+from spark_history_mcp.config.config import CacheConfig
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig(backend="sqlite", max_bytes=None, max_entries=None))
+    yield cache
+    cache.clear_cache()
+    cache.configure(None)
+
+
+def _use(config_overrides):
+    cache.configure(CacheConfig(backend="sqlite", **config_overrides))
+
+
+def _age(key, seconds):
+    """Backdate both access and creation time of a cached entry."""
+    backend = cache.get_backend()
+    past = time.time() - seconds
+    backend._connection().execute(
+        "UPDATE entries SET created_at = ?, accessed_at = ? WHERE key_hash = ?",
+        (past, past, key_hash(key)),
+    )
+
+
+def test_backend_is_selected_from_config(sqlite_cache):
+    backend = sqlite_cache.get_backend()
+    assert isinstance(backend, cache.SQLiteCacheBackend)
+    assert sqlite_cache.cache_stats()["backend"] == "sqlite"
+
+
+def test_round_trip_stores_compressed_payload_and_metadata(sqlite_cache):
+    data = json.dumps([{"stageId": i, "name": "x" * 50} for i in range(100)])
+    sqlite_cache.disk_set(("srv", "stages", "app-1", True), data)
+
+    assert sqlite_cache.disk_get(("srv", "stages", "app-1", True)) == data
+    db = sqlite3.connect(cache.CACHE_DIR / sqlite_backend.DB_FILE)
+    row = db.execute(
+        "SELECT namespace, server, app_id, size, length(payload) FROM entries"
+    ).fetchone()
+    db.close()
+    assert row[:3] == ("stages", "srv", "app-1")
+    assert row[3] == row[4] < len(data) / 5
+
+
+def test_journal_is_in_wal_mode(sqlite_cache):
+    sqlite_cache.disk_set(("srv", "env", "app-1"), "{}")
+    mode = cache.get_backend()._connection().execute("PRAGMA journal_mode")
+    assert mode.fetchone()[0] == "wal"
+
+
+def test_invalidate_app_removes_only_that_app(sqlite_cache):
+    for namespace in ("env", "jobs", "stages"):
+        sqlite_cache.disk_set(("srv", namespace, "app-1"), "[]")
+    sqlite_cache.disk_set(("srv", "env", "app-2"), "{}")
+    sqlite_cache.disk_set(("other", "env", "app-1"), "{}")
+
+    assert sqlite_cache.invalidate_app("app-1", server_key="srv") == 3
+    assert sqlite_cache.disk_get(("srv", "jobs", "app-1")) is None
+    assert sqlite_cache.disk_get(("other", "env", "app-1")) == "{}"
+    assert sqlite_cache.invalidate_app("app-1") == 1
+    assert [e.namespace for e in sqlite_cache.iter_entries()] == ["env"]
+
+
+def test_file_backend_rejects_per_app_invalidation(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig(backend="file"))
+    try:
+        with pytest.raises(NotImplementedError):
+            cache.invalidate_app("app-1")
+    finally:
+        cache.configure(None)
+
+
+def test_entry_budget_evicts_least_recently_accessed(sqlite_cache):
+    _use({"max_bytes": None, "max_entries": 3})
+    keys = [("srv", "jobs", f"app-{i}") for i in range(3)]
+    for age, key in zip((300, 200, 100), keys, strict=True):
+        sqlite_cache.disk_set(key, "[]")
+        _age(key, age)
+    assert sqlite_cache.disk_get(keys[0]) == "[]"
+
+    sqlite_cache.disk_set(("srv", "jobs", "app-3"), "[]")
+
+    # Pruned down to the low watermark (90% of 3 entries -> 2)
+    assert sqlite_cache.disk_get(keys[1]) is None
+    assert sqlite_cache.disk_get(keys[2]) is None
+    assert sqlite_cache.disk_get(keys[0]) == "[]"
+    assert sqlite_cache.cache_stats()["namespaces"]["jobs"]["evictions"] == 2
+
+
+def test_ttl_and_explicit_prune(sqlite_cache):
+    _use({"ttl_seconds": {"jobs": 60}})
+    for i in range(3):
+        sqlite_cache.disk_set(("srv", "jobs", f"app-{i}"), "[]")
+        sqlite_cache.disk_set(("srv", "env", f"app-{i}"), "{}")
+    _age(("srv", "jobs", "app-0"), 120)
+    _age(("srv", "jobs", "app-1"), 120)
+
+    assert sqlite_cache.disk_get(("srv", "jobs", "app-0")) is None
+    result = sqlite_cache.prune(max_entries=2)
+
+    assert result["expired"] == 1
+    assert result["evicted"] == 2
+    assert result["entries"] == 2
+
+
+def test_stats_aggregate_by_namespace(sqlite_cache):
+    sqlite_cache.disk_set(("srv", "env", "app-1"), "{}")
+    sqlite_cache.disk_set(("srv", "stages", "app-1"), "[]")
+    sqlite_cache.disk_get(("srv", "env", "app-1"))
+    sqlite_cache.disk_get(("srv", "env", "missing"))
+
+    stats = sqlite_cache.cache_stats()
+
+    assert stats["entries"] == 2
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["namespaces"]["env"]["hit_rate"] == 0.5
+    assert stats["namespaces"]["stages"]["writes"] == 1
+
+
+def test_clear_cache_counts_entries(sqlite_cache):
+    sqlite_cache.disk_set(("srv", "env", "a"), "{}")
+    sqlite_cache.disk_set(("srv", "jobs", "a"), "[]")
+
+    assert sqlite_cache.clear_cache() == 2
+    assert sqlite_cache.iter_entries() == []
+    assert sqlite_cache.cache_stats()["namespaces"] == {}
+
+
+def _hammer(cache_dir, worker, rounds):
+    cache.CACHE_DIR = cache_dir
+    cache.configure(CacheConfig(backend="sqlite", max_bytes=None, max_entries=None))
+    payload = json.dumps({"worker": worker, "items": ["x" * 64] * 2000})
+    errors = 0
+    for i in range(rounds):
+        cache.disk_set(("srv", "stages", f"app-{i % 5}"), payload)
+        raw = cache.disk_get(("srv", "stages", f"app-{i % 5}"))
+        if raw is None:
+            errors += 1
+        else:
+            json.loads(raw)
+    cache.flush_stats()
+    return errors
+
+
+def test_processes_share_one_database(sqlite_cache):
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(4) as pool:
+        errors = pool.starmap(_hammer, [(cache.CACHE_DIR, i, 25) for i in range(4)])
+
+    assert errors == [0, 0, 0, 0]
+    stats = sqlite_cache.cache_stats()
+    assert stats["entries"] == 5
+    assert stats["namespaces"]["stages"]["writes"] == 100
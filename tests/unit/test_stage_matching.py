@@ -0,0 +1,271 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from spark_history_mcp import cache
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import CacheConfig
+from spark_history_mcp.models.spark_types import ApplicationInfo, StageData
+from spark_history_mcp.tools import fetchers, matching
+from spark_history_mcp.tools.matching import (
+    StageNameIndex,
+    match_stages,
+    name_similarity,
+    normalize_stage_name,
+    stage_fingerprint,
+)
+
+START = datetime(2024, 1, 1)
+
+
+def make_stage(name, submit=None, complete=None):
+    return SimpleNamespace(name=name, submission_time=submit, completion_time=complete)
+
+
+def _brute_force_best(stages1, stages2, threshold):
+    """Best similarity available to each stage over every pair."""
+    return [
+        max(
+            (name_similarity(s1.name, s2.name) for s2 in stages2),
+            default=0.0,
+        )
+        >= threshold
+        for s1 in stages1
+    ]
+
+
+def test_normalized_names_ignore_case_spacing_and_numbers():
+    assert normalize_stage_name("Map  at Job.scala:42") == "map at job.scala:#"
+    assert normalize_stage_name("map at Job.scala:7") == "map at job.scala:#"
+
+
+def test_exact_names_pair_in_order_of_appearance():
+    s1 = [make_stage("save at A.scala:1") for _ in range(3)]
+    s2 = [make_stage("Save at A.scala:1") for _ in range(3)]
+
+    matches = match_stages(s1, s2, similarity_threshold=0.9)
+
+    position = {id(s): i for i, s in enumerate(s1 + s2)}
+    assert [(position[id(m.stage1)], position[id(m.stage2)] - 3) for m in matches] == [
+        (0, 0),
+        (1, 1),
+        (2, 2),
+    ]
+    assert all(m.similarity == 1.0 for m in matches)
+
+
+def test_exact_names_respect_required_overlap():
+    early = (START, START + timedelta(seconds=10))
+    late = (START + timedelta(hours=1), START + timedelta(hours=1, seconds=10))
+    s1 = [make_stage("count at A.scala:3", *late)]
+    s2 = [
+        make_stage("count at A.scala:3", *early),
+        make_stage("count at A.scala:3", *late),
+    ]
+
+    (match,) = match_stages(s1, s2, similarity_threshold=0.9, require_overlap=True)
+
+    assert match.stage2 is s2[1]
+    assert match.overlap_seconds == 10
+
+
+def test_fuzzy_scores_match_sequence_matcher():
+    s1 = [make_stage("mapPartitions at Ingest.scala:120")]
+    s2 = [
+        make_stage("collect at Report.scala:9"),
+        make_stage("mapPartitions at Ingest.scala:131"),
+    ]
+
+    (match,) = match_stages(s1, s2, similarity_threshold=0.7)
+
+    assert match.stage2 is s2[1]
+    assert match.similarity == name_similarity(s1[0].name, s2[1].name)
+
+
+def test_below_threshold_pairs_are_not_matched():
+    s1 = [make_stage("collect at Report.scala:9")]
+    s2 = [make_stage("parquet at Writer.scala:200")]
+
+    assert match_stages(s1, s2, similarity_threshold=0.75) == []
+
+
+def test_greedy_takes_most_similar_pair_first():
+    # First-come greedy would give s1[0] the closest name of s1[1]
+    s1 = [make_stage("join at Etl.scala:10 x"), make_stage("join at Etl.scala:10")]
+    s2 = [make_stage("join at Etl.scala:10!"), make_stage("join at Etl.scala:1")]
+
+    matches = match_stages(s1, s2, similarity_threshold=0.5)
+    pairs = {m.stage1.name: m.stage2.name for m in matches}
+
+    assert pairs["join at Etl.scala:10"] == "join at Etl.scala:10!"
+
+
+def test_optimal_assignment_maximizes_total_similarity():
+    # Greedy takes the single best pair (a1, b1) and leaves a2 with b2 only
+    s1 = [make_stage("abcdefghij"), make_stage("abcdefgxyz")]
+    s2 = [make_stage("abcdefghiq"), make_stage("abcdefgxyq")]
+    edges = [(0, 0, 0.95, 0.0), (0, 1, 0.9, 0.0), (1, 0, 0.9, 0.0)]
+
+    greedy = matching._assign_greedy(edges)
+    optimal = matching._assign_optimal(edges)
+
+    assert sorted(e[:2] for e in greedy) == [(0, 0)]
+    assert sorted(e[:2] for e in optimal) == [(0, 1), (1, 0)]
+    assert len(match_stages(s1, s2, similarity_threshold=0.8, optimal=True)) == 2
+
+
+def test_candidate_index_skips_common_grams():
+    names = [f"stage {i} at Common.scala" for i in range(200)] + ["unique xyz"]
+    index = StageNameIndex(names, common_threshold=10)
+
+    candidates = index.candidates("unique xyq", limit=5)
+
+    assert candidates[0] == 200
+    assert len(candidates) <= 5 + 1
+
+
+@pytest.mark.parametrize("optimal", [False, True])
+def test_matches_every_stage_a_full_scan_could_match(optimal):
+    rng = random.Random(3)  # noqa: S311
+    operations = ["map", "filter", "save", "collect", "mapPartitions", "join"]
+    files = ["Ingest", "Transform", "Report", "Writer"]
+    s1 = [
+        make_stage(
+            f"{rng.choice(operations)} at {rng.choice(files)}.scala:{rng.randint(1, 400)}"
+        )
+        for _ in range(120)
+    ]
+    s2 = [make_stage(s.name.replace("scala:", "scala:1")) for s in s1]
+
+    matches = match_stages(s1, s2, similarity_threshold=0.75, optimal=optimal)
+
+    assert len(matches) == sum(_brute_force_best(s1, s2, 0.75))
+    assert len({id(m.stage2) for m in matches}) == len(matches)
+    for m in matches:
+        assert m.similarity == name_similarity(m.stage1.name, m.stage2.name)
+        assert m.similarity >= 0.75
+
+
+CALL_SITE = (
+    "org.apache.spark.sql.Dataset.count(Dataset.scala:3615)\n"
+    "etl.Job$.$anonfun$run$1(Job.scala:{line})\n"
+    "etl.Job$$$Lambda${lambda_id}/0x000000080123{suffix}.apply(Unknown Source)"
+)
+
+
+def stage_data(stage_id, name, line, lambda_id=1234, suffix="abcd", tasks=200):
+    return StageData.model_validate(
+        {
+            "status": "COMPLETE",
+            "stageId": stage_id,
+            "attemptId": 0,
+            "numTasks": tasks,
+            "name": name,
+            "details": CALL_SITE.format(line=line, lambda_id=lambda_id, suffix=suffix),
+            "rddIds": [stage_id * 3, stage_id * 3 + 1],
+        }
+    )
+
+
+def test_fingerprint_ignores_per_run_lambda_ids():
+    run1 = stage_data(1, "count at Job.scala:10", line=10)
+    run2 = stage_data(7, "count at Job.scala:10", line=10, lambda_id=99, suffix="ff00")
+
+    assert stage_fingerprint(run1) == stage_fingerprint(run2)
+    # Same name from another call site, or a different task count band
+    assert stage_fingerprint(run1) != stage_fingerprint(
+        stage_data(1, "count at Job.scala:10", line=11)
+    )
+    assert stage_fingerprint(run1) != stage_fingerprint(
+        stage_data(1, "count at Job.scala:10", line=10, tasks=2000)
+    )
+
+
+def test_fingerprints_join_before_names():
+    # Same stage name, told apart only by call site; app2 runs them reversed
+    s1 = [
+        stage_data(1, "count at Job.scala:10", line=10),
+        stage_data(2, "count at Job.scala:10", line=20),
+    ]
+    s2 = [
+        stage_data(5, "count at Job.scala:10", line=20),
+        stage_data(6, "count at Job.scala:10", line=10),
+        stage_data(7, "save at Job.scala:30", line=30),
+    ]
+    s1.append(stage_data(3, "save at Job.scala:30", line=31))
+
+    matches = match_stages(s1, s2, similarity_threshold=0.9)
+    pairs = {m.stage1.stage_id: (m.stage2.stage_id, m.matched_by) for m in matches}
+
+    assert pairs == {1: (6, "fingerprint"), 2: (5, "fingerprint"), 3: (7, "name")}
+
+
+@pytest.fixture
+def stage_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    cache.configure(CacheConfig())
+    fetchers._CACHE.clear()
+    client = MagicMock(spec=SparkRestClient)
+    client.get_application.return_value = ApplicationInfo.model_validate(
+        {
+            "id": "app-1",
+            "name": "etl",
+            "attempts": [{"attemptId": "1", "duration": 1, "completed": True}],
+        }
+    )
+    client.list_stages.side_effect = lambda **kwargs: [
+        stage_data(1, "count at Job.scala:10", line=10)
+    ]
+    with patch.object(fetchers, "_resolve_client", return_value=(client, True, True)):
+        yield client
+    fetchers._CACHE.clear()
+    cache.clear_cache()
+    cache.configure(None)
+
+
+def test_fingerprints_are_cached_next_to_stages(stage_client):
+    (fetched,) = fetchers.fetch_stages("app-1")
+    expected = stage_fingerprint(stage_data(1, "count at Job.scala:10", line=10))
+    assert fetchers.fetch_stage_fingerprints("app-1") == {"1:0": expected}
+    # Neither the fingerprint nor the RDD ids leak into outputs or the cache
+    assert "fingerprint" not in fetched.model_dump()
+    assert "rddIds" not in fetched.model_dump(by_alias=True)
+
+    # Reload from disk: the fingerprints are stored, the RDD ids are not
+    fetchers._CACHE.clear()
+    (reloaded,) = fetchers.fetch_stages("app-1")
+
+    assert stage_client.list_stages.call_count == 1
+    assert reloaded.rdd_ids is None
+    assert stage_fingerprint(reloaded) != expected
+    assert fetchers.fetch_stage_fingerprints("app-1") == {"1:0": expected}
+    (match,) = match_stages(
+        [reloaded],
+        [stage_data(1, "count at Job.scala:10", line=10)],
+        fingerprints1=fetchers.fetch_stage_fingerprints("app-1"),
+    )
+    assert match.matched_by == "fingerprint"
+
+
+def test_stored_fingerprints_join_stages_without_rdd_ids():
+    # app1 fingerprints come from the stored map, app2 stages were restored
+    # from the cache without RDD ids or a map; app2 runs them reversed
+    s1 = [
+        stage_data(1, "count at Job.scala:10", line=10),
+        stage_data(2, "count at Job.scala:10", line=20),
+    ]
+    stored = matching.fingerprint_stages(s1)
+    s2 = [
+        stage_data(5, "count at Job.scala:10", line=20),
+        stage_data(6, "count at Job.scala:10", line=10),
+    ]
+    for stage in s1 + s2:
+        stage.rdd_ids = None
+
+    matches = match_stages(s1, s2, similarity_threshold=0.9, fingerprints1=stored)
+    pairs = {m.stage1.stage_id: (m.stage2.stage_id, m.matched_by) for m in matches}
+
+    assert pairs == {1: (6, "fingerprint"), 2: (5, "fingerprint")}
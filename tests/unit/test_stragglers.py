@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from spark_history_mcp.models.spark_types import TaskData, TaskStatus
+from spark_history_mcp.tools.analysis import analyze_stragglers
+from spark_history_mcp.tools.task_stats import TaskStatsAccumulator
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _task(i, duration, host="h1", launch_s=0, **metrics):
+    return TaskData.model_validate(
+        {
+            "taskId": i,
+            "index": i,
+            "attempt": 0,
+            "launchTime": (START + timedelta(seconds=launch_s)).isoformat(),
+            "duration": duration,
+            "executorId": host,
+            "host": host,
+            "status": "SUCCESS",
+            "speculative": False,
+            "taskMetrics": {
+                "jvmGcTime": metrics.get("gc", 0),
+                "memoryBytesSpilled": metrics.get("spill", 0),
+                "inputMetrics": {"bytesRead": metrics.get("input", 100)},
+                "shuffleReadMetrics": {"fetchWaitTime": metrics.get("fetch_wait", 0)},
+            },
+        }
+    )
+
+
+def _stage(stage_id, run_time, tasks=20):
+    return SimpleNamespace(
+        stage_id=stage_id,
+        attempt_id=0,
+        name=f"stage {stage_id}",
+        status="COMPLETE",
+        num_tasks=tasks,
+        executor_run_time=run_time,
+        submission_time=START,
+        completion_time=START + timedelta(seconds=60),
+    )
+
+
+STAGE_TASKS = {
+    # Four tail tasks, each with a different cause, ending the stage late
+    1: [_task(i, 1000, host=f"h{i % 3}") for i in range(16)]
+    + [
+        _task(16, 10_000, input=5000),
+        _task(17, 8000, gc=4000),
+        _task(18, 6000, fetch_wait=3000),
+        _task(19, 5000, spill=1 << 20),
+    ],
+    # Uniform stage without stragglers
+    2: [_task(i, 1000, host=f"h{i % 2}") for i in range(20)],
+}
+
+
+def _fake_tasks(app_id, stage_id, attempt_id=0, server=None, status=None):
+    assert status == [TaskStatus.SUCCESS]
+    return iter(STAGE_TASKS[stage_id])
+
+
+def _run(**kwargs):
+    stages = [_stage(1, 50_000), _stage(2, 20_000), _stage(3, 1, tasks=2)]
+    with (
+        patch("spark_history_mcp.tools.analysis.fetch_stages", return_value=stages),
+        patch(
+            "spark_history_mcp.tools.analysis.fetch_stage_tasks",
+            side_effect=_fake_tasks,
+        ) as fetch_tasks,
+    ):
+        return analyze_stragglers("app-1", **kwargs), fetch_tasks
+
+
+def test_tail_tasks_are_found_and_attributed():
+    result, fetch_tasks = _run()
+
+    # Stage 3 has too few tasks to analyze
+    assert fetch_tasks.call_count == 2
+    stage = result["stages"][0]
+    assert stage["stage_id"] == 1
+    assert stage["median_task_ms"] == 1000
+    assert stage["tail_task_count"] == 4
+    causes = {t["task_id"]: t["causes"] for t in stage["tail_tasks"]}
+    assert causes == {
+        16: ["input_skew"],
+        17: ["gc"],
+        18: ["shuffle_fetch_wait"],
+        19: ["spill"],
+    }
+    # All tasks launch together; the stage would have ended after the median
+    assert stage["wall_clock_lost_ms"] == 9000
+    assert stage["wall_clock_lost_pct"] == 15.0
+
+    uniform = result["stages"][1]
+    assert uniform["tail_task_count"] == 0
+    assert uniform["wall_clock_lost_ms"] == 0
+    assert result["summary"]["stages_with_stragglers"] == 1
+    assert {r["type"] for r in result["recommendations"]} == {
+        "data_partitioning",
+        "memory",
+        "shuffle",
+    }
+
+
+def test_top_stages_limits_analysis_to_heaviest():
+    result, fetch_tasks = _run(top_stages=1, max_tail_tasks=2)
+
+    assert fetch_tasks.call_count == 1
+    assert [s["stage_id"] for s in result["stages"]] == [1]
+    # Only the slowest tail tasks are reported, but all are counted
+    assert [t["task_id"] for t in result["stages"][0]["tail_tasks"]] == [16, 17]
+    assert result["stages"][0]["tail_task_count"] == 4
+    causes = {"input_skew": 1, "gc": 1, "shuffle_fetch_wait": 1, "spill": 1}
+    assert result["stages"][0]["tail_causes"] == causes
+    assert result["summary"]["tail_causes"] == causes
+    # Recommendations cover the causes of the unreported tail tasks too
+    assert {r["type"] for r in result["recommendations"]} == {
+        "data_partitioning",
+        "memory",
+        "shuffle",
+    }
+
+
+def test_slow_host_is_attributed():
+    tasks = [_task(i, 1000, host=f"h{i % 4}") for i in range(20)]
+    tasks += [_task(20 + i, 4000, host="slow") for i in range(3)]
+    stats = TaskStatsAccumulator().add_all(tasks)
+
+    with (
+        patch(
+            "spark_history_mcp.tools.analysis.fetch_stages",
+            return_value=[_stage(1, 10, tasks=23)],
+        ),
+        patch(
+            "spark_history_mcp.tools.analysis.fetch_stage_tasks",
+            return_value=iter(tasks),
+        ),
+    ):
+        result = analyze_stragglers("app-1")
+
+    stage = result["stages"][0]
+    assert stats.count_above(2000) == 3
+    assert [h["host"] for h in stage["slow_hosts"]] == ["slow"]
+    assert all(t["causes"] == ["slow_host"] for t in stage["tail_tasks"])
+
+
+def test_wall_clock_loss_respects_launch_times():
+    # The long task starts early, so it does not delay the stage end
+    tasks = [_task(0, 5000, launch_s=0)] + [
+        _task(i, 1000, launch_s=10) for i in range(1, 10)
+    ]
+    stats = TaskStatsAccumulator().add_all(tasks)
+
+    assert stats.wall_clock_lost_ms(2000, 1000) == 0
+    assert stats.wall_clock_lost_ms(500, 100) == 900
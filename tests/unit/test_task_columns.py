@@ -0,0 +1,242 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from spark_history_mcp.api.event_log_client import EventLogClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.models.spark_types import StageStatus, TaskData
+from spark_history_mcp.tools import fetchers, task_columns
+from spark_history_mcp.tools.jobs_stages import get_stage_task_distribution
+from spark_history_mcp.tools.task_columns import (
+    TaskColumns,
+    TaskColumnStore,
+    parse_quantiles,
+)
+from spark_history_mcp.tools.task_stats import quantile
+
+EVENTS = Path(__file__).parents[2] / "examples" / "basic" / "events"
+APP_ID = "spark-cc4d115f011443d787f03a71a476a745"
+
+
+@pytest.fixture(params=["numpy", "python"])
+def kernel(request, monkeypatch):
+    """Run a test with the NumPy kernels and again with the pure-Python ones."""
+    if request.param == "numpy":
+        if not task_columns.NUMPY_AVAILABLE:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(task_columns, "NUMPY_AVAILABLE", False)
+    return request.param
+
+
+def _task(i, duration, executor="1", host="h1", status="SUCCESS", shuffle=0):
+    data = {
+        "taskId": i,
+        "index": i,
+        "attempt": 0,
+        "duration": duration,
+        "executorId": executor,
+        "host": host,
+        "status": status,
+        "speculative": False,
+    }
+    if status == "SUCCESS":
+        data["taskMetrics"] = {
+            "executorRunTime": duration,
+            "jvmGcTime": i % 7,
+            "shuffleReadMetrics": {
+                "remoteBytesRead": shuffle,
+                "localBytesRead": 1,
+                "fetchWaitTime": i % 3,
+            },
+        }
+    return TaskData.model_validate(data)
+
+
+@pytest.fixture
+def tasks():
+    tasks = [
+        _task(i, 100 + (i * 37) % 500, str(i % 5), f"h{i % 2}", shuffle=i * 10)
+        for i in range(1000)
+    ]
+    tasks[17] = _task(17, 40, "4", "h1", status="FAILED")
+    return tasks
+
+
+def test_quantiles_match_nearest_rank(kernel, tasks):
+    columns = TaskColumns.from_tasks(tasks)
+    durations = sorted(t.duration for t in tasks)
+    shuffle = sorted(
+        t.task_metrics.shuffle_read_metrics.remote_bytes_read + 1
+        for t in tasks
+        if t.task_metrics
+    )
+    qs = [0.0, 0.25, 0.5, 0.9, 0.999, 1.0]
+
+    assert len(columns) == 1000
+    assert columns.quantiles("duration_ms", qs) == [quantile(durations, q) for q in qs]
+    # The failed task reported no metrics and is left out
+    assert columns.quantiles("shuffle_read_bytes", qs) == [
+        quantile(shuffle, q) for q in qs
+    ]
+    assert len(columns.values("shuffle_read_bytes")) == 999
+    assert columns.where(host=["nowhere"]).quantiles("duration_ms", qs) == [None] * 6
+
+
+def test_histogram_covers_every_task(kernel, tasks):
+    histogram = TaskColumns.from_tasks(tasks).histogram("duration_ms", bins=4)
+
+    assert [b["lower"] for b in histogram] == [40.0, 179.75, 319.5, 459.25]
+    assert histogram[-1]["upper"] == 599.0
+    assert sum(b["count"] for b in histogram) == 1000
+    assert TaskColumns.from_tasks(tasks[:1]).histogram("duration_ms") == [
+        {"lower": 100.0, "upper": 100.0, "count": 1}
+    ]
+
+
+def test_group_by_and_filter(kernel, tasks):
+    columns = TaskColumns.from_tasks(tasks)
+    groups = columns.group_by("executor_id", ["duration_ms", "jvm_gc_time_ms"])
+
+    for executor, group in groups.items():
+        mine = [t for t in tasks if t.executor_id == executor]
+        assert group["tasks"] == len(mine)
+        assert group["duration_ms_sum"] == sum(t.duration for t in mine)
+        assert group["duration_ms_max"] == max(t.duration for t in mine)
+        gc = [t.task_metrics.jvm_gc_time for t in mine if t.task_metrics]
+        assert group["jvm_gc_time_ms_mean"] == round(sum(gc) / len(gc), 1)
+    sums = [g["duration_ms_sum"] for g in groups.values()]
+    assert sums == sorted(sums, reverse=True)
+
+    successful = columns.where(status=["SUCCESS"], host=["h1"])
+    assert len(successful) == 499
+    assert successful.labels("host") == ["h0", "h1"]
+    assert list(successful.group_by("host")) == ["h1"]
+
+    with pytest.raises(ValueError, match="Unknown task metric"):
+        columns.quantiles("bogus", [0.5])
+    with pytest.raises(ValueError, match="Cannot group"):
+        columns.group_by("stage")
+
+
+def test_save_and_load_round_trip(kernel, tasks, tmp_path):
+    columns = TaskColumns.from_tasks(tasks)
+    path = tmp_path / "stage.cols"
+    columns.save(path)
+    loaded = TaskColumns.load(path)
+
+    assert len(loaded) == len(columns)
+    assert loaded.values("duration_ms") == columns.values("duration_ms")
+    assert loaded.group_by("host") == columns.group_by("host")
+    assert loaded.where(status=["FAILED"]).values("duration_ms") == [40.0]
+
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="truncated"):
+        TaskColumns.load(path)
+
+
+def test_store_keeps_stages_apart(tasks, tmp_path):
+    store = TaskColumnStore(tmp_path)
+    store.put("srv", "app-1", 3, 0, TaskColumns.from_tasks(tasks))
+
+    assert len(store.get("srv", "app-1", 3, 0)) == 1000
+    assert store.get("srv", "app-1", 3, 1) is None
+    assert store.get("other", "app-1", 3, 0) is None
+    store.path("srv", "app-1", 4, 0).write_bytes(b"garbage")
+    assert store.get("srv", "app-1", 4, 0) is None
+
+
+def test_store_evicts_least_recently_used_files(tasks, tmp_path):
+    store = TaskColumnStore(tmp_path)
+    columns = TaskColumns.from_tasks(tasks)
+    store.put("srv", "app-1", 0, 0, columns)
+    size = store.path("srv", "app-1", 0, 0).stat().st_size
+    store.files.max_bytes = int(size * 2.5)
+    store.put("srv", "app-1", 1, 0, columns)
+    os.utime(store.path("srv", "app-1", 0, 0), (1, 1))
+    store.put("srv", "app-2", 0, 0, columns)
+
+    assert store.get("srv", "app-1", 0, 0) is None
+    assert store.get("srv", "app-1", 1, 0) is not None
+    assert store.get("srv", "app-2", 0, 0) is not None
+    assert store.files.stats()["bytes"] == 2 * size
+
+
+def test_store_invalidates_one_application(tasks, tmp_path):
+    store = TaskColumnStore(tmp_path)
+    columns = TaskColumns.from_tasks(tasks)
+    for server, app_id in [("a", "app-1"), ("b", "app-1"), ("a", "app-12")]:
+        store.put(server, app_id, 0, 0, columns)
+
+    assert store.files.invalidate_app("app-1", server_key="b") == 1
+    assert store.get("b", "app-1", 0, 0) is None
+    assert store.files.invalidate_app("app-1") == 1
+    assert store.get("a", "app-1", 0, 0) is None
+    assert store.get("a", "app-12", 0, 0) is not None
+
+
+def test_parse_quantiles():
+    assert parse_quantiles("0.5, 0.99,1") == [0.5, 0.99, 1.0]
+    for bad in ("", "p50", "1.5"):
+        with pytest.raises(ValueError):
+            parse_quantiles(bad)
+
+
+def test_event_log_records_match_task_data(kernel):
+    client = EventLogClient(ServerConfig(event_log_dir=str(EVENTS)))
+    stages = client.list_stages(APP_ID, status=[StageStatus.COMPLETE])
+    stage = max(stages, key=lambda s: s.shuffle_read_bytes or 0)
+
+    from_records = TaskColumns.from_records(
+        client.stage_task_records(APP_ID, stage.stage_id, stage.attempt_id)
+    )
+    from_tasks = TaskColumns.from_tasks(
+        client.list_stage_tasks(
+            APP_ID, stage.stage_id, stage.attempt_id, length=100_000
+        )
+    )
+
+    assert len(from_records) == len(from_tasks) == stage.num_tasks
+    for name in task_columns.COLUMNS:
+        assert sorted(from_records.values(name)) == sorted(from_tasks.values(name))
+    assert from_records.group_by("executor_id") == from_tasks.group_by("executor_id")
+
+
+class CountingTaskClient:
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.calls = 0
+
+    def list_stage_tasks(
+        self, app_id, stage_id, attempt_id, offset, length, sort_by, status
+    ):
+        self.calls += 1
+        return self.tasks[offset : offset + length]
+
+
+def test_tool_builds_columns_once(tasks):
+    client = CountingTaskClient(tasks)
+    fetchers._CACHE.clear()
+    with patch.object(fetchers, "_resolve_client", return_value=(client, True, False)):
+        result = get_stage_task_distribution(
+            "app-1",
+            3,
+            metrics=["duration_ms"],
+            quantiles="0.5,1.0",
+            histogram_bins=2,
+            group_by="host",
+            status=["success"],
+            max_groups=1,
+        )
+        calls = client.calls
+        get_stage_task_distribution("app-1", 3, quantiles="0.99")
+    fetchers._CACHE.clear()
+
+    assert client.calls == calls
+    assert result["task_count"] == 999
+    assert result["metrics"]["duration_ms"]["quantiles"] == [350.0, 599.0]
+    assert sum(b["count"] for b in result["metrics"]["duration_ms"]["histogram"]) == 999
+    assert result["group_count"] == 2
+    assert len(result["by_host"]) == 1
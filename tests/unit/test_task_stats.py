@@ -0,0 +1,145 @@
+from unittest.mock import patch
+
+import pytest
+
+from spark_history_mcp.models.spark_types import TaskData, TaskStatus
+from spark_history_mcp.tools import fetchers
+from spark_history_mcp.tools.jobs_stages import get_stage_task_stats
+from spark_history_mcp.tools.task_stats import (
+    Log2Histogram,
+    TaskStatsAccumulator,
+    quantile,
+)
+
+
+def _task(i, duration, executor="1", host="h1", status="SUCCESS", **metrics):
+    return TaskData.model_validate(
+        {
+            "taskId": i,
+            "index": i,
+            "attempt": 0,
+            "duration": duration,
+            "executorId": executor,
+            "host": host,
+            "status": status,
+            "speculative": False,
+            "taskMetrics": {
+                "executorRunTime": duration,
+                "jvmGcTime": metrics.get("gc", 0),
+                "memoryBytesSpilled": metrics.get("spill", 0),
+                "diskBytesSpilled": 0,
+                "inputMetrics": {"bytesRead": metrics.get("input", 0)},
+                "shuffleReadMetrics": {
+                    "remoteBytesRead": metrics.get("shuffle", 0),
+                    "localBytesRead": 0,
+                    "fetchWaitTime": metrics.get("fetch_wait", 0),
+                },
+            },
+        }
+    )
+
+
+class PagedTaskClient:
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.calls = []
+
+    def list_stage_tasks(
+        self, app_id, stage_id, attempt_id, offset, length, sort_by, status
+    ):
+        self.calls.append((stage_id, attempt_id, offset, length, status))
+        selected = [
+            t for t in self.tasks if not status or t.status in {s.value for s in status}
+        ]
+        return selected[offset : offset + length]
+
+
+@pytest.fixture
+def task_client():
+    tasks = [
+        _task(i, 100 + i % 10, executor=str(i % 4), host=f"h{i % 2}")
+        for i in range(2500)
+    ]
+    tasks[1234] = _task(1234, 9000, executor="3", host="h0", gc=5000)
+    tasks[7] = _task(7, 50, executor="3", host="h1", status="FAILED")
+    client = PagedTaskClient(tasks)
+    with patch.object(fetchers, "_resolve_client", return_value=(client, False, False)):
+        yield client
+
+
+def test_fetch_stage_tasks_pages_through_all_tasks(task_client):
+    tasks = list(
+        fetchers.fetch_stage_tasks(
+            "app-1", 3, attempt_id=1, page_size=1000, pages_in_flight=2
+        )
+    )
+
+    assert [t.task_id for t in tasks] == list(range(2500))
+    assert {(c[0], c[1], c[3]) for c in task_client.calls} == {(3, 1, 1000)}
+
+
+def test_accumulator_groups_tasks_exactly(task_client):
+    stats = TaskStatsAccumulator(top_n=3).add_all(task_client.tasks)
+    summary = stats.summary()
+
+    assert summary["task_count"] == 2500
+    assert summary["failed_tasks"] == 1
+    assert summary["executor_count"] == 4
+    executor_3 = summary["by_executor"]["3"]
+    expected = [t for t in task_client.tasks if t.executor_id == "3"]
+    assert executor_3["tasks"] == len(expected)
+    assert executor_3["duration_sum_ms"] == sum(t.duration for t in expected)
+    assert executor_3["duration_max_ms"] == 9000
+    assert executor_3["gc_time_ms"] == 5000
+    assert executor_3["failed_tasks"] == 1
+    # Busiest executor first
+    assert next(iter(summary["by_executor"])) == "3"
+
+    slowest = summary["slowest_tasks"]
+    assert [t["task_id"] for t in slowest][0] == 1234
+    assert len(slowest) == 3
+    assert slowest[0]["gc_time_ms"] == 5000
+
+
+def test_duration_quantiles_and_histogram(task_client):
+    summary = TaskStatsAccumulator().add_all(task_client.tasks).summary()
+    durations = sorted(t.duration for t in task_client.tasks)
+
+    assert summary["duration_ms"]["p50"] == durations[1249]
+    assert summary["duration_ms"]["max"] == 9000
+    assert summary["duration_ms"]["min"] == 50
+    histogram = summary["histograms"]["duration_ms"]
+    assert sum(b["count"] for b in histogram) == 2500
+    assert {"lower": 8192, "upper": 16384, "count": 1} in histogram
+
+
+def test_log2_histogram_buckets():
+    histogram = Log2Histogram()
+    for value in (0, 1, 2, 3, 4, 1000):
+        histogram.add(value)
+
+    assert histogram.buckets() == [
+        {"lower": 0, "upper": 1, "count": 1},
+        {"lower": 1, "upper": 2, "count": 1},
+        {"lower": 2, "upper": 4, "count": 2},
+        {"lower": 4, "upper": 8, "count": 1},
+        {"lower": 512, "upper": 1024, "count": 1},
+    ]
+
+
+def test_quantile_nearest_rank():
+    assert quantile([], 0.5) is None
+    assert quantile([1, 2, 3, 4], 0.5) == 2
+    assert quantile([1, 2, 3, 4], 0.99) == 4
+    assert quantile([5], 0.0) == 5
+
+
+def test_tool_streams_stage_tasks(task_client):
+    result = get_stage_task_stats("app-1", 3, top_n=1, max_groups=1, status=["success"])
+
+    assert result["stage_id"] == 3
+    assert result["task_count"] == 2499
+    assert result["failed_tasks"] == 0
+    assert result["slowest_tasks"][0]["task_id"] == 1234
+    assert list(result["by_executor"]) == ["3"]
+    assert task_client.calls[0][4] == [TaskStatus.SUCCESS]
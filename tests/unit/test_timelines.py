@@ -2,9 +2,20 @@
 Tests for spark_history_mcp.tools.timelines module.
 """
 
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
 from types import SimpleNamespace
+from unittest.mock import patch
 
+import pytest
+
+from spark_history_mcp.tools import timelines
+from spark_history_mcp.tools.comparison_modules.executors import (
+    _analyze_intervals,
+    _analyze_stage_intervals,
+    _create_timeline_intervals,
+)
+from spark_history_mcp.tools.executors import get_timeline
 from spark_history_mcp.tools.timelines import (
     build_app_executor_timeline,
     build_stage_executor_timeline,
@@ -530,3 +541,325 @@ class TestBuildAppExecutorTimeline:
         timeline = result["timeline"]
         expected_avg = sum(t["active_executor_count"] for t in timeline) / len(timeline)
         assert summary["avg_executor_count"] == expected_avg
+
+
+def _brute_force_counts(spans, windows):
+    """Per-window overlap counts with the original O(E x I) test."""
+    return [
+        sum(1 for start, end in spans if start <= hi and end >= lo)
+        for lo, hi in windows
+    ]
+
+
+class TestTimelineSweep:
+    """The sweep must match a per-interval scan over every executor."""
+
+    def _random_executors(self, seed, count, start):
+        rng = random.Random(seed)  # noqa: S311
+        executors = []
+        for i in range(count):
+            add = start + timedelta(seconds=rng.randint(-120, 3600))
+            remove = add + timedelta(seconds=rng.randint(-60, 1800))
+            executors.append(
+                SimpleNamespace(
+                    id=str(i),
+                    host_port=f"host{i % 7}:7337",
+                    total_cores=rng.choice([None, 1, 2, 4]),
+                    max_memory=rng.choice([None, 512 * 1024 * 1024, 2 << 30]),
+                    add_time=None if i % 11 == 0 else add,
+                    remove_time=None if i % 5 == 0 else remove,
+                )
+            )
+        return executors
+
+    def test_stage_timeline_matches_brute_force(self):
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        end = start + timedelta(minutes=61, seconds=30)
+        stage = SimpleNamespace(
+            stage_id=1,
+            attempt_id=0,
+            name="s",
+            submission_time=start,
+            completion_time=end,
+        )
+        executors = self._random_executors(7, 300, start)
+
+        timeline = build_stage_executor_timeline(stage, executors)["timeline"]
+
+        spans = [(e.add_time or start, e.remove_time or end) for e in executors]
+        windows = [
+            (
+                datetime.fromisoformat(t["interval_start"]),
+                datetime.fromisoformat(t["interval_end"]),
+            )
+            for t in timeline
+        ]
+        assert len(timeline) == 62
+        assert [t["active_executor_count"] for t in timeline] == _brute_force_counts(
+            spans, windows
+        )
+        for entry, (lo, hi) in zip(timeline, windows, strict=True):
+            active = [
+                e
+                for e, (s, f) in zip(executors, spans, strict=True)
+                if s <= hi and f >= lo
+            ]
+            assert [d["id"] for d in entry["active_executors"]] == [
+                e.id for e in active
+            ]
+            assert entry["total_cores"] == sum(e.total_cores or 0 for e in active)
+            assert entry["total_memory_mb"] == sum(
+                (e.max_memory or 0) for e in active
+            ) / (1024 * 1024)
+
+    def test_stage_timeline_without_executor_details(self):
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        stage = SimpleNamespace(
+            stage_id=1,
+            attempt_id=0,
+            name="s",
+            submission_time=start,
+            completion_time=start + timedelta(minutes=30),
+        )
+        executors = self._random_executors(3, 50, start)
+
+        full = build_stage_executor_timeline(stage, executors)["timeline"]
+        lean = build_stage_executor_timeline(
+            stage, executors, include_executor_details=False
+        )["timeline"]
+
+        assert all("active_executors" not in t for t in lean)
+        for entry in full:
+            del entry["active_executors"]
+        assert lean == full
+
+    def test_get_timeline_passes_executor_details_option(self):
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        stage = SimpleNamespace(
+            stage_id=4,
+            attempt_id=1,
+            name="s",
+            submission_time=start,
+            completion_time=start + timedelta(minutes=5),
+        )
+        executors = self._random_executors(5, 20, start)
+
+        with (
+            patch(
+                "spark_history_mcp.tools.executors.fetch_stage_attempt",
+                return_value=stage,
+            ) as fetch_stage,
+            patch(
+                "spark_history_mcp.tools.executors.fetch_executors",
+                return_value=executors,
+            ),
+        ):
+            full = get_timeline("app-1", stage_id=4, attempt_id=1)
+            lean = get_timeline(
+                "app-1", stage_id=4, attempt_id=1, include_executor_details=False
+            )
+
+        fetch_stage.assert_called_with(
+            app_id="app-1", stage_id=4, attempt_id=1, server=None
+        )
+        assert full["stage_info"]["stage_id"] == 4
+        assert any(t.get("active_executors") for t in full["timeline"])
+        assert all("active_executors" not in t for t in lean["timeline"])
+        assert [t["active_executor_count"] for t in lean["timeline"]] == [
+            t["active_executor_count"] for t in full["timeline"]
+        ]
+
+    def test_app_timeline_matches_brute_force(self):
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        end = start + timedelta(minutes=45)
+        app = SimpleNamespace(
+            id="app-1",
+            name="a",
+            attempts=[SimpleNamespace(start_time=start, end_time=end)],
+        )
+        executors = self._random_executors(11, 200, start)
+        stages = [
+            SimpleNamespace(
+                stage_id=i // 2,  # two attempts per stage id
+                name=f"stage {i}",
+                submission_time=start + timedelta(minutes=i % 40),
+                completion_time=None
+                if i % 9 == 0
+                else start + timedelta(minutes=i % 40 + 3),
+            )
+            for i in range(60)
+        ]
+
+        timeline = build_app_executor_timeline(app, executors, stages)["timeline"]
+
+        spans = [(e.add_time or start, e.remove_time or end) for e in executors]
+        windows = [
+            (
+                datetime.fromisoformat(t["interval_start"]),
+                datetime.fromisoformat(t["interval_end"]),
+            )
+            for t in timeline
+        ]
+        assert [t["active_executor_count"] for t in timeline] == _brute_force_counts(
+            spans, windows
+        )
+        expected_stages = [
+            len(
+                {
+                    s.stage_id
+                    for s in stages
+                    if s.submission_time <= hi and (s.completion_time or end) >= lo
+                }
+            )
+            for lo, hi in windows
+        ]
+        assert [t["active_stages_count"] for t in timeline] == expected_stages
+
+
+@pytest.fixture(params=["numpy", "python"])
+def kernel(request, monkeypatch):
+    """Run a test against the NumPy kernel (when installed) and the fallback."""
+    if request.param == "numpy":
+        if not timelines.NUMPY_AVAILABLE:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(timelines, "NUMPY_AVAILABLE", False)
+    return request.param
+
+
+def _replay_intervals(intervals, events):
+    """The event replay _analyze_intervals used to perform per interval."""
+    executors, stages, cores, memory, index, result = set(), set(), 0, 0, 0, []
+    for interval in intervals:
+        while index < len(events) and events[index]["timestamp"] <= interval["end"]:
+            event = events[index]
+            if event["type"] == "executor_add":
+                executors.add(event["executor_id"])
+                cores += event["cores"]
+                memory += event["memory_mb"]
+            elif event["type"] == "executor_remove":
+                executors.discard(event["executor_id"])
+            elif event["type"] == "stage_start":
+                stages.add(event["stage_id"])
+            elif event["type"] == "stage_end":
+                stages.discard(event["stage_id"])
+            index += 1
+        result.append((len(executors), cores, memory, len(stages)))
+    return result
+
+
+class TestIntervalKernels:
+    """Array-backed interval counts used by timelines and comparisons."""
+
+    def test_window_overlaps_and_totals(self, kernel):
+        first, stop = timelines.window_overlaps(
+            [0, 5, 25, 12], [4, 30, 26, 8], [0, 10, 20], [10, 20, 30]
+        )
+
+        # The inverted span (12 > 8) overlaps nothing
+        assert [int(x) for x in first] == [0, 0, 2, 1]
+        assert [int(x) for x in stop] == [1, 3, 3, 1]
+        assert timelines.range_totals(first, stop, 3) == [2, 1, 2]
+        assert timelines.range_totals(first, stop, 3, [1, 10, 100, 1000]) == [
+            11,
+            10,
+            110,
+        ]
+
+    def test_empty_spans_keep_integer_totals(self, kernel):
+        first, stop = timelines.window_overlaps([], [], [0, 10], [10, 20])
+
+        totals = timelines.range_totals(first, stop, 2, [])
+        assert totals == [0, 0]
+        assert all(type(t) is int for t in totals)
+
+    def test_merge_ranges_by_key(self):
+        first, stop = timelines.merge_ranges_by_key(
+            [0, 2, 5, 1, 3], [3, 4, 6, 1, 4], ["a", "a", "a", "b", "c"]
+        )
+
+        assert sorted(zip(first, stop, strict=True)) == [(0, 4), (3, 4), (5, 6)]
+
+    def test_app_timeline_matches_on_both_kernels(self, kernel):
+        TestTimelineSweep().test_app_timeline_matches_brute_force()
+        TestTimelineSweep().test_stage_timeline_matches_brute_force()
+
+    def test_comparison_intervals_match_event_replay(self, kernel):
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        rng = random.Random(5)  # noqa: S311
+        events = []
+        for i in range(150):
+            added = start + timedelta(seconds=rng.randint(-300, 3000))
+            events.append(
+                {
+                    "timestamp": added,
+                    "type": "executor_add",
+                    "executor_id": str(i % 120),  # some ids are reused
+                    "cores": rng.choice([1, 4]),
+                    "memory_mb": rng.choice([512.0, 1024.5]),
+                }
+            )
+            if i % 3:
+                events.append(
+                    {
+                        "timestamp": added + timedelta(seconds=rng.randint(-60, 900)),
+                        "type": "executor_remove",
+                        "executor_id": str(i % 120),
+                    }
+                )
+        for i in range(40):
+            submitted = start + timedelta(seconds=rng.randint(0, 3000))
+            events.append(
+                {"timestamp": submitted, "type": "stage_start", "stage_id": i % 25}
+            )
+            events.append(
+                {
+                    "timestamp": submitted + timedelta(seconds=rng.randint(0, 600)),
+                    "type": "stage_end",
+                    "stage_id": i % 25,
+                }
+            )
+        events.sort(key=lambda e: e["timestamp"])
+        intervals = _create_timeline_intervals(
+            start, start + timedelta(minutes=55, seconds=20), 1
+        )
+
+        analysis = _analyze_intervals(intervals, events)
+
+        assert [
+            (
+                a["executor_count"],
+                a["total_cores"],
+                a["total_memory_mb"],
+                a["active_stages"],
+            )
+            for a in analysis
+        ] == _replay_intervals(intervals, events)
+        assert analysis[0]["interval"] is intervals[0]
+        assert _analyze_intervals([], events) == []
+
+    def test_stage_intervals_clip_executors_to_stage(self, kernel):
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        end = start + timedelta(minutes=3)
+        executors = [
+            SimpleNamespace(
+                add_time=start - timedelta(minutes=5),
+                remove_time=start + timedelta(seconds=30),
+                total_cores=2,
+                max_memory=1024 * 1024 * 1024,
+            ),
+            SimpleNamespace(
+                add_time=start + timedelta(minutes=1, seconds=30),
+                remove_time=None,
+                total_cores=4,
+                max_memory=None,
+            ),
+        ]
+
+        analysis = _analyze_stage_intervals(
+            _create_timeline_intervals(start, end, 1), executors, start, end
+        )
+
+        assert [a["active_executor_count"] for a in analysis] == [1, 1, 1]
+        assert [a["total_cores"] for a in analysis] == [2, 4, 4]
+        assert [a["total_memory_mb"] for a in analysis] == [1024, 0, 0]
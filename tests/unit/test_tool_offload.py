@@ -0,0 +1,135 @@
+import inspect
+import threading
+import time
+from contextlib import AsyncExitStack
+from unittest.mock import patch
+
+import anyio
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from spark_history_mcp.core.app import mcp
+from spark_history_mcp.models.spark_types import (
+    ApplicationEnvironmentInfo,
+    ApplicationInfo,
+)
+from spark_history_mcp.tools import fetchers, get_application
+
+CLIENTS = 50
+
+
+class GatedClient:
+    """Fake SHS whose get_application blocks until released (except "fast")."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+
+    def get_application(self, app_id):
+        self.threads.add(threading.current_thread().name)
+        if app_id != "fast":
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            self.gate.wait(10)
+            with self.lock:
+                self.active -= 1
+        return ApplicationInfo.model_validate(
+            {"id": app_id, "name": app_id, "attempts": []}
+        )
+
+    def get_environment(self, app_id):
+        return ApplicationEnvironmentInfo.model_validate(
+            {"runtime": {"javaVersion": "17"}}
+        )
+
+
+@pytest.fixture
+def shs():
+    client = GatedClient()
+    with patch.object(fetchers, "_resolve_client", return_value=(client, False, False)):
+        yield client
+    client.gate.set()
+
+
+async def _wait_for(condition):
+    with anyio.fail_after(10):
+        while not condition():
+            await anyio.sleep(0.01)
+
+
+async def _timed_call(session, tool, arguments, latencies):
+    start = time.perf_counter()
+    result = await session.call_tool(tool, arguments)
+    latencies[arguments["app_id"]] = time.perf_counter() - start
+    assert not result.isError, result.content
+    return result
+
+
+def test_sync_tools_stay_plain_functions():
+    assert not inspect.iscoroutinefunction(get_application)
+    tool = mcp._tool_manager.get_tool("get_application")
+    assert tool.is_async
+    assert set(tool.parameters["properties"]) == {"app_id", "server", "compact"}
+
+
+async def test_concurrent_clients_get_independent_latencies(shs, monkeypatch):
+    monkeypatch.setenv("SHS_TOOL_MAX_CONCURRENCY", str(CLIENTS))
+    # Every call goes to one server; lift its cap so only the threads limit
+    monkeypatch.setenv("SHS_PER_SERVER_MAX_CONCURRENCY", str(CLIENTS))
+    latencies = {}
+    async with AsyncExitStack() as stack:
+        sessions = [
+            await stack.enter_async_context(
+                create_connected_server_and_client_session(mcp)
+            )
+            for _ in range(CLIENTS)
+        ]
+        async with anyio.create_task_group() as tg:
+            for i, session in enumerate(sessions[1:]):
+                tg.start_soon(
+                    _timed_call,
+                    session,
+                    "get_application",
+                    {"app_id": f"slow-{i}"},
+                    latencies,
+                )
+            # Every slow call is blocked in its own worker thread at once...
+            await _wait_for(lambda: shs.active == CLIENTS - 1)
+            # ...and the event loop still serves the remaining client
+            await _timed_call(
+                sessions[0], "get_application", {"app_id": "fast"}, latencies
+            )
+            assert len(latencies) == 1
+            shs.gate.set()
+
+    assert len(latencies) == CLIENTS
+    assert shs.peak == CLIENTS - 1
+    assert latencies["fast"] < min(v for k, v in latencies.items() if k != "fast")
+    assert threading.main_thread().name not in shs.threads
+
+
+async def test_per_tool_limit_leaves_threads_for_other_tools(shs, monkeypatch):
+    monkeypatch.setenv("SHS_TOOL_MAX_CONCURRENCY", "8")
+    monkeypatch.setenv("SHS_TOOL_CONCURRENCY_LIMITS", '{"get_application": 3}')
+    latencies = {}
+    async with create_connected_server_and_client_session(mcp) as session:
+        async with anyio.create_task_group() as tg:
+            for i in range(20):
+                tg.start_soon(
+                    _timed_call,
+                    session,
+                    "get_application",
+                    {"app_id": f"slow-{i}"},
+                    latencies,
+                )
+            await _wait_for(lambda: shs.active == 3)
+            await _timed_call(session, "get_environment", {"app_id": "x"}, latencies)
+            assert shs.active == 3
+            shs.gate.set()
+
+    assert shs.peak == 3
+    assert len(latencies) == 21